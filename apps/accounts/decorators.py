@@ -9,15 +9,51 @@ Decorators available:
 - @login_required: Ensures user is logged in
 - @role_required(*roles): Checks user has one of specified roles
 - @permission_required(*perms): Checks user has required permissions
+
+All of them accept sync and async (``async def``) views.
 """
 
 from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.http import HttpResponseForbidden
 from django.shortcuts import redirect
 from django.urls import reverse
 from django.utils.translation import gettext as _
 
 
+def _guarded(view_func, check):
+    """
+    Wrap view_func so check(request) runs first.
+
+    check returns a response (redirect/403) to deny access, or None to let
+    the view run. For async views the check (session/DB access) runs in a
+    worker thread and the view is awaited.
+    """
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _async_wrapped_view(request, *args, **kwargs):
+            denied = await sync_to_async(check)(request)
+            if denied is not None:
+                return denied
+            return await view_func(request, *args, **kwargs)
+        return _async_wrapped_view
+
+    @wraps(view_func)
+    def _wrapped_view(request, *args, **kwargs):
+        denied = check(request)
+        if denied is not None:
+            return denied
+        return view_func(request, *args, **kwargs)
+    return _wrapped_view
+
+
+def _login_redirect(request):
+    login_url = reverse('auth:login')
+    next_url = request.get_full_path()
+    return redirect(f'{login_url}?next={next_url}')
+
+
 def public_view(view_func):
     """
     Decorator that marks a view as public (no authentication required).
@@ -60,23 +96,22 @@ def login_required(function=None, redirect_url=None):
     Returns:
         Decorated function that checks for 'local_user_id' in session
     """
+    def check(request):
+        # Check if user is authenticated via Hub session
+        if 'local_user_id' not in request.session:
+            # Get redirect URL
+            if redirect_url:
+                login_url = redirect_url
+            else:
+                login_url = reverse('auth:login')
+
+            # Add 'next' parameter to redirect back after login
+            next_url = request.get_full_path()
+            return redirect(f'{login_url}?next={next_url}')
+        return None
+
     def decorator(view_func):
-        @wraps(view_func)
-        def _wrapped_view(request, *args, **kwargs):
-            # Check if user is authenticated via Hub session
-            if 'local_user_id' not in request.session:
-                # Get redirect URL
-                if redirect_url:
-                    login_url = redirect_url
-                else:
-                    login_url = reverse('auth:login')
-
-                # Add 'next' parameter to redirect back after login
-                next_url = request.get_full_path()
-                return redirect(f'{login_url}?next={next_url}')
-
-            return view_func(request, *args, **kwargs)
-        return _wrapped_view
+        return _guarded(view_func, check)
 
     # Allow using @login_required or @login_required()
     if function:
@@ -100,24 +135,21 @@ def role_required(*roles):
     Returns:
         Decorated function that checks user role
     """
+    def check(request):
+        # First check if user is logged in
+        if 'local_user_id' not in request.session:
+            return _login_redirect(request)
+
+        # Check if user has required role
+        user_role = request.session.get('user_role')
+        if user_role not in roles:
+            return HttpResponseForbidden(
+                _("You don't have permission to access this page.")
+            )
+        return None
+
     def decorator(view_func):
-        @wraps(view_func)
-        def _wrapped_view(request, *args, **kwargs):
-            # First check if user is logged in
-            if 'local_user_id' not in request.session:
-                login_url = reverse('auth:login')
-                next_url = request.get_full_path()
-                return redirect(f'{login_url}?next={next_url}')
-
-            # Check if user has required role
-            user_role = request.session.get('user_role')
-            if user_role not in roles:
-                return HttpResponseForbidden(
-                    _("You don't have permission to access this page.")
-                )
-
-            return view_func(request, *args, **kwargs)
-        return _wrapped_view
+        return _guarded(view_func, check)
     return decorator
 
 
@@ -170,45 +202,40 @@ def permission_required(*permissions, any_perm=False):
     Returns:
         Decorated function that checks user permissions
     """
-    def decorator(view_func):
-        @wraps(view_func)
-        def _wrapped_view(request, *args, **kwargs):
-            # First check if user is logged in
-            if 'local_user_id' not in request.session:
-                login_url = reverse('auth:login')
-                next_url = request.get_full_path()
-                return redirect(f'{login_url}?next={next_url}')
+    def check(request):
+        # First check if user is logged in
+        if 'local_user_id' not in request.session:
+            return _login_redirect(request)
 
-            # Get the current user
-            user = _get_current_user(request)
-            if not user:
-                login_url = reverse('auth:login')
-                next_url = request.get_full_path()
-                return redirect(f'{login_url}?next={next_url}')
+        # Get the current user
+        user = _get_current_user(request)
+        if not user:
+            return _login_redirect(request)
 
-            # Admin always passes
-            if user.get_role_name() == 'admin':
-                return view_func(request, *args, **kwargs)
+        # Admin always passes
+        if user.get_role_name() == 'admin':
+            return None
 
-            # No permissions specified = just needs to be logged in
-            if not permissions:
-                return view_func(request, *args, **kwargs)
+        # No permissions specified = just needs to be logged in
+        if not permissions:
+            return None
 
-            # Check permissions
-            if any_perm:
-                # User needs ANY of the permissions
-                has_permission = any(user.has_perm(p) for p in permissions)
-            else:
-                # User needs ALL permissions
-                has_permission = all(user.has_perm(p) for p in permissions)
+        # Check permissions
+        if any_perm:
+            # User needs ANY of the permissions
+            has_permission = any(user.has_perm(p) for p in permissions)
+        else:
+            # User needs ALL permissions
+            has_permission = all(user.has_perm(p) for p in permissions)
 
-            if not has_permission:
-                return HttpResponseForbidden(
-                    _("You don't have permission to access this page.")
-                )
+        if not has_permission:
+            return HttpResponseForbidden(
+                _("You don't have permission to access this page.")
+            )
+        return None
 
-            return view_func(request, *args, **kwargs)
-        return _wrapped_view
+    def decorator(view_func):
+        return _guarded(view_func, check)
     return decorator
 
 
@@ -223,26 +250,22 @@ def admin_required(view_func):
         def admin_only_view(request):
             ...
     """
-    @wraps(view_func)
-    def _wrapped_view(request, *args, **kwargs):
-        # First check if user is logged in
-        if 'local_user_id' not in request.session:
-            login_url = reverse('auth:login')
-            next_url = request.get_full_path()
-            return redirect(f'{login_url}?next={next_url}')
+    return _guarded(view_func, _check_admin)
 
-        # Get the current user
-        user = _get_current_user(request)
-        if not user:
-            login_url = reverse('auth:login')
-            next_url = request.get_full_path()
-            return redirect(f'{login_url}?next={next_url}')
 
-        # Check admin role
-        if user.get_role_name() != 'admin':
-            return HttpResponseForbidden(
-                _("Administrator access required.")
-            )
+def _check_admin(request):
+    # First check if user is logged in
+    if 'local_user_id' not in request.session:
+        return _login_redirect(request)
 
-        return view_func(request, *args, **kwargs)
-    return _wrapped_view
+    # Get the current user
+    user = _get_current_user(request)
+    if not user:
+        return _login_redirect(request)
+
+    # Check admin role
+    if user.get_role_name() != 'admin':
+        return HttpResponseForbidden(
+            _("Administrator access required.")
+        )
+    return None
@@ -5,6 +5,7 @@ Attaches LocalUser instance to request.user based on session data.
 This replaces Django's default AnonymousUser with the authenticated LocalUser.
 """
 
+from django.utils.deprecation import MiddlewareMixin
 from django.utils.functional import SimpleLazyObject
 from apps.accounts.models import LocalUser
 
@@ -61,22 +62,16 @@ def get_user(request):
         return AnonymousUser()
 
 
-class LocalUserAuthenticationMiddleware:
+class LocalUserAuthenticationMiddleware(MiddlewareMixin):
     """
     Middleware that attaches LocalUser to request.user.
 
     Must be placed after SessionMiddleware in settings.MIDDLEWARE.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         # Attach user to request (lazy loaded)
         request.user = SimpleLazyObject(lambda: get_user(request))
 
         # Add helper property to check if user is authenticated
         request.user_authenticated = 'local_user_id' in request.session
-
-        response = self.get_response(request)
-        return response
@@ -6,12 +6,15 @@ Cloud session (JWT) is handled separately by the login views.
 """
 import logging
 from django.shortcuts import redirect
-from django.urls import resolve, reverse, Resolver404
+from django.urls import reverse
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.core.path_classifier import SCOPE_AUTH, classify_request, path_classifier
 
 logger = logging.getLogger(__name__)
 
 
-class JWTMiddleware:
+class JWTMiddleware(MiddlewareMixin):
     """
     Middleware that requires PIN authentication for all Hub pages.
 
@@ -53,22 +56,27 @@ class JWTMiddleware:
 
     def __init__(self, get_response):
         """Initialize middleware."""
-        self.get_response = get_response
+        super().__init__(get_response)
+        path_classifier.register(
+            SCOPE_AUTH, prefixes=self.EXEMPT_PREFIXES, exact=self.EXEMPT_EXACT,
+        )
+
+    def process_request(self, request):
+        """Process request (None lets it through)."""
+        path_class = classify_request(request)
 
-    def __call__(self, request):
-        """Process request."""
         # Check if path is exempt
-        if self._is_exempt_path(request.path):
-            return self.get_response(request)
+        if path_class.is_exempt(SCOPE_AUTH):
+            return None
 
         # Check if the view is marked as public (via @public_view decorator)
-        if self._is_public_view(request.path):
-            return self.get_response(request)
+        if path_class.is_public:
+            return None
 
         # Check if already authenticated via local PIN login
         # (local_user_id in session means authenticated via PIN)
         if request.session.get('local_user_id'):
-            return self.get_response(request)
+            return None
 
         # No PIN session — redirect to login for profile selection + PIN
         return redirect(reverse('auth:login'))
@@ -83,16 +91,7 @@ class JWTMiddleware:
         Returns:
             bool: True if exempt, False otherwise
         """
-        # Check exact matches first
-        if path in self.EXEMPT_EXACT:
-            return True
-
-        # Check prefix matches
-        for prefix in self.EXEMPT_PREFIXES:
-            if path.startswith(prefix):
-                return True
-
-        return False
+        return path_classifier.classify(path).is_exempt(SCOPE_AUTH)
 
     def _is_public_view(self, path):
         """
@@ -108,8 +107,4 @@ class JWTMiddleware:
         Returns:
             bool: True if the view is marked as public, False otherwise
         """
-        try:
-            match = resolve(path)
-            return getattr(match.func, 'is_public', False)
-        except Resolver404:
-            return False
+        return path_classifier.classify(path).is_public
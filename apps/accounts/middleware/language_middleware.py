@@ -1,10 +1,11 @@
 from django.utils import translation
+from django.utils.deprecation import MiddlewareMixin
 from django.conf import settings
 from apps.configuration.models import HubConfig
 from apps.core.utils import detect_os_language
 
 
-class LanguageMiddleware:
+class LanguageMiddleware(MiddlewareMixin):
     """
     Custom language middleware that:
     1. Uses cookie language (set by browser auto-detection)
@@ -13,10 +14,7 @@ class LanguageMiddleware:
     4. Falls back to default language code
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
+    def process_request(self, request):
         language = None
 
         # Priority 1: Check session language (logged-in user preference)
@@ -59,8 +57,7 @@ class LanguageMiddleware:
         translation.activate(language)
         request.LANGUAGE_CODE = language
 
-        response = self.get_response(request)
-
+    def process_response(self, request, response):
         # Deactivate to prevent leaking to other requests
         translation.deactivate()
 
@@ -0,0 +1,69 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='localuser',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='accounts_lo_create_2e64c4_live'),
+        ),
+        migrations.AddIndex(
+            model_name='localuser',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='accounts_lo_update_f0f706_live'),
+        ),
+        migrations.AddIndex(
+            model_name='localuser',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name'], name='accounts_lo_name_56c869_live'),
+        ),
+        migrations.AddIndex(
+            model_name='permission',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='accounts_pe_create_f822d4_live'),
+        ),
+        migrations.AddIndex(
+            model_name='permission',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='accounts_pe_update_db773f_live'),
+        ),
+        migrations.AddIndex(
+            model_name='permission',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'module_id', 'codename'], name='accounts_pe_codena_7a8b47_live'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='accounts_ro_create_105b6b_live'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='accounts_ro_update_d1de71_live'),
+        ),
+        migrations.AddIndex(
+            model_name='role',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'name'], name='accounts_ro_name_d6b948_live'),
+        ),
+        migrations.AddIndex(
+            model_name='rolepermission',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='accounts_ro_create_884c1e_live'),
+        ),
+        migrations.AddIndex(
+            model_name='rolepermission',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='accounts_ro_update_4c4e9a_live'),
+        ),
+        migrations.AddIndex(
+            model_name='trusteddevice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='accounts_tr_create_ebf27d_live'),
+        ),
+        migrations.AddIndex(
+            model_name='trusteddevice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='accounts_tr_update_b98f93_live'),
+        ),
+        migrations.AddIndex(
+            model_name='trusteddevice',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', '-last_used'], name='accounts_tr_last_u_0b9b43_live'),
+        ),
+    ]
@@ -0,0 +1,14 @@
+from django.db import migrations
+
+from apps.core.search import search_index_operation
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_hub_partial_indexes'),
+    ]
+
+    operations = [
+        search_index_operation('accounts', 'LocalUser', ['name', 'email']),
+    ]
@@ -359,12 +359,13 @@ class LocalUser(HubBaseModel):
     def __str__(self):
         return f"{self.name} ({self.email})"
 
-    def set_pin(self, pin):
+    def set_pin(self, pin, save=True):
         """Hash and save PIN using HMAC-SHA256 (fast, sufficient for 4-digit PINs)."""
         salt = secrets.token_hex(16)
         digest = hmac.new(salt.encode(), pin.encode(), hashlib.sha256).hexdigest()
         self.pin_hash = f"sha256${salt}${digest}"
-        self.save(update_fields=['pin_hash', 'updated_at'])
+        if save:
+            self.save(update_fields=['pin_hash', 'updated_at'])
 
     def check_pin(self, pin):
         """Verify PIN against stored hash. Supports both new (sha256$) and legacy (pbkdf2) formats."""
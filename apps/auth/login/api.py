@@ -6,7 +6,6 @@ Authentication endpoints: login, logout, PIN verification, Cloud login.
 import requests
 from django.utils import timezone
 from django.conf import settings as django_settings
-from django.core.cache import cache
 from rest_framework import status, serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -17,6 +16,8 @@ from apps.accounts.models import LocalUser
 from apps.configuration.models import HubConfig
 from apps.sync.models import TokenCache
 from apps.core.api_base import SuccessResponseSerializer, ErrorResponseSerializer
+from apps.core.services import cloud_http
+from apps.core.services.rate_limiter import CLOUD_LOGIN, PIN_LOGIN, login_identity
 
 
 # =============================================================================
@@ -114,6 +115,7 @@ class PinLoginView(APIView):
             400: ErrorResponseSerializer,
             401: ErrorResponseSerializer,
             404: ErrorResponseSerializer,
+            429: ErrorResponseSerializer,
         }
     )
     def post(self, request):
@@ -124,13 +126,13 @@ class PinLoginView(APIView):
         pin = serializer.validated_data['pin']
 
         # Rate limiting: max 3 failed PIN attempts per user per 24 hours
-        cache_key = f'pin_attempts_{user_id}'
-        attempts = cache.get(cache_key, 0)
+        decision = PIN_LOGIN.check(user_id)
 
-        if attempts >= 3:
+        if not decision.allowed:
             return Response(
                 {'success': False, 'error': 'Too many attempts. Try again in 24 hours or use email login.', 'locked': True},
-                status=status.HTTP_429_TOO_MANY_REQUESTS
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(decision.retry_after)},
             )
 
         try:
@@ -142,7 +144,7 @@ class PinLoginView(APIView):
             )
 
         if user.check_pin(pin):
-            cache.delete(cache_key)
+            PIN_LOGIN.reset(user_id)
             user.last_login = timezone.now()
             user.save(update_fields=['last_login'])
 
@@ -163,7 +165,7 @@ class PinLoginView(APIView):
                 },
             })
         else:
-            cache.set(cache_key, attempts + 1, timeout=86400)  # 24 hours
+            PIN_LOGIN.hit(user_id, decision)
             return Response(
                 {'success': False, 'error': 'Incorrect PIN'},
                 status=status.HTTP_401_UNAUTHORIZED
@@ -183,6 +185,7 @@ class CloudLoginView(APIView):
             200: CloudLoginResponseSerializer,
             400: ErrorResponseSerializer,
             401: ErrorResponseSerializer,
+            429: ErrorResponseSerializer,
             503: ErrorResponseSerializer,
         }
     )
@@ -193,16 +196,27 @@ class CloudLoginView(APIView):
         email = serializer.validated_data['email']
         password = serializer.validated_data['password']
 
+        # Failed credentials are limited per email (stores share one NAT'd IP)
+        limit_key = login_identity(email)
+        decision = CLOUD_LOGIN.check(limit_key)
+        if not decision.allowed:
+            return Response(
+                {'success': False, 'error': 'Too many login attempts. Try again later.', 'locked': True},
+                status=status.HTTP_429_TOO_MANY_REQUESTS,
+                headers={'Retry-After': str(decision.retry_after)},
+            )
+
         cloud_api_url = django_settings.CLOUD_API_URL
 
         try:
-            response = requests.post(
+            response = cloud_http.post(
                 f"{cloud_api_url}/api/auth/login/",
                 json={'email': email, 'password': password},
                 timeout=10
             )
 
             if response.status_code == 200:
+                CLOUD_LOGIN.reset(limit_key)
                 auth_data = response.json()
                 access_token = auth_data.get('access')
                 refresh_token = auth_data.get('refresh')
@@ -212,7 +226,7 @@ class CloudLoginView(APIView):
                 token_cache.cache_jwt_tokens(access_token, refresh_token)
 
                 # Get user info
-                user_response = requests.get(
+                user_response = cloud_http.get(
                     f"{cloud_api_url}/api/auth/me/",
                     headers={'Authorization': f'Bearer {access_token}'},
                     timeout=10
@@ -224,7 +238,7 @@ class CloudLoginView(APIView):
 
                     # Register Hub if first time
                     if not hub_config.is_configured:
-                        hub_response = requests.post(
+                        hub_response = cloud_http.post(
                             f"{cloud_api_url}/api/hubs/register/",
                             json={'name': f"Hub - {email}", 'address': 'Local'},
                             headers={'Authorization': f'Bearer {access_token}'},
@@ -294,7 +308,14 @@ class CloudLoginView(APIView):
                         {'success': False, 'error': 'Failed to get user info'},
                         status=status.HTTP_400_BAD_REQUEST
                     )
+            elif response.status_code >= 500:
+                # Cloud failing is not a failed login attempt
+                return Response(
+                    {'success': False, 'error': 'Cloud unavailable. Try again later.'},
+                    status=status.HTTP_503_SERVICE_UNAVAILABLE
+                )
             else:
+                CLOUD_LOGIN.hit(limit_key, decision)
                 return Response(
                     {'success': False, 'error': 'Invalid credentials'},
                     status=status.HTTP_401_UNAUTHORIZED
@@ -14,12 +14,15 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.utils import timezone
 from django.conf import settings as django_settings
-from django.core.cache import cache
 
 logger = logging.getLogger(__name__)
 
 from apps.accounts.models import LocalUser
 from apps.configuration.models import HubConfig
+from apps.core.services import cloud_http
+from apps.core.services.rate_limiter import (
+    CLOUD_LOGIN, EMPLOYEE_LIST, PIN_LOGIN, TRUSTED_DEVICE, client_ip, login_identity,
+)
 from apps.sync.models import TokenCache
 from apps.sync.services.trusted_device_service import TrustedDeviceService
 
@@ -39,6 +42,13 @@ def login(request):
     return render(request, 'auth/login/pages/index.html', context)
 
 
+def _throttled(payload, decision):
+    """429 response for a rate-limited request."""
+    response = JsonResponse(payload, status=429)
+    response['Retry-After'] = str(decision.retry_after)
+    return response
+
+
 @csrf_exempt
 @require_http_methods(["POST"])
 def get_employees(request):
@@ -48,6 +58,10 @@ def get_employees(request):
     Only returns data if the device is trusted (valid device_token)
     or the user has an active Cloud session (jwt_token in session).
     """
+    decision = EMPLOYEE_LIST.consume(client_ip(request))
+    if not decision.allowed:
+        return _throttled({'authorized': False, 'employees': [], 'throttled': True}, decision)
+
     try:
         data = json.loads(request.body)
         device_token = data.get('device_token')
@@ -93,6 +107,10 @@ def verify_device_trust(request):
     Returns the list of users trusted on this device.
     Called from login page on load if a device token exists in localStorage.
     """
+    decision = TRUSTED_DEVICE.consume(client_ip(request))
+    if not decision.allowed:
+        return _throttled({'trusted': False, 'throttled': True}, decision)
+
     try:
         data = json.loads(request.body)
         device_token = data.get('device_token')
@@ -132,10 +150,9 @@ def verify_pin(request):
             return JsonResponse({'success': False, 'error': 'User not found'})
 
         # Rate limiting: max 3 failed PIN attempts per user per 24 hours
-        cache_key = f'pin_attempts_{user_id}'
-        attempts = cache.get(cache_key, 0)
+        decision = PIN_LOGIN.check(user_id)
 
-        if attempts >= 3:
+        if not decision.allowed:
             return JsonResponse({
                 'success': False,
                 'error': 'Too many attempts. Try again in 24 hours or use email login.',
@@ -169,7 +186,7 @@ def verify_pin(request):
 
         if user.check_pin(pin):
             # Clear rate limit on success
-            cache.delete(cache_key)
+            PIN_LOGIN.reset(user_id)
 
             user.last_login = timezone.now()
             user.save(update_fields=['last_login'])
@@ -191,8 +208,8 @@ def verify_pin(request):
                 },
             })
         else:
-            # Increment failed attempts
-            cache.set(cache_key, attempts + 1, timeout=86400)  # 24 hours
+            # Count the failed attempt
+            PIN_LOGIN.hit(user_id, decision)
             return JsonResponse({'success': False, 'error': 'Incorrect PIN'})
 
     except Exception as e:
@@ -211,6 +228,16 @@ def cloud_login(request):
         if not email or not password:
             return JsonResponse({'success': False, 'error': 'Missing credentials'})
 
+        # Failed credentials are limited per email (stores share one NAT'd IP)
+        limit_key = login_identity(email)
+        decision = CLOUD_LOGIN.check(limit_key)
+        if not decision.allowed:
+            return _throttled({
+                'success': False,
+                'error': 'Too many login attempts. Try again later.',
+                'locked': True,
+            }, decision)
+
         cloud_api_url = django_settings.CLOUD_API_URL
 
         try:
@@ -220,7 +247,7 @@ def cloud_login(request):
             headers = {}
             if deployment_mode != 'web':
                 headers['X-Client-Type'] = f'hub-{deployment_mode or "desktop"}'
-            response = requests.post(
+            response = cloud_http.post(
                 f"{cloud_api_url}/api/auth/login/",
                 json={'email': email, 'password': password},
                 headers=headers,
@@ -228,6 +255,7 @@ def cloud_login(request):
             )
 
             if response.status_code == 200:
+                CLOUD_LOGIN.reset(limit_key)
                 auth_data = response.json()
                 access_token = auth_data.get('access')
                 refresh_token = auth_data.get('refresh')
@@ -263,17 +291,17 @@ def cloud_login(request):
                     except Exception as e:
                         logger.warning(f"Failed to sync roles/permissions: {e}")
 
-                    # Start WebSocket client for heartbeat now that we have hub_jwt
+                    # Start Cloud sync (leader process only) now that we have hub_jwt
                     try:
-                        from apps.sync.services.websocket_client import start_websocket_client
-                        start_websocket_client()
+                        from apps.sync.services import start_cloud_sync
+                        start_cloud_sync()
                     except Exception as e:
                         logger.warning(f"Failed to start WebSocket client: {e}")
 
                 token_cache = TokenCache.get_cache()
                 token_cache.cache_jwt_tokens(access_token, refresh_token)
 
-                user_response = requests.get(
+                user_response = cloud_http.get(
                     f"{cloud_api_url}/api/auth/me/",
                     headers={'Authorization': f'Bearer {access_token}'},
                     timeout=10
@@ -314,7 +342,7 @@ def cloud_login(request):
                     # Register user on Hub in Cloud
                     try:
                         import platform
-                        register_response = requests.post(
+                        register_response = cloud_http.post(
                             f"{cloud_api_url}/api/hubs/{hub_config.hub_id}/users/register/",
                             json={
                                 'user_email': email,
@@ -352,7 +380,11 @@ def cloud_login(request):
                     })
                 else:
                     return JsonResponse({'success': False, 'error': 'Failed to get user info'})
+            elif response.status_code >= 500:
+                # Cloud failing is not a failed login attempt
+                return JsonResponse({'success': False, 'error': 'Cloud unavailable. Try again later.'})
             else:
+                CLOUD_LOGIN.hit(limit_key, decision)
                 return JsonResponse({'success': False, 'error': 'Invalid credentials'})
 
         except requests.exceptions.ConnectionError:
@@ -368,6 +400,10 @@ def cloud_login(request):
 @require_http_methods(["POST"])
 def trust_device(request):
     """Register current device as trusted via Cloud API."""
+    decision = TRUSTED_DEVICE.consume(client_ip(request))
+    if not decision.allowed:
+        return _throttled({'success': False, 'error': 'Too many requests', 'throttled': True}, decision)
+
     try:
         data = json.loads(request.body)
         user_id = data.get('user_id')
@@ -389,9 +425,7 @@ def trust_device(request):
             return JsonResponse({'success': False, 'error': 'User mismatch'})
 
         user_agent = request.META.get('HTTP_USER_AGENT', '')
-        ip = request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')[0].strip()
-        if not ip:
-            ip = request.META.get('REMOTE_ADDR')
+        ip = client_ip(request)
 
         service = TrustedDeviceService()
         result = service.create(
@@ -416,6 +450,10 @@ def trust_device(request):
 @require_http_methods(["POST"])
 def revoke_device(request):
     """Revoke trust for a specific device via Cloud API."""
+    decision = TRUSTED_DEVICE.consume(client_ip(request))
+    if not decision.allowed:
+        return _throttled({'success': False, 'error': 'Too many requests', 'throttled': True}, decision)
+
     try:
         data = json.loads(request.body)
         device_id = data.get('device_id')
@@ -1,17 +1,19 @@
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils.deprecation import MiddlewareMixin
 
 from apps.configuration.models import HubConfig
+from apps.core.path_classifier import SCOPE_SETUP, classify_request, path_classifier
 
 
-class StoreConfigCheckMiddleware:
+class StoreConfigCheckMiddleware(MiddlewareMixin):
     """
     Middleware to check if hub is configured after login.
     If not configured, redirects to the AI assistant for setup.
     """
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
         # Paths that don't require store configuration check
         self.exempt_paths = [
             reverse('auth:login'),
@@ -29,12 +31,12 @@ class StoreConfigCheckMiddleware:
             '/media/',  # Media files
             '/__debug__/',  # Debug toolbar
         ]
+        path_classifier.register(SCOPE_SETUP, prefixes=self.exempt_paths)
 
-    def __call__(self, request):
+    def process_request(self, request):
         # Check if user is logged in
         if 'local_user_id' in request.session:
-            path = request.path
-            is_exempt = any(path.startswith(exempt) for exempt in self.exempt_paths)
+            is_exempt = classify_request(request).is_exempt(SCOPE_SETUP)
 
             if not is_exempt:
                 # Check if setup is needed (once per session)
@@ -46,6 +48,4 @@ class StoreConfigCheckMiddleware:
 
                     # Mark as checked for this session
                     request.session['store_config_checked'] = True
-
-        response = self.get_response(request)
-        return response
+        return None
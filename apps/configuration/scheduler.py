@@ -16,6 +16,10 @@ Usage:
 
     # Reschedule after config change
     backup_service.reschedule()
+
+Every worker process builds the scheduler, paused; only the process elected
+for 'scheduler' (apps.core.services.leader_election) resumes it, so backups
+and cleanup jobs run once per hub however many workers/instances there are.
 """
 
 import logging
@@ -77,8 +81,8 @@ def init_scheduler() -> bool:
             timezone='UTC',
         )
 
-        # Start scheduler first
-        scheduler.start()
+        # Start paused: jobs only run in the elected process (see below)
+        scheduler.start(paused=True)
 
         logger.info("[SCHEDULER] Started APScheduler for Hub background tasks")
 
@@ -90,6 +94,11 @@ def init_scheduler() -> bool:
         except Exception as e:
             logger.warning(f"[SCHEDULER] Could not setup backup job (will retry on first access): {e}")
 
+        _setup_cache_cleanup(scheduler)
+
+        from apps.core.services.leader_election import run_as_leader
+        run_as_leader(SCHEDULER_LEADER, start=_resume_jobs, stop=_pause_jobs)
+
         # Register shutdown handler
         atexit.register(shutdown_scheduler)
 
@@ -102,15 +111,83 @@ def init_scheduler() -> bool:
         return False
 
 
+SCHEDULER_LEADER = 'scheduler'
+
+
+def _resume_jobs() -> None:
+    """Elected: this process runs the scheduled jobs."""
+    if scheduler:
+        scheduler.resume()
+        logger.info("[SCHEDULER] Leader: running scheduled jobs")
+
+
+def _pause_jobs() -> None:
+    """Lost leadership: stop running jobs (another process took over)."""
+    if scheduler and scheduler.running:
+        scheduler.pause()
+        logger.info("[SCHEDULER] Not leader: scheduled jobs paused")
+
+
 def shutdown_scheduler() -> None:
     """Gracefully shutdown the scheduler."""
     global scheduler
 
+    from apps.core.services.leader_election import stop_leader
+    stop_leader(SCHEDULER_LEADER)
+
     if scheduler and scheduler.running:
         logger.info("[SCHEDULER] Shutting down...")
         scheduler.shutdown(wait=False)
 
 
+CACHE_CLEANUP_JOB_ID = 'cache_cleanup'
+
+
+def _setup_cache_cleanup(scheduler) -> None:
+    """
+    Schedule expiry cleanup for caches that don't cull inline
+    (PostgresCache on web deployments).
+    """
+    from django.core.cache import caches
+
+    aliases = [
+        alias for alias in settings.CACHES
+        if hasattr(caches[alias], 'delete_expired')
+    ]
+    if not aliases:
+        return
+
+    from apscheduler.triggers.interval import IntervalTrigger
+
+    scheduler.add_job(
+        cleanup_expired_cache_entries,
+        trigger=IntervalTrigger(seconds=getattr(settings, 'CACHE_CLEANUP_INTERVAL', 300)),
+        args=[aliases],
+        id=CACHE_CLEANUP_JOB_ID,
+        name='Cache expiry cleanup',
+        replace_existing=True,
+    )
+
+
+def cleanup_expired_cache_entries(aliases) -> int:
+    """Delete expired rows from the given cache aliases."""
+    from django.core.cache import caches
+    from django.db import close_old_connections
+
+    removed = 0
+    try:
+        for alias in aliases:
+            removed += caches[alias].delete_expired()
+    except Exception as e:
+        logger.warning(f"[SCHEDULER] Cache cleanup failed: {e}")
+    finally:
+        close_old_connections()
+
+    if removed:
+        logger.debug(f"[SCHEDULER] Removed {removed} expired cache entries")
+    return removed
+
+
 def _should_skip_scheduler() -> bool:
     """
     Check if scheduler should be skipped.
@@ -128,8 +205,9 @@ def _should_skip_scheduler() -> bool:
     if 'collectstatic' in sys.argv:
         return True
 
-    # Skip during tests (unless explicitly enabled)
-    if 'test' in sys.argv or 'pytest' in sys.argv:
+    # Skip during tests: no jobs and no leader election against the real
+    # database (argv[0] is a path under pytest, so check the loaded module)
+    if 'test' in sys.argv or 'pytest' in sys.modules:
         return True
 
     # Skip in shell commands
@@ -153,13 +231,14 @@ def get_scheduler_status() -> dict:
     Get current scheduler status.
 
     Returns:
-        dict with keys: running, jobs, next_run
+        dict with keys: running, leader, jobs, next_run
     """
     global scheduler
 
     if not scheduler:
         return {
             'running': False,
+            'leader': False,
             'jobs': [],
             'next_run': None,
         }
@@ -180,8 +259,12 @@ def get_scheduler_status() -> dict:
             if next_run is None or job.next_run_time < next_run:
                 next_run = job.next_run_time
 
+    from apps.core.services.leader_election import get_leadership_status
+
     return {
         'running': scheduler.running,
+        # Jobs only run in the leader process
+        'leader': get_leadership_status().get(SCHEDULER_LEADER, False),
         'jobs': jobs_info,
         'next_run': next_run,
     }
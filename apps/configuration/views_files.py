@@ -388,9 +388,10 @@ def get_storage_info(request):
                     count += 1
         return count
 
-    # Get database size
-    from django.db import connection as db_connection
-    with db_connection.cursor() as cursor:
+    # Get database size (same value on the replica, when there is one)
+    from django.db import connections
+    from apps.core.db_router import replica_alias
+    with connections[replica_alias()].cursor() as cursor:
         cursor.execute("SELECT pg_database_size(current_database())")
         db_size = cursor.fetchone()[0]
     # Get directory sizes
@@ -0,0 +1,11 @@
+"""
+Custom Django cache backends.
+
+- TwoTierCache: in-process LRU (L1) in front of a shared cache (L2),
+  used by web deployments (config/settings/web.py).
+- PostgresCache: UNLOGGED-table PostgreSQL cache, the shared L2 on web.
+"""
+from .postgres import PostgresCache
+from .two_tier import TwoTierCache
+
+__all__ = ['PostgresCache', 'TwoTierCache']
@@ -0,0 +1,247 @@
+"""
+PostgreSQL cache backend on an UNLOGGED table.
+
+Drop-in replacement for django.core.cache.backends.db.DatabaseCache on web
+deployments. Compared to DatabaseCache:
+
+- The table is UNLOGGED: no WAL is written for cache traffic (the table is
+  emptied after a Postgres crash, which is fine for a cache).
+- set/add are single INSERT ... ON CONFLICT upserts, not SELECT + INSERT or
+  UPDATE inside a transaction.
+- get_many/set_many/delete_many are one statement each, whatever the number
+  of keys.
+- incr/decr are atomic (UPDATE ... RETURNING), so PIN attempt counters do
+  not lose increments between instances.
+- Nothing is culled inline during set: expired rows are deleted by the
+  scheduler (delete_expired(), see apps/configuration/scheduler.py).
+
+Integers are stored in a bigint column so they can be incremented in SQL;
+every other value is pickled into a bytea column.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'apps.core.cache_backends.PostgresCache',
+            'LOCATION': 'hub_cache',         # table name
+            'OPTIONS': {'DATABASE': 'default'},
+        },
+    }
+
+The table is created by the core migrations (create_cache_table()).
+"""
+
+import pickle
+
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.db import connections
+
+DEFAULT_TABLE = 'hub_cache'
+
+
+def create_cache_table(connection, table=DEFAULT_TABLE):
+    """Create the UNLOGGED cache table and its expiry index if missing."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'CREATE UNLOGGED TABLE IF NOT EXISTS {qn(table)} ('
+            ' cache_key text PRIMARY KEY,'
+            ' value bytea,'
+            ' counter bigint,'
+            ' expires timestamptz'
+            ')'
+        )
+        cursor.execute(
+            f'CREATE INDEX IF NOT EXISTS {qn(table + "_expires")} '
+            f'ON {qn(table)} (expires) WHERE expires IS NOT NULL'
+        )
+
+
+class PostgresCache(BaseCache):
+    """Cache backend storing entries in an UNLOGGED PostgreSQL table."""
+
+    def __init__(self, table, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._table = table or DEFAULT_TABLE
+        self._db = options.get('DATABASE', 'default')
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @property
+    def _connection(self):
+        return connections[self._db]
+
+    def _execute(self, sql, params=()):
+        """Run sql (with {table} filled in) and return the cursor's rows."""
+        connection = self._connection
+        sql = sql.format(table=connection.ops.quote_name(self._table))
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall() if cursor.description else []
+            return rows, cursor.rowcount
+
+    def _seconds(self, timeout):
+        """Timeout in seconds for SQL (None = never expires)."""
+        if timeout is DEFAULT_TIMEOUT:
+            timeout = self.default_timeout
+        return timeout
+
+    @staticmethod
+    def _encode(value):
+        # bool is an int subclass but must round-trip as bool
+        if type(value) is int and -2 ** 63 <= value < 2 ** 63:
+            return None, value
+        return pickle.dumps(value, pickle.HIGHEST_PROTOCOL), None
+
+    @staticmethod
+    def _decode(value, counter):
+        if value is None:
+            return counter
+        return pickle.loads(bytes(value))
+
+    def _keys(self, keys, version):
+        """Map backend keys back to the caller's keys."""
+        mapped = {}
+        for key in keys:
+            backend_key = self.make_and_validate_key(key, version=version)
+            mapped[backend_key] = key
+        return mapped
+
+    _LIVE = '(expires IS NULL OR expires > now())'
+    _EXPIRES = "CASE WHEN %s::float8 IS NULL THEN NULL ELSE now() + %s::float8 * interval '1 second' END"
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        rows, _ = self._execute(
+            f'SELECT value, counter FROM {{table}} WHERE cache_key = %s AND {self._LIVE}',
+            [key],
+        )
+        if not rows:
+            return default
+        return self._decode(*rows[0])
+
+    def get_many(self, keys, version=None):
+        mapped = self._keys(keys, version)
+        if not mapped:
+            return {}
+        rows, _ = self._execute(
+            f'SELECT cache_key, value, counter FROM {{table}} '
+            f'WHERE cache_key = ANY(%s) AND {self._LIVE}',
+            [list(mapped)],
+        )
+        return {mapped[key]: self._decode(value, counter) for key, value, counter in rows}
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        rows, _ = self._execute(
+            f'SELECT 1 FROM {{table}} WHERE cache_key = %s AND {self._LIVE}', [key],
+        )
+        return bool(rows)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout=timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        if not data:
+            return []
+        seconds = self._seconds(timeout)
+        if seconds is not None and seconds <= 0:
+            self.delete_many(data, version=version)
+            return []
+
+        rows, params = [], []
+        for key, value in data.items():
+            key = self.make_and_validate_key(key, version=version)
+            rows.append(f'(%s, %s, %s, {self._EXPIRES})')
+            params.extend([key, *self._encode(value), seconds, seconds])
+        self._execute(
+            'INSERT INTO {table} (cache_key, value, counter, expires) VALUES '
+            + ', '.join(rows)
+            + ' ON CONFLICT (cache_key) DO UPDATE SET value = EXCLUDED.value,'
+            ' counter = EXCLUDED.counter, expires = EXCLUDED.expires',
+            params,
+        )
+        return []
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        seconds = self._seconds(timeout)
+        # Insert, or replace only an expired row; no row back = key was live
+        rows, _ = self._execute(
+            f'INSERT INTO {{table}} AS c (cache_key, value, counter, expires) '
+            f'VALUES (%s, %s, %s, {self._EXPIRES}) '
+            'ON CONFLICT (cache_key) DO UPDATE SET value = EXCLUDED.value,'
+            ' counter = EXCLUDED.counter, expires = EXCLUDED.expires'
+            ' WHERE c.expires IS NOT NULL AND c.expires <= now() '
+            'RETURNING 1',
+            [key, *self._encode(value), seconds, seconds],
+        )
+        return bool(rows)
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        seconds = self._seconds(timeout)
+        _, rowcount = self._execute(
+            f'UPDATE {{table}} SET expires = {self._EXPIRES} '
+            f'WHERE cache_key = %s AND {self._LIVE}',
+            [seconds, seconds, key],
+        )
+        return rowcount > 0
+
+    def incr(self, key, delta=1, version=None):
+        backend_key = self.make_and_validate_key(key, version=version)
+        while True:
+            rows, _ = self._execute(
+                f'UPDATE {{table}} SET counter = counter + %s '
+                f'WHERE cache_key = %s AND counter IS NOT NULL AND {self._LIVE} '
+                'RETURNING counter',
+                [delta, backend_key],
+            )
+            if rows:
+                return rows[0][0]
+            rows, _ = self._execute(
+                f'SELECT value, counter FROM {{table}} WHERE cache_key = %s AND {self._LIVE}',
+                [backend_key],
+            )
+            if not rows:
+                raise ValueError("Key '%s' not found" % key)
+            value, counter = rows[0]
+            if counter is None:
+                # Not stored as an integer (e.g. a float): plain get + set
+                new_value = self._decode(value, counter) + delta
+                self.set(key, new_value, version=version)
+                return new_value
+            # Counter created concurrently after the UPDATE: retry it
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        _, rowcount = self._execute('DELETE FROM {table} WHERE cache_key = %s', [key])
+        return rowcount > 0
+
+    def delete_many(self, keys, version=None):
+        mapped = self._keys(keys, version)
+        if mapped:
+            self._execute('DELETE FROM {table} WHERE cache_key = ANY(%s)', [list(mapped)])
+
+    def clear(self):
+        self._execute('TRUNCATE {table}')
+
+    # ------------------------------------------------------------------
+    # Maintenance
+    # ------------------------------------------------------------------
+
+    def delete_expired(self):
+        """Delete expired rows (scheduled job). Returns the number removed."""
+        _, rowcount = self._execute(
+            'DELETE FROM {table} WHERE expires IS NOT NULL AND expires <= now()',
+        )
+        return rowcount
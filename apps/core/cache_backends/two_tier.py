@@ -0,0 +1,294 @@
+"""
+Two-tier cache: bounded in-process LRU (L1) in front of a shared cache (L2).
+
+Web deployments share state through a database cache, which makes every
+cache.get a SQL query. TwoTierCache keeps hot, read-mostly keys (singleton
+configs, marketplace/blueprint lists, connectivity and subscription status)
+in process memory, and only goes to L2 to revalidate them.
+
+Only keys starting with one of L1_PREFIXES use L1; everything else (PIN
+attempt counters, lockouts, rate limits) passes straight through to L2, so
+values that must be exact across instances never live in L1.
+
+For L1 keys, L2 holds the value together with a version token, plus a small
+companion entry (<key>:__v) holding just the token. Once an L1 entry is
+older than L1_REVALIDATE seconds, the next read fetches only the token: if
+it still matches, the L1 copy is served again; if not (another instance
+wrote or deleted the key), the value is re-read from L2.
+
+    CACHES = {
+        'default': {
+            'BACKEND': 'apps.core.cache_backends.TwoTierCache',
+            'OPTIONS': {
+                'L2': 'shared',                  # alias of the shared cache
+                'L1_PREFIXES': ['config_', 'mp:'],
+                'L1_MAX_ENTRIES': 1000,
+                'L1_REVALIDATE': 2,              # seconds
+            },
+        },
+        'shared': {'BACKEND': 'apps.core.cache_backends.PostgresCache', ...},
+    }
+
+cache.stats() returns L1/L2 hit and miss counters.
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from django.core.cache import caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+
+_VERSION_SUFFIX = ':__v'
+_MISSING = object()
+
+
+class _L1Entry:
+    __slots__ = ('value', 'token', 'expires_at', 'checked_at')
+
+    def __init__(self, value, token, expires_at, checked_at):
+        self.value = value
+        self.token = token
+        self.expires_at = expires_at
+        self.checked_at = checked_at
+
+
+class TwoTierCache(BaseCache):
+    """Cache backend with a per-process LRU in front of another cache alias."""
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self._l2_alias = options.get('L2', location)
+        self.l1_prefixes = tuple(options.get('L1_PREFIXES', ()))
+        self.l1_max_entries = int(options.get('L1_MAX_ENTRIES', 1000))
+        self.l1_revalidate = float(options.get('L1_REVALIDATE', 2))
+
+        self._l1 = OrderedDict()  # (key, version) -> _L1Entry
+        self._lock = threading.Lock()
+        self._stats = dict.fromkeys(
+            ('l1_hits', 'l1_revalidated', 'l1_stale', 'l2_hits', 'misses', 'l1_evictions'), 0,
+        )
+
+    @property
+    def l2(self):
+        """The shared cache (looked up per call: cache handlers are per thread)."""
+        return caches[self._l2_alias]
+
+    # ------------------------------------------------------------------
+    # L1 bookkeeping
+    # ------------------------------------------------------------------
+
+    def uses_l1(self, key):
+        return bool(self.l1_prefixes) and key.startswith(self.l1_prefixes)
+
+    def _count(self, name, n=1):
+        with self._lock:
+            self._stats[name] += n
+
+    def _l1_get(self, key, version):
+        with self._lock:
+            entry = self._l1.get((key, version))
+            if entry is None:
+                return None
+            if entry.expires_at is not None and entry.expires_at <= time.monotonic():
+                del self._l1[(key, version)]
+                return None
+            self._l1.move_to_end((key, version))
+            return entry
+
+    def _l1_put(self, key, version, value, token, timeout):
+        now = time.monotonic()
+        expires_at = None if timeout is None else now + timeout
+        with self._lock:
+            self._l1[(key, version)] = _L1Entry(value, token, expires_at, now)
+            self._l1.move_to_end((key, version))
+            while len(self._l1) > self.l1_max_entries:
+                self._l1.popitem(last=False)
+                self._stats['l1_evictions'] += 1
+
+    def _l1_drop(self, key, version):
+        with self._lock:
+            self._l1.pop((key, version), None)
+
+    def _timeout(self, timeout):
+        return self.default_timeout if timeout is DEFAULT_TIMEOUT else timeout
+
+    @staticmethod
+    def _new_token():
+        return uuid.uuid4().hex[:16]
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def get(self, key, default=None, version=None):
+        return self.get_many([key], version=version).get(key, default)
+
+    def get_many(self, keys, version=None):
+        keys = list(keys)
+        found = {}
+        l2_keys = []       # plain L2 keys (no L1)
+        revalidate = {}    # key -> L1 entry older than L1_REVALIDATE
+        reload = []        # L1 keys to load from L2
+
+        now = time.monotonic()
+        for key in keys:
+            if not self.uses_l1(key):
+                l2_keys.append(key)
+                continue
+            entry = self._l1_get(key, version)
+            if entry is None:
+                reload.append(key)
+            elif now - entry.checked_at < self.l1_revalidate:
+                found[key] = entry.value
+                self._count('l1_hits')
+            else:
+                revalidate[key] = entry
+
+        # One round trip for all L2 reads: plain keys, version tokens of
+        # stale L1 entries, and envelopes of L1 misses.
+        request = l2_keys + [k + _VERSION_SUFFIX for k in revalidate] + reload
+        l2_values = self.l2.get_many(request, version=version) if request else {}
+
+        for key in l2_keys:
+            if key in l2_values:
+                found[key] = l2_values[key]
+                self._count('l2_hits')
+            else:
+                self._count('misses')
+
+        stale = []
+        for key, entry in revalidate.items():
+            if l2_values.get(key + _VERSION_SUFFIX) == entry.token:
+                entry.checked_at = now
+                found[key] = entry.value
+                self._count('l1_revalidated')
+            else:
+                self._l1_drop(key, version)
+                stale.append(key)
+                self._count('l1_stale')
+
+        # Changed elsewhere: fetch the new envelopes (second round trip)
+        if stale:
+            l2_values.update(self.l2.get_many(stale, version=version))
+            reload.extend(stale)
+
+        for key in reload:
+            envelope = l2_values.get(key, _MISSING)
+            if envelope is _MISSING or not isinstance(envelope, tuple) or len(envelope) != 3:
+                self._count('misses')
+                continue
+            token, value, expires_at = envelope
+            remaining = None if expires_at is None else expires_at - time.time()
+            if remaining is not None and remaining <= 0:
+                self._count('misses')
+                continue
+            self._l1_put(key, version, value, token, remaining)
+            found[key] = value
+            self._count('l2_hits')
+
+        return found
+
+    def has_key(self, key, version=None):
+        return self.get(key, _MISSING, version=version) is not _MISSING
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+
+    def _envelopes(self, data, timeout, version):
+        """Split data into L2 entries, updating L1 for opted-in keys."""
+        expires_at = None if timeout is None else time.time() + timeout
+        l2_data = {}
+        for key, value in data.items():
+            if not self.uses_l1(key):
+                l2_data[key] = value
+                continue
+            token = self._new_token()
+            l2_data[key] = (token, value, expires_at)
+            l2_data[key + _VERSION_SUFFIX] = token
+            self._l1_put(key, version, value, token, timeout)
+        return l2_data
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.set_many({key: value}, timeout=timeout, version=version)
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        timeout = self._timeout(timeout)
+        l2_data = self._envelopes(data, timeout, version)
+        failed = self.l2.set_many(l2_data, timeout=timeout, version=version)
+        return [key for key in failed if key in data]
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self.uses_l1(key):
+            return self.l2.add(key, value, timeout=timeout, version=version)
+        if self.has_key(key, version=version):
+            return False
+        self.set(key, value, timeout=timeout, version=version)
+        return True
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        if not self.uses_l1(key):
+            return self.l2.touch(key, timeout=timeout, version=version)
+        value = self.get(key, _MISSING, version=version)
+        if value is _MISSING:
+            return False
+        self.set(key, value, timeout=timeout, version=version)
+        return True
+
+    def delete(self, key, version=None):
+        if not self.uses_l1(key):
+            return self.l2.delete(key, version=version)
+        self._l1_drop(key, version)
+        existed = self.l2.has_key(key, version=version)
+        self.l2.delete_many([key, key + _VERSION_SUFFIX], version=version)
+        return existed
+
+    def delete_many(self, keys, version=None):
+        l2_keys = []
+        for key in keys:
+            l2_keys.append(key)
+            if self.uses_l1(key):
+                self._l1_drop(key, version)
+                l2_keys.append(key + _VERSION_SUFFIX)
+        self.l2.delete_many(l2_keys, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        if not self.uses_l1(key):
+            # Counters stay L2-only, so the L2 backend's incr applies
+            return self.l2.incr(key, delta, version=version)
+        return super().incr(key, delta, version=version)
+
+    def clear(self):
+        self.clear_l1()
+        self.l2.clear()
+
+    def close(self, **kwargs):
+        self.l2.close(**kwargs)
+
+    # ------------------------------------------------------------------
+    # Diagnostics
+    # ------------------------------------------------------------------
+
+    def clear_l1(self):
+        """Drop every in-process entry (L2 is left untouched)."""
+        with self._lock:
+            self._l1.clear()
+
+    def stats(self):
+        """Hit/miss counters and L1 size for this process."""
+        with self._lock:
+            stats = dict(self._stats)
+            stats['l1_size'] = len(self._l1)
+        hits = stats['l1_hits'] + stats['l1_revalidated'] + stats['l2_hits']
+        total = hits + stats['misses']
+        stats['hit_ratio'] = round(hits / total, 3) if total else None
+        stats['l1_ratio'] = round((stats['l1_hits'] + stats['l1_revalidated']) / total, 3) if total else None
+        return stats
+
+    def reset_stats(self):
+        with self._lock:
+            for name in self._stats:
+                self._stats[name] = 0
@@ -25,6 +25,8 @@ Configuration in modules (module.py or a dedicated chooser config):
                 'order_by': ['name'],
                 'per_page': 20,
                 'image_field': 'image',
+                'prefix_fields': ['barcode'],   # matched by prefix only
+                'search_backend': 'auto',       # see apps/core/search.py
             })
 
 Usage in templates:
@@ -52,7 +54,8 @@ import logging
 from typing import Any, Callable, Dict, List, Optional, Type
 
 from django.db import models
-from django.db.models import Q
+
+from apps.core.search import BACKENDS, search
 
 logger = logging.getLogger(__name__)
 
@@ -74,6 +77,8 @@ class ChooserConfig:
         subtitle_field: Optional[str] = None,
         queryset_fn: Optional[Callable] = None,
         display_fn: Optional[Callable] = None,
+        prefix_fields: Optional[List[str]] = None,
+        search_backend: str = 'auto',
     ):
         self.model = model
         self.search_fields = search_fields
@@ -87,6 +92,10 @@ class ChooserConfig:
         self.subtitle_field = subtitle_field
         self.queryset_fn = queryset_fn
         self.display_fn = display_fn
+        self.prefix_fields = prefix_fields or []
+        if search_backend != 'auto' and search_backend not in BACKENDS:
+            raise ValueError(f"Unknown search backend '{search_backend}'")
+        self.search_backend = search_backend
 
     @property
     def key(self) -> str:
@@ -103,16 +112,17 @@ class ChooserConfig:
             qs = qs.filter(is_active=True)
         return qs.order_by(*self.order_by)
 
-    def search(self, queryset: models.QuerySet, query: str) -> models.QuerySet:
-        """Apply search across configured search_fields."""
-        if not query or not self.search_fields:
-            return queryset
-
-        q = Q()
-        for field in self.search_fields:
-            q |= Q(**{f"{field}__icontains": query})
+    def search(self, queryset: models.QuerySet, query: str, rank: bool = False) -> models.QuerySet:
+        """
+        Apply search across configured search_fields and prefix_fields.
 
-        return queryset.filter(q)
+        With rank=True results are ordered best match first (annotated as
+        `search_rank`). See apps/core/search.py for the backends.
+        """
+        return search(
+            queryset, query, self.search_fields, self.prefix_fields,
+            backend=self.search_backend, rank=rank,
+        )
 
     def apply_filters(self, queryset: models.QuerySet, filter_values: dict) -> models.QuerySet:
         """Apply filter values to queryset."""
@@ -13,6 +13,10 @@ from django.views.decorators.http import require_GET
 
 from apps.accounts.decorators import login_required
 from apps.core.chooser import chooser_registry
+from apps.core.pagination import keyset_page
+
+# Result counts above this are shown as "1000+"
+COUNT_CAP = 1000
 
 
 @login_required
@@ -21,7 +25,11 @@ def chooser_search(request, model_key):
     """
     HTMX endpoint: search and paginate chooser results.
 
-    GET /htmx/chooser/<model_key>/search/?q=...&page=1&filters=...
+    GET /htmx/chooser/<model_key>/search/?q=...&cursor=...&filters=...
+
+    Pages are keyset-paginated: cursor is the next_cursor of the previous
+    page (none for the first page), and the result count is computed once,
+    capped at COUNT_CAP, and carried in the cursor.
 
     Returns HTML partial with search results.
     """
@@ -30,14 +38,14 @@ def chooser_search(request, model_key):
         raise Http404(f"No chooser registered for '{model_key}'")
 
     query = request.GET.get('q', '').strip()
-    page = int(request.GET.get('page', 1))
+    cursor = request.GET.get('cursor') or None
 
     # Get base queryset
     qs = config.get_queryset(request)
 
     # Apply search
     if query:
-        qs = config.search(qs, query)
+        qs = config.search(qs, query, rank=True)
 
     # Apply filters from GET params
     filter_values = {}
@@ -49,16 +57,15 @@ def chooser_search(request, model_key):
         qs = config.apply_filters(qs, filter_values)
 
     # Paginate
-    total = qs.count()
     per_page = config.per_page
+    page_data = keyset_page(qs, per_page, cursor=cursor, count='capped', count_cap=COUNT_CAP)
+    total = page_data['total_count']
     total_pages = max(1, math.ceil(total / per_page))
-    page = min(page, total_pages)
-    offset = (page - 1) * per_page
-    items = qs[offset:offset + per_page]
+    page = page_data['page_number']
 
     # Build item data for template
     results = []
-    for obj in items:
+    for obj in page_data['items']:
         results.append({
             'pk': str(obj.pk),
             'label': config.get_display_value(obj),
@@ -72,9 +79,11 @@ def chooser_search(request, model_key):
         'page': page,
         'total_pages': total_pages,
         'total': total,
+        'total_capped': page_data['total_count_capped'],
         'model_key': model_key,
         'has_prev': page > 1,
-        'has_next': page < total_pages,
+        'has_next': page_data['next_cursor'] is not None,
+        'next_cursor': page_data['next_cursor'],
         'config': config,
     }
 
@@ -83,7 +83,7 @@ def navigation_context(request):
     - {{ is_module_page }} - True if in a module
     - {{ current_module }} - Module ID if in a module
     """
-    import re
+    from apps.core.path_classifier import MODULE_PREFIX, classify_request
 
     path = request.path
 
@@ -97,10 +97,9 @@ def navigation_context(request):
         }
 
     # Module pages: /m/{module_id}/...
-    module_match = re.match(r'^/m/([^/]+)(/.*)?$', path)
-    if module_match:
-        module_id = module_match.group(1)
-        sub_path = module_match.group(2) or ''
+    module_id = classify_request(request).module_id
+    if module_id:
+        sub_path = path[len(MODULE_PREFIX) + len(module_id):]
 
         # Module main page (/m/sales/) -> back to home
         if sub_path in ('', '/'):
@@ -158,21 +157,16 @@ def module_context(request):
     1. Load tabs from module.py using current_module_id
     2. Highlight the active tab using current_view
     """
-    import re
-
-    path = request.path
+    from apps.core.path_classifier import classify_request
 
     # Extract module_id from /m/{module_id}/...
-    module_match = re.match(r'^/m/([^/]+)(/.*)?$', path)
-    if not module_match:
+    module_id = classify_request(request).module_id
+    if not module_id:
         return {
             'current_module_id': '',
             'current_view': '',
         }
 
-    module_id = module_match.group(1)
-    sub_path = module_match.group(2) or ''
-
     # Try to extract current_view from URL name
     # URL names typically follow pattern: {module}:{view}
     # e.g., 'inventory:products_list' -> 'products'
@@ -0,0 +1,73 @@
+"""
+Read-replica routing.
+
+When DATABASE_REPLICA_URL is set (config/database.py) there is a 'replica'
+database alias. ReplicaRouter sends reads there only inside
+using_replica(), so normal request handling keeps reading its own writes
+from the primary and module authors opt in explicitly for heavy reads
+(reports, exports, statistics):
+
+    from apps.core.db_router import using_replica
+
+    with using_replica():
+        rows = list(Sale.objects.filter(date__year=2025).values(...))
+
+    @using_replica()
+    def monthly_report(request):
+        ...
+
+Querysets are routed when they are evaluated, so build them anywhere and
+iterate them inside the block. Inside a transaction on the primary, reads
+stay on the primary. Without a replica configured using_replica() does
+nothing. Writes always go to the primary.
+"""
+
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from config.database import REPLICA
+
+_replica_reads = ContextVar('replica_reads', default=False)
+
+
+def replica_alias():
+    """The replica alias if one is configured, else the primary."""
+    return REPLICA if REPLICA in settings.DATABASES else DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def using_replica():
+    """Route reads in this block (and functions it calls) to the replica."""
+    token = _replica_reads.set(True)
+    try:
+        yield replica_alias()
+    finally:
+        _replica_reads.reset(token)
+
+
+class ReplicaRouter:
+    """Send reads inside using_replica() to the replica alias."""
+
+    def db_for_read(self, model, **hints):
+        if not _replica_reads.get() or REPLICA not in settings.DATABASES:
+            return None
+        if connections[DEFAULT_DB_ALIAS].in_atomic_block:
+            return None  # read what this transaction wrote
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Same data on both aliases
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA, None}:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        if db == REPLICA:
+            return False
+        return None
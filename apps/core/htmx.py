@@ -6,8 +6,71 @@ to enable SPA-like navigation without full page reloads.
 """
 import json
 from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, sync_to_async
 from django.shortcuts import render
 
+from apps.core.pagination import COUNT_MODES, is_cursor, keyset_page
+
+
+def _render_htmx_result(request, result, full_template, partial_template):
+    """Turn a view result (HttpResponse or context dict) into the response."""
+    # If view returns HttpResponse directly, return it
+    if hasattr(result, 'status_code'):
+        return result
+
+    # Otherwise, result should be context dict
+    context = result if isinstance(result, dict) else {}
+
+    # Merge module navigation context if set by @with_module_nav
+    module_nav = getattr(request, '_module_nav', None)
+    if module_nav:
+        for key, value in module_nav.items():
+            context.setdefault(key, value)
+
+    # Check for template override in context
+    template_override = context.pop('template', None)
+
+    # Check if partial requested via HTMX or ?partial=true query param
+    is_partial = request.headers.get('HX-Request') or request.GET.get('partial') == 'true'
+
+    if is_partial:
+        # Use template override if provided, otherwise default partial
+        template = template_override or partial_template
+        response = render(request, template, context)
+
+        # Send page_title via HX-Trigger so the header can update
+        page_title = context.get('page_title')
+        if page_title:
+            response['HX-Trigger'] = json.dumps({
+                'pageTitle': str(page_title)
+            })
+
+        # Update tabbar via OOB swap for HTMX partial responses
+        if context.get('navigation'):
+            # Views with navigation context render the tabbar OOB
+            from django.template.loader import render_to_string
+            oob_html = render_to_string(
+                'partials/tabbar_oob.html',
+                {'navigation': context['navigation']},
+                request=request,
+            )
+            response.content = response.content + oob_html.encode('utf-8')
+        else:
+            # Clear tabbar when navigating to non-module views
+            response.content = (
+                response.content
+                + b'<footer id="global-tabbar-footer" hx-swap-oob="true"></footer>'
+            )
+
+        return response
+
+    # Full page request — inject the partial template so the
+    # full-page template can {% include content_template %} and
+    # render the correct content on browser refresh / deep links.
+    context.setdefault('content_template', template_override or partial_template)
+    return render(request, full_template, context)
+
 
 def htmx_view(full_template, partial_template):
     """
@@ -36,6 +99,9 @@ def htmx_view(full_template, partial_template):
         - Browser: /my-view/?partial=true → fragment only
         - HTMX: /my-view/ with HX-Request header → fragment only
 
+    Async views (``async def``) are supported too: the view is awaited and
+    the templates are rendered in a worker thread afterwards.
+
     Args:
         full_template: Template path for full page (with layout)
         partial_template: Template path for partial content (HTMX swap)
@@ -44,66 +110,22 @@ def htmx_view(full_template, partial_template):
         Decorated view function
     """
     def decorator(view_func):
+        if iscoroutinefunction(view_func):
+            # Async view (Cloud-bound, awaits concurrent fetches); template
+            # rendering and context processors still run in sync code.
+            @wraps(view_func)
+            async def async_wrapper(request, *args, **kwargs):
+                result = await view_func(request, *args, **kwargs)
+                return await sync_to_async(_render_htmx_result)(
+                    request, result, full_template, partial_template,
+                )
+            return async_wrapper
+
         @wraps(view_func)
         def wrapper(request, *args, **kwargs):
             # Call the view to get context
             result = view_func(request, *args, **kwargs)
-
-            # If view returns HttpResponse directly, return it
-            if hasattr(result, 'status_code'):
-                return result
-
-            # Otherwise, result should be context dict
-            context = result if isinstance(result, dict) else {}
-
-            # Merge module navigation context if set by @with_module_nav
-            module_nav = getattr(request, '_module_nav', None)
-            if module_nav:
-                for key, value in module_nav.items():
-                    context.setdefault(key, value)
-
-            # Check for template override in context
-            template_override = context.pop('template', None)
-
-            # Check if partial requested via HTMX or ?partial=true query param
-            is_partial = request.headers.get('HX-Request') or request.GET.get('partial') == 'true'
-
-            if is_partial:
-                # Use template override if provided, otherwise default partial
-                template = template_override or partial_template
-                response = render(request, template, context)
-
-                # Send page_title via HX-Trigger so the header can update
-                page_title = context.get('page_title')
-                if page_title:
-                    response['HX-Trigger'] = json.dumps({
-                        'pageTitle': str(page_title)
-                    })
-
-                # Update tabbar via OOB swap for HTMX partial responses
-                if context.get('navigation'):
-                    # Views with navigation context render the tabbar OOB
-                    from django.template.loader import render_to_string
-                    oob_html = render_to_string(
-                        'partials/tabbar_oob.html',
-                        {'navigation': context['navigation']},
-                        request=request,
-                    )
-                    response.content = response.content + oob_html.encode('utf-8')
-                else:
-                    # Clear tabbar when navigating to non-module views
-                    response.content = (
-                        response.content
-                        + b'<footer id="global-tabbar-footer" hx-swap-oob="true"></footer>'
-                    )
-
-                return response
-
-            # Full page request — inject the partial template so the
-            # full-page template can {% include content_template %} and
-            # render the correct content on browser refresh / deep links.
-            context.setdefault('content_template', template_override or partial_template)
-            return render(request, full_template, context)
+            return _render_htmx_result(request, result, full_template, partial_template)
 
         return wrapper
     return decorator
@@ -174,18 +196,37 @@ class InfiniteScrollPaginator:
             No more items
         </div>
         {% endif %}
+
+    Cursor mode (keyset pagination, see apps/core/pagination.py):
+        paginator = InfiniteScrollPaginator(queryset, per_page=20, mode='cursor')
+
+    Pages continue after the last row shown instead of using OFFSET, so deep
+    pages cost the same as the first one. next_page is then an opaque cursor
+    token instead of a number; templates use it unchanged (?page={{ next_page }}).
+    total_count is computed once on the first page ('exact'), or capped,
+    estimated or skipped with count='capped' | 'estimate' | None.
     """
 
-    def __init__(self, queryset, per_page=20):
+    def __init__(self, queryset, per_page=20, mode='offset', count='exact', count_cap=1000):
         """
         Initialize paginator.
 
         Args:
             queryset: Django QuerySet to paginate
             per_page: Number of items per page (default: 20)
+            mode: 'offset' (page numbers) or 'cursor' (keyset)
+            count: cursor mode total count: 'exact', 'capped', 'estimate' or None
+            count_cap: Upper bound for count='capped'
         """
+        if mode not in ('offset', 'cursor'):
+            raise ValueError(f"mode must be 'offset' or 'cursor', not {mode!r}")
+        if count not in COUNT_MODES:
+            raise ValueError(f'count must be one of {COUNT_MODES}, not {count!r}')
         self.queryset = queryset
         self.per_page = per_page
+        self.mode = mode
+        self.count = count
+        self.count_cap = count_cap
 
     def get_page(self, page_number):
         """
@@ -204,7 +245,14 @@ class InfiniteScrollPaginator:
                 - page_number: current page number
                 - start_index: 1-indexed start position
                 - end_index: 1-indexed end position
+
+            In cursor mode page_number is the cursor (next_page of the
+            previous page) and next_page is a cursor token; total_count and
+            total_pages are None with count=None.
         """
+        if self.mode == 'cursor':
+            return self._get_cursor_page(page_number)
+
         try:
             page_number = int(page_number)
         except (TypeError, ValueError):
@@ -245,6 +293,32 @@ class InfiniteScrollPaginator:
             'per_page': self.per_page,
         }
 
+    def _get_cursor_page(self, cursor):
+        page = keyset_page(
+            self.queryset, self.per_page,
+            cursor=cursor if is_cursor(cursor) else None,
+            count=self.count, count_cap=self.count_cap,
+        )
+        items = page['items']
+        total_count = page['total_count']
+        total_pages = None
+        if total_count is not None:
+            total_pages = max((total_count + self.per_page - 1) // self.per_page, 1)
+
+        return {
+            'items': items,
+            'has_next': page['next_cursor'] is not None,
+            'next_page': page['next_cursor'],
+            'is_first_page': page['page_number'] == 1,
+            'total_count': total_count,
+            'total_count_capped': page['total_count_capped'],
+            'page_number': page['page_number'],
+            'total_pages': total_pages,
+            'start_index': page['offset'] + 1 if items else 0,
+            'end_index': page['offset'] + len(items),
+            'per_page': self.per_page,
+        }
+
 
 def infinite_scroll_view(full_template, partial_template, items_template):
     """
@@ -254,7 +328,7 @@ def infinite_scroll_view(full_template, partial_template, items_template):
 
     - Full page request → renders full_template
     - HTMX request (page=1 or no page) → renders partial_template (includes headers/search)
-    - HTMX request (page>1) → renders items_template only (just the items + loader)
+    - HTMX request (page>1 or a cursor) → renders items_template only (just the items + loader)
 
     Usage:
         @infinite_scroll_view(
@@ -292,7 +366,8 @@ def infinite_scroll_view(full_template, partial_template, items_template):
             try:
                 page_num = int(page)
             except (TypeError, ValueError):
-                page_num = 1
+                # Cursor-mode paginators pass an opaque token as the page
+                page_num = 2 if is_cursor(page) else 1
 
             if not is_htmx:
                 # Full page request
@@ -0,0 +1,56 @@
+"""
+Run the static asset pipeline for installed modules.
+
+Copies each active module's static/ directory into STATIC_ROOT, hashes and
+precompresses the files and merges them into the staticfiles manifest.
+Module installs do this automatically; this command covers modules that
+are already on disk when the container starts (STATIC_ROOT comes from the
+image and doesn't contain runtime-installed modules).
+
+Usage:
+    python manage.py collectstatic_modules
+    python manage.py collectstatic_modules sales inventory
+"""
+
+from django.core.management.base import BaseCommand
+
+from apps.core.services.module_static_service import ModuleStaticService
+
+
+class Command(BaseCommand):
+    help = 'Hash, precompress and publish static files of installed modules'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'module_ids', nargs='*',
+            help='Module IDs to process (default: all active modules)',
+        )
+
+    def handle(self, *args, **options):
+        if not ModuleStaticService.is_enabled():
+            self.stdout.write('Static storage is not a manifest storage, skipping')
+            return
+
+        module_ids = options['module_ids']
+        if module_ids:
+            results = [
+                ModuleStaticService.collect_module(mid, refresh=False)
+                for mid in module_ids
+            ]
+        else:
+            results = ModuleStaticService.collect_all()
+
+        total = 0
+        for result in results:
+            if result.skipped:
+                continue
+            total += result.collected
+            self.stdout.write(
+                f'  {result.module_id}: {result.collected} files, {result.hashed} hashed'
+            )
+            for error in result.errors:
+                self.stdout.write(self.style.WARNING(f'    {error}'))
+
+        self.stdout.write(self.style.SUCCESS(
+            f'Module static pipeline complete: {total} files from {len(results)} modules'
+        ))
@@ -0,0 +1,120 @@
+"""
+Report missing and unused indexes on PostgreSQL.
+
+Compares the indexes declared by the installed models (including the
+standard HubBaseModel partial indexes, see apps/core/models/indexes.py)
+with the database, and lists indexes that were never scanned according to
+pg_stat_user_indexes, plus large tables read mostly by sequential scans.
+
+Usage counts are cumulative since the statistics were last reset, so run
+this on a database that has served real traffic for a while.
+
+Usage:
+    python manage.py index_report
+    python manage.py index_report --all-tables --min-rows 50000
+"""
+
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+
+class Command(BaseCommand):
+    help = 'Report missing and unused indexes (PostgreSQL, pg_stat_user_indexes)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS)
+        parser.add_argument(
+            '--all-tables', action='store_true',
+            help='Include tables that do not belong to an installed model',
+        )
+        parser.add_argument(
+            '--min-rows', type=int, default=10000,
+            help='Only flag sequential scans on tables with at least this many rows',
+        )
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'postgresql':
+            raise CommandError('index_report needs PostgreSQL (pg_stat_user_indexes).')
+
+        tables = self._model_tables()
+        with connection.cursor() as cursor:
+            existing = self._existing_indexes(cursor)
+            unused = self._unused_indexes(cursor)
+            seq_scanned = self._seq_scanned_tables(cursor, options['min_rows'])
+            cursor.execute('SELECT stats_reset FROM pg_stat_database WHERE datname = current_database()')
+            stats_reset = cursor.fetchone()[0]
+
+        if not options['all_tables']:
+            unused = [row for row in unused if row[0] in tables]
+            seq_scanned = [row for row in seq_scanned if row[0] in tables]
+
+        missing = [
+            (table, name) for table, names in sorted(tables.items())
+            for name in names if name not in existing.get(table, set())
+        ]
+
+        self.stdout.write(f'Statistics since: {stats_reset or "server start"}')
+
+        self._section('Declared but missing from the database (run migrate)', missing,
+                      lambda row: f'{row[0]}.{row[1]}')
+        self._section('Never used (idx_scan = 0)', unused,
+                      lambda row: f'{row[0]}.{row[1]} ({row[2]})')
+        self._section('Mostly sequential scans', seq_scanned,
+                      lambda row: f'{row[0]}: {row[1]} rows, {row[2]} seq / {row[3]} index scans')
+
+    def _section(self, title, rows, fmt):
+        self.stdout.write('')
+        if not rows:
+            self.stdout.write(self.style.SUCCESS(f'{title}: none'))
+            return
+        self.stdout.write(self.style.WARNING(f'{title}: {len(rows)}'))
+        for row in rows:
+            self.stdout.write(f'  {fmt(row)}')
+
+    @staticmethod
+    def _model_tables():
+        """{db_table: {declared index names}} for the installed concrete models."""
+        tables = {}
+        for model in apps.get_models():
+            meta = model._meta
+            if meta.proxy or not meta.managed:
+                continue
+            names = tables.setdefault(meta.db_table, set())
+            names.update(index.name for index in meta.indexes if index.name)
+        return tables
+
+    @staticmethod
+    def _existing_indexes(cursor):
+        cursor.execute(
+            'SELECT tablename, indexname FROM pg_indexes WHERE schemaname = current_schema()'
+        )
+        existing = {}
+        for table, name in cursor.fetchall():
+            existing.setdefault(table, set()).add(name)
+        return existing
+
+    @staticmethod
+    def _unused_indexes(cursor):
+        # Primary keys and unique indexes enforce constraints: never "unused"
+        cursor.execute(
+            'SELECT s.relname, s.indexrelname, pg_size_pretty(pg_relation_size(s.indexrelid)) '
+            'FROM pg_stat_user_indexes s JOIN pg_index i ON i.indexrelid = s.indexrelid '
+            'WHERE s.schemaname = current_schema() AND s.idx_scan = 0 '
+            'AND NOT i.indisunique AND NOT i.indisprimary '
+            'ORDER BY pg_relation_size(s.indexrelid) DESC, s.relname, s.indexrelname'
+        )
+        return cursor.fetchall()
+
+    @staticmethod
+    def _seq_scanned_tables(cursor, min_rows):
+        cursor.execute(
+            'SELECT relname, n_live_tup, seq_scan, coalesce(idx_scan, 0) '
+            'FROM pg_stat_user_tables '
+            'WHERE schemaname = current_schema() AND n_live_tup >= %s '
+            'AND seq_scan > coalesce(idx_scan, 0) '
+            'ORDER BY seq_scan DESC, relname',
+            [min_rows],
+        )
+        return cursor.fetchall()
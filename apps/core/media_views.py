@@ -102,14 +102,14 @@ def shared_assets(request):
     # Fetch asset listing from Cloud
     assets = []
     try:
-        import requests as http_requests
+        from apps.core.services import cloud_http
         params = {}
         if folder:
             params['folder'] = folder
         if search:
             params['q'] = search
 
-        resp = http_requests.get(
+        resp = cloud_http.get(
             f'{cloud_url}/api/blueprints/assets/',
             params=params,
             timeout=10,
@@ -135,8 +135,8 @@ def shared_folders(request):
 
     folders = []
     try:
-        import requests as http_requests
-        resp = http_requests.get(
+        from apps.core.services import cloud_http
+        resp = cloud_http.get(
             f'{cloud_url}/api/blueprints/assets/folders/',
             timeout=10,
         )
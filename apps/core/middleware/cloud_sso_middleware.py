@@ -8,7 +8,8 @@ La cookie de sesión del Cloud Portal se comparte con el Hub gracias a
 SESSION_COOKIE_DOMAIN configurado en Cloud (ej: '.int.erplora.com').
 
 Flujo SSO completo:
-  1. Usuario visita Hub → SSO verifica cookie de Cloud
+  1. Usuario visita Hub → SSO verifica cookie de Cloud (sesión y acceso al
+     Hub en paralelo; éxito cacheado y firmado SSO_VERIFY_CACHE_TTL segundos)
   2. Si no autenticado → redirige a Cloud login
   3. Si autenticado → crea/actualiza LocalUser
   4. Si LocalUser sin PIN → redirige a /setup-pin/
@@ -22,18 +23,37 @@ Requisitos:
   - Hub debe estar en el mismo dominio (ej: demo.int.erplora.com)
 """
 import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from http.cookiejar import DefaultCookiePolicy
+
 import requests
+from asgiref.sync import sync_to_async
 from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
+from django.core import signing
+from django.core.cache import cache
 from django.shortcuts import redirect
 from django.conf import settings
+from django.db import connections
 from django.urls import reverse
 from django.utils import timezone
+from django.utils.crypto import salted_hmac
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.core.path_classifier import SCOPE_SSO, classify_request, path_classifier
 
 logger = logging.getLogger(__name__)
 
+# Signed cache of successful Cloud verifications (sessionid -> user_data + access)
+_CK_VERIFY = 'sso:verify:'  # + HMAC(sessionid)
+_VERIFY_SALT = 'apps.core.sso.verify'
+
+# Runs the hub-access check alongside the session check (shared by all requests)
+_verify_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix='sso-verify')
+
 
-class CloudSSOMiddleware:
+class CloudSSOMiddleware(MiddlewareMixin):
     """
     Middleware de SSO para Cloud Hubs.
 
@@ -68,7 +88,8 @@ class CloudSSOMiddleware:
     ]
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
+        path_classifier.register(SCOPE_SSO, prefixes=self.EXEMPT_URLS)
         # Use settings instead of decouple for consistency
         self.deployment_mode = getattr(settings, 'DEPLOYMENT_MODE', 'local')
         self.hub_id = getattr(settings, 'HUB_ID', '')
@@ -82,14 +103,62 @@ class CloudSSOMiddleware:
         cloud_public_url = getattr(settings, 'CLOUD_PUBLIC_URL', cloud_api_url)
         self.cloud_base_url = cloud_public_url.rstrip('/')
 
-    def __call__(self, request):
+        # Pooled keep-alive session to Cloud (created lazily, shared by all requests)
+        self._http = None
+        self._http_lock = threading.Lock()
+        self.verify_cache_ttl = getattr(settings, 'SSO_VERIFY_CACHE_TTL', 60)
+
+        # In-flight verifications keyed by HMAC(sessionid), for single-flight
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    async def __acall__(self, request):
         # Solo aplicar middleware en Cloud Hubs
         if self.deployment_mode != 'web':
-            return self.get_response(request)
+            return await self.get_response(request)
+
+        # La verificación con Cloud corre fuera del hilo sync compartido,
+        # para que un Cloud lento no bloquee el resto de peticiones
+        verification = None
+        session_id = await sync_to_async(self._session_to_verify)(request)
+        if session_id:
+            verification = await sync_to_async(
+                self._verify_in_worker, thread_sensitive=False,
+            )(session_id)
+
+        response = await sync_to_async(self.process_request)(request, verification)
+        return response or await self.get_response(request)
+
+    def _verify_in_worker(self, session_id):
+        """_verify_cloud_session on an executor thread, closing its DB connections."""
+        try:
+            return self._verify_cloud_session(session_id)
+        finally:
+            # The cache may be database-backed; nothing else closes this thread's connections
+            connections.close_all()
+
+    def _session_to_verify(self, request):
+        """sessionid que hay que verificar con Cloud, o None si no hace falta."""
+        if classify_request(request).is_exempt(SCOPE_SSO):
+            return None
+        if request.session.get('local_user_id'):
+            return None
+        return request.COOKIES.get('sessionid') or None
+
+    def process_request(self, request, verification=None):
+        """
+        Autentica la petición (None la deja pasar).
+
+        verification: resultado ya obtenido de _verify_cloud_session
+        (camino async); si es None se verifica aquí.
+        """
+        # Solo aplicar middleware en Cloud Hubs
+        if self.deployment_mode != 'web':
+            return None
 
         # Skip URLs exentas
-        if self._is_exempt_url(request.path):
-            return self.get_response(request)
+        if classify_request(request).is_exempt(SCOPE_SSO):
+            return None
 
         # Fast path: if user already has a local session, skip Cloud verification
         local_user_id = request.session.get('local_user_id')
@@ -100,7 +169,7 @@ class CloudSSOMiddleware:
                 hub_config = HubConfig.get_config()
                 request.session['hub_id'] = str(hub_config.hub_id)
                 request.session.save()
-            return self.get_response(request)
+            return None
 
         # No local session — verify with Cloud
         session_id = request.COOKIES.get('sessionid')
@@ -109,8 +178,10 @@ class CloudSSOMiddleware:
             logger.info("[SSO] No sessionid cookie found. Redirecting to login.")
             return self._redirect_to_login(request)
 
-        # Verificar sesión con Cloud API
-        is_authenticated, user_data = self._verify_session_with_cloud(session_id)
+        # Verificar sesión y acceso al Hub con Cloud API (cacheado, en paralelo)
+        if verification is None:
+            verification = self._verify_cloud_session(session_id)
+        is_authenticated, user_data, has_access = verification
 
         if not is_authenticated:
             logger.info("[SSO] Invalid session. Redirecting to login.")
@@ -123,8 +194,6 @@ class CloudSSOMiddleware:
             logger.info(f"[SSO] DEMO MODE: User {user_email} authenticated - access granted")
         else:
             # Verificar que el usuario tiene acceso a este Hub (solo modo producción)
-            has_access = self._verify_hub_access(session_id, user_email)
-
             if not has_access:
                 logger.warning(f"[SSO] User {user_email} does not have access to Hub {self.hub_id}")
                 return self._render_no_access_page(request, user_email)
@@ -140,14 +209,11 @@ class CloudSSOMiddleware:
         if redirect_response:
             return redirect_response
 
-        return self.get_response(request)
+        return None
 
     def _is_exempt_url(self, path):
         """Verifica si la URL está exenta de autenticación."""
-        for exempt_url in self.EXEMPT_URLS:
-            if path.startswith(exempt_url):
-                return True
-        return False
+        return path_classifier.classify(path).is_exempt(SCOPE_SSO)
 
     def _ensure_local_user_and_session(self, request, user_data):
         """
@@ -236,6 +302,93 @@ class CloudSSOMiddleware:
             # On error, redirect to login instead of continuing unauthenticated
             return self._redirect_to_login(request)
 
+    def _get_http_session(self):
+        """Pooled requests session to Cloud, reused across requests (keep-alive)."""
+        if self._http is None:
+            with self._http_lock:
+                if self._http is None:
+                    session = requests.Session()
+                    # Shared by every user: never keep a Set-Cookie from Cloud
+                    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                    retry = Retry(total=1, backoff_factor=0.2, status_forcelist=[502, 503, 504])
+                    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16, max_retries=retry)
+                    session.mount('https://', adapter)
+                    session.mount('http://', adapter)
+                    self._http = session
+        return self._http
+
+    def _verify_cloud_session(self, session_id):
+        """
+        Verifica sesión y acceso al Hub, con caché firmada y single-flight.
+
+        Both Cloud calls run concurrently. Successful results are cached
+        (signed, keyed by an HMAC of the sessionid) for
+        SSO_VERIFY_CACHE_TTL seconds; concurrent requests with the same
+        sessionid share one in-flight verification.
+
+        Returns:
+            tuple: (is_authenticated, user_data or None, has_access)
+        """
+        key = salted_hmac(_VERIFY_SALT, session_id, algorithm='sha256').hexdigest()
+
+        cached = self._get_cached_verification(key)
+        if cached is not None:
+            return True, cached['user_data'], cached['has_access']
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = self._fetch_verification(key, session_id)
+            future.set_result(result)
+            return result
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def _fetch_verification(self, key, session_id):
+        """Run both Cloud checks concurrently and cache definitive successes."""
+        access_future = None
+        if not self.demo_mode:
+            access_future = _verify_executor.submit(self._check_hub_access, session_id)
+
+        is_authenticated, user_data, auth_definitive = self._check_session(session_id)
+
+        has_access, access_definitive = True, True
+        if access_future is not None:
+            has_access, access_definitive = access_future.result()
+
+        if not is_authenticated:
+            return False, None, False
+
+        if auth_definitive and access_definitive and has_access and self.verify_cache_ttl:
+            cache.set(
+                f'{_CK_VERIFY}{key}',
+                signing.dumps({'user_data': user_data, 'has_access': has_access}, salt=_VERIFY_SALT),
+                self.verify_cache_ttl,
+            )
+        return True, user_data, has_access
+
+    def _get_cached_verification(self, key):
+        value = cache.get(f'{_CK_VERIFY}{key}')
+        if value is None:
+            return None
+        try:
+            return signing.loads(value, salt=_VERIFY_SALT, max_age=self.verify_cache_ttl)
+        except signing.BadSignature:
+            logger.warning("[SSO] Discarding cached verification with bad signature")
+            cache.delete(f'{_CK_VERIFY}{key}')
+            return None
+
     def _verify_session_with_cloud(self, session_id):
         """
         Verifica la sesión con Cloud API.
@@ -244,13 +397,19 @@ class CloudSSOMiddleware:
             tuple: (is_authenticated: bool, user_data: dict or None)
                    user_data contains: email, user_id, name
         """
+        is_authenticated, user_data, _ = self._check_session(session_id)
+        return is_authenticated, user_data
+
+    def _check_session(self, session_id):
+        """
+        Returns:
+            tuple: (is_authenticated, user_data or None, definitive)
+                   definitive=False for network/server errors (never cached)
+        """
         try:
-            session = requests.Session()
-            retry = Retry(total=1, backoff_factor=0.2, status_forcelist=[502, 503, 504])
-            session.mount('https://', HTTPAdapter(max_retries=retry))
-            response = session.get(
+            response = self._get_http_session().get(
                 f"{self.cloud_api_url}/api/auth/verify-session/",
-                cookies={'sessionid': session_id},
+                headers={'Cookie': f'sessionid={session_id}'},
                 timeout=5
             )
 
@@ -262,52 +421,58 @@ class CloudSSOMiddleware:
                         'email': data.get('email'),
                         'user_id': data.get('user_id'),
                         'name': data.get('name', ''),
-                    }
+                    }, True
                 else:
-                    return False, None
+                    return False, None, True
             else:
                 logger.warning(f"[SSO] Session verification failed: {response.status_code}")
-                return False, None
+                return False, None, False
 
         except requests.exceptions.RequestException as e:
             logger.error(f"[SSO] Error verifying session with Cloud: {str(e)}")
             # En caso de error de red, denegar acceso por seguridad
             # El usuario será redirigido al login
-            return False, None
+            return False, None, False
 
-    def _verify_hub_access(self, session_id, user_email):
+    def _verify_hub_access(self, session_id, user_email=None):
         """
         Verifica que el usuario tiene acceso a este Hub específico.
 
         Returns:
             bool: True si tiene acceso, False si no
         """
+        has_access, _ = self._check_hub_access(session_id)
+        return has_access
+
+    def _check_hub_access(self, session_id):
+        """
+        Returns:
+            tuple: (has_access, definitive)
+                   definitive=False for errors/fallbacks (never cached)
+        """
         if not self.hub_id:
             logger.warning("[SSO] HUB_ID not configured, allowing access")
-            return True
+            return True, False
 
         try:
-            session = requests.Session()
-            retry = Retry(total=1, backoff_factor=0.2, status_forcelist=[502, 503, 504])
-            session.mount('https://', HTTPAdapter(max_retries=retry))
-            response = session.get(
+            response = self._get_http_session().get(
                 f"{self.cloud_api_url}/api/hubs/{self.hub_id}/check-access/",
-                cookies={'sessionid': session_id},
+                headers={'Cookie': f'sessionid={session_id}'},
                 timeout=5
             )
 
             if response.status_code == 200:
                 data = response.json()
-                return data.get('has_access', False)
+                return data.get('has_access', False), True
             else:
                 logger.warning(f"[SSO] Hub access check failed: {response.status_code}")
                 # En caso de error, denegar acceso por seguridad
-                return False
+                return False, False
 
         except requests.exceptions.RequestException as e:
             logger.error(f"[SSO] Error checking Hub access: {str(e)}")
             # En caso de error de red, permitir acceso (fallback)
-            return True
+            return True, False
 
     def _redirect_to_login(self, request):
         """Redirige al login de Cloud con next parameter."""
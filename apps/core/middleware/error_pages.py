@@ -1,8 +1,9 @@
 from django.http import HttpResponse
 from django.template.loader import render_to_string
+from django.utils.deprecation import MiddlewareMixin
 
 
-class ErrorPageMiddleware:
+class ErrorPageMiddleware(MiddlewareMixin):
     """Render custom error pages for HTTP error responses that Django
     doesn't handle with templates by default (e.g. 405)."""
 
@@ -10,12 +11,7 @@ class ErrorPageMiddleware:
         405: '405.html',
     }
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-
+    def process_response(self, request, response):
         if response.status_code in self.TEMPLATE_MAP:
             # Skip for API/HTMX requests — they expect JSON or fragments
             if request.path.startswith('/api/') or request.headers.get('HX-Request'):
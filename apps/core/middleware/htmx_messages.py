@@ -7,17 +7,13 @@ can display them.
 """
 import json
 from django.contrib.messages import get_messages
+from django.utils.deprecation import MiddlewareMixin
 
 
-class HtmxMessagesMiddleware:
+class HtmxMessagesMiddleware(MiddlewareMixin):
     """Convert Django messages to HX-Trigger showMessage events for HTMX."""
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-
+    def process_response(self, request, response):
         if not getattr(request, 'htmx', False):
             return response
 
@@ -10,10 +10,13 @@ This solves the problem of modules being deactivated but their middleware still
 
 from pathlib import Path
 from django.conf import settings
+from django.utils.deprecation import MiddlewareMixin
 from django.utils.module_loading import import_string
 
+from .server_timing import stage
 
-class ModuleMiddlewareManager:
+
+class ModuleMiddlewareManager(MiddlewareMixin):
     """
     Dynamically manages module middlewares based on module active status.
 
@@ -24,7 +27,7 @@ class ModuleMiddlewareManager:
     """
 
     def __init__(self, get_response):
-        self.get_response = get_response
+        super().__init__(get_response)
         self._middleware_cache = {}  # Cache middleware instances
         self._module_middleware_map = {}  # Map module_id → middleware path
 
@@ -108,9 +111,9 @@ class ModuleMiddlewareManager:
 
         return self._middleware_cache[middleware_path]
 
-    def __call__(self, request):
+    def process_request(self, request):
         """
-        Process request through active module middlewares.
+        Run process_request of active module middlewares.
         """
         # Get list of currently active modules
         active_module_ids = self._get_active_module_ids()
@@ -124,22 +127,29 @@ class ModuleMiddlewareManager:
                 if middleware_instance:
                     active_middlewares.append(middleware_instance)
 
+        # Response hooks only run when the request got through all of them
+        request._module_middlewares = ()
+
         # Process request through active middlewares
-        response = None
         for middleware in active_middlewares:
             # Call process_request if it exists
             if hasattr(middleware, 'process_request'):
-                result = middleware.process_request(request)
+                with stage(f'mod.{type(middleware).__name__}'):
+                    result = middleware.process_request(request)
                 if result is not None:
                     # Middleware returned a response, short-circuit
                     return result
 
-        # Get response from next middleware/view
-        response = self.get_response(request)
+        request._module_middlewares = active_middlewares
+        return None
 
-        # Process response through active middlewares (in reverse order)
-        for middleware in reversed(active_middlewares):
+    def process_response(self, request, response):
+        """
+        Run process_response of active module middlewares (in reverse order).
+        """
+        for middleware in reversed(getattr(request, '_module_middlewares', ())):
             if hasattr(middleware, 'process_response'):
-                response = middleware.process_response(request, response)
+                with stage(f'mod.{type(middleware).__name__}'):
+                    response = middleware.process_response(request, response)
 
         return response
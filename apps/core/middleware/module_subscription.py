@@ -7,14 +7,24 @@ to a pricing page. Zero changes needed in module code.
 Flow:
 1. Detect module from URL namespace (e.g., 'tobacco', 'assistant')
 2. Check if module is premium (reads PRICING from module.py)
-3. Query Cloud API for subscription status (cached 5 min)
+3. Look up the last-known subscription status (cache, then DB). Stale
+   statuses are served while one batched Cloud call refreshes every
+   premium module in the background — the request never waits on Cloud.
 4. If not paid → redirect to /marketplace/pricing/<module_id>/
-5. If paid/trialing → pass through normally
+5. If paid/trialing → pass through normally. 'unknown' (confirmed once,
+   but not within MODULE_SUBSCRIPTION_GRACE_HOURS) follows
+   MODULE_SUBSCRIPTION_UNKNOWN_POLICY. A module whose status was never
+   confirmed ('unconfirmed') is checked with the Cloud on first access and
+   denied while the Cloud cannot confirm it. A failed check is not
+   repeated for _REFRESH_RETRY_AFTER seconds, so a slow Cloud delays at
+   most one request per module and window.
 
 Also provides `is_module_paid(module_id)` for background jobs
 that don't go through HTTP middleware.
 """
 import logging
+import threading
+import time
 from pathlib import Path
 
 from django.conf import settings
@@ -22,14 +32,20 @@ from django.core.cache import cache
 from django.http import HttpResponse
 from django.shortcuts import redirect
 from django.urls import reverse
+from django.utils import timezone
+from django.utils.deprecation import MiddlewareMixin
+
+from apps.core.path_classifier import classify_request
 
 logger = logging.getLogger(__name__)
 
-# Cache TTL for subscription status (seconds)
+# Default freshness of a subscription status (seconds);
+# see MODULE_SUBSCRIPTION_FRESH_TTL
 _SUB_CACHE_TTL = 300  # 5 minutes
 
-# Cache key prefix
+# Cache key prefixes
 _CK_SUB_STATUS = 'mod_sub:'  # + hub_id:module_id
+_CK_SUB_CONFIRM = 'mod_sub_confirm:'  # + hub_id:module_id, sync confirmation attempted
 
 
 def _get_module_pricing(module_id):
@@ -78,17 +94,43 @@ def _is_premium_module(module_id):
     return pricing.get('type') in ('subscription', 'one_time')
 
 
+def _get_hub_credentials():
+    """Return (hub_id, auth_token) from HubConfig."""
+    from apps.configuration.models import HubConfig
+    hub_config = HubConfig.get_solo()
+    return str(hub_config.hub_id or ''), hub_config.hub_jwt or hub_config.cloud_api_token
+
+
+def _premium_module_ids():
+    """Active module ids with premium PRICING."""
+    modules_dir = getattr(settings, 'MODULES_DIR', None)
+    if not modules_dir or not Path(modules_dir).is_dir():
+        return []
+    return sorted(
+        d.name for d in Path(modules_dir).iterdir()
+        if d.is_dir() and not d.name.startswith(('.', '_')) and _is_premium_module(d.name)
+    )
+
+
+def _fresh_ttl():
+    return getattr(settings, 'MODULE_SUBSCRIPTION_FRESH_TTL', _SUB_CACHE_TTL)
+
+
+def _grace_seconds():
+    return getattr(settings, 'MODULE_SUBSCRIPTION_GRACE_HOURS', 72) * 3600
+
+
 def _fetch_subscription_status(hub_id, module_id, auth_token):
     """
     Query Cloud API for module subscription status.
     Returns dict with 'status', 'trial_end', 'period_end'.
     """
-    import requests as http_requests
+    from apps.core.services import cloud_http
 
     cloud_api_url = getattr(settings, 'CLOUD_API_URL', 'https://erplora.com')
 
     try:
-        response = http_requests.get(
+        response = cloud_http.get(
             f'{cloud_api_url}/api/hubs/me/module-subscription/',
             params={'module': module_id},
             headers={
@@ -105,30 +147,208 @@ def _fetch_subscription_status(hub_id, module_id, auth_token):
     return {'status': 'unknown'}
 
 
-def get_subscription_status(module_id, hub_id=None, auth_token=None):
+def _fetch_subscription_statuses(hub_id, module_ids, auth_token):
+    """
+    Query Cloud API for several modules in one call.
+
+    Sends ?modules=a,b,c and expects {'subscriptions': {module_id: {...}}}.
+    If the Cloud answers without a 'subscriptions' map (older API), falls
+    back to one call per module. On network errors returns {} so the
+    caller keeps the last-known statuses.
+    """
+    from apps.core.services import cloud_http
+
+    cloud_api_url = getattr(settings, 'CLOUD_API_URL', 'https://erplora.com')
+
+    try:
+        response = cloud_http.get(
+            f'{cloud_api_url}/api/hubs/me/module-subscription/',
+            params={'modules': ','.join(module_ids)},
+            headers={
+                'Authorization': f'Bearer {auth_token}',
+                'Accept': 'application/json',
+            },
+            timeout=10,
+        )
+    except Exception as e:
+        logger.warning('[MODULE_SUB] Cloud API error (batch of %d): %s', len(module_ids), e)
+        return {}
+
+    if response.status_code != 200:
+        logger.warning('[MODULE_SUB] Cloud API returned %s (batch)', response.status_code)
+        return {}
+
+    try:
+        subscriptions = response.json().get('subscriptions')
+    except (ValueError, AttributeError):
+        subscriptions = None
+
+    if isinstance(subscriptions, dict):
+        return {m: subscriptions[m] for m in module_ids if isinstance(subscriptions.get(m), dict)}
+
+    return {m: _fetch_subscription_status(hub_id, m, auth_token) for m in module_ids}
+
+
+def _store_statuses(hub_id, statuses):
+    """Persist confirmed statuses and publish them to the cache."""
+    from apps.core.models import ModuleSubscriptionState
+
+    now = timezone.now()
+    stored = 0
+    for module_id, data in statuses.items():
+        status = data.get('status', 'none')
+        if status == 'unknown':
+            continue
+        ModuleSubscriptionState.objects.update_or_create(
+            hub_id=hub_id, module_id=module_id,
+            defaults={'status': status, 'data': data, 'checked_at': now},
+        )
+        cache.set(
+            f'{_CK_SUB_STATUS}{hub_id}:{module_id}',
+            {'status': status, 'checked_at': now.timestamp()},
+            _grace_seconds(),
+        )
+        stored += 1
+    return stored
+
+
+def refresh_subscription_statuses(module_ids=None, hub_id=None, auth_token=None):
+    """
+    Fetch statuses from the Cloud (one batched call) and persist them.
+
+    Args:
+        module_ids: Modules to refresh (default: every premium module)
+
+    Returns:
+        int: Number of statuses confirmed by the Cloud
+    """
+    if not hub_id or not auth_token:
+        hub_id, auth_token = _get_hub_credentials()
+    if not hub_id or not auth_token:
+        return 0
+
+    if module_ids is None:
+        module_ids = _premium_module_ids()
+    if not module_ids:
+        return 0
+
+    return _store_statuses(hub_id, _fetch_subscription_statuses(hub_id, module_ids, auth_token))
+
+
+# Background refresh (one in flight per process, backoff after failures)
+_refresh_lock = threading.Lock()
+_refresh_thread = None
+_refresh_failed_at = 0.0
+_REFRESH_RETRY_AFTER = 60
+
+
+def _note_refresh_failure():
+    global _refresh_failed_at
+    _refresh_failed_at = time.monotonic()
+
+
+def _background_refresh(hub_id, auth_token):
+    from django.db import connection
+
+    try:
+        if not refresh_subscription_statuses(hub_id=hub_id, auth_token=auth_token):
+            _note_refresh_failure()
+    except Exception as e:
+        logger.warning('[MODULE_SUB] Background refresh failed: %s', e)
+        _note_refresh_failure()
+    finally:
+        connection.close()
+
+
+def _schedule_refresh(hub_id, auth_token):
+    """Start a background refresh of all premium modules unless one is running."""
+    global _refresh_thread
+
+    with _refresh_lock:
+        if _refresh_thread is not None and _refresh_thread.is_alive():
+            return
+        if _refresh_failed_at and time.monotonic() - _refresh_failed_at < _REFRESH_RETRY_AFTER:
+            return
+        _refresh_thread = threading.Thread(
+            target=_background_refresh, args=(hub_id, auth_token),
+            name='module-subscription-refresh', daemon=True,
+        )
+        _refresh_thread.start()
+
+
+def _load_status_entry(hub_id, module_id):
+    """Cached {'status', 'checked_at'} entry, falling back to the DB row."""
+    from apps.core.models import ModuleSubscriptionState
+
+    cache_key = f'{_CK_SUB_STATUS}{hub_id}:{module_id}'
+    entry = cache.get(cache_key)
+    if entry is not None:
+        return entry
+
+    row = (
+        ModuleSubscriptionState.objects
+        .filter(hub_id=hub_id, module_id=module_id)
+        .values('status', 'checked_at')
+        .first()
+    )
+    if row:
+        entry = {'status': row['status'], 'checked_at': row['checked_at'].timestamp()}
+        cache.set(cache_key, entry, _grace_seconds())
+    else:
+        # Never confirmed: remember the miss briefly so we don't hit the DB per request
+        entry = {'status': 'unconfirmed', 'checked_at': 0}
+        cache.set(cache_key, entry, _fresh_ttl())
+    return entry
+
+
+def get_subscription_status(module_id, hub_id=None, auth_token=None, refresh=True):
     """
-    Get subscription status for a module (cached).
-    Returns: 'active', 'trialing', 'expired', 'none', or 'unknown'.
+    Get subscription status for a module without blocking on the Cloud.
+
+    Serves the last-known status (cache, then DB) and, unless refresh is
+    False, triggers a batched background refresh once it is older than
+    MODULE_SUBSCRIPTION_FRESH_TTL.
+    A status not confirmed within MODULE_SUBSCRIPTION_GRACE_HOURS is
+    reported as 'unknown'; one never confirmed at all as 'unconfirmed'.
+
+    Returns: 'active', 'trialing', 'expired', 'none', 'unknown' or
+    'unconfirmed'.
     """
     if not hub_id or not auth_token:
-        from apps.configuration.models import HubConfig
-        hub_config = HubConfig.get_solo()
-        hub_id = hub_id or str(hub_config.hub_id or '')
-        auth_token = auth_token or hub_config.hub_jwt or hub_config.cloud_api_token
+        config_hub_id, config_token = _get_hub_credentials()
+        hub_id = hub_id or config_hub_id
+        auth_token = auth_token or config_token
 
     if not hub_id or not auth_token:
         return 'unknown'
 
-    cache_key = f'{_CK_SUB_STATUS}{hub_id}:{module_id}'
-    cached = cache.get(cache_key)
-    if cached is not None:
-        return cached
+    entry = _load_status_entry(hub_id, module_id)
+    age = time.time() - entry['checked_at']
+
+    if refresh and (entry.get('stale') or age >= _fresh_ttl()):
+        _schedule_refresh(hub_id, auth_token)
 
-    data = _fetch_subscription_status(hub_id, module_id, auth_token)
-    status = data.get('status', 'none')
+    if entry['status'] == 'unconfirmed':
+        return 'unconfirmed'
+    if age >= _grace_seconds():
+        return 'unknown'
+    return entry['status']
 
-    cache.set(cache_key, status, _SUB_CACHE_TTL)
-    return status
+
+def is_status_allowed(status):
+    """
+    Whether a status lets the user into the module.
+
+    'unknown' (Cloud unreachable and no status confirmed within the grace
+    period) follows MODULE_SUBSCRIPTION_UNKNOWN_POLICY: 'allow' (fail-open,
+    default) or 'deny'. 'unconfirmed' (no status ever confirmed, so no
+    payment was ever seen) is always denied.
+    """
+    if status in ('active', 'trialing'):
+        return True
+    if status == 'unknown':
+        return getattr(settings, 'MODULE_SUBSCRIPTION_UNKNOWN_POLICY', 'allow') != 'deny'
+    return False
 
 
 def is_module_paid(module_id):
@@ -141,34 +361,45 @@ def is_module_paid(module_id):
     Returns True if:
     - Module is free (not premium)
     - Module is premium AND has active/trialing subscription
+    - Module is premium AND its status is 'unknown' under the 'allow'
+      policy (same rule as the middleware, see is_status_allowed)
     Returns False if:
-    - Module is premium AND subscription is expired/none/unknown
+    - Module is premium AND subscription is expired/none/unconfirmed
     """
     if not _is_premium_module(module_id):
         return True
 
-    status = get_subscription_status(module_id)
-    return status in ('active', 'trialing')
+    return is_status_allowed(get_subscription_status(module_id))
 
 
 def invalidate_subscription_cache(module_id=None):
     """
-    Invalidate cached subscription status.
+    Mark cached subscription status as stale.
     Call after purchase, cancellation, or Stripe webhook.
+
+    The last-known status keeps being served until the background refresh
+    (triggered by the next check) replaces it.
     """
-    from apps.configuration.models import HubConfig
-    hub_config = HubConfig.get_solo()
-    hub_id = str(hub_config.hub_id or '')
+    from apps.core.models import ModuleSubscriptionState
+
+    hub_id, _ = _get_hub_credentials()
 
     if module_id:
-        cache.delete(f'{_CK_SUB_STATUS}{hub_id}:{module_id}')
+        module_ids = [module_id]
     else:
-        # Can't easily clear pattern with Django cache,
-        # but keys expire in 5 min anyway
-        pass
+        module_ids = list(
+            ModuleSubscriptionState.objects.filter(hub_id=hub_id)
+            .values_list('module_id', flat=True)
+        )
 
+    for mid in module_ids:
+        cache_key = f'{_CK_SUB_STATUS}{hub_id}:{mid}'
+        entry = cache.get(cache_key)
+        if entry is not None:
+            cache.set(cache_key, {**entry, 'stale': True}, _grace_seconds())
 
-class ModuleSubscriptionMiddleware:
+
+class ModuleSubscriptionMiddleware(MiddlewareMixin):
     """
     Bouncer middleware: blocks access to premium modules without payment.
 
@@ -179,20 +410,13 @@ class ModuleSubscriptionMiddleware:
     Does NOT intercept API URLs, marketplace, or system pages.
     """
 
-    def __init__(self, get_response):
-        self.get_response = get_response
-
-    def __call__(self, request):
-        response = self.get_response(request)
-        return response
-
     def process_view(self, request, view_func, view_args, view_kwargs):
         # Only check authenticated users on module pages
         if not hasattr(request, 'session') or 'local_user_id' not in request.session:
             return None
 
         # Only intercept module URLs: /m/<module_id>/...
-        if not request.path.startswith('/m/'):
+        if not classify_request(request).module_id:
             return None
 
         # Extract module_id from resolver match namespace
@@ -210,24 +434,35 @@ class ModuleSubscriptionMiddleware:
             return None
 
         # Get Hub config for Cloud API auth
-        from apps.configuration.models import HubConfig
-        hub_config = HubConfig.get_solo()
-        hub_id = str(hub_config.hub_id or '')
-        auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
+        hub_id, auth_token = _get_hub_credentials()
 
         if not hub_id or not auth_token:
             # Hub not connected — let module load (can't check status)
             return None
 
-        # After Stripe checkout, force cache refresh (LocMemCache is per-worker)
+        # After Stripe checkout, confirm the new status right away
+        # (the one place we wait on Cloud: the user just paid)
         if request.GET.get('subscription') == 'success':
-            invalidate_subscription_cache(namespace)
-
-        # Check subscription status
-        status = get_subscription_status(namespace, hub_id, auth_token)
-
-        if status in ('active', 'trialing', 'unknown'):
-            return None  # Paid or can't verify — pass through (fail-open)
+            refresh_subscription_statuses([namespace], hub_id, auth_token)
+
+        # Check subscription status (last-known, refreshed in background)
+        status = get_subscription_status(namespace, hub_id, auth_token, refresh=False)
+
+        # Never confirmed (e.g. just installed): ask the Cloud now rather
+        # than letting an unpaid module in; denied if it can't answer. One
+        # attempt per module per _REFRESH_RETRY_AFTER (across processes),
+        # then the deny answer is served without waiting on Cloud again.
+        confirm_key = f'{_CK_SUB_CONFIRM}{hub_id}:{namespace}'
+        if status == 'unconfirmed' and cache.add(confirm_key, True, _REFRESH_RETRY_AFTER):
+            if refresh_subscription_statuses([namespace], hub_id, auth_token):
+                status = get_subscription_status(namespace, hub_id, auth_token, refresh=False)
+            else:
+                _note_refresh_failure()  # background refreshes back off too
+        else:
+            status = get_subscription_status(namespace, hub_id, auth_token)
+
+        if is_status_allowed(status):
+            return None  # Paid, or unknown under the 'allow' grace policy
 
         # Not paid — redirect to pricing page
         pricing_url = reverse('marketplace:module_pricing', kwargs={'module_id': namespace})
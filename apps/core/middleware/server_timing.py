@@ -0,0 +1,501 @@
+"""
+Request pipeline timing instrumentation (opt-in).
+
+Enabled with REQUEST_TIMING=true. Records, per request and per stage
+(each middleware, each context processor, each module middleware and the
+view itself):
+
+- self time (wall clock minus nested stages)
+- DB query count and time
+- cache call count and time
+- Cloud HTTP call count and time
+
+Results are emitted as a ``Server-Timing`` response header (visible in the
+browser devtools "Timing" tab) and aggregated in-process per URL name for
+the diagnostics page (/htmx/diagnostics/timing/).
+
+Pieces:
+- ServerTimingMiddleware: outermost middleware, owns the per-request
+  recorder, emits the header and feeds TimingStats.
+- TimedHandlerMixin / TimedWSGIHandler / TimedASGIHandler: handler that wraps the get_response
+  callable passed to every middleware in settings.MIDDLEWARE, so each layer
+  is measured without touching the middleware classes themselves.
+- stage(): context manager for ad-hoc stages (used by
+  ModuleMiddlewareManager for module middlewares).
+
+All hooks are no-ops when no recorder is active for the current request.
+"""
+import logging
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+
+logger = logging.getLogger(__name__)
+
+_current = ContextVar('request_timing', default=None)
+
+# Server-Timing metric names must be HTTP tokens
+_TOKEN_RE = re.compile(r"[^A-Za-z0-9!#$%&'*+.^_`|~-]")
+
+COUNTERS = ('db', 'cache', 'cloud')
+
+
+# =============================================================================
+# Per-request recorder
+# =============================================================================
+
+class _Stage:
+    __slots__ = ('name', 'start', 'children')
+
+    def __init__(self, name):
+        self.name = name
+        self.start = time.perf_counter()
+        self.children = 0.0
+
+
+class RequestTimings:
+    """Stage stack plus per-stage aggregates for a single request."""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.total = 0.0
+        self.stack = []
+        # name -> {'time': s, 'db': n, 'db_time': s, 'cache': n, ...}
+        self.stages = {}
+        self.counters = {kind: [0, 0.0] for kind in COUNTERS}
+
+    def _entry(self, name):
+        entry = self.stages.get(name)
+        if entry is None:
+            entry = {'time': 0.0}
+            for kind in COUNTERS:
+                entry[kind] = 0
+                entry[f'{kind}_time'] = 0.0
+            self.stages[name] = entry
+        return entry
+
+    def enter(self, name):
+        self.stack.append(_Stage(name))
+
+    def exit(self):
+        stage = self.stack.pop()
+        elapsed = time.perf_counter() - stage.start
+        self._entry(stage.name)['time'] += elapsed - stage.children
+        if self.stack:
+            self.stack[-1].children += elapsed
+
+    def record(self, kind, duration):
+        """Attribute an I/O call (db/cache/cloud) to the innermost stage."""
+        self.counters[kind][0] += 1
+        self.counters[kind][1] += duration
+        name = self.stack[-1].name if self.stack else 'other'
+        entry = self._entry(name)
+        entry[kind] += 1
+        entry[f'{kind}_time'] += duration
+
+    def finish(self):
+        self.total = time.perf_counter() - self.start
+
+    def server_timing_header(self):
+        """Build the Server-Timing header value (durations in ms)."""
+        parts = [f'total;dur={self.total * 1000:.1f}']
+        for kind in COUNTERS:
+            count, duration = self.counters[kind]
+            if count:
+                parts.append(f'{kind};dur={duration * 1000:.1f};desc="{count} calls"')
+        for name, entry in self.stages.items():
+            desc = name
+            if entry['db']:
+                desc = f"{name} ({entry['db']} queries)"
+            parts.append(
+                f'{_TOKEN_RE.sub("_", name)};dur={entry["time"] * 1000:.1f};desc="{desc}"'
+            )
+        return ', '.join(parts)
+
+
+def get_current_timings():
+    """Return the active RequestTimings, or None outside an instrumented request."""
+    return _current.get()
+
+
+@contextmanager
+def stage(name):
+    """Measure a block as its own stage (no-op without an active recorder)."""
+    timings = _current.get()
+    if timings is None:
+        yield
+        return
+    timings.enter(name)
+    try:
+        yield
+    finally:
+        timings.exit()
+
+
+def timed(func, name):
+    """Wrap a callable (sync or async) so each call is recorded as a stage."""
+    if iscoroutinefunction(func):
+        async def async_wrapper(*args, **kwargs):
+            timings = _current.get()
+            if timings is None:
+                return await func(*args, **kwargs)
+            timings.enter(name)
+            try:
+                return await func(*args, **kwargs)
+            finally:
+                timings.exit()
+
+        wrapper = wraps(func)(async_wrapper)
+        markcoroutinefunction(wrapper)
+        wrapper._timing_stage = name
+        return wrapper
+
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return func(*args, **kwargs)
+        timings.enter(name)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.exit()
+
+    wrapper._timing_stage = name
+    return wrapper
+
+
+# =============================================================================
+# In-process aggregation
+# =============================================================================
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+class TimingStats:
+    """Bounded per-URL-name sample window with percentile snapshots."""
+
+    def __init__(self, max_samples=500):
+        self.max_samples = max_samples
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def add(self, url_name, timings):
+        sample = {
+            'total': timings.total * 1000,
+            'db': timings.counters['db'][0],
+            'db_time': timings.counters['db'][1] * 1000,
+            'cache': timings.counters['cache'][0],
+            'cloud': timings.counters['cloud'][0],
+            'stages': {
+                name: entry['time'] * 1000 for name, entry in timings.stages.items()
+            },
+            'stage_queries': {
+                name: entry['db'] for name, entry in timings.stages.items() if entry['db']
+            },
+        }
+        with self._lock:
+            window = self._samples.get(url_name)
+            if window is None:
+                window = self._samples[url_name] = deque(maxlen=self.max_samples)
+            window.append(sample)
+
+    def reset(self):
+        with self._lock:
+            self._samples.clear()
+
+    def snapshot(self):
+        """Return per-URL-name summaries, slowest p95 first."""
+        with self._lock:
+            data = {name: list(window) for name, window in self._samples.items()}
+
+        rows = []
+        for url_name, samples in data.items():
+            totals = sorted(s['total'] for s in samples)
+            stage_values = {}
+            stage_queries = {}
+            for s in samples:
+                for name, ms in s['stages'].items():
+                    stage_values.setdefault(name, []).append(ms)
+                for name, count in s['stage_queries'].items():
+                    stage_queries.setdefault(name, []).append(count)
+
+            stages = []
+            for name, values in stage_values.items():
+                values.sort()
+                queries = stage_queries.get(name, [])
+                stages.append({
+                    'name': name,
+                    'p50': _percentile(values, 50),
+                    'p95': _percentile(values, 95),
+                    'avg_queries': sum(queries) / len(samples) if queries else 0,
+                })
+            stages.sort(key=lambda s: s['p95'], reverse=True)
+
+            count = len(samples)
+            rows.append({
+                'url_name': url_name,
+                'count': count,
+                'p50': _percentile(totals, 50),
+                'p95': _percentile(totals, 95),
+                'p99': _percentile(totals, 99),
+                'avg_db': sum(s['db'] for s in samples) / count,
+                'avg_db_time': sum(s['db_time'] for s in samples) / count,
+                'avg_cache': sum(s['cache'] for s in samples) / count,
+                'avg_cloud': sum(s['cloud'] for s in samples) / count,
+                'stages': stages,
+            })
+
+        rows.sort(key=lambda r: r['p95'], reverse=True)
+        return rows
+
+
+timing_stats = TimingStats(getattr(settings, 'REQUEST_TIMING_SAMPLES', 500))
+
+
+# =============================================================================
+# I/O hooks (DB, cache, Cloud HTTP)
+# =============================================================================
+
+def _db_wrapper(execute, sql, params, many, context):
+    timings = _current.get()
+    if timings is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        timings.record('db', time.perf_counter() - start)
+
+
+def _add_db_wrapper(connection, **kwargs):
+    if _db_wrapper not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_db_wrapper)
+
+
+def _instrument_db():
+    """
+    Time queries on every connection, in every thread.
+
+    Connections are per thread: under ASGI queries run in sync_to_async
+    threads, not on the thread that handles the request. The wrapper is
+    added to each connection as it is opened (connection_created) and to
+    the connections already open in this thread; the request's recorder
+    reaches it through the context var.
+    """
+    from django.db import connections
+    from django.db.backends.signals import connection_created
+
+    connection_created.connect(_add_db_wrapper, dispatch_uid='server_timing_db')
+    for conn in connections.all(initialized_only=True):
+        _add_db_wrapper(conn)
+
+
+CACHE_METHODS = (
+    'get', 'set', 'add', 'delete', 'touch', 'has_key',
+    'get_many', 'set_many', 'delete_many', 'incr', 'decr',
+)
+
+_patch_lock = threading.Lock()
+
+
+def _counted(func, kind):
+    @wraps(func)
+    def wrapper(*args, **kwargs):
+        timings = _current.get()
+        if timings is None:
+            return func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            timings.record(kind, time.perf_counter() - start)
+
+    wrapper._timing_counted = True
+    return wrapper
+
+
+def _instrument_caches():
+    """Count calls on every configured cache backend class."""
+    from django.core.cache import caches
+
+    for alias in settings.CACHES:
+        backend_class = type(caches[alias])
+        for method in CACHE_METHODS:
+            func = backend_class.__dict__.get(method)
+            if func is None:
+                # Inherited: wrap on the concrete class so it stays scoped
+                func = getattr(backend_class, method, None)
+            if func is None or getattr(func, '_timing_counted', False):
+                continue
+            setattr(backend_class, method, _counted(func, 'cache'))
+
+
+def _instrument_cloud_http():
+    """Count requests.Session.send calls addressed to the Cloud."""
+    import requests
+
+    send = requests.Session.send
+    if getattr(send, '_timing_counted', False):
+        return
+
+    cloud_url = getattr(settings, 'CLOUD_API_URL', '')
+
+    @wraps(send)
+    def wrapper(self, request, **kwargs):
+        timings = _current.get()
+        if timings is None or not cloud_url or not request.url.startswith(cloud_url):
+            return send(self, request, **kwargs)
+        start = time.perf_counter()
+        try:
+            return send(self, request, **kwargs)
+        finally:
+            timings.record('cloud', time.perf_counter() - start)
+
+    wrapper._timing_counted = True
+    requests.Session.send = wrapper
+
+
+def _instrument_context_processors():
+    """Wrap each template context processor in its own stage."""
+    from django.template import engines
+
+    for backend in engines.all():
+        engine = getattr(backend, 'engine', None)
+        if engine is None:
+            continue
+        processors = engine.template_context_processors
+        engine.__dict__['template_context_processors'] = tuple(
+            p if getattr(p, '_timing_stage', None) else timed(p, f'cp.{p.__name__}')
+            for p in processors
+        )
+
+
+def install_hooks():
+    """Install DB/cache/HTTP/context-processor hooks once per process."""
+    with _patch_lock:
+        for hook in (_instrument_db, _instrument_caches, _instrument_cloud_http,
+                     _instrument_context_processors):
+            try:
+                hook()
+            except Exception as e:
+                logger.warning("[TIMING] Could not install %s: %s", hook.__name__, e)
+
+
+# =============================================================================
+# Middleware
+# =============================================================================
+
+class ServerTimingMiddleware:
+    """
+    Outermost timing middleware.
+
+    Creates the per-request recorder (hooks record into it while it is the
+    current one), adds the Server-Timing header and feeds timing_stats.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        install_hooks()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        timings = self._start(request)
+        token = _current.set(timings)
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    async def __acall__(self, request):
+        timings = self._start(request)
+        token = _current.set(timings)
+        try:
+            # The context var (and so the recorder) follows the request into
+            # the sync_to_async threads, whose connections carry _db_wrapper.
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self._finish(request, response, timings)
+
+    @staticmethod
+    def _start(request):
+        timings = RequestTimings()
+        request.timings = timings
+        return timings
+
+    @staticmethod
+    def _finish(request, response, timings):
+        timings.finish()
+        response['Server-Timing'] = timings.server_timing_header()
+
+        match = getattr(request, 'resolver_match', None)
+        url_name = match.view_name if match and match.view_name else 'unresolved'
+        timing_stats.add(url_name, timings)
+
+        return response
+
+
+# =============================================================================
+# Handler (per-middleware stages)
+# =============================================================================
+
+def _stage_name(handler):
+    """Name the layer behind a get_response callable built by load_middleware."""
+    target = getattr(handler, '__wrapped__', handler)
+    func_name = getattr(target, '__name__', '')
+    if func_name.startswith('_get_response'):
+        return 'view'
+    if func_name:
+        # Function-based middleware: factory.<locals>.middleware -> factory
+        return f'mw.{target.__qualname__.split(".<locals>")[0]}'
+    return f'mw.{type(target).__name__}'
+
+
+class TimedHandlerMixin:
+    """
+    Wrap the get_response passed to each middleware in a timed stage.
+
+    BaseHandler.load_middleware() routes every layer through
+    adapt_method_mode(name="middleware <path>"); the handler it adapts is the
+    *next* layer inward, so wrapping it measures that layer's time. Self
+    time per layer falls out of the stage stack (total minus children).
+    """
+
+    def adapt_method_mode(self, is_async, method, method_is_async=None, debug=False, name=None):
+        adapted = super().adapt_method_mode(
+            is_async, method, method_is_async, debug=debug, name=name
+        )
+        if name and name.startswith('middleware '):
+            return timed(adapted, _stage_name(method))
+        return adapted
+
+
+class TimedWSGIHandler(TimedHandlerMixin, WSGIHandler):
+    """WSGIHandler with per-middleware timing stages."""
+
+
+class TimedASGIHandler(TimedHandlerMixin, ASGIHandler):
+    """ASGIHandler with per-middleware timing stages."""
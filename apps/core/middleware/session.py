@@ -0,0 +1,56 @@
+"""
+Session middleware for the coalesced session engine.
+
+Replaces django.contrib.sessions.middleware.SessionMiddleware when
+SESSION_MODE=coalesced. On the way in it verifies the flags cookie and
+hands it to the SessionStore, and defers save() calls; on the way out it
+writes the session once (if it changed) and re-issues or deletes the flags
+cookie. See apps/core/session_backends/coalesced.py.
+"""
+
+from django.conf import settings
+from django.contrib.sessions.middleware import SessionMiddleware
+
+
+def flags_cookie_name():
+    return getattr(settings, 'SESSION_FLAGS_COOKIE_NAME', settings.SESSION_COOKIE_NAME + '_flags')
+
+
+class CoalescingSessionMiddleware(SessionMiddleware):
+
+    def process_request(self, request):
+        session_key = request.COOKIES.get(settings.SESSION_COOKIE_NAME)
+        flags = self.SessionStore.load_flags(request.COOKIES.get(flags_cookie_name()), session_key)
+        request.session = self.SessionStore(session_key, flags=flags)
+        request.session.defer_saves()
+
+    def process_response(self, request, response):
+        session = getattr(request, 'session', None)
+        if session is None or not hasattr(session, 'defer_saves'):
+            return super().process_response(request, response)
+
+        session.end_deferral()
+        response = super().process_response(request, response)
+
+        cookie_name = flags_cookie_name()
+        if session.is_empty():
+            if cookie_name in request.COOKIES:
+                response.delete_cookie(
+                    cookie_name,
+                    path=settings.SESSION_COOKIE_PATH,
+                    domain=settings.SESSION_COOKIE_DOMAIN,
+                    samesite=settings.SESSION_COOKIE_SAMESITE,
+                )
+        elif session.is_loaded and session.session_key and response.status_code < 500:
+            # The session was read from the store: refresh the flags so the
+            # next requests can skip it again.
+            response.set_cookie(
+                cookie_name,
+                session.dump_flags(),
+                domain=settings.SESSION_COOKIE_DOMAIN,
+                path=settings.SESSION_COOKIE_PATH,
+                secure=settings.SESSION_COOKIE_SECURE or None,
+                httponly=True,
+                samesite=settings.SESSION_COOKIE_SAMESITE,
+            )
+        return response
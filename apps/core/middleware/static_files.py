@@ -0,0 +1,92 @@
+"""
+WhiteNoise middleware that can pick up module static files at runtime.
+
+WhiteNoise indexes STATIC_ROOT once, when the middleware is created.
+Modules installed afterwards are run through the static pipeline
+(apps.core.services.module_static_service), which writes hashed and
+precompressed files into STATIC_ROOT; refresh_static_files() then rescans
+STATIC_ROOT in every live middleware instance so those files are served
+with immutable cache headers without a worker restart. Other worker
+processes pick up the rewritten manifest on their next request
+(ModuleStaticService.reload_if_changed()).
+
+WhiteNoiseMiddleware itself is sync-only, which under ASGI would pin every
+request to Django's shared sync thread; this subclass adds an async path
+(files are looked up in memory and served from a worker thread).
+"""
+import logging
+import threading
+import weakref
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction, sync_to_async
+from django.db import connections
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+from apps.core.services.module_static_service import ModuleStaticService
+
+logger = logging.getLogger(__name__)
+
+_instances = weakref.WeakSet()
+_instances_lock = threading.Lock()
+
+
+def _in_worker(func, *args):
+    # Pool threads outlive requests: never leave a DB connection behind
+    # (finders or signal receivers may open one)
+    try:
+        return func(*args)
+    finally:
+        connections.close_all()
+
+
+class ModuleStaticFilesMiddleware(WhiteNoiseMiddleware):
+    """WhiteNoiseMiddleware registered for runtime rescans of STATIC_ROOT."""
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response=None, *args, **kwargs):
+        super().__init__(get_response, *args, **kwargs)
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        with _instances_lock:
+            _instances.add(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        ModuleStaticService.reload_if_changed()
+        return super().__call__(request)
+
+    async def __acall__(self, request):
+        if ModuleStaticService.manifest_changed():
+            await sync_to_async(_in_worker, thread_sensitive=False)(ModuleStaticService.refresh)
+        if self.autorefresh:
+            static_file = await sync_to_async(_in_worker, thread_sensitive=False)(
+                self.find_file, request.path_info
+            )
+        else:
+            static_file = self.files.get(request.path_info)
+        if static_file is not None:
+            return await sync_to_async(_in_worker, thread_sensitive=False)(
+                self.serve, static_file, request
+            )
+        return await self.get_response(request)
+
+    def refresh(self):
+        """Re-index STATIC_ROOT (new files, .gz/.br variants, immutable headers)."""
+        if self.static_root:
+            self.add_files(self.static_root, prefix=self.static_prefix)
+
+
+def refresh_static_files():
+    """Rescan STATIC_ROOT in all live ModuleStaticFilesMiddleware instances."""
+    with _instances_lock:
+        instances = list(_instances)
+
+    for instance in instances:
+        try:
+            instance.refresh()
+        except Exception as e:
+            logger.warning("[STATIC] WhiteNoise refresh failed: %s", e)
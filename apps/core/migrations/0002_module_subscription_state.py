@@ -0,0 +1,28 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ModuleSubscriptionState',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hub_id', models.CharField(max_length=64)),
+                ('module_id', models.CharField(max_length=100)),
+                ('status', models.CharField(default='unknown', max_length=20)),
+                ('data', models.JSONField(blank=True, default=dict)),
+                ('checked_at', models.DateTimeField(help_text='Last time the Cloud confirmed this status')),
+            ],
+            options={
+                'db_table': 'core_module_subscription_state',
+                'constraints': [models.UniqueConstraint(fields=('hub_id', 'module_id'), name='core_modsub_hub_module_uniq')],
+            },
+        ),
+    ]
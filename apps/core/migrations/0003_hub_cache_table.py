@@ -0,0 +1,24 @@
+from django.db import migrations
+
+from apps.core.cache_backends.postgres import DEFAULT_TABLE, create_cache_table
+
+
+def create_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        create_cache_table(schema_editor.connection, DEFAULT_TABLE)
+
+
+def drop_table(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {schema_editor.quote_name(DEFAULT_TABLE)}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_module_subscription_state'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_table, drop_table),
+    ]
@@ -21,8 +21,10 @@ Usage in modules:
 """
 
 from .base import TimeStampedModel, ActiveModel, HubBaseModel
+from .indexes import hub_indexes
 from .managers import HubManager, HubManagerWithDeleted
 from .media import MediaFile
+from .subscription import ModuleSubscriptionState
 
 __all__ = [
     # Simple base models for modules
@@ -33,6 +35,10 @@ __all__ = [
     # Managers
     'HubManager',
     'HubManagerWithDeleted',
+    # Standard partial composite indexes
+    'hub_indexes',
     # Media
     'MediaFile',
+    # Subscription status persistence
+    'ModuleSubscriptionState',
 ]
@@ -8,8 +8,10 @@ Provides:
 
 import uuid
 from django.db import models
+from django.db.models.signals import class_prepared
 from django.utils import timezone
 
+from .indexes import add_hub_indexes
 from .managers import HubManager, HubManagerWithDeleted
 
 
@@ -79,6 +81,9 @@ class HubBaseModel(models.Model):
     - hub_id for multi-tenancy (multiple Hubs sharing same PostgreSQL database)
     - Audit fields: created_by, updated_by, timestamps
     - Soft delete support with is_deleted flag
+    - Partial composite indexes on (hub_id, created_at), (hub_id, updated_at)
+      and (hub_id, <ordering>) WHERE NOT is_deleted, added automatically
+      (see apps/core/models/indexes.py; opt out with auto_hub_indexes = False)
 
     Usage:
         class MyModel(HubBaseModel):
@@ -124,6 +129,8 @@ class HubBaseModel(models.Model):
     )
 
     # Soft delete
+    # Still indexed on its own: module models only get the partial indexes
+    # below once they generate migrations of their own
     is_deleted = models.BooleanField(
         default=False,
         db_index=True,
@@ -140,6 +147,9 @@ class HubBaseModel(models.Model):
     objects = HubManager()
     all_objects = HubManagerWithDeleted()
 
+    # Add the standard partial composite indexes to concrete subclasses
+    auto_hub_indexes = True
+
     class Meta:
         abstract = True
 
@@ -233,3 +243,11 @@ class HubBaseModel(models.Model):
         """
         from apps.core.references import can_delete
         return can_delete(self)
+
+
+def _add_hub_indexes(sender, **kwargs):
+    if issubclass(sender, HubBaseModel) and sender.auto_hub_indexes:
+        add_hub_indexes(sender)
+
+
+class_prepared.connect(_add_hub_indexes)
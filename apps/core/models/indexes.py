@@ -0,0 +1,96 @@
+"""
+Standard partial composite indexes for HubBaseModel subclasses.
+
+HubManager adds `hub_id = <uuid> AND is_deleted = false` to every query,
+usually followed by an ORDER BY. Single-column indexes on hub_id and
+is_deleted make the planner combine bitmaps (or scan) on large tables, so
+every concrete HubBaseModel gets these indexes, all partial on
+`WHERE NOT is_deleted`:
+
+- (hub_id, created_at)
+- (hub_id, updated_at)      -- "changed since" queries (sync, reports)
+- (hub_id, <Meta.ordering>) -- when the model orders by its own columns
+
+They are added to Model._meta.indexes when the class is prepared, so
+makemigrations picks them up for core apps and modules alike (modules get
+them on their next makemigrations). A model opts out with:
+
+    class Ticket(HubBaseModel):
+        auto_hub_indexes = False
+
+`python manage.py index_report` lists indexes missing from the database
+and indexes never used since the statistics were last reset.
+"""
+
+from django.db import models
+from django.db.backends.utils import names_digest
+
+LIVE = models.Q(is_deleted=False)
+
+STANDARD_FIELDS = (
+    ('hub_id', 'created_at'),
+    ('hub_id', 'updated_at'),
+)
+
+
+def _ordering_fields(model):
+    """Meta.ordering as index fields, or () if it is not plain local columns."""
+    fields = []
+    for item in model._meta.ordering:
+        if not isinstance(item, str) or '__' in item or item.lstrip('-') in ('?', 'pk'):
+            return ()
+        try:
+            field = model._meta.get_field(item.lstrip('-'))
+        except Exception:
+            return ()
+        if not field.concrete or field.is_relation:
+            return ()
+        fields.append(item)
+    return tuple(fields)
+
+
+def _index_name(model, fields):
+    """
+    Deterministic name within the 30 character limit.
+
+    Same shape as Index.set_name_with_model(), with the partial condition in
+    the digest so it never collides with a plain index on the same columns.
+    """
+    table = model._meta.db_table
+    columns = [model._meta.get_field(f.lstrip('-')).column + ('_desc' if f.startswith('-') else '')
+               for f in fields]
+    digest = names_digest(table, *columns, 'not_deleted', length=6)
+    return f'{table[:11]}_{columns[-1][:6]}_{digest}_live'
+
+
+def hub_indexes(model):
+    """Partial composite indexes for a concrete HubBaseModel subclass."""
+    wanted = list(STANDARD_FIELDS)
+    ordering = _ordering_fields(model)
+    if ordering:
+        wanted.append(('hub_id', *ordering))
+
+    indexes, seen = [], set()
+    for fields in wanted:
+        if fields in seen:
+            continue
+        seen.add(fields)
+        indexes.append(models.Index(fields=list(fields), condition=LIVE, name=_index_name(model, fields)))
+    return indexes
+
+
+def add_hub_indexes(model):
+    """Add the standard indexes the model does not already declare."""
+    meta = model._meta
+    if meta.proxy or meta.get_field('hub_id').model is not model:
+        return  # proxies and multi-table children: the parent table has them
+    declared = {(tuple(index.fields), index.condition) for index in meta.indexes}
+    names = {index.name for index in meta.indexes}
+    missing = [
+        index for index in hub_indexes(model)
+        if (tuple(index.fields), index.condition) not in declared and index.name not in names
+    ]
+    if missing:
+        meta.indexes = [*meta.indexes, *missing]
+        # The migration autodetector only reads options found in original_attrs
+        meta.original_attrs['indexes'] = meta.indexes
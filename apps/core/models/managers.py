@@ -3,12 +3,96 @@ Custom managers for Hub models with automatic multi-tenancy filtering.
 
 These managers ensure that each Hub only sees its own data when
 multiple Hubs share the same PostgreSQL database.
+
+Both managers return HubQuerySet, which adds set-based versions of what
+HubBaseModel does per instance (hub_id stamping, soft delete, restore).
 """
 
 from django.db import models
+from django.utils import timezone
+
+
+def current_hub_id():
+    """
+    hub_id from the HubConfig singleton.
+
+    Returns None if HubConfig is not available (during migrations/tests).
+    """
+    try:
+        from apps.configuration.models import HubConfig
+        return HubConfig.get_solo().hub_id
+    except Exception:
+        return None
+
+
+class HubQuerySet(models.QuerySet):
+    """
+    QuerySet for HubBaseModel with bulk-safe tenancy and audit stamping.
+
+    Every method runs one statement per batch; `by` is the UUID of the user
+    performing the action (stored in created_by/updated_by).
+
+    Usage:
+        # Import: one INSERT per batch, hub_id/created_by filled in
+        LocalUser.objects.bulk_create(users, by=request.session['local_user_id'])
+
+        # Mass actions: one UPDATE
+        LocalUser.objects.filter(id__in=ids).soft_delete(by=user_id)
+        LocalUser.objects.with_deleted().filter(id__in=ids).restore(by=user_id)
+
+    Like QuerySet.update(), these do not call save() or send model signals.
+    """
+
+    def bulk_create(self, objs, *args, by=None, **kwargs):
+        """bulk_create that stamps hub_id (when unset) and created_by/updated_by."""
+        objs = list(objs)
+        hub_id = None
+        for obj in objs:
+            if not obj.hub_id:
+                if hub_id is None:
+                    hub_id = current_hub_id() or False
+                if hub_id:
+                    obj.hub_id = hub_id
+            if by is not None:
+                if obj.created_by is None:
+                    obj.created_by = by
+                obj.updated_by = by
+        return super().bulk_create(objs, *args, **kwargs)
+
+    def bulk_update(self, objs, fields, *args, by=None, **kwargs):
+        """bulk_update that also writes updated_at (and updated_by if given)."""
+        objs = list(objs)
+        now = timezone.now()
+        stamped = ['updated_at'] + (['updated_by'] if by is not None else [])
+        for obj in objs:
+            obj.updated_at = now
+            if by is not None:
+                obj.updated_by = by
+        fields = list(fields) + [name for name in stamped if name not in fields]
+        return super().bulk_update(objs, fields, *args, **kwargs)
+
+    def _stamp(self, by, **values):
+        values['updated_at'] = timezone.now()
+        if by is not None:
+            values['updated_by'] = by
+        return self.update(**values)
+
+    def soft_delete(self, by=None):
+        """Mark the matching live rows as deleted. Returns the number of rows."""
+        now = timezone.now()
+        return self.filter(is_deleted=False)._stamp(by, is_deleted=True, deleted_at=now)
+
+    def restore(self, by=None):
+        """
+        Restore the matching soft-deleted rows. Returns the number of rows.
+
+        HubManager hides deleted rows, so start from with_deleted() or
+        all_objects.
+        """
+        return self.filter(is_deleted=True)._stamp(by, is_deleted=False, deleted_at=None)
 
 
-class HubManager(models.Manager):
+class HubManager(models.Manager.from_queryset(HubQuerySet)):
     """
     Default manager that automatically filters by current hub_id.
 
@@ -89,15 +173,10 @@ class HubManager(models.Manager):
 
         Returns None if HubConfig is not available (during migrations/tests).
         """
-        try:
-            from apps.configuration.models import HubConfig
-            config = HubConfig.get_solo()
-            return config.hub_id
-        except Exception:
-            return None
+        return current_hub_id()
 
 
-class HubManagerWithDeleted(models.Manager):
+class HubManagerWithDeleted(models.Manager.from_queryset(HubQuerySet)):
     """
     Manager that includes soft-deleted records but still filters by hub_id.
 
@@ -132,9 +211,4 @@ class HubManagerWithDeleted(models.Manager):
         """
         Get current hub_id from HubConfig singleton.
         """
-        try:
-            from apps.configuration.models import HubConfig
-            config = HubConfig.get_solo()
-            return config.hub_id
-        except Exception:
-            return None
+        return current_hub_id()
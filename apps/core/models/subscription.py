@@ -0,0 +1,30 @@
+"""
+ModuleSubscriptionState — last-known Cloud subscription status per module.
+
+Written by the background refresh in
+apps.core.middleware.module_subscription so that restarts and Cloud
+outages fall back to the last confirmed status instead of blocking the
+request on a Cloud round-trip.
+"""
+from django.db import models
+
+
+class ModuleSubscriptionState(models.Model):
+    hub_id = models.CharField(max_length=64)
+    module_id = models.CharField(max_length=100)
+    status = models.CharField(max_length=20, default='unknown')
+    data = models.JSONField(default=dict, blank=True)
+    checked_at = models.DateTimeField(
+        help_text='Last time the Cloud confirmed this status',
+    )
+
+    class Meta:
+        db_table = 'core_module_subscription_state'
+        constraints = [
+            models.UniqueConstraint(
+                fields=['hub_id', 'module_id'], name='core_modsub_hub_module_uniq',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.module_id}: {self.status}'
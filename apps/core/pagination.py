@@ -0,0 +1,271 @@
+"""
+Keyset (cursor) pagination helpers.
+
+OFFSET pagination reads and discards every row before the page, and the
+COUNT(*) it needs for total pages runs again on every page. Keyset
+pagination instead remembers the ordering values of the last row shown and
+asks for the rows after it:
+
+    WHERE (name, id) > ('Lopez', '0b1c...')  ORDER BY name, id  LIMIT 21
+
+so every page costs the same, however deep the scroll. The ordering is the
+queryset's (or the model's Meta.ordering) with the primary key appended as
+a tie-breaker, and per_page + 1 rows are fetched to know whether there is a
+next page without counting. A foreign key in the ordering orders by its
+column ('category' -> 'category_id'), not by the related model's ordering.
+
+Cursors are signed, so a client cannot inject arbitrary values. They also
+carry the page number, the row offset and the total count computed on the
+first page, so later pages never count again.
+
+Total counts (count=...):
+    'exact'     COUNT(*) once, on the first page
+    'capped'    COUNT over at most count_cap + 1 rows (total_count_capped
+                tells whether there are more)
+    'estimate'  planner estimate: pg_class.reltuples for an unfiltered
+                table, EXPLAIN's row estimate otherwise (PostgreSQL only)
+    None        no count (total_count is None)
+
+Used by InfiniteScrollPaginator(mode='cursor') and chooser_search.
+"""
+
+import json
+
+from django.core import signing
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import Q
+
+_CURSOR_SALT = 'hub.pagination.cursor'
+
+COUNT_MODES = ('exact', 'capped', 'estimate', None)
+
+
+# -----------------------------------------------------------------------------
+# Counting
+# -----------------------------------------------------------------------------
+
+def estimate_count(queryset):
+    """Planner row estimate for queryset (exact count off PostgreSQL)."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    with connection.cursor() as cursor:
+        if not queryset.query.where:
+            cursor.execute(
+                'SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass',
+                [queryset.model._meta.db_table],
+            )
+            row = cursor.fetchone()
+            # -1 = never analyzed
+            if row and row[0] >= 0:
+                return int(row[0])
+        sql, params = queryset.values('pk').query.sql_with_params()
+        cursor.execute(f'EXPLAIN (FORMAT JSON) {sql}', params)
+        plan = cursor.fetchone()[0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]['Plan']['Plan Rows'])
+
+
+def count_rows(queryset, mode, cap=1000):
+    """(total, capped) for a count mode; total is None when mode is None."""
+    if mode == 'exact':
+        return queryset.count(), False
+    if mode == 'capped':
+        total = queryset.order_by()[:cap + 1].count()
+        return min(total, cap), total > cap
+    if mode == 'estimate':
+        return estimate_count(queryset), False
+    return None, False
+
+
+# -----------------------------------------------------------------------------
+# Keyset
+# -----------------------------------------------------------------------------
+
+def _ordering(queryset):
+    """[(lookup, descending)] with a pk tie-breaker."""
+    order_by = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    ordering = []
+    for item in order_by:
+        if not isinstance(item, str) or item == '?':
+            raise ValueError(f'Keyset pagination needs field orderings, got {item!r}')
+        descending = item.startswith('-')
+        lookup = item.lstrip('-+')
+        if lookup == 'pk':
+            lookup = queryset.model._meta.pk.name
+        ordering.append((_column_lookup(queryset, lookup), descending))
+    pk_name = queryset.model._meta.pk.name
+    if not any(lookup == pk_name for lookup, _ in ordering):
+        ordering.append((pk_name, False))
+    return ordering
+
+
+def _column_lookup(queryset, lookup):
+    """
+    lookup ordering by a column: a trailing foreign key by its own column.
+
+    order_by('category') would sort by Category's Meta.ordering, while the
+    cursor compares the category_id values.
+    """
+    if lookup in queryset.query.annotations:
+        return lookup
+    model = queryset.model
+    parts = lookup.split('__')
+    for i, part in enumerate(parts):
+        field = model._meta.get_field(part)
+        if not field.is_relation:
+            continue
+        if i < len(parts) - 1:
+            model = field.related_model
+        elif field.concrete and (field.many_to_one or field.one_to_one):
+            parts[i] = field.attname
+        else:
+            raise ValueError(f'Keyset pagination cannot order by the relation {lookup!r}')
+    return '__'.join(parts)
+
+
+def _field(queryset, lookup):
+    """
+    Field at the end of a lookup path ('role_obj__name') or of an annotation.
+
+    A foreign key stays itself (its null, to_python() of the target field).
+    """
+    if lookup in queryset.query.annotations:
+        return queryset.query.annotations[lookup].output_field
+    model = queryset.model
+    field = None
+    for part in lookup.split('__'):
+        field = model._meta.get_field(part)
+        if field.is_relation and field.related_model is not None:
+            model = field.related_model
+    return field
+
+
+def _value(queryset, obj, lookup):
+    """Ordering value of obj for a lookup path (FKs by their column value)."""
+    if lookup in queryset.query.annotations:
+        return getattr(obj, lookup)
+    *path, last = lookup.split('__')
+    for part in path:
+        obj = getattr(obj, part)
+        if obj is None:
+            return None
+    field = obj._meta.get_field(last)
+    return getattr(obj, field.attname)
+
+
+def _after(lookup, value, descending, nullable):
+    """
+    (strictly after, equal) conditions for one ordering column.
+
+    PostgreSQL (and Django's default) puts NULLs last ascending and first
+    descending.
+    """
+    if value is None:
+        equal = Q(**{f'{lookup}__isnull': True})
+        if descending:
+            return Q(**{f'{lookup}__isnull': False}), equal
+        return Q(pk__in=[]), equal
+    equal = Q(**{lookup: value})
+    after = Q(**{f'{lookup}__{"lt" if descending else "gt"}': value})
+    if nullable and not descending:
+        after |= Q(**{f'{lookup}__isnull': True})
+    return after, equal
+
+
+def keyset_filter(queryset, values):
+    """queryset restricted to the rows after the row with these ordering values."""
+    condition = Q(pk__in=[])
+    equal_so_far = Q()
+    for (lookup, descending), value in zip(_ordering(queryset), values, strict=True):
+        field = _field(queryset, lookup)
+        after, equal = _after(lookup, value, descending, field.null)
+        condition |= equal_so_far & after
+        equal_so_far &= equal
+    return queryset.filter(condition)
+
+
+def _serialize(value):
+    """JSON-safe form of an ordering value; field.to_python() reverses it."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return str(value)
+
+
+def encode_cursor(queryset, obj, state):
+    """Signed cursor for the rows after obj; state carries page/offset/total."""
+    values = [_serialize(_value(queryset, obj, lookup)) for lookup, _ in _ordering(queryset)]
+    return signing.dumps({**state, 'k': values}, salt=_CURSOR_SALT, compress=True)
+
+
+def decode_cursor(queryset, token):
+    """(ordering values, state) from a cursor, or None if invalid."""
+    try:
+        data = signing.loads(token, salt=_CURSOR_SALT)
+    except (signing.BadSignature, TypeError):
+        return None
+    if not isinstance(data, dict):
+        return None
+    ordering = _ordering(queryset)
+    raw = data.pop('k', None)
+    if not isinstance(raw, list) or len(raw) != len(ordering):
+        return None
+    try:
+        values = [
+            None if value is None else _field(queryset, lookup).to_python(value)
+            for (lookup, _), value in zip(ordering, raw, strict=True)
+        ]
+    except (FieldDoesNotExist, ValidationError):
+        return None
+    return values, data
+
+
+def is_cursor(value):
+    """True if value looks like a cursor (not a page number)."""
+    return isinstance(value, str) and ':' in value
+
+
+def keyset_page(queryset, per_page, cursor=None, count='exact', count_cap=1000):
+    """
+    One page of queryset after cursor.
+
+    Returns a dict with items (list), next_cursor (None on the last page),
+    page_number, offset, total_count and total_count_capped.
+    """
+    decoded = decode_cursor(queryset, cursor) if cursor else None
+    ordered = queryset.order_by(*(
+        f'-{lookup}' if descending else lookup for lookup, descending in _ordering(queryset)
+    ))
+    if decoded:
+        values, state = decoded
+        rows = keyset_filter(ordered, values)
+        page_number = state.get('p', 1)
+        offset = state.get('o', 0)
+        total, capped = state.get('t'), state.get('c', False)
+    else:
+        rows = ordered
+        page_number, offset = 1, 0
+        total, capped = count_rows(queryset, count, count_cap)
+
+    items = list(rows[:per_page + 1])
+    has_next = len(items) > per_page
+    items = items[:per_page]
+
+    next_cursor = None
+    if has_next:
+        state = {'p': page_number + 1, 'o': offset + len(items), 't': total, 'c': capped}
+        next_cursor = encode_cursor(queryset, items[-1], state)
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'page_number': page_number,
+        'offset': offset,
+        'total_count': total,
+        'total_count_capped': capped,
+    }
@@ -0,0 +1,182 @@
+"""
+Shared request path classification.
+
+JWTMiddleware, StoreConfigCheckMiddleware and CloudSSOMiddleware each keep
+their own list of exempt path prefixes, and module pages are recognised by
+the /m/<module_id>/ prefix in several places. Instead of every layer
+looping over its list (and JWTMiddleware calling resolve() on every
+unauthenticated request), the lists are registered here under a scope name
+and compiled once into a prefix trie. Classification results are kept in
+an LRU keyed by path, and the request is tagged once:
+
+    from apps.core.path_classifier import classify_request, SCOPE_AUTH
+
+    info = classify_request(request)      # cached on request.path_class
+    info.is_exempt(SCOPE_AUTH)            # trie lookup (cached per path)
+    info.is_public                        # resolve() once per path, cached
+    info.module_id                        # 'sales' for /m/sales/...
+
+Registration (done by each middleware in __init__):
+
+    path_classifier.register(SCOPE_AUTH, prefixes=[...], exact=[...])
+"""
+
+import logging
+import threading
+from functools import lru_cache
+
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.urls import Resolver404, get_urlconf, resolve
+
+logger = logging.getLogger(__name__)
+
+# Exempt scopes (one per consumer)
+SCOPE_AUTH = 'auth'    # JWTMiddleware: no PIN session required
+SCOPE_SSO = 'sso'      # CloudSSOMiddleware: no Cloud session required
+SCOPE_SETUP = 'setup'  # StoreConfigCheckMiddleware: no setup redirect
+
+MODULE_PREFIX = '/m/'
+
+# Distinct paths kept in the classification LRU. Paths with ids in them
+# (e.g. /m/sales/orders/123/) make the key space open-ended.
+CACHE_SIZE = 4096
+
+
+class PathInfo:
+    """Classification of a single path. Shared between requests (read-only)."""
+
+    __slots__ = ('path', 'exempt', 'module_id', '_urlconf', '_match', '_resolved')
+
+    def __init__(self, path, exempt, urlconf=None):
+        self.path = path
+        self.exempt = exempt
+        self.module_id = _module_id(path)
+        self._urlconf = urlconf
+        self._match = None
+        self._resolved = False
+
+    def is_exempt(self, scope):
+        """True if the path matches one of the prefixes registered for scope."""
+        return scope in self.exempt
+
+    @property
+    def resolver_match(self):
+        """ResolverMatch for the path (resolved lazily, at most once), or None."""
+        if not self._resolved:
+            try:
+                self._match = resolve(self.path, self._urlconf)
+            except Resolver404:
+                self._match = None
+            self._resolved = True
+        return self._match
+
+    @property
+    def is_public(self):
+        """True if the resolved view is marked with @public_view."""
+        match = self.resolver_match
+        return bool(match and getattr(match.func, 'is_public', False))
+
+    def __repr__(self):
+        return f'<PathInfo {self.path} exempt={sorted(self.exempt)} module={self.module_id!r}>'
+
+
+def _module_id(path):
+    """Module id for /m/<module_id>/... paths, '' otherwise."""
+    if not path.startswith(MODULE_PREFIX):
+        return ''
+    return path[len(MODULE_PREFIX):].split('/', 1)[0]
+
+
+class _Node:
+    __slots__ = ('children', 'prefix_scopes', 'exact_scopes')
+
+    def __init__(self):
+        self.children = {}
+        self.prefix_scopes = frozenset()
+        self.exact_scopes = frozenset()
+
+
+class PathClassifier:
+    """
+    Prefix trie over every registered exempt list, plus a per-path LRU.
+
+    A single walk over the path collects the scopes of every registered
+    prefix it starts with (and exact paths it equals), so the cost no
+    longer grows with the number of middlewares or list entries.
+    """
+
+    def __init__(self, cache_size=CACHE_SIZE):
+        self.cache_size = cache_size
+        self._rules = {}  # scope -> (prefixes, exact)
+        self._lock = threading.Lock()
+        self._root = _Node()
+        self._classify = lru_cache(maxsize=cache_size)(self._build_info)
+
+    def register(self, scope, prefixes=(), exact=()):
+        """Set (or replace) the exempt prefixes and exact paths for a scope."""
+        rules = (tuple(prefixes), tuple(exact))
+        with self._lock:
+            if self._rules.get(scope) == rules:
+                return
+            self._rules[scope] = rules
+            self._root = self._compile(self._rules)
+            self.clear_cache()
+
+    @staticmethod
+    def _compile(rules):
+        root = _Node()
+
+        def insert(value):
+            node = root
+            for char in value:
+                node = node.children.setdefault(char, _Node())
+            return node
+
+        for scope, (prefixes, exact) in rules.items():
+            for prefix in prefixes:
+                node = insert(prefix)
+                node.prefix_scopes = node.prefix_scopes | {scope}
+            for value in exact:
+                node = insert(value)
+                node.exact_scopes = node.exact_scopes | {scope}
+        return root
+
+    def exempt_scopes(self, path):
+        """Scopes whose exempt lists match path (uncached trie walk)."""
+        node = self._root
+        scopes = node.prefix_scopes
+        for char in path:
+            node = node.children.get(char)
+            if node is None:
+                return scopes
+            scopes = scopes | node.prefix_scopes
+        return scopes | node.exact_scopes
+
+    def _build_info(self, path, urlconf):
+        return PathInfo(path, self.exempt_scopes(path), urlconf)
+
+    def classify(self, path):
+        """Return the (cached) PathInfo for path under the active URLconf."""
+        return self._classify(path, get_urlconf())
+
+    def clear_cache(self):
+        self._classify.cache_clear()
+
+
+path_classifier = PathClassifier()
+
+
+def classify_request(request):
+    """Classify request.path once and tag the request (request.path_class)."""
+    info = getattr(request, 'path_class', None)
+    if info is None or info.path != request.path:
+        info = path_classifier.classify(request.path)
+        request.path_class = info
+    return info
+
+
+@receiver(setting_changed)
+def _clear_on_urlconf_change(*, setting, **kwargs):
+    if setting == 'ROOT_URLCONF':
+        path_classifier.clear_cache()
@@ -0,0 +1,274 @@
+"""
+Search backends for choosers.
+
+ChooserConfig used to OR `icontains` across its search_fields, which is a
+sequential scan of UPPER(col) LIKE '%q%' on every keystroke. A chooser now
+picks a backend with its `search_backend` option:
+
+    'basic'    icontains on any database; rank: exact > prefix > contains
+    'trigram'  PostgreSQL pg_trgm + unaccent; substring and fuzzy (typo)
+               matches served by GIN trigram indexes, ranked by
+               word_similarity
+    'auto'     (default) 'trigram' where the database has it set up,
+               otherwise 'basic' (tests, fresh databases)
+
+Fields listed in a chooser's `prefix_fields` (barcodes, SKUs, codes) only
+match by prefix and rank above fuzzy matches. The trigram backend only
+applies to char and text fields; other fields (numbers, dates, UUIDs) are
+matched with icontains / istartswith as in 'basic'.
+
+The trigram backend needs the extensions, an immutable unaccent wrapper and
+the indexes; create them from a migration:
+
+    from apps.core.search import search_index_operation
+
+    class Migration(migrations.Migration):
+        operations = [
+            search_index_operation('inventory', 'Product', ['name', 'sku', 'barcode']),
+        ]
+
+On other databases the operation does nothing, and it skips fields that
+are not char or text fields.
+"""
+
+import time
+import unicodedata
+from functools import reduce
+from operator import add, or_
+
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections, migrations
+from django.db.backends.utils import names_digest
+from django.db.models import (
+    BooleanField, Case, CharField, F, FloatField, Func, QuerySet, TextField, Value, When,
+)
+from django.db.models.constants import LOOKUP_SEP
+from django.db.models.functions import Cast, Greatest, Upper
+from django.db.models.lookups import Contains, IContains, IExact, IStartsWith, StartsWith
+
+RANK = 'search_rank'
+
+TRIGRAM_CHECK_INTERVAL = 60  # seconds before checking the database setup again
+
+UNACCENT_FUNCTION_SQL = """
+CREATE OR REPLACE FUNCTION hub_unaccent(text) RETURNS text
+LANGUAGE sql IMMUTABLE PARALLEL SAFE STRICT
+AS $$ SELECT public.unaccent('public.unaccent'::regdictionary, $1) $$
+"""
+
+
+def is_text_field(model, path):
+    """True if path (e.g. 'name', 'category__name') is a char or text field."""
+    field = None
+    try:
+        for name in path.split(LOOKUP_SEP):
+            field = model._meta.get_field(name)
+            if field.is_relation:
+                model = field.related_model
+    except FieldDoesNotExist:
+        return False
+    return isinstance(field, (CharField, TextField))
+
+
+def normalize(text):
+    """Upper-case text without accents, as UPPER(hub_unaccent(...)) does."""
+    decomposed = unicodedata.normalize('NFKD', text)
+    return ''.join(c for c in decomposed if not unicodedata.combining(c)).upper()
+
+
+class HubUnaccent(Func):
+    """hub_unaccent(expr): immutable (indexable) unaccent()."""
+    function = 'hub_unaccent'
+    output_field = TextField()
+
+
+class WordSimilarity(Func):
+    """word_similarity(query, expr) between 0 and 1."""
+    function = 'word_similarity'
+    output_field = FloatField()
+
+
+class WordSimilar(Func):
+    """expr %> query: word similarity above pg_trgm.word_similarity_threshold."""
+    template = '%(expressions)s'
+    arg_joiner = ' %%> '
+    output_field = BooleanField()
+
+
+# -----------------------------------------------------------------------------
+# Backends
+# -----------------------------------------------------------------------------
+
+class BasicSearchBackend:
+    """Case-insensitive substring search that works on any database."""
+
+    name = 'basic'
+
+    def filter(self, queryset, query, fields, prefix_fields=()):
+        conditions = [IContains(F(field), query) for field in fields]
+        conditions += [IStartsWith(F(field), query) for field in prefix_fields]
+        return queryset.filter(reduce(or_, conditions))
+
+    def rank(self, queryset, query, fields, prefix_fields=()):
+        whens = [When(IExact(F(field), query), then=Value(3.0)) for field in prefix_fields]
+        whens += [When(IExact(F(field), query), then=Value(2.0)) for field in fields]
+        whens += [When(IStartsWith(F(field), query), then=Value(1.5)) for field in prefix_fields]
+        whens += [When(IStartsWith(F(field), query), then=Value(1.0)) for field in fields]
+        return queryset.annotate(**{RANK: Case(*whens, default=Value(0.0), output_field=FloatField())})
+
+
+class TrigramSearchBackend:
+    """pg_trgm search over UPPER(hub_unaccent(field)), see module docstring."""
+
+    name = 'trigram'
+
+    @staticmethod
+    def _expr(field):
+        # Must match the indexed expression exactly
+        return Upper(HubUnaccent(F(field)))
+
+    def _starts_with(self, model, field, query):
+        if is_text_field(model, field):
+            return StartsWith(self._expr(field), normalize(query))
+        return IStartsWith(F(field), query)
+
+    def filter(self, queryset, query, fields, prefix_fields=()):
+        model = queryset.model
+        normalized = normalize(query)
+        conditions = []
+        for field in fields:
+            if is_text_field(model, field):
+                conditions.append(Contains(self._expr(field), normalized))
+                conditions.append(WordSimilar(self._expr(field), Value(normalized)))
+            else:
+                conditions.append(IContains(F(field), query))
+        conditions += [self._starts_with(model, field, query) for field in prefix_fields]
+        return queryset.filter(reduce(or_, conditions))
+
+    def rank(self, queryset, query, fields, prefix_fields=()):
+        model = queryset.model
+        text_fields = [field for field in fields if is_text_field(model, field)]
+        parts = []
+        if text_fields:
+            similarities = [WordSimilarity(Value(normalize(query)), self._expr(field)) for field in text_fields]
+            parts.append(similarities[0] if len(similarities) == 1 else Greatest(*similarities))
+        if fields:
+            # Prefix matches first among equally similar names
+            parts.append(self._bonus(model, fields, query, 0.5))
+        if prefix_fields:
+            parts.append(self._bonus(model, prefix_fields, query, 2.0))
+        # float8 so cursor values compare exactly on later pages
+        return queryset.annotate(**{RANK: Cast(reduce(add, parts), FloatField())})
+
+    def _bonus(self, model, fields, query, value):
+        """value if any of fields starts with query, else 0."""
+        condition = reduce(or_, [self._starts_with(model, field, query) for field in fields])
+        return Case(When(condition, then=Value(value)), default=Value(0.0), output_field=FloatField())
+
+
+BACKENDS = {
+    'basic': BasicSearchBackend(),
+    'trigram': TrigramSearchBackend(),
+}
+
+# {alias: (ready, checked at)}
+_trigram_ready = {}
+
+
+def trigram_available(using):
+    """
+    True if the database has pg_trgm and hub_unaccent.
+
+    Cached per alias for TRIGRAM_CHECK_INTERVAL seconds, so extensions
+    created (or dropped) later are picked up without a restart.
+    """
+    cached = _trigram_ready.get(using)
+    now = time.monotonic()
+    if cached is not None and now - cached[1] < TRIGRAM_CHECK_INTERVAL:
+        return cached[0]
+    connection = connections[using]
+    ready = False
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_extension WHERE extname = 'pg_trgm') "
+                "AND to_regprocedure('hub_unaccent(text)') IS NOT NULL"
+            )
+            ready = cursor.fetchone()[0]
+    _trigram_ready[using] = (ready, now)
+    return ready
+
+
+def get_search_backend(name, using):
+    """Backend for a chooser's search_backend option on database `using`."""
+    if name == 'auto':
+        name = 'trigram' if using and trigram_available(using) else 'basic'
+    try:
+        return BACKENDS[name]
+    except KeyError:
+        raise ValueError(f"Unknown search backend '{name}' (choose from {', '.join(BACKENDS)}, auto)") from None
+
+
+def search(queryset, query, fields, prefix_fields=(), backend='auto', rank=False):
+    """
+    Filter queryset to rows matching query; with rank=True also annotate
+    `search_rank` and order by it (best first) before the existing ordering.
+    """
+    if not query or not (fields or prefix_fields):
+        return queryset
+    using = queryset.db if isinstance(queryset, QuerySet) else None
+    backend = get_search_backend(backend, using)
+    result = backend.filter(queryset, query, fields, prefix_fields)
+    if not rank:
+        return result
+    ordering = list(queryset.query.order_by) or list(queryset.model._meta.ordering)
+    return backend.rank(result, query, fields, prefix_fields).order_by(f'-{RANK}', *ordering)
+
+
+# -----------------------------------------------------------------------------
+# Migrations
+# -----------------------------------------------------------------------------
+
+def _index_name(table, column):
+    return f'{table[:24]}_{column[:20]}_{names_digest(table, column, length=6)}_trgm'
+
+
+def create_search_indexes(connection, table, columns):
+    """Extensions, hub_unaccent() and one GIN trigram index per column."""
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        cursor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+        cursor.execute(UNACCENT_FUNCTION_SQL)
+        for column in columns:
+            cursor.execute(
+                f'CREATE INDEX IF NOT EXISTS {qn(_index_name(table, column))} '
+                f'ON {qn(table)} USING gin (UPPER(hub_unaccent({qn(column)})) gin_trgm_ops)'
+            )
+    _trigram_ready.clear()
+
+
+def drop_search_indexes(connection, table, columns):
+    qn = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        for column in columns:
+            cursor.execute(f'DROP INDEX IF EXISTS {qn(_index_name(table, column))}')
+
+
+def search_index_operation(app_label, model_name, fields):
+    """Migration operation creating trigram search indexes for model fields."""
+
+    def _columns(apps):
+        model = apps.get_model(app_label, model_name)
+        columns = [model._meta.get_field(f).column for f in fields if is_text_field(model, f)]
+        return model._meta.db_table, columns
+
+    def forwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            create_search_indexes(schema_editor.connection, *_columns(apps))
+
+    def backwards(apps, schema_editor):
+        if schema_editor.connection.vendor == 'postgresql':
+            drop_search_indexes(schema_editor.connection, *_columns(apps))
+
+    return migrations.RunPython(forwards, backwards)
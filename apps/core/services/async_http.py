@@ -0,0 +1,161 @@
+"""
+Async HTTP client for Cloud-bound views.
+
+Views that talk to Cloud (marketplace, module store) are async under the
+ASGI server mode (see config/asgi.py): while one of them waits on Cloud the
+event loop keeps serving POS requests, instead of a WSGI worker sitting
+blocked on a socket.
+
+Under ASGI one pooled httpx.AsyncClient is kept per worker event loop (an
+AsyncClient must not be shared across loops), so keep-alive connections to
+Cloud are reused between requests. config/asgi.py wraps the application
+with asgi_application(), which marks the worker's loop as long-lived and
+closes its client at lifespan shutdown. Any other loop is temporary: under
+WSGI (HUB_SERVER=wsgi) every async view runs in a fresh loop through
+async_to_sync. There each call uses its own client and closes it, since
+there is nothing to pool with:
+
+    from apps.core.services.async_http import aget, aget_json
+
+    status, data = await aget_json(f"{cloud_api_url}/api/blueprints/types/")
+
+    # Several Cloud calls in parallel
+    (s1, sectors), (s2, types) = await asyncio.gather(
+        aget_json(sectors_url), aget_json(types_url),
+    )
+
+Calls share the circuit breakers and metrics of the blocking client
+(cloud_http): while Cloud is marked down, aget raises httpx.ConnectError
+immediately.
+"""
+
+import asyncio
+import logging
+import time
+import weakref
+
+import httpx
+from django.conf import settings
+
+from apps.core.services import cloud_http
+
+logger = logging.getLogger(__name__)
+
+# Connection attempts retried on connect errors (stale keep-alive after long idle)
+RETRIES = 2
+
+_clients = weakref.WeakKeyDictionary()  # event loop -> httpx.AsyncClient
+_persistent_loops = weakref.WeakSet()   # ASGI worker loops (see asgi_application)
+
+
+def _build_client():
+    limits = httpx.Limits(
+        max_connections=settings.CLOUD_HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.CLOUD_HTTP_MAX_KEEPALIVE,
+        keepalive_expiry=30,
+    )
+    return httpx.AsyncClient(
+        timeout=httpx.Timeout(10.0, connect=5.0),
+        headers={'Accept': 'application/json'},
+        transport=httpx.AsyncHTTPTransport(retries=RETRIES, limits=limits),
+    )
+
+
+def asgi_application(app):
+    """
+    Wrap the ASGI application: pool clients on the worker's event loop.
+
+    Also answers lifespan events (Django does not), closing the pooled
+    client at shutdown.
+    """
+    async def application(scope, receive, send):
+        if scope['type'] == 'lifespan':
+            while True:
+                message = await receive()
+                if message['type'] == 'lifespan.startup':
+                    await send({'type': 'lifespan.startup.complete'})
+                elif message['type'] == 'lifespan.shutdown':
+                    await aclose_clients()
+                    await send({'type': 'lifespan.shutdown.complete'})
+                    return
+        _persistent_loops.add(asyncio.get_running_loop())
+        return await app(scope, receive, send)
+
+    return application
+
+
+def mark_persistent_loop():
+    """Pool clients on the running loop (it lives as long as the process)."""
+    _persistent_loops.add(asyncio.get_running_loop())
+
+
+def get_async_client():
+    """Return the pooled AsyncClient for the running event loop."""
+    loop = asyncio.get_running_loop()
+    client = _clients.get(loop)
+    if client is None or client.is_closed:
+        client = _build_client()
+        _clients[loop] = client
+    return client
+
+
+async def aclose_clients():
+    """Close the client of the running loop (ASGI lifespan shutdown, tests)."""
+    loop = asyncio.get_running_loop()
+    client = _clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+async def aget(url, *, headers=None, params=None, timeout=10):
+    """GET url with the pooled client. Raises httpx.HTTPError on failure."""
+    breaker = cloud_http.get_breaker(url)
+    if not breaker.allow_request():
+        cloud_http.metrics.record(url, 0.0, error=cloud_http.CircuitOpenError.__name__)
+        raise httpx.ConnectError(f"Cloud unavailable (circuit open): {cloud_http.endpoint_name(url)}")
+
+    start = time.perf_counter()
+    try:
+        if asyncio.get_running_loop() in _persistent_loops:
+            response = await get_async_client().get(url, headers=headers, params=params, timeout=timeout)
+        else:
+            # Temporary loop (async view under WSGI): a client per call, closed
+            async with _build_client() as client:
+                response = await client.get(url, headers=headers, params=params, timeout=timeout)
+    except httpx.TransportError as e:
+        cloud_http.metrics.record(url, time.perf_counter() - start, error=type(e).__name__)
+        breaker.record_failure()
+        raise
+    except BaseException:
+        # Cancelled, too many redirects...: never leave a probe hanging
+        breaker.release_probe()
+        raise
+
+    cloud_http.metrics.record(url, time.perf_counter() - start, status=response.status_code)
+    if response.status_code in cloud_http.BREAKER_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+async def aget_json(url, *, headers=None, params=None, timeout=10):
+    """
+    GET url and decode the JSON body.
+
+    Returns:
+        tuple: (status_code, data). status_code is None and data None when
+        Cloud is unreachable; data is None for non-200 or invalid JSON.
+    """
+    try:
+        response = await aget(url, headers=headers, params=params, timeout=timeout)
+    except httpx.HTTPError as e:
+        logger.warning("[ASYNC_HTTP] GET %s failed: %s", url, e)
+        return None, None
+
+    if response.status_code != 200:
+        return response.status_code, None
+    try:
+        return response.status_code, response.json()
+    except ValueError:
+        return response.status_code, None
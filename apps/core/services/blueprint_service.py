@@ -3,14 +3,17 @@ Blueprint Service for Hub.
 
 Handles communication with Cloud Blueprint API for business type selection,
 module computation, and seed product import during setup.
+
+Blueprint data is read through the local Cloud mirror (cloud_mirror): the
+wizard gets stored copies at once, revalidated with conditional GETs, and
+keeps working offline.
 """
 import logging
-import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from django.conf import settings
 from django.core.cache import cache
 
+from apps.core.services import cloud_http, cloud_mirror
+
 logger = logging.getLogger(__name__)
 
 CACHE_TTL = 300  # 5 min
@@ -25,22 +28,28 @@ COMPLIANCE_MODULES = {
 }
 
 
-def _get_session():
-    """Get a requests session with retry."""
-    session = requests.Session()
-    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('https://', adapter)
-    session.mount('http://', adapter)
-    return session
-
-
 def _cloud_url(path):
     """Build full Cloud API URL."""
     base = getattr(settings, 'CLOUD_API_URL', 'https://erplora.com')
     return f'{base}/api/blueprints/{path}'
 
 
+def _fetch(name, path, params=None, cache_key=None, timeout=10):
+    """Blueprint data via the cache and the Cloud mirror; None if unavailable."""
+    if cache_key:
+        data = cache.get(cache_key)
+        if data is not None:
+            return data
+    try:
+        data = cloud_mirror.fetch(_cloud_url(path), params=params, timeout=timeout)
+    except Exception as e:
+        logger.error(f'BlueprintService.{name} failed: {e}')
+        return None
+    if cache_key:
+        cache.set(cache_key, data, CACHE_TTL)
+    return data
+
+
 class BlueprintService:
     """Service for interacting with Cloud Blueprint API."""
 
@@ -86,110 +95,40 @@ class BlueprintService:
     @classmethod
     def get_sectors(cls, language='en'):
         """GET /api/blueprints/sectors/ — returns list of business sectors."""
-        cache_key = f'bp:sectors:{language}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            resp = _get_session().get(
-                _cloud_url('sectors/'),
-                params={'language': language},
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_sectors failed: {e}')
-            return []
+        data = _fetch('get_sectors', 'sectors/', {'language': language}, f'bp:sectors:{language}')
+        return data if data is not None else []
 
     @classmethod
     def get_types(cls, sector=None, language='en'):
         """GET /api/blueprints/types/ — returns list of business types."""
-        cache_key = f'bp:types:{sector or "all"}:{language}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            params = {'language': language}
-            if sector:
-                params['sector'] = sector
-            resp = _get_session().get(
-                _cloud_url('types/'),
-                params=params,
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_types failed: {e}')
-            return []
+        params = {'language': language}
+        if sector:
+            params['sector'] = sector
+        data = _fetch('get_types', 'types/', params, f'bp:types:{sector or "all"}:{language}')
+        return data if data is not None else []
 
     @classmethod
     def get_type_detail(cls, code, language='en'):
         """GET /api/blueprints/types/<code>/ — returns full business type detail."""
-        cache_key = f'bp:type:{code}:{language}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            resp = _get_session().get(
-                _cloud_url(f'types/{code}/'),
-                params={'language': language},
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_type_detail failed: {e}')
-            return None
+        return _fetch(
+            'get_type_detail', f'types/{code}/', {'language': language}, f'bp:type:{code}:{language}'
+        )
 
     @classmethod
     def get_transversals(cls, language='en'):
         """GET /api/blueprints/transversals/ — returns transversal business models."""
-        cache_key = f'bp:transversals:{language}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            resp = _get_session().get(
-                _cloud_url('transversals/'),
-                params={'language': language},
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_transversals failed: {e}')
-            return []
+        data = _fetch(
+            'get_transversals', 'transversals/', {'language': language}, f'bp:transversals:{language}'
+        )
+        return data if data is not None else []
 
     @classmethod
     def get_functional_units(cls, language='en'):
         """GET /api/blueprints/functional-units/ — returns 12 UFOs."""
-        cache_key = f'bp:ufos:{language}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            resp = _get_session().get(
-                _cloud_url('functional-units/'),
-                params={'language': language},
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_functional_units failed: {e}')
-            return []
+        data = _fetch(
+            'get_functional_units', 'functional-units/', {'language': language}, f'bp:ufos:{language}'
+        )
+        return data if data is not None else []
 
     @classmethod
     def compute_modules(cls, type_codes):
@@ -198,7 +137,7 @@ class BlueprintService:
         Merge multiple business types to get combined UFO matrix + modules + roles.
         """
         try:
-            resp = _get_session().post(
+            resp = cloud_http.post(
                 _cloud_url('types/compute/'),
                 json={'types': type_codes},
                 timeout=15
@@ -212,37 +151,15 @@ class BlueprintService:
     @classmethod
     def get_products(cls, type_code, country='generic', language='en'):
         """GET /api/blueprints/products/<code>/ — returns seed products for a business type."""
-        try:
-            resp = _get_session().get(
-                _cloud_url(f'products/{type_code}/'),
-                params={'country': country.lower(), 'language': language},
-                timeout=15
-            )
-            resp.raise_for_status()
-            return resp.json()
-        except Exception as e:
-            logger.error(f'BlueprintService.get_products failed: {e}')
-            return None
+        return _fetch(
+            'get_products', f'products/{type_code}/',
+            {'country': country.lower(), 'language': language}, timeout=15,
+        )
 
     @classmethod
     def get_tax_data(cls, country_code):
         """GET /api/blueprints/tax/<country_code>/ — returns tax presets for a country."""
-        cache_key = f'bp:tax:{country_code}'
-        data = cache.get(cache_key)
-        if data is not None:
-            return data
-        try:
-            resp = _get_session().get(
-                _cloud_url(f'tax/{country_code}/'),
-                timeout=10
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            cache.set(cache_key, data, CACHE_TTL)
-            return data
-        except Exception as e:
-            logger.error(f'BlueprintService.get_tax_data failed: {e}')
-            return None
+        return _fetch('get_tax_data', f'tax/{country_code}/', cache_key=f'bp:tax:{country_code}')
 
     @classmethod
     def resolve_modules_for_types(cls, type_codes, include_recommended=True):
@@ -425,12 +342,11 @@ class BlueprintService:
                 s for s in compliance_slugs if s not in module_slugs
             )
         try:
-            import requests as http_requests
             hub_token = ModuleInstallService.get_hub_token()
             for slug in all_installed_slugs:
                 try:
                     version = ModuleInstallService.get_installed_version(slug)
-                    http_requests.post(
+                    cloud_http.post(
                         f'{cloud_url}/api/marketplace/modules/{slug}/mark_installed/',
                         headers={'X-Hub-Token': hub_token},
                         json={'version': version},
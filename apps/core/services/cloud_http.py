@@ -0,0 +1,334 @@
+"""
+Shared HTTP client for Cloud calls (sync views, services, background threads).
+
+Every blocking Cloud call goes through one pooled requests.Session per
+process (the SSO middleware keeps its own session), so keep-alive
+connections are reused across services instead of each module opening its
+own. The session keeps no cookies: pass them per call.
+
+    from apps.core.services import cloud_http
+
+    response = cloud_http.get(f"{cloud_url}/api/marketplace/modules/", headers=headers)
+    response = cloud_http.post(url, json=data, timeout=30)
+
+Per host, a circuit breaker tracks Cloud outages. After
+CLOUD_HTTP_BREAKER_THRESHOLD consecutive failures (connection errors,
+timeouts, 502/503/504) the breaker opens and calls fail at once with
+CircuitOpenError, a requests ConnectionError, so existing
+`except requests.exceptions.RequestException` handlers treat it as
+offline, without waiting for a timeout. After CLOUD_HTTP_BREAKER_RESET
+seconds one call goes through as a probe; success closes the breaker.
+ConnectivityChecker feeds its /health/ outcomes into the same breaker.
+
+Timeouts are per endpoint: a read timeout passed by the caller, otherwise
+the longest matching path prefix in ENDPOINT_TIMEOUTS (extended by the
+CLOUD_HTTP_TIMEOUTS setting), otherwise DEFAULT_TIMEOUT. Connecting never
+waits more than CLOUD_HTTP_CONNECT_TIMEOUT.
+
+Every call records latency, status and errors per endpoint in `metrics`
+(paths with ids collapsed, e.g. /api/hubs/me/commands/{id}/ack/). The async
+client (async_http) uses the same breakers and metrics.
+"""
+
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from http.cookiejar import DefaultCookiePolicy
+from urllib.parse import urlsplit
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 10  # seconds (read)
+
+# Read timeouts by path prefix (longest match wins)
+ENDPOINT_TIMEOUTS = {
+    '/health/': 5,
+    '/api/auth/public-key/': 5,
+    '/api/hubs/me/metrics/': 5,
+    '/api/hubs/me/sync/batch/': 30,
+    '/api/marketplace/': 15,
+    '/api/modules/download/': 120,
+}
+
+# Responses meaning Cloud (or its proxy) is down, not an application error
+BREAKER_STATUSES = (502, 503, 504)
+
+_ID_SEGMENT = re.compile(r'^(\d+|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12})$', re.I)
+
+
+class CircuitOpenError(requests.exceptions.ConnectionError):
+    """Cloud host marked down by its circuit breaker; the call was not made."""
+
+
+# -----------------------------------------------------------------------------
+# Circuit breaker
+# -----------------------------------------------------------------------------
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one host (thread-safe)."""
+
+    CLOSED, OPEN, HALF_OPEN = 'closed', 'open', 'half_open'
+
+    def __init__(self, failure_threshold=5, reset_timeout=30, clock=time.monotonic):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return self.CLOSED
+        if self._clock() - self._opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self):
+        """False while open; in half-open, True for a single probe call."""
+        with self._lock:
+            state = self._state()
+            if state == self.CLOSED:
+                return True
+            if state == self.HALF_OPEN and not self._probing:
+                self._probing = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info("[CLOUD HTTP] Circuit closed")
+            self._failures = 0
+            self._opened_at = None
+            self._probing = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._probing or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._probing:
+                    logger.warning(f"[CLOUD HTTP] Circuit open after {self._failures} failures")
+                self._opened_at = self._clock()
+            self._probing = False
+
+    def release_probe(self):
+        """End a call without an outcome (errors that say nothing about Cloud)."""
+        with self._lock:
+            self._probing = False
+
+    def reset(self):
+        self.record_success()
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    """Circuit breaker for the host of url (scheme://host:port)."""
+    parts = urlsplit(url)
+    host = f'{parts.scheme}://{parts.netloc}'
+    with _breakers_lock:
+        breaker = _breakers.get(host)
+        if breaker is None:
+            breaker = CircuitBreaker(
+                failure_threshold=getattr(settings, 'CLOUD_HTTP_BREAKER_THRESHOLD', 5),
+                reset_timeout=getattr(settings, 'CLOUD_HTTP_BREAKER_RESET', 30),
+            )
+            _breakers[host] = breaker
+        return breaker
+
+
+def reset_breakers():
+    """Forget every breaker (tests, settings changes)."""
+    with _breakers_lock:
+        _breakers.clear()
+
+
+def record_connectivity(url, online):
+    """Feed a connectivity check outcome (ConnectivityChecker) to url's breaker."""
+    breaker = get_breaker(url)
+    if online:
+        breaker.record_success()
+    else:
+        breaker.record_failure()
+
+
+# -----------------------------------------------------------------------------
+# Metrics
+# -----------------------------------------------------------------------------
+
+def endpoint_name(url):
+    """'host/path' of url with numeric/UUID path segments replaced by {id}."""
+    parts = urlsplit(url)
+    segments = ['{id}' if _ID_SEGMENT.match(s) else s for s in parts.path.split('/')]
+    return f"{parts.netloc}{'/'.join(segments)}"
+
+
+class CloudHTTPMetrics:
+    """Thread-safe latency/error counters per endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._endpoints = defaultdict(lambda: {
+            'requests': 0, 'errors': 0, 'rejected': 0,
+            'total_ms': 0.0, 'max_ms': 0.0, 'statuses': defaultdict(int),
+        })
+
+    def record(self, url, elapsed, status=None, error=None):
+        """One call: elapsed seconds, response status or error class name."""
+        elapsed_ms = elapsed * 1000
+        with self._lock:
+            entry = self._endpoints[endpoint_name(url)]
+            entry['requests'] += 1
+            entry['total_ms'] += elapsed_ms
+            entry['max_ms'] = max(entry['max_ms'], elapsed_ms)
+            if error:
+                entry['errors'] += 1
+                entry['statuses'][error] += 1
+                if error == CircuitOpenError.__name__:
+                    entry['rejected'] += 1
+            else:
+                entry['statuses'][status] += 1
+
+    def snapshot(self):
+        """{endpoint: {requests, errors, rejected, avg_ms, max_ms, statuses}}."""
+        with self._lock:
+            return {
+                endpoint: {
+                    'requests': entry['requests'],
+                    'errors': entry['errors'],
+                    'rejected': entry['rejected'],
+                    'avg_ms': round(entry['total_ms'] / entry['requests'], 1),
+                    'max_ms': round(entry['max_ms'], 1),
+                    'statuses': dict(entry['statuses']),
+                }
+                for endpoint, entry in self._endpoints.items()
+            }
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+
+
+metrics = CloudHTTPMetrics()
+
+
+# -----------------------------------------------------------------------------
+# Client
+# -----------------------------------------------------------------------------
+
+_session = None
+_session_lock = threading.Lock()
+
+
+def _build_session():
+    # Retries only stale keep-alive connections and idempotent requests
+    # through a restarting proxy; the breaker handles longer outages
+    retry = Retry(
+        total=2, connect=1, backoff_factor=0.3,
+        status_forcelist=BREAKER_STATUSES, raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, 'CLOUD_HTTP_MAX_CONNECTIONS', 20),
+        pool_maxsize=getattr(settings, 'CLOUD_HTTP_MAX_KEEPALIVE', 10),
+        max_retries=retry,
+    )
+    session = requests.Session()
+    # Shared by every caller and hub: never keep a Set-Cookie from Cloud
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session():
+    """The process-wide pooled session."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = _build_session()
+    return _session
+
+
+def get_timeout(url, timeout=None):
+    """(connect, read) timeout for url; timeout overrides the read timeout."""
+    if timeout is None:
+        path = urlsplit(url).path
+        table = {**ENDPOINT_TIMEOUTS, **getattr(settings, 'CLOUD_HTTP_TIMEOUTS', {})}
+        matches = [prefix for prefix in table if path.startswith(prefix)]
+        timeout = table[max(matches, key=len)] if matches else DEFAULT_TIMEOUT
+    if isinstance(timeout, tuple):
+        return timeout
+    connect = getattr(settings, 'CLOUD_HTTP_CONNECT_TIMEOUT', 3.05)
+    return (min(connect, timeout), timeout)
+
+
+def request(method, url, *, timeout=None, probe=False, **kwargs):
+    """
+    Send a request through the shared session.
+
+    Args:
+        method: HTTP method
+        url: Absolute URL
+        timeout: Read timeout in seconds (or a (connect, read) tuple);
+            defaults per endpoint
+        probe: Bypass an open breaker (health checks); the outcome still
+            updates it
+        **kwargs: Passed to requests (json, data, headers, params, stream...)
+
+    Returns:
+        requests.Response
+
+    Raises:
+        CircuitOpenError: The host's breaker is open
+        requests.exceptions.RequestException: On network errors
+    """
+    breaker = get_breaker(url)
+    if not probe and not breaker.allow_request():
+        metrics.record(url, 0.0, error=CircuitOpenError.__name__)
+        raise CircuitOpenError(f"Cloud unavailable (circuit open): {endpoint_name(url)}")
+
+    start = time.perf_counter()
+    try:
+        response = get_session().request(method.upper(), url, timeout=get_timeout(url, timeout), **kwargs)
+    except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+        metrics.record(url, time.perf_counter() - start, error=type(e).__name__)
+        breaker.record_failure()
+        raise
+    except BaseException as e:
+        # Redirect loops, bad headers, interrupts...: never leave a probe hanging
+        if isinstance(e, requests.exceptions.RequestException):
+            metrics.record(url, time.perf_counter() - start, error=type(e).__name__)
+        breaker.release_probe()
+        raise
+
+    metrics.record(url, time.perf_counter() - start, status=response.status_code)
+    if response.status_code in BREAKER_STATUSES:
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+    return response
+
+
+def get(url, **kwargs):
+    return request('GET', url, **kwargs)
+
+
+def post(url, **kwargs):
+    return request('POST', url, **kwargs)
@@ -0,0 +1,258 @@
+"""
+Local mirror of Cloud reference data (blueprints, marketplace catalog).
+
+Setup wizards and marketplace pages read data that rarely changes
+(sectors, business types, functional units, tax presets, seed products,
+the module catalog). Instead of downloading it again every time the cache
+expires, responses are kept on disk under CLOUD_MIRROR_DIR (default
+DATA_DIR/cloud_mirror) with their ETag / Last-Modified validators, one
+file per URL and query string (endpoint, language, country...):
+
+    from apps.core.services import cloud_mirror
+
+    types = cloud_mirror.fetch(f"{cloud_url}/api/blueprints/types/", params={'language': 'es'})
+
+- A stored copy younger than CLOUD_MIRROR_MAX_AGE seconds is served
+  without contacting Cloud.
+- An older one is revalidated with a conditional GET (If-None-Match /
+  If-Modified-Since): 304 Not Modified keeps it, 200 replaces it.
+- When Cloud is unreachable or failing (timeouts, open circuit breaker,
+  5xx, a body that is not JSON), the stored copy is served however old it
+  is, so the wizard and the marketplace keep working offline.
+- 404/410 and auth failures (401/403) remove the stored copy and raise:
+  old data never hides a rejected token.
+
+Only mirror data that is the same for every hub. Per-hub responses
+(entitlements, purchases, can_install) must not go through here.
+
+fetch() behaves like GET + raise_for_status() + json(): with nothing to
+serve it raises the requests exception (HTTPError for error statuses).
+afetch() is the async variant (httpx exceptions).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from urllib.parse import urlencode
+
+import httpx
+import requests
+from django.conf import settings
+
+from apps.core.services import async_http, cloud_http
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_AGE = 300  # seconds
+
+# The resource no longer exists on Cloud, or this hub may not read it
+DISCARD = (401, 403, 404, 410)
+
+
+def get_mirror_dir():
+    """Directory holding the mirrored payloads."""
+    directory = getattr(settings, 'CLOUD_MIRROR_DIR', None)
+    if directory:
+        return Path(directory)
+    data_dir = getattr(settings, 'DATA_DIR', None)
+    if data_dir:
+        return Path(data_dir) / 'cloud_mirror'
+    return Path(tempfile.gettempdir()) / 'erplora_cloud_mirror'
+
+
+def mirror_key(url, params=None):
+    """URL with its query parameters in a stable order."""
+    query = urlencode(sorted((params or {}).items()))
+    return f'{url}?{query}' if query else url
+
+
+def _path(key):
+    return get_mirror_dir() / f'{hashlib.sha256(key.encode()).hexdigest()}.json'
+
+
+def load(key):
+    """
+    Stored copy for key.
+
+    Returns:
+        (entry, age): entry dict ({'url', 'etag', 'last_modified', 'data'})
+        and seconds since it was last confirmed by Cloud; (None, None) if
+        there is none
+    """
+    path = _path(key)
+    try:
+        age = time.time() - path.stat().st_mtime
+        return json.loads(path.read_text()), age
+    except FileNotFoundError:
+        return None, None
+    except (OSError, ValueError) as e:
+        logger.warning(f"[CLOUD MIRROR] Unreadable copy of {key}: {e}")
+        return None, None
+
+
+def _store(key, entry):
+    path = _path(key)
+    tmp = path.with_name(f'{path.name}.{os.getpid()}.{threading.get_ident()}.tmp')
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp.write_text(json.dumps(entry))
+        os.replace(tmp, path)
+    except (OSError, TypeError, ValueError) as e:
+        logger.warning(f"[CLOUD MIRROR] Could not store {key}: {e}")
+        tmp.unlink(missing_ok=True)
+
+
+def _touch(key):
+    try:
+        os.utime(_path(key))
+    except OSError:
+        pass
+
+
+def _discard(key):
+    try:
+        _path(key).unlink(missing_ok=True)
+    except OSError:
+        pass
+
+
+def _header(headers, name):
+    value = headers.get(name)
+    return value if isinstance(value, str) else ''
+
+
+def _conditional_headers(entry, headers=None):
+    headers = dict(headers or {})
+    if entry:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    return headers
+
+
+def _max_age(max_age):
+    return getattr(settings, 'CLOUD_MIRROR_MAX_AGE', DEFAULT_MAX_AGE) if max_age is None else max_age
+
+
+def _apply(key, entry, status, headers, read_json):
+    """
+    Update the mirror with a Cloud response.
+
+    Returns:
+        (served, data): served is False when there is nothing to serve for
+        this status (the caller raises)
+    """
+    if status == 304 and entry is not None:
+        _touch(key)
+        return True, entry['data']
+    if status == 200:
+        data = read_json()
+        _store(key, {
+            'url': key,
+            'etag': _header(headers, 'ETag'),
+            'last_modified': _header(headers, 'Last-Modified'),
+            'data': data,
+        })
+        return True, data
+    if status in DISCARD:
+        _discard(key)
+        return False, None
+    if entry is not None:
+        logger.warning(f"[CLOUD MIRROR] Cloud returned {status} for {key}, serving stored copy")
+        return True, entry['data']
+    return False, None
+
+
+def fetch(url, *, params=None, headers=None, timeout=None, max_age=None):
+    """
+    GET a JSON resource through the mirror.
+
+    Args:
+        url: Absolute Cloud URL
+        params: Query parameters (part of the mirror key)
+        headers: Extra request headers (not part of the key)
+        timeout: Read timeout (default per endpoint, see cloud_http)
+        max_age: Seconds a stored copy is served without revalidation
+            (default CLOUD_MIRROR_MAX_AGE)
+
+    Returns:
+        Decoded JSON payload
+
+    Raises:
+        requests.exceptions.RequestException: Cloud failed and there is no
+            stored copy (HTTPError for error statuses)
+    """
+    key = mirror_key(url, params)
+    entry, age = load(key)
+    if entry is not None and age < _max_age(max_age):
+        return entry['data']
+
+    try:
+        response = cloud_http.get(
+            url, params=params, headers=_conditional_headers(entry, headers), timeout=timeout
+        )
+    except requests.exceptions.RequestException as e:
+        if entry is None:
+            raise
+        logger.info(f"[CLOUD MIRROR] Cloud unavailable ({e}), serving stored {key}")
+        return entry['data']
+
+    try:
+        served, data = _apply(key, entry, response.status_code, response.headers, response.json)
+    except ValueError:  # requests.JSONDecodeError
+        if entry is None:
+            raise
+        logger.warning(f"[CLOUD MIRROR] Invalid JSON for {key}, serving stored copy")
+        return entry['data']
+    if not served:
+        response.raise_for_status()
+        raise requests.exceptions.HTTPError(f"Unexpected status {response.status_code}", response=response)
+    return data
+
+
+async def afetch(url, *, params=None, headers=None, timeout=10, max_age=None):
+    """
+    Async fetch() for async views (pooled httpx client).
+
+    Raises:
+        httpx.HTTPError: Cloud failed and there is no stored copy
+            (HTTPStatusError for error statuses, DecodingError for a body
+            that is not JSON)
+    """
+    key = mirror_key(url, params)
+    entry, age = await asyncio.to_thread(load, key)
+    if entry is not None and age < _max_age(max_age):
+        return entry['data']
+
+    try:
+        response = await async_http.aget(
+            url, params=params, headers=_conditional_headers(entry, headers), timeout=timeout
+        )
+    except httpx.HTTPError as e:
+        if entry is None:
+            raise
+        logger.info(f"[CLOUD MIRROR] Cloud unavailable ({e}), serving stored {key}")
+        return entry['data']
+
+    try:
+        served, data = await asyncio.to_thread(
+            _apply, key, entry, response.status_code, response.headers, response.json
+        )
+    except ValueError as e:
+        if entry is None:
+            raise httpx.DecodingError(f"Invalid JSON for {key}", request=response.request) from e
+        logger.warning(f"[CLOUD MIRROR] Invalid JSON for {key}, serving stored copy")
+        return entry['data']
+    if not served:
+        response.raise_for_status()
+        raise httpx.HTTPStatusError(
+            f"Unexpected status {response.status_code}", request=response.request, response=response
+        )
+    return data
@@ -2,11 +2,16 @@
 Connectivity Checker Service.
 
 Checks if Cloud is reachable (online vs offline mode).
+
+Each check also feeds the Cloud host's circuit breaker (see cloud_http):
+a failed check counts towards opening it, a successful one closes it.
 """
 import logging
 import requests
 from django.core.cache import cache
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -59,24 +64,27 @@ class ConnectivityChecker:
         Returns:
             bool: True if Cloud is reachable, False otherwise
         """
+        # GET request to /health/ endpoint (Cloud's health check)
+        url = f"{self.cloud_url}/health/"
         try:
-            # GET request to /health/ endpoint (Cloud's health check)
-            url = f"{self.cloud_url}/health/"
-            response = requests.get(url, timeout=5)
+            # probe: goes through even while the breaker is open
+            response = cloud_http.get(url, timeout=5, probe=True)
 
             # Consider 2xx as "online"
             online = response.status_code == 200
 
             logger.info(f"Connectivity check: {'online' if online else 'offline'} (status: {response.status_code})")
-            return online
 
         except requests.exceptions.RequestException as e:
             logger.warning(f"Connectivity check failed: {e}")
-            return False
+            online = False
 
         except Exception as e:
             logger.error(f"Unexpected error during connectivity check: {e}")
-            return False
+            online = False
+
+        cloud_http.record_connectivity(url, online)
+        return online
 
     def force_check(self):
         """
@@ -14,6 +14,8 @@ from typing import List, Dict, Any, Optional, Callable, Union
 from django.http import HttpResponse
 from django.db.models import QuerySet
 
+from apps.core.db_router import using_replica
+
 
 def export_to_csv(
     data: Union[QuerySet, List[Dict]],
@@ -63,28 +65,30 @@ def export_to_csv(
     writer = csv.writer(response)
     writer.writerow(headers)
 
-    for item in data:
-        row = []
-        for field in fields:
-            # Get value from dict or object
-            if isinstance(item, dict):
-                value = item.get(field, '')
-            else:
-                value = getattr(item, field, '')
+    # Querysets are read from the replica when one is configured
+    with using_replica():
+        for item in data:
+            row = []
+            for field in fields:
+                # Get value from dict or object
+                if isinstance(item, dict):
+                    value = item.get(field, '')
+                else:
+                    value = getattr(item, field, '')
 
-            # Handle callable (e.g., methods)
-            if callable(value):
-                value = value()
+                # Handle callable (e.g., methods)
+                if callable(value):
+                    value = value()
 
-            # Apply custom formatter if exists
-            if field in field_formatters:
-                value = field_formatters[field](value)
-            else:
-                value = _format_value(value)
+                # Apply custom formatter if exists
+                if field in field_formatters:
+                    value = field_formatters[field](value)
+                else:
+                    value = _format_value(value)
 
-            row.append(value)
+                row.append(value)
 
-        writer.writerow(row)
+            writer.writerow(row)
 
     return response
 
@@ -152,27 +156,29 @@ def export_to_excel(
         cell.alignment = header_alignment
 
     # Write data
-    row_count = 0
-    for row_num, item in enumerate(data, 2):
-        row_count += 1
-        for col_num, field in enumerate(fields, 1):
-            # Get value from dict or object
-            if isinstance(item, dict):
-                value = item.get(field, '')
-            else:
-                value = getattr(item, field, '')
-
-            # Handle callable
-            if callable(value):
-                value = value()
-
-            # Apply custom formatter if exists
-            if field in field_formatters:
-                value = field_formatters[field](value)
-            else:
-                value = _format_value_for_excel(value)
-
-            sheet.cell(row=row_num, column=col_num, value=value)
+    # Querysets are read from the replica when one is configured
+    with using_replica():
+        row_count = 0
+        for row_num, item in enumerate(data, 2):
+            row_count += 1
+            for col_num, field in enumerate(fields, 1):
+                # Get value from dict or object
+                if isinstance(item, dict):
+                    value = item.get(field, '')
+                else:
+                    value = getattr(item, field, '')
+
+                # Handle callable
+                if callable(value):
+                    value = value()
+
+                # Apply custom formatter if exists
+                if field in field_formatters:
+                    value = field_formatters[field](value)
+                else:
+                    value = _format_value_for_excel(value)
+
+                sheet.cell(row=row_num, column=col_num, value=value)
 
     # Auto-adjust column widths
     from openpyxl.utils import get_column_letter
@@ -0,0 +1,285 @@
+"""
+Leader election for per-hub singleton background services.
+
+Every gunicorn worker (and every App Runner instance) runs AppConfig.ready(),
+so services started there (Cloud heartbeat/WebSocket, the backup scheduler)
+would run once per process. run_as_leader() starts a service only in the
+process holding its leadership:
+
+    from apps.core.services.leader_election import run_as_leader
+
+    run_as_leader('cloud_sync', start=start_websocket_client, stop=stop_websocket_client)
+
+Leadership is a PostgreSQL session advisory lock on a key derived from the
+hub id and the service name, held on a dedicated connection (outside
+Django's per-thread connections and the connection pool):
+
+- Each process runs a daemon thread that tries pg_try_advisory_lock every
+  LEADER_ELECTION_INTERVAL seconds until it wins, then calls start(). The
+  key is computed on every attempt, so a hub configured after startup
+  competes under its own id.
+- start() returning False (e.g. Cloud not configured yet) or raising
+  releases the lock; the service is tried again on the next attempt.
+- The leader renews its lease every interval with a query on the lock's
+  connection. The session has idle_session_timeout = LEADER_ELECTION_LEASE
+  and short TCP keepalives, so if the leader process dies, hangs or loses
+  the network, PostgreSQL ends the session and releases the lock within
+  the lease. A follower takes over on its next attempt.
+- A leader whose renewal fails (connection gone, lock lost) or whose hub
+  id changed calls stop() and goes back to competing.
+
+The lock must be taken on a direct PostgreSQL connection: transaction-mode
+poolers (PgBouncer) do not keep session advisory locks. Use
+LEADER_ELECTION_DATABASE to point at a direct alias if needed. On other
+databases (SQLite desktop installs, single process) the elector is leader
+at once.
+"""
+
+import hashlib
+import logging
+import threading
+
+from django.conf import settings
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_INTERVAL = 5  # seconds between lock attempts / lease renewals
+DEFAULT_LEASE = 15  # seconds without renewal before PostgreSQL drops the leader
+
+
+def lock_key(hub_id, name):
+    """Signed 64-bit advisory lock key for a service of a hub."""
+    digest = hashlib.blake2b(f'hub-leader:{hub_id}:{name}'.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'big', signed=True)
+
+
+def _current_hub_id():
+    try:
+        from apps.configuration.models import HubConfig
+        hub_id = HubConfig.get_solo().hub_id
+    except Exception:
+        hub_id = None
+    return str(hub_id) if hub_id else getattr(settings, 'HUB_ID', '') or 'unconfigured'
+
+
+class LeaderElector:
+    """
+    Runs start()/stop() as this process gains/loses leadership of `name`.
+
+    Args:
+        name: Service name (one leader per hub and name)
+        start: Called (in the elector thread) when elected; returning False
+            means the service did not start, and leadership is released
+        stop: Called when leadership is lost or the elector stops
+        hub_id: Hub the service belongs to (default: HubConfig.hub_id)
+        interval: Seconds between lock attempts and lease renewals
+        lease: Seconds after which a silent leader loses the lock
+        using: Database alias holding the lock
+    """
+
+    def __init__(self, name, start, stop=None, hub_id=None, interval=None, lease=None, using=None):
+        self.name = name
+        self._start = start
+        self._stop = stop
+        self.hub_id = hub_id
+        self.interval = interval or getattr(settings, 'LEADER_ELECTION_INTERVAL', DEFAULT_INTERVAL)
+        self.lease = lease or getattr(settings, 'LEADER_ELECTION_LEASE', DEFAULT_LEASE)
+        self.using = using or getattr(settings, 'LEADER_ELECTION_DATABASE', 'default')
+
+        self.is_leader = False
+        self._conn = None
+        self._key = None
+        self._wakeup = threading.Event()
+        self._stopping = False
+        self._thread = None
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Start competing for leadership in a daemon thread."""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stopping = False
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run, daemon=True, name=f'Leader-{self.name}')
+        self._thread.start()
+
+    def stop(self, timeout=10):
+        """Step down (calling stop()), release the lock and end the thread."""
+        self._stopping = True
+        self._wakeup.set()
+        if self._thread and self._thread is not threading.current_thread():
+            self._thread.join(timeout=timeout)
+
+    def _run(self):
+        try:
+            while not self._stopping:
+                self.step()
+                # Django connections opened in this thread (hub id, start/stop)
+                connections.close_all()
+                self._wakeup.wait(self.interval)
+        finally:
+            self._demote('elector stopped')
+            self._close()
+            connections.close_all()
+
+    def step(self):
+        """One election round: renew if leader, otherwise try to acquire."""
+        try:
+            if self.is_leader:
+                if not self._renew():
+                    self._demote('lease lost')
+                elif self._conn is not None and self._lock_key() != self._key:
+                    self._demote('hub id changed')
+            elif self._acquire():
+                self._promote()
+        except Exception as e:
+            logger.warning(f"[LEADER] {self.name}: election error: {e}")
+            if self.is_leader:
+                self._demote('election error')
+            self._close()
+
+    # -------------------------------------------------------------------------
+    # Lock
+    # -------------------------------------------------------------------------
+
+    def _connect(self):
+        wrapper = connections[self.using]
+        if wrapper.vendor != 'postgresql':
+            return None
+        conn = wrapper.Database.connect(**wrapper.get_connection_params())
+        conn.autocommit = True
+        lease_ms = int(self.lease * 1000)
+        with conn.cursor() as cursor:
+            # Server-side lease: a leader that stops renewing (dead, hung,
+            # partitioned) gets its session, and the lock, dropped
+            try:
+                cursor.execute(f"SET idle_session_timeout = {lease_ms}")
+            except Exception:
+                # PostgreSQL < 14: only the keepalives below detect dead leaders
+                logger.debug("[LEADER] idle_session_timeout not supported")
+            cursor.execute("SET tcp_keepalives_idle = 5")
+            cursor.execute("SET tcp_keepalives_interval = 2")
+            cursor.execute("SET tcp_keepalives_count = 3")
+        return conn
+
+    def _lock_key(self):
+        return lock_key(self.hub_id or _current_hub_id(), self.name)
+
+    def _acquire(self):
+        if connections[self.using].vendor != 'postgresql':
+            return True
+        if self._conn is None:
+            self._conn = self._connect()
+        # Computed per attempt: the hub may have been configured since
+        key = self._lock_key()
+        with self._conn.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_lock(%s)", [key])
+            acquired = bool(cursor.fetchone()[0])
+        if acquired:
+            self._key = key
+        return acquired
+
+    def _renew(self):
+        """True if this session still holds the lock (the query resets the idle lease)."""
+        if self._conn is None:
+            return connections[self.using].vendor != 'postgresql'
+        with self._conn.cursor() as cursor:
+            cursor.execute(
+                "SELECT EXISTS (SELECT 1 FROM pg_locks WHERE locktype = 'advisory' "
+                "AND pid = pg_backend_pid() AND granted AND objsubid = 1 "
+                "AND ((classid::bigint << 32) | objid::bigint) = %s)",
+                [self._key],
+            )
+            return bool(cursor.fetchone()[0])
+
+    def _close(self):
+        """Close the lock connection (releases the lock if held)."""
+        conn, self._conn = self._conn, None
+        if conn is not None:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    # -------------------------------------------------------------------------
+    # Transitions
+    # -------------------------------------------------------------------------
+
+    def _promote(self):
+        self.is_leader = True
+        try:
+            started = self._start()
+        except Exception as e:
+            logger.error(f"[LEADER] {self.name}: start failed, stepping down: {e}")
+            self._demote('start failed')
+            self._close()
+            return
+        if started is False:
+            # Nothing to stop; let another round (or process) try again
+            logger.debug(f"[LEADER] {self.name}: service not started, releasing leadership")
+            self.is_leader = False
+            self._unlock()
+            return
+        logger.info(f"[LEADER] {self.name}: elected (hub {self.hub_id or _current_hub_id()})")
+
+    def _demote(self, reason):
+        if not self.is_leader:
+            return
+        self.is_leader = False
+        logger.info(f"[LEADER] {self.name}: stepping down ({reason})")
+        if self._stop:
+            try:
+                self._stop()
+            except Exception as e:
+                logger.error(f"[LEADER] {self.name}: stop failed: {e}")
+        self._unlock()
+
+    def _unlock(self):
+        if self._conn is not None:
+            try:
+                with self._conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", [self._key])
+            except Exception:
+                self._close()
+
+
+# =============================================================================
+# Registry
+# =============================================================================
+
+_electors = {}
+_electors_lock = threading.Lock()
+
+
+def run_as_leader(name, start, stop=None, **kwargs):
+    """
+    Run a singleton service under leader election (idempotent per name).
+
+    Returns:
+        LeaderElector: The (started) elector for `name`
+    """
+    with _electors_lock:
+        elector = _electors.get(name)
+        if elector is None:
+            elector = LeaderElector(name, start, stop, **kwargs)
+            _electors[name] = elector
+    elector.start()
+    return elector
+
+
+def stop_leader(name):
+    """Stop the elector for `name` (steps down if leader)."""
+    with _electors_lock:
+        elector = _electors.pop(name, None)
+    if elector:
+        elector.stop()
+
+
+def get_leadership_status():
+    """{name: is_leader} for the electors of this process."""
+    with _electors_lock:
+        return {name: elector.is_leader for name, elector in _electors.items()}
@@ -19,6 +19,8 @@ from pathlib import Path
 import requests as http_requests
 from django.conf import settings
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -45,6 +47,7 @@ class ModuleInstallService:
     - ZIP extraction with single-root-folder detection
     - MODULE_ID discovery from module.py
     - Copy to MODULES_DIR with already-installed check
+    - Static pipeline (fingerprint, precompress, manifest merge)
     """
 
     @classmethod
@@ -109,7 +112,7 @@ class ModuleInstallService:
 
         # Download
         try:
-            resp = http_requests.get(
+            resp = cloud_http.get(
                 download_url, headers=headers, timeout=120, stream=True
             )
             if resp.status_code != 200:
@@ -181,6 +184,9 @@ class ModuleInstallService:
                 # Copy to modules directory
                 shutil.copytree(extracted_root, target)
                 logger.info("[INSTALL] Installed module %s to %s", module_id, target)
+
+                # Hash, precompress and publish the module's static files
+                cls.collect_static(module_id)
                 return InstallResult(
                     success=True, module_id=module_id, message=f"{module_id} installed"
                 )
@@ -294,7 +300,7 @@ class ModuleInstallService:
                 dep_ids = dep_cache[slug]
             else:
                 try:
-                    resp = http_requests.get(
+                    resp = cloud_http.get(
                         f"{cloud_url}/api/marketplace/modules/?slug={slug}",
                         headers=headers, timeout=15,
                     )
@@ -375,7 +381,7 @@ class ModuleInstallService:
             try:
                 solution_url = f"{cloud_url}/api/marketplace/solutions/{slug}/"
                 logger.info("[INSTALL] Fetching solution: %s", solution_url)
-                resp = http_requests.get(solution_url, timeout=15)
+                resp = cloud_http.get(solution_url, timeout=15)
 
                 if resp.status_code != 200:
                     msg = f"Solution {slug}: HTTP {resp.status_code}"
@@ -516,6 +522,21 @@ class ModuleInstallService:
                 from apps.core.utils import schedule_server_restart
                 schedule_server_restart()
 
+    @classmethod
+    def collect_static(cls, module_id):
+        """Run the static asset pipeline for an installed module (best-effort).
+
+        A failure here never fails the install: WhiteNoise/finders still
+        serve the unhashed files, just without far-future caching.
+        """
+        try:
+            from .module_static_service import ModuleStaticService
+            result = ModuleStaticService.collect_module(module_id)
+            for error in result.errors:
+                logger.warning("[INSTALL] Static pipeline %s: %s", module_id, error)
+        except Exception as e:
+            logger.warning("[INSTALL] Static pipeline failed for %s: %s", module_id, e)
+
     @classmethod
     def get_installed_version(cls, module_id):
         """Read MODULE_VERSION from an installed module's module.py.
@@ -574,7 +595,7 @@ class ModuleInstallService:
         for module_id in module_ids:
             version = cls.get_installed_version(module_id)
             try:
-                http_requests.post(
+                cloud_http.post(
                     f'{cloud_url}/api/marketplace/hub-modules/',
                     json={'module_slug': module_id, 'version': version},
                     headers={
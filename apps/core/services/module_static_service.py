@@ -0,0 +1,278 @@
+"""
+Module Static Pipeline for ERPlora Hub.
+
+Modules installed at runtime live outside the image-build collectstatic run,
+so their static files never get hashed names, precompressed variants or
+far-future caching. This service runs the same pipeline per module at
+install time:
+
+1. Copy MODULES_DIR/<id>/static/** into STATIC_ROOT
+2. Hash-fingerprint (and rewrite CSS references) via the configured
+   manifest storage
+3. Precompress (gzip/brotli) when the storage supports it
+   (whitenoise.storage.CompressedManifestStaticFilesStorage)
+4. Merge the new entries into staticfiles.json (written atomically, so a
+   worker never reads a half-written manifest) and refresh the in-process
+   manifest and WhiteNoise file index
+
+Other worker processes notice the new manifest by its mtime: the static
+files middleware calls reload_if_changed() on each request (at most one
+stat() every MANIFEST_CHECK_INTERVAL seconds).
+
+Only runs when STORAGES['staticfiles'] is a manifest storage (web
+deployment). In local development modules are served by the staticfiles
+finders and this is a no-op.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+# Serializes manifest read-merge-write across concurrent installs
+# (bulk_download_and_install runs in a thread pool).
+_pipeline_lock = threading.Lock()
+
+MANIFEST_CHECK_INTERVAL = 2  # seconds between manifest mtime checks
+
+_manifest_state = {'mtime': None, 'checked_at': 0.0}
+_manifest_state_lock = threading.Lock()
+
+
+@dataclass
+class StaticPipelineResult:
+    module_id: str
+    collected: int = 0
+    hashed: int = 0
+    errors: list = field(default_factory=list)
+    skipped: bool = False
+
+
+class ModuleStaticService:
+    """
+    Per-module collectstatic + manifest merge.
+
+    Usage:
+        ModuleStaticService.collect_module('sales')
+        ModuleStaticService.collect_all()
+    """
+
+    @classmethod
+    def is_enabled(cls):
+        """True when the configured static storage hashes files into a manifest."""
+        from django.contrib.staticfiles.storage import ManifestFilesMixin, staticfiles_storage
+        return isinstance(staticfiles_storage, ManifestFilesMixin)
+
+    @classmethod
+    def collect_module(cls, module_id, refresh=True):
+        """Run the static pipeline for a single installed module.
+
+        Args:
+            module_id: Active module directory name under MODULES_DIR
+            refresh: Refresh in-process manifest and WhiteNoise index afterwards
+
+        Returns:
+            StaticPipelineResult
+        """
+        result = StaticPipelineResult(module_id=module_id)
+        source_dir = Path(settings.MODULES_DIR) / module_id / 'static'
+
+        if not source_dir.is_dir() or not cls.is_enabled():
+            result.skipped = True
+            return result
+
+        paths = cls._discover_files(source_dir)
+        if not paths:
+            result.skipped = True
+            return result
+
+        with _pipeline_lock:
+            storage = cls._create_storage()
+            previous, _ = storage.load_manifest()
+
+            # Copy originals first: hashing CSS references reads them back
+            # from STATIC_ROOT.
+            for rel, (source_storage, path) in paths.items():
+                try:
+                    if storage.exists(rel):
+                        storage.delete(rel)
+                    with source_storage.open(path) as f:
+                        storage.save(rel, f)
+                    result.collected += 1
+                except Exception as e:
+                    result.errors.append(f'{rel}: {e}')
+
+            try:
+                for name, hashed_name, processed in storage.post_process(paths):
+                    if isinstance(processed, Exception):
+                        result.errors.append(f'{name}: {processed}')
+                    elif hashed_name and hashed_name != name:
+                        result.hashed += 1
+            except Exception as e:
+                logger.warning("[STATIC] post_process failed for %s: %s", module_id, e)
+                result.errors.append(str(e))
+
+            # ManifestFilesMixin.post_process() resets hashed_files to only
+            # this module's entries (its own save is suppressed, see
+            # _create_storage); merge them back over the previous manifest
+            # so core and other modules keep their hashed names.
+            merged = {**previous, **storage.hashed_files}
+            cls._write_manifest(storage, merged)
+
+        logger.info(
+            "[STATIC] %s: %d collected, %d hashed, %d errors",
+            module_id, result.collected, result.hashed, len(result.errors),
+        )
+
+        if refresh:
+            cls.refresh(merged, storage.manifest_hash)
+
+        return result
+
+    @classmethod
+    def collect_all(cls):
+        """Run the pipeline for every active module. Returns list of results."""
+        modules_dir = Path(settings.MODULES_DIR)
+        results = []
+        if not modules_dir.exists() or not cls.is_enabled():
+            return results
+
+        for module_dir in sorted(modules_dir.iterdir()):
+            if not module_dir.is_dir() or module_dir.name.startswith(('.', '_')):
+                continue
+            results.append(cls.collect_module(module_dir.name, refresh=False))
+
+        cls.refresh()
+        return results
+
+    @classmethod
+    def refresh(cls, hashed_files=None, manifest_hash=None):
+        """Make newly collected files visible to this process.
+
+        Swaps the manifest into the shared staticfiles_storage (so
+        {% static %} returns hashed names) and rescans STATIC_ROOT in any
+        live WhiteNoise middleware (so files are served with immutable
+        cache headers and precompressed variants).
+        """
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        with _manifest_state_lock:
+            _manifest_state['mtime'] = cls._manifest_mtime()
+        try:
+            if hashed_files is None:
+                hashed_files, manifest_hash = staticfiles_storage.load_manifest()
+            staticfiles_storage.hashed_files = hashed_files
+            staticfiles_storage.manifest_hash = manifest_hash
+        except Exception as e:
+            logger.warning("[STATIC] Could not reload manifest: %s", e)
+
+        from apps.core.middleware.static_files import refresh_static_files
+        refresh_static_files()
+
+    @classmethod
+    def reload_if_changed(cls):
+        """Refresh when another process rewrote the manifest.
+
+        Returns:
+            bool: True if the manifest changed and was reloaded
+        """
+        if not cls.manifest_changed():
+            return False
+        logger.info("[STATIC] Manifest changed on disk, reloading")
+        cls.refresh()
+        return True
+
+    @classmethod
+    def manifest_changed(cls):
+        """True once per manifest rewrite by another process.
+
+        Cheap enough for every request: at most one stat() every
+        MANIFEST_CHECK_INTERVAL seconds. The first check only records the
+        current mtime (the manifest loaded at startup is current).
+        """
+        now = time.monotonic()
+        if now - _manifest_state['checked_at'] < MANIFEST_CHECK_INTERVAL:
+            return False
+        with _manifest_state_lock:
+            if now - _manifest_state['checked_at'] < MANIFEST_CHECK_INTERVAL:
+                return False
+            _manifest_state['checked_at'] = now
+            if not cls.is_enabled():
+                return False
+            mtime = cls._manifest_mtime()
+            known, _manifest_state['mtime'] = _manifest_state['mtime'], mtime
+            return known is not None and mtime != known
+
+    @staticmethod
+    def _manifest_path(storage=None):
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        storage = storage or staticfiles_storage
+        return storage.manifest_storage.path(storage.manifest_name)
+
+    @classmethod
+    def _manifest_mtime(cls):
+        try:
+            return os.stat(cls._manifest_path()).st_mtime_ns
+        except (OSError, NotImplementedError, AttributeError):
+            return None
+
+    @classmethod
+    def _write_manifest(cls, storage, hashed_files):
+        """Write staticfiles.json like ManifestFilesMixin.save_manifest(), atomically."""
+        from django.core.files.base import ContentFile
+
+        sorted_hashed_files = sorted(hashed_files.items())
+        storage.hashed_files = dict(sorted_hashed_files)
+        storage.manifest_hash = storage.file_hash(
+            None, ContentFile(json.dumps(sorted_hashed_files).encode())
+        )
+        payload = {
+            'paths': storage.hashed_files,
+            'version': storage.manifest_version,
+            'hash': storage.manifest_hash,
+        }
+        path = cls._manifest_path(storage)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.staticfiles-')
+        try:
+            with os.fdopen(fd, 'w') as f:
+                json.dump(payload, f)
+            os.chmod(tmp_path, 0o644)
+            os.replace(tmp_path, path)
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+
+    @staticmethod
+    def _discover_files(source_dir):
+        """Map relative static names to (source_storage, path) like collectstatic."""
+        from django.core.files.storage import FileSystemStorage
+
+        source_storage = FileSystemStorage(location=str(source_dir))
+        paths = {}
+        for path in sorted(source_dir.rglob('*')):
+            if not path.is_file():
+                continue
+            rel = path.relative_to(source_dir)
+            if any(part.startswith('.') for part in rel.parts):
+                continue
+            paths[rel.as_posix()] = (source_storage, rel.as_posix())
+        return paths
+
+    @staticmethod
+    def _create_storage():
+        """Fresh storage instance so post_process doesn't clear the live manifest."""
+        from django.core.files.storage import storages
+        storage = storages.create_storage(settings.STORAGES['staticfiles'])
+        # post_process() would save a manifest holding only this module's
+        # entries; collect_module() writes the merged one instead.
+        storage.save_manifest = lambda: None
+        return storage
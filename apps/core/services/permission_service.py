@@ -411,7 +411,7 @@ class PermissionService:
         )
 
         # Process each role permission
-        for rp in role.role_permissions.filter(is_deleted=False):
+        for rp in role.role_permissions.filter(is_deleted=False).select_related('permission'):
             if rp.permission:
                 # Direct permission
                 permissions.add(rp.permission.codename)
@@ -9,6 +9,8 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from django.conf import settings
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -103,7 +105,7 @@ class PublicKeyFetcher:
         url = f"{self.cloud_url}/api/auth/public-key/"
 
         try:
-            response = requests.get(url, timeout=10)
+            response = cloud_http.get(url, timeout=10)
             response.raise_for_status()
 
             public_key = response.text
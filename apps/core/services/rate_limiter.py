@@ -0,0 +1,264 @@
+"""
+Sliding-window rate limiter.
+
+Shared by the login endpoints (PIN, Cloud login), the trusted-device
+endpoints and the employee list. State lives in the 'ratelimit' cache
+alias, a PostgresCache on every deployment (settings.RATE_LIMIT_CACHE),
+so limits hold across processes and web instances.
+
+Each identity (user id, client IP, ...) gets one counter per window-sized
+bucket. The count over the last `window` seconds is estimated from the
+current and previous bucket, weighting the previous one by how much of it
+still overlaps the window (rounded up, so an attempt is never allowed
+while the full previous count could still be inside the window). Counters
+are bumped with cache.incr, an UPDATE ... RETURNING on PostgresCache, so
+concurrent attempts are never lost the way a get + set pair loses them
+(as the default FileBasedCache of desktop/local deployments would).
+
+    from apps.core.services.rate_limiter import PIN_LOGIN
+
+    decision = PIN_LOGIN.check(user_id)       # one cache round trip
+    if not decision.allowed:
+        ...                                   # decision.retry_after seconds
+    if pin_is_wrong:
+        PIN_LOGIN.hit(user_id, decision)      # one atomic incr
+    else:
+        PIN_LOGIN.reset(user_id)
+
+    # Plain throttling: check and count the request in one call
+    decision = EMPLOYEE_LIST.consume(client_ip(request))
+
+Policies with a lockout lock the identity out for `lockout` seconds once
+the limit is reached; every further lockout within `max_lockout` multiplies
+the duration by `backoff`.
+"""
+
+import hashlib
+import math
+import time
+from dataclasses import dataclass, field
+
+from django.conf import settings
+from django.core.cache import caches
+
+KEY_PREFIX = 'rl:'
+
+
+@dataclass(frozen=True)
+class RateLimit:
+    """A rate limit policy."""
+    name: str
+    limit: int                 # attempts allowed per window
+    window: int                # seconds
+    lockout: int = 0           # seconds locked out once the limit is hit (0 = none)
+    backoff: float = 2.0       # lockout multiplier for repeated lockouts
+    max_lockout: int = 86400   # cap for the lockout, also how long strikes are remembered
+
+
+@dataclass(frozen=True)
+class Decision:
+    """Outcome of a rate limit check."""
+    allowed: bool
+    count: float               # estimated attempts in the sliding window
+    remaining: int
+    retry_after: int = 0       # seconds until the next attempt is allowed
+    locked: bool = False       # denied by a lockout (not just the window)
+    bucket: int = field(default=0, repr=False)
+    previous: int = field(default=0, repr=False)  # previous bucket's counter
+
+
+class RateLimiter:
+    """Applies a RateLimit policy to identities, using a cache alias."""
+
+    def __init__(self, policy, cache_alias='ratelimit'):
+        self.policy = policy
+        self.cache_alias = cache_alias
+
+    @property
+    def cache(self):
+        return caches[self.cache_alias]
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def _base_key(self, identity):
+        digest = hashlib.sha256(str(identity).encode()).hexdigest()[:24]
+        return f'{KEY_PREFIX}{self.policy.name}:{digest}'
+
+    def _bucket_key(self, identity, bucket):
+        return f'{self._base_key(identity)}:{bucket}'
+
+    def _lock_key(self, identity):
+        return f'{self._base_key(identity)}:lock'
+
+    def _strikes_key(self, identity):
+        return f'{self._base_key(identity)}:strikes'
+
+    # ------------------------------------------------------------------
+    # Sliding window
+    # ------------------------------------------------------------------
+
+    def _retry_after(self, previous, current, now):
+        """Seconds until the estimated count drops below the limit."""
+        window, limit = self.policy.window, self.policy.limit
+        elapsed = now % window
+        if current < limit:
+            # Decay of the previous bucket within the current one
+            if not previous:
+                return 0
+            at = window * (1 - (limit - 1 - current) / previous)
+            return max(1, math.ceil(at - elapsed))
+        # The current bucket alone is over the limit: wait for it to become
+        # the previous bucket and decay enough.
+        at = window * (1 - (limit - 1) / current)
+        return max(1, math.ceil(window - elapsed + at))
+
+    def _estimate(self, previous, current, now):
+        window = self.policy.window
+        return math.ceil(previous * (1 - (now % window) / window)) + current
+
+    def _decide(self, values, identity, bucket, now):
+        limit = self.policy.limit
+        locked_until = values.get(self._lock_key(identity))
+        current = values.get(self._bucket_key(identity, bucket), 0)
+        previous = values.get(self._bucket_key(identity, bucket - 1), 0)
+        count = self._estimate(previous, current, now)
+
+        if locked_until and locked_until > now:
+            return Decision(
+                allowed=False, count=count, remaining=0,
+                retry_after=max(1, math.ceil(locked_until - now)), locked=True,
+                bucket=bucket, previous=previous,
+            )
+        if count >= limit:
+            return Decision(
+                allowed=False, count=count, remaining=0,
+                retry_after=self._retry_after(previous, current, now),
+                bucket=bucket, previous=previous,
+            )
+        return Decision(
+            allowed=True, count=count, remaining=max(0, math.floor(limit - count)),
+            bucket=bucket, previous=previous,
+        )
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def check(self, identity):
+        """Decide whether identity may make another attempt (one round trip)."""
+        now = time.time()
+        bucket = int(now // self.policy.window)
+        keys = [
+            self._bucket_key(identity, bucket),
+            self._bucket_key(identity, bucket - 1),
+            self._lock_key(identity),
+        ]
+        return self._decide(self.cache.get_many(keys), identity, bucket, now)
+
+    def hit(self, identity, decision=None):
+        """
+        Record an attempt (e.g. a failed PIN) and return the decision for the
+        next one. Pass the decision from check() to skip re-reading the window.
+        """
+        now = time.time()
+        if decision is None or decision.bucket != int(now // self.policy.window):
+            decision = self.check(identity)
+
+        current = self._incr(self._bucket_key(identity, decision.bucket), 2 * self.policy.window)
+        count = self._estimate(decision.previous, current, now)
+        if count < self.policy.limit:
+            return Decision(
+                allowed=True, count=count,
+                remaining=max(0, math.floor(self.policy.limit - count)),
+                bucket=decision.bucket, previous=decision.previous,
+            )
+
+        if self.policy.lockout:
+            return self._lock(identity, count, decision, now)
+        return Decision(
+            allowed=False, count=count, remaining=0,
+            retry_after=self._retry_after(decision.previous, current, now),
+            bucket=decision.bucket, previous=decision.previous,
+        )
+
+    def consume(self, identity):
+        """check() and, if allowed, count this attempt."""
+        decision = self.check(identity)
+        if not decision.allowed:
+            return decision
+        after = self.hit(identity, decision)
+        # This request was within the limit even if the next one is not
+        return Decision(
+            allowed=True, count=after.count, remaining=after.remaining,
+            bucket=after.bucket, previous=after.previous,
+        )
+
+    def reset(self, identity):
+        """Forget all attempts and lockouts for identity (e.g. after a success)."""
+        bucket = int(time.time() // self.policy.window)
+        self.cache.delete_many([
+            self._bucket_key(identity, bucket),
+            self._bucket_key(identity, bucket - 1),
+            self._lock_key(identity),
+            self._strikes_key(identity),
+        ])
+
+    # ------------------------------------------------------------------
+    # Internals
+    # ------------------------------------------------------------------
+
+    def _incr(self, key, timeout):
+        """Atomic increment, creating the counter on first use."""
+        cache = self.cache
+        try:
+            return cache.incr(key)
+        except ValueError:
+            if cache.add(key, 1, timeout=timeout):
+                return 1
+            return cache.incr(key)  # created concurrently
+
+    def _lock(self, identity, count, decision, now):
+        policy = self.policy
+        strikes = self._incr(self._strikes_key(identity), policy.max_lockout)
+        duration = min(policy.max_lockout, math.ceil(policy.lockout * policy.backoff ** (strikes - 1)))
+        self.cache.set(self._lock_key(identity), now + duration, timeout=duration)
+        return Decision(
+            allowed=False, count=count, remaining=0, retry_after=duration, locked=True,
+            bucket=decision.bucket, previous=decision.previous,
+        )
+
+
+def client_ip(request):
+    """
+    Client IP as seen by the first trusted proxy.
+
+    Each proxy appends the address it received the request from to
+    X-Forwarded-For, so with TRUSTED_PROXY_COUNT proxies in front of the
+    Hub (App Runner: 1) the client is that many entries from the right.
+    Anything further left was sent by the client and is ignored.
+    """
+    hops = getattr(settings, 'TRUSTED_PROXY_COUNT', 0)
+    if hops > 0:
+        forwarded = [ip.strip() for ip in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+        if len(forwarded) >= hops and forwarded[-hops]:
+            return forwarded[-hops]
+    return request.META.get('REMOTE_ADDR', '')
+
+
+def login_identity(email):
+    """CLOUD_LOGIN identity: the normalized email, whatever IP it comes from."""
+    return email.strip().lower()
+
+
+# Max 3 failed PIN attempts per user per 24 hours
+PIN_LOGIN = RateLimiter(RateLimit('pin', limit=3, window=86400))
+
+# Cloud credentials: 5 failures per 15 min per email, then a lockout
+# that doubles on every repeat (15 min, 30 min, 1 h ... up to 24 h)
+CLOUD_LOGIN = RateLimiter(RateLimit('cloud_login', limit=5, window=900, lockout=900))
+
+# Trusted-device endpoints (each call goes to Cloud) and the employee list
+TRUSTED_DEVICE = RateLimiter(RateLimit('device', limit=20, window=60))
+EMPLOYEE_LIST = RateLimiter(RateLimit('employees', limit=30, window=60))
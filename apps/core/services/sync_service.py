@@ -2,75 +2,221 @@
 Servicio de sincronización para operaciones offline.
 
 Procesa la cola de sincronización y envía operaciones pendientes al Cloud.
+
+Cada ejecución reclama un lote con SyncQueue.claim_batch() (SELECT ... FOR
+UPDATE SKIP LOCKED, así varios workers nunca toman las mismas filas; en
+orden de cola y una sola operación por entidad a la vez), lo
+envía en una sola petición al endpoint batch del Cloud a través del
+cliente HTTP compartido (cloud_http: keep-alive y circuit breaker) y
+actualiza los estados en bloque (un UPDATE para las completadas, un
+bulk_update para las fallidas). Si el Cloud no tiene endpoint batch
+(404/405/501), las operaciones se envían una a una.
+
+Los cuerpos grandes se envían comprimidos (zstd o gzip, ver
+apps/sync/services/compression.py) y cada petición registra los bytes
+enviados y recibidos en wire_stats.
+
+Antes de cada lote, compact_queue() fusiona las operaciones pendientes
+sobre una misma entidad (ver apps/sync/services/compaction.py).
+
+Tras un periodo offline, drain_queue() vacía la cola lote a lote.
 """
-import requests
 import logging
+
+import requests
 from django.conf import settings
+from django.utils import timezone
+
+from apps.core.services import cloud_http
 from apps.sync.models import SyncQueue
+from apps.sync.services.compaction import compact_queue
+from apps.sync.services.compression import (
+    ACCEPT_ENCODING, UNSUPPORTED_MEDIA_TYPE, encode_json, received_bytes, wire_stats,
+)
 from apps.configuration.models import HubConfig
 
 logger = logging.getLogger(__name__)
 
+BATCH_ENDPOINT = '/api/hubs/me/sync/batch/'
+
+# Respuestas del endpoint batch que indican que el Cloud no lo soporta
+BATCH_UNSUPPORTED = (404, 405, 501)
+
+SUPPORTED_METHODS = ('POST', 'DELETE', 'PUT', 'PATCH')
+
+FAILURE_FIELDS = ['status', 'retry_count', 'last_error', 'next_retry_at']
+
 
 class SyncService:
     """
     Servicio que procesa la cola de sincronización.
 
     Se ejecuta periódicamente para enviar operaciones pendientes al Cloud.
+    Seguro con varios workers en paralelo (ver SyncQueue.claim_batch).
     """
 
     def __init__(self):
         self.cloud_api_url = settings.CLOUD_API_URL
         self.hub_config = HubConfig.get_config()
+        self.batch_supported = True
+        # False cuando el Cloud rechaza cuerpos comprimidos (415)
+        self.compression_supported = True
 
-    def process_queue(self, batch_size=10):
+    def process_queue(self, batch_size=None):
         """
-        Procesar cola de sincronización.
+        Procesar un lote de la cola de sincronización.
 
         Args:
-            batch_size: Número máximo de operaciones a procesar por ejecución
+            batch_size: Número máximo de operaciones del lote
+                (por defecto settings.SYNC_BATCH_SIZE)
 
         Returns:
             dict: Estadísticas de procesamiento
         """
+        stats = {'processed': 0, 'completed': 0, 'failed': 0}
+
         if not self.hub_config.is_configured:
             logger.warning("Hub not configured, skipping sync")
-            return {'processed': 0, 'completed': 0, 'failed': 0}
+            return stats
 
-        # Obtener operaciones pendientes
-        pending_ops = SyncQueue.get_pending_operations(limit=batch_size)
+        # Fusionar/descartar operaciones redundantes antes de subirlas
+        compact_queue()
 
-        stats = {
-            'processed': 0,
-            'completed': 0,
-            'failed': 0,
-        }
+        operations = SyncQueue.claim_batch(limit=batch_size or settings.SYNC_BATCH_SIZE)
+        if not operations:
+            return stats
 
-        for operation in pending_ops:
-            stats['processed'] += 1
+        try:
+            results = self._send_batch(operations)
+        except Exception as e:
+            error_msg = f"Error executing operation: {str(e)}"
+            logger.error(f"Sync error: {error_msg}")
+            results = {op.id: (False, error_msg) for op in operations}
+
+        now = timezone.now()
+        completed, failed = [], []
+        for operation in operations:
+            success, error = results.get(operation.id, (False, "No result from Cloud"))
+            if success:
+                completed.append(operation.id)
+            else:
+                # Backoff differs per row (retry count, jitter)
+                operation.record_failure(error, now)
+                failed.append(operation)
+                logger.debug(f"Sync failed: {operation.operation_type} - {operation.endpoint}: {error}")
+
+        if completed:
+            SyncQueue.objects.filter(id__in=completed).update(
+                status='completed', completed_at=now, updated_at=now,
+            )
+        if failed:
+            SyncQueue.objects.bulk_update(failed, FAILURE_FIELDS)
+
+        stats = {'processed': len(operations), 'completed': len(completed), 'failed': len(failed)}
+        logger.info(f"Sync batch processed: {stats}")
+        return stats
 
-            try:
-                success = self._execute_operation(operation)
+    def drain_queue(self, batch_size=None, max_batches=100):
+        """
+        Procesar lotes hasta vaciar la cola (o max_batches).
 
-                if success:
-                    operation.mark_completed()
-                    stats['completed'] += 1
-                    logger.info(f"Sync completed: {operation.operation_type} - {operation.endpoint}")
-                else:
-                    operation.mark_failed("Operation failed")
-                    stats['failed'] += 1
-                    logger.warning(f"Sync failed: {operation.operation_type} - {operation.endpoint}")
+        Se detiene también cuando un lote entero falla (sin conexión): el
+        resto espera a su next_retry_at.
 
-            except Exception as e:
-                error_msg = f"Error executing operation: {str(e)}"
-                operation.mark_failed(error_msg)
-                stats['failed'] += 1
-                logger.error(f"Sync error: {operation.operation_type} - {error_msg}")
+        Returns:
+            dict: Estadísticas acumuladas
+        """
+        totals = {'processed': 0, 'completed': 0, 'failed': 0}
+        for _ in range(max_batches):
+            stats = self.process_queue(batch_size)
+            for key in totals:
+                totals[key] += stats[key]
+            if not stats['processed'] or not stats['completed']:
+                break
+        return totals
+
+    def _headers(self, extra=None):
+        return {
+            'Content-Type': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING,
+            'X-Hub-Token': self.hub_config.cloud_api_token,
+            **(extra or {}),
+        }
 
-        if stats['processed'] > 0:
-            logger.info(f"Sync batch processed: {stats}")
+    def _send_json(self, method, url, data, headers=None, timeout=10):
+        """
+        Enviar data como JSON (comprimido si es grande) por el cliente compartido.
 
-        return stats
+        Si el Cloud responde 415 al cuerpo comprimido, reintenta sin
+        comprimir y deja de comprimir en adelante.
+        """
+        body, body_headers, raw_size = encode_json(data, compressed=self.compression_supported)
+        response = cloud_http.request(
+            method, url, data=body, headers={**self._headers(headers), **body_headers}, timeout=timeout,
+        )
+        wire_stats.record('sync', raw_size, len(body), received_bytes(response))
+        if response.status_code == UNSUPPORTED_MEDIA_TYPE and 'Content-Encoding' in body_headers:
+            logger.info("Cloud rejected compressed sync body, sending uncompressed")
+            self.compression_supported = False
+            return self._send_json(method, url, data, headers, timeout)
+        return response
+
+    def _send_batch(self, operations):
+        """
+        Enviar un lote de operaciones.
+
+        Returns:
+            dict: {operation.id: (success, error_message)}
+        """
+        if self.batch_supported:
+            try:
+                response = self._send_json(
+                    'POST', f"{self.cloud_api_url}{BATCH_ENDPOINT}",
+                    {'operations': [
+                        {
+                            'id': str(op.id),
+                            'operation_type': op.operation_type,
+                            'endpoint': op.endpoint,
+                            'method': op.method,
+                            'payload': op.payload,
+                            'headers': op.headers,
+                        }
+                        for op in operations
+                    ]},
+                    timeout=30,
+                )
+            except requests.exceptions.ConnectionError:
+                logger.debug("No internet connection, will retry later")
+                return {op.id: (False, "No internet connection") for op in operations}
+            except requests.exceptions.Timeout:
+                logger.warning("Request timeout, will retry later")
+                return {op.id: (False, "Request timeout") for op in operations}
+
+            if response.status_code in BATCH_UNSUPPORTED:
+                logger.info("Cloud has no sync batch endpoint, sending operations one by one")
+                self.batch_supported = False
+            elif response.status_code in [200, 201, 207]:
+                by_id = {str(op.id): op.id for op in operations}
+                results = {}
+                for result in response.json().get('results', []):
+                    pk = by_id.get(str(result.get('id')))
+                    if pk is not None:
+                        ok = result.get('status') in [200, 201, 204]
+                        results[pk] = (ok, '' if ok else str(result.get('error') or result.get('status')))
+                return results
+            else:
+                error = f"Batch failed: {response.status_code}"
+                logger.warning(f"Sync batch failed: {response.status_code} - {response.text[:200]}")
+                return {op.id: (False, error) for op in operations}
+
+        results = {}
+        for operation in operations:
+            try:
+                ok = self._execute_operation(operation)
+                results[operation.id] = (ok, '' if ok else "Operation failed")
+            except Exception as e:
+                results[operation.id] = (False, f"Error executing operation: {str(e)}")
+        return results
 
     def _execute_operation(self, operation):
         """
@@ -82,29 +228,15 @@ class SyncService:
         Returns:
             bool: True si la operación fue exitosa
         """
+        if operation.method not in SUPPORTED_METHODS:
+            logger.error(f"Unsupported HTTP method: {operation.method}")
+            return False
+
         # Construir URL completa
         url = f"{self.cloud_api_url}{operation.endpoint}"
 
-        # Preparar headers
-        headers = {
-            'Content-Type': 'application/json',
-            'X-Hub-Token': self.hub_config.cloud_api_token,
-            **operation.headers
-        }
-
         try:
-            # Ejecutar request según el método
-            if operation.method == 'POST':
-                response = requests.post(url, json=operation.payload, headers=headers, timeout=10)
-            elif operation.method == 'DELETE':
-                response = requests.delete(url, json=operation.payload, headers=headers, timeout=10)
-            elif operation.method == 'PUT':
-                response = requests.put(url, json=operation.payload, headers=headers, timeout=10)
-            elif operation.method == 'PATCH':
-                response = requests.patch(url, json=operation.payload, headers=headers, timeout=10)
-            else:
-                logger.error(f"Unsupported HTTP method: {operation.method}")
-                return False
+            response = self._send_json(operation.method, url, operation.payload, operation.headers)
 
             # Verificar respuesta
             if response.status_code in [200, 201, 204]:
@@ -138,6 +270,10 @@ class SyncService:
             'total': SyncQueue.objects.count(),
             'by_status': {item['status']: item['count'] for item in status_counts},
             'oldest_pending': SyncQueue.objects.filter(status='pending').order_by('created_at').first(),
+            # Peticiones al Cloud evitadas por compactación
+            'requests_avoided': SyncQueue.objects.filter(status='compacted').count(),
+            # Bytes enviados/recibidos por canal desde el arranque
+            'wire': wire_stats.snapshot(),
         }
 
 
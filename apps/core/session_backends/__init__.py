@@ -0,0 +1,6 @@
+"""
+Custom Django session engines.
+
+- apps.core.session_backends.coalesced: cached_db sessions with a signed
+  flags cookie and write coalescing, for POS terminals (SESSION_MODE=coalesced).
+"""
@@ -0,0 +1,184 @@
+"""
+Cached-db session store with a signed flags cookie and write coalescing.
+
+Used with CoalescingSessionMiddleware when SESSION_MODE=coalesced (see
+config/settings/base.py). The session itself is stored like the cached_db
+engine; on top of that:
+
+- The keys every request reads (local_user_id, hub_id, user_language,
+  store_config_checked, ...; SESSION_FLAG_KEYS) are also sent to the
+  browser in a small signed cookie. While that cookie is valid, reading
+  those keys does not load the session, so a typical POS request does no
+  session query at all. The cookie is signed with the session key as salt
+  and expires after SESSION_FLAGS_MAX_AGE seconds, after which the session
+  is loaded once and the cookie re-issued.
+  The cookie is also bound to a version of the flag values kept in the
+  session cache (a digest, refreshed on every save). Logging out, a role
+  change or any other change to a flag key changes the version, and
+  deleting, flushing or cycling the session removes it, so a replayed old
+  cookie is rejected and the session is loaded instead.
+  On web the version keys are in CACHE_L1_PREFIXES, so checking them is
+  usually an in-process read too; a change made on another instance is
+  seen within CACHE_L1_REVALIDATE seconds.
+- Assigning a value equal to the current one is not a modification.
+- save() calls made during the request (middlewares that force a save) are
+  deferred and written once by the middleware on the way out, and skipped
+  entirely if the data is unchanged since it was loaded.
+"""
+
+import hashlib
+import json
+
+from django.conf import settings
+from django.contrib.sessions.backends.cached_db import SessionStore as CachedDBStore
+from django.core import signing
+from django.core.cache import caches
+
+DEFAULT_FLAG_KEYS = (
+    'local_user_id',
+    'hub_id',
+    'user_name',
+    'user_email',
+    'user_role',
+    'user_language',
+    'store_config_checked',
+    'django_language',
+    '_auth_user_id',
+)
+
+_FLAGS_SALT = 'hub.sessions.flags:'
+_VERSION_PREFIX = 'hub.sessions.flags_version:'
+
+
+def _flags_version(data):
+    return hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()[:16]
+
+
+def _version_cache():
+    return caches[settings.SESSION_CACHE_ALIAS]
+
+
+class SessionStore(CachedDBStore):
+
+    def __init__(self, session_key=None, flags=None):
+        super().__init__(session_key)
+        self.flag_keys = frozenset(getattr(settings, 'SESSION_FLAG_KEYS', DEFAULT_FLAG_KEYS))
+        self._flags = flags          # verified flags cookie payload, or None
+        self._deferred = False
+        self._loaded_digest = None
+        self._version_stored = False
+
+    # ------------------------------------------------------------------
+    # Flags cookie
+    # ------------------------------------------------------------------
+
+    @property
+    def is_loaded(self):
+        return hasattr(self, '_session_cache')
+
+    def _from_flags(self, key):
+        return self._flags is not None and key in self.flag_keys and not self.is_loaded
+
+    @classmethod
+    def load_flags(cls, value, session_key):
+        """
+        Verify a flags cookie for session_key.
+
+        None if missing, forged, expired or stale (the flag values changed
+        or the session was deleted since it was issued).
+        """
+        if not value or not session_key:
+            return None
+        try:
+            data = signing.loads(
+                value, salt=_FLAGS_SALT + session_key,
+                max_age=getattr(settings, 'SESSION_FLAGS_MAX_AGE', 300),
+            )
+        except signing.BadSignature:
+            return None
+        if _version_cache().get(_VERSION_PREFIX + session_key) != _flags_version(data):
+            return None
+        return data
+
+    def _flag_data(self):
+        return {key: value for key, value in self._session.items() if key in self.flag_keys}
+
+    def _store_version(self):
+        _version_cache().set(
+            _VERSION_PREFIX + self.session_key, _flags_version(self._flag_data()),
+            getattr(settings, 'SESSION_FLAGS_MAX_AGE', 300),
+        )
+        self._version_stored = True
+
+    def dump_flags(self):
+        """Signed flags cookie value for the loaded session."""
+        if not self._version_stored:
+            self._store_version()
+        return signing.dumps(self._flag_data(), salt=_FLAGS_SALT + self.session_key, compress=True)
+
+    def __contains__(self, key):
+        if self._from_flags(key):
+            self.accessed = True
+            return key in self._flags
+        return super().__contains__(key)
+
+    def __getitem__(self, key):
+        if self._from_flags(key):
+            self.accessed = True
+            return self._flags[key]
+        return super().__getitem__(key)
+
+    def get(self, key, default=None):
+        if self._from_flags(key):
+            self.accessed = True
+            return self._flags.get(key, default)
+        return super().get(key, default)
+
+    def __setitem__(self, key, value):
+        # Re-assigning the current value is not a change (no load, no write)
+        if key in self and self[key] == value:
+            return
+        super().__setitem__(key, value)
+
+    # ------------------------------------------------------------------
+    # Write coalescing
+    # ------------------------------------------------------------------
+
+    def _digest(self, data):
+        return hashlib.sha1(self.serializer().dumps(data)).digest()
+
+    def load(self):
+        data = super().load()
+        self._loaded_digest = self._digest(data)
+        return data
+
+    def defer_saves(self):
+        """Turn save() into 'save at the end of the request' (middleware)."""
+        self._deferred = True
+
+    def end_deferral(self):
+        self._deferred = False
+
+    def save(self, must_create=False):
+        if not must_create and self.session_key is not None and not self.is_loaded:
+            return  # never read, so nothing changed
+        if self._deferred and not must_create:
+            self.modified = True
+            return
+        if (
+            not must_create
+            and self.session_key is not None
+            and self._loaded_digest is not None
+            and self._digest(self._session_cache) == self._loaded_digest
+        ):
+            return
+        super().save(must_create)
+        self._loaded_digest = self._digest(self._get_session())
+        # Flags cookies issued for the previous values are now stale
+        self._store_version()
+
+    def delete(self, session_key=None):
+        key = session_key or self.session_key
+        if key:
+            _version_cache().delete(_VERSION_PREFIX + key)
+        super().delete(session_key)
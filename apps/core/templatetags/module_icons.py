@@ -2,8 +2,10 @@
 Template tags for module icons.
 
 Supports:
-- Local SVG icons from module's static/icons/ directory (inline rendering)
-- Local PNG icons from module's static/icons/ directory (base64 img tag)
+- Local SVG icons from module's static/{module_id}/icons/ or static/icons/
+  directory (inline rendering, memoized per file mtime/classes/size)
+- Local PNG icons (fingerprinted static URL; icons staticfiles can't serve
+  go through the htmx:module_icon view, also fingerprinted)
 - djicons as fallback
 
 Usage:
@@ -20,8 +22,11 @@ Usage:
 """
 import os
 import base64
+import hashlib
 import re
+from functools import lru_cache
 from pathlib import Path
+from urllib.parse import quote
 from django import template
 from django.conf import settings
 from django.utils.safestring import mark_safe
@@ -103,40 +108,150 @@ def add_svg_classes(svg_content: str, classes: str, size_px: int = 24) -> str:
     return svg_content.replace(svg_tag_match.group(0), f'<svg{tag_attrs}>')
 
 
+# Icon locations inside a module directory, in priority order.
+# Namespaced Django static layout first (static/{module_id}/icons/), then the
+# legacy flat layout (static/icons/).
+ICON_SUBDIRS = ('{module_id}/icons', 'icons')
+ICON_CACHE_SIZE = 512
+PNG_DATA_URI_PREFIX = 'data:image/png;base64,'
+
+
+def _stat_mtime(path: Path) -> int | None:
+    """Return file mtime in nanoseconds, or None if the file doesn't exist."""
+    try:
+        return os.stat(path).st_mtime_ns
+    except OSError:
+        return None
+
+
 def find_module_icon(module_id: str) -> dict | None:
     """
-    Find icon file in module's static/icons/ directory.
+    Find icon file in module's static directory.
 
     Priority:
     1. icon.svg (preferred - inline rendering)
-    2. icon.png (fallback - base64 img tag)
+    2. icon.png (fallback - static URL, or the module icon view)
+
+    Only stats files; content is read lazily by the cached renderers, so
+    repeated renders don't hit the disk beyond a stat() per candidate.
 
-    Returns dict with 'type' ('svg' or 'png') and content/data.
+    Returns dict with 'type' ('svg' or 'png'), 'path', 'mtime' and, for PNG
+    icons servable by staticfiles, 'static_name'.
     Returns None if no icon found.
     """
     modules_dir = Path(settings.MODULES_DIR)
 
     # Check both active and inactive module directories
     for prefix in ['', '_']:
-        module_dir = modules_dir / f'{prefix}{module_id}'
-        icons_dir = module_dir / 'static' / 'icons'
+        static_dir = modules_dir / f'{prefix}{module_id}' / 'static'
+
+        for subdir in ICON_SUBDIRS:
+            rel_dir = subdir.format(module_id=module_id)
+            icons_dir = static_dir / rel_dir
+
+            # Priority 1: SVG (inline rendering)
+            svg_path = icons_dir / 'icon.svg'
+            mtime = _stat_mtime(svg_path)
+            if mtime is not None and _load_svg(str(svg_path), mtime) is not None:
+                return {'type': 'svg', 'path': svg_path, 'mtime': mtime}
+
+            # Priority 2: PNG (static URL)
+            png_path = icons_dir / 'icon.png'
+            mtime = _stat_mtime(png_path)
+            if mtime is not None:
+                # Only active modules with namespaced static dirs are
+                # reachable through staticfiles without name collisions.
+                static_name = None
+                if not prefix and rel_dir != 'icons':
+                    static_name = f'{rel_dir}/icon.png'
+                return {
+                    'type': 'png',
+                    'path': png_path,
+                    'mtime': mtime,
+                    'static_name': static_name,
+                }
 
-        if not icons_dir.exists():
-            continue
+    return None
 
-        # Priority 1: SVG (inline rendering)
-        svg_path = icons_dir / 'icon.svg'
-        svg_content = get_svg_content(svg_path)
-        if svg_content:
-            return {'type': 'svg', 'content': svg_content}
 
-        # Priority 2: PNG (base64 img tag)
-        png_path = icons_dir / 'icon.png'
-        png_data = get_png_base64(png_path)
-        if png_data:
-            return {'type': 'png', 'data': png_data}
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def _load_svg(svg_path: str, mtime: int) -> str | None:
+    """Read and validate an SVG file, memoized per (path, mtime)."""
+    return get_svg_content(Path(svg_path))
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def render_svg_icon(svg_path: str, mtime: int, classes: str = '', size_px: int = 24) -> str | None:
+    """
+    Read an SVG file and apply classes/size, memoized.
+
+    The file mtime is part of the cache key, so editing or reinstalling a
+    module invalidates its entries without an explicit flush.
+
+    Returns None if the file is missing or not a valid SVG.
+    """
+    svg_content = _load_svg(svg_path, mtime)
+    if svg_content is None:
+        return None
+    return add_svg_classes(svg_content, classes, size_px)
+
+
+def _file_digest(path: str) -> str | None:
+    """Short content hash for ?v= cache busting, or None if unreadable."""
+    try:
+        with open(path, 'rb') as f:
+            return hashlib.md5(f.read(), usedforsecurity=False).hexdigest()[:12]
+    except OSError:
+        return None
 
-    return None
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def png_icon_src(png_path: str, mtime: int, static_name: str | None = None,
+                 module_id: str | None = None) -> str | None:
+    """
+    Return an ``<img src>`` for a PNG icon, memoized.
+
+    Prefers a fingerprinted static URL (manifest-hashed name when available,
+    otherwise ``?v=<content hash>``) so browsers cache the file and pages
+    don't grow with the number of modules. Icons staticfiles can't serve
+    (inactive modules, legacy flat static/icons/ layout) are served by the
+    htmx:module_icon view, fingerprinted the same way; an inline base64
+    data URI is only left for icons without a module_id.
+    """
+    if static_name:
+        from django.contrib.staticfiles.storage import staticfiles_storage, HashedFilesMixin
+
+        if isinstance(staticfiles_storage, HashedFilesMixin) and not settings.DEBUG:
+            try:
+                return staticfiles_storage.url(static_name)
+            except ValueError:
+                # Not in the manifest (module installed after collectstatic)
+                pass
+
+        digest = _file_digest(png_path)
+        if digest is None:
+            return None
+        return f'{settings.STATIC_URL}{quote(static_name)}?v={digest}'
+
+    if module_id:
+        from django.urls import reverse
+
+        digest = _file_digest(png_path)
+        if digest is None:
+            return None
+        return f"{reverse('htmx:module_icon', args=[module_id])}?v={digest}"
+
+    png_data = get_png_base64(Path(png_path))
+    if png_data is None:
+        return None
+    return f'{PNG_DATA_URI_PREFIX}{png_data}'
+
+
+def clear_icon_cache():
+    """Drop memoized icon renders (e.g. after bulk module changes)."""
+    _load_svg.cache_clear()
+    render_svg_icon.cache_clear()
+    png_icon_src.cache_clear()
 
 
 def size_to_px(size: str) -> int:
@@ -182,7 +297,7 @@ def module_icon(module_id: str = None, icon: str = None, css_class: str = '', si
 
     Priority:
     1. SVG from module's static/icons/icon.svg (inline)
-    2. PNG from module's static/icons/icon.png (base64 img)
+    2. PNG from module's static/icons/icon.png (static URL img)
     3. djicons icon from module.py
     4. Default cube-outline icon
 
@@ -204,16 +319,23 @@ def module_icon(module_id: str = None, icon: str = None, css_class: str = '', si
 
         if icon_info:
             if icon_info['type'] == 'svg':
-                svg_with_classes = add_svg_classes(icon_info['content'], all_classes, size_px)
-                return mark_safe(svg_with_classes)
+                svg_with_classes = render_svg_icon(
+                    str(icon_info['path']), icon_info['mtime'], all_classes, size_px
+                )
+                if svg_with_classes:
+                    return mark_safe(svg_with_classes)
 
             elif icon_info['type'] == 'png':
-                class_attr = f'class="{escape(all_classes)}"' if all_classes else ''
-                return mark_safe(
-                    f'<img src="data:image/png;base64,{icon_info["data"]}" '
-                    f'width="{size_px}" height="{size_px}" '
-                    f'{class_attr} alt="Module icon" />'
+                src = png_icon_src(
+                    str(icon_info['path']), icon_info['mtime'], icon_info['static_name'], module_id
                 )
+                if src:
+                    class_attr = f'class="{escape(all_classes)}"' if all_classes else ''
+                    return mark_safe(
+                        f'<img src="{escape(src)}" '
+                        f'width="{size_px}" height="{size_px}" '
+                        f'{class_attr} alt="Module icon" loading="lazy" />'
+                    )
 
     # Fallback to djicons
     import djicons
@@ -247,9 +369,12 @@ def svg_icon(path: str, css_class: str = '', size: str = ''):
     else:
         svg_path = Path(path)
 
-    svg_content = get_svg_content(svg_path)
-    if svg_content:
-        svg_with_classes = add_svg_classes(svg_content, all_classes, size_px)
+    mtime = _stat_mtime(svg_path)
+    if mtime is None:
+        return ''
+
+    svg_with_classes = render_svg_icon(str(svg_path), mtime, all_classes, size_px)
+    if svg_with_classes:
         return mark_safe(svg_with_classes)
 
     return ''
@@ -273,7 +398,11 @@ def module_icon_component(module=None, module_id: str = None, icon: str = None,
         fallback_icon: Icon to use if nothing else is found
 
     Returns:
-        Context for the component template
+        Context for the component template. PNG icons: png_url is the
+        ``<img src>`` to render. png_data keeps its earlier meaning (the raw
+        base64 payload, for ``data:image/png;base64,{{ png_data }}``) and is
+        None when the icon is served by URL, which is now the rule: templates
+        should render png_url.
     """
     # Determine module_id from module dict if provided
     if module and isinstance(module, dict):
@@ -296,15 +425,24 @@ def module_icon_component(module=None, module_id: str = None, icon: str = None,
         'has_svg': False,
         'has_png': False,
         'svg_content': None,
+        'png_url': None,
         'png_data': None,
     }
 
     if icon_info:
         if icon_info['type'] == 'svg':
-            context['has_svg'] = True
-            context['svg_content'] = add_svg_classes(icon_info['content'], all_classes, size_px)
+            svg_content = render_svg_icon(
+                str(icon_info['path']), icon_info['mtime'], all_classes, size_px
+            )
+            context['has_svg'] = svg_content is not None
+            context['svg_content'] = mark_safe(svg_content) if svg_content else None
         elif icon_info['type'] == 'png':
-            context['has_png'] = True
-            context['png_data'] = icon_info['data']
+            src = png_icon_src(
+                str(icon_info['path']), icon_info['mtime'], icon_info['static_name'], module_id
+            )
+            context['png_url'] = src
+            if src and src.startswith(PNG_DATA_URI_PREFIX):
+                context['png_data'] = src[len(PNG_DATA_URI_PREFIX):]
+            context['has_png'] = src is not None
 
     return context
@@ -0,0 +1,207 @@
+"""
+Tests for the async (ASGI) request path.
+
+Covers async-capable middlewares, the async-aware view decorators, the
+pooled async HTTP client and the full middleware chain under the ASGI
+handler (the concurrent marketplace fetches are covered in
+tests/unit/test_marketplace.py). Async code is driven with async_to_sync/asyncio.run,
+so DB access from sync_to_async lands on the test's connection.
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.http import HttpResponse
+from django.test import AsyncClient, AsyncRequestFactory
+from django.utils.module_loading import import_string
+
+from apps.accounts.decorators import admin_required, login_required
+from apps.core.htmx import htmx_view
+from apps.core.services import async_http
+
+PROJECT_MIDDLEWARE = [
+    'apps.accounts.middleware.LanguageMiddleware',
+    'apps.accounts.middleware.LocalUserAuthenticationMiddleware',
+    'apps.accounts.middleware.jwt_middleware.JWTMiddleware',
+    'apps.configuration.middleware.StoreConfigCheckMiddleware',
+    'apps.core.middleware.htmx_messages.HtmxMessagesMiddleware',
+    'apps.core.middleware.module_subscription.ModuleSubscriptionMiddleware',
+    'apps.core.middleware.module_middleware_manager.ModuleMiddlewareManager',
+    'apps.core.middleware.error_pages.ErrorPageMiddleware',
+    'apps.core.middleware.CloudSSOMiddleware',
+    'apps.core.middleware.server_timing.ServerTimingMiddleware',
+    'apps.core.middleware.static_files.ModuleStaticFilesMiddleware',
+    'apps.core.middleware.session.CoalescingSessionMiddleware',
+]
+
+
+class TestMiddlewareModes:
+
+    @pytest.mark.parametrize('path', PROJECT_MIDDLEWARE)
+    def test_middleware_is_async_capable(self, path):
+        middleware_class = import_string(path)
+        assert middleware_class.sync_capable
+        assert middleware_class.async_capable
+
+    def test_async_get_response_switches_to_async_mode(self):
+        from apps.core.middleware.error_pages import ErrorPageMiddleware
+
+        async def get_response(request):
+            return HttpResponse('ok')
+
+        middleware = ErrorPageMiddleware(get_response)
+        assert iscoroutinefunction(middleware)
+
+        request = AsyncRequestFactory().get('/')
+        response = async_to_sync(middleware)(request)
+        assert response.content == b'ok'
+
+
+class TestAsyncDecorators:
+
+    def _request(self, session):
+        request = AsyncRequestFactory().get('/marketplace/')
+        request.session = session
+        return request
+
+    def test_htmx_view_awaits_async_view(self):
+        @htmx_view('full.html', 'partial.html')
+        async def view(request):
+            await asyncio.sleep(0)
+            return {'page_title': 'Store'}
+
+        assert iscoroutinefunction(view)
+
+        request = self._request({})
+        request.META['HTTP_HX_REQUEST'] = 'true'
+        with patch('apps.core.htmx.render', return_value=HttpResponse('partial')) as render:
+            response = async_to_sync(view)(request)
+
+        assert render.call_args.args[1] == 'partial.html'
+        assert 'pageTitle' in response['HX-Trigger']
+
+    def test_login_required_redirects_async_view(self):
+        @login_required
+        async def view(request):
+            return HttpResponse('secret')
+
+        assert iscoroutinefunction(view)
+        response = async_to_sync(view)(self._request({}))
+        assert response.status_code == 302
+        assert '/login/' in response.url
+
+    def test_login_required_runs_async_view(self):
+        @login_required
+        async def view(request):
+            return HttpResponse('secret')
+
+        response = async_to_sync(view)(self._request({'local_user_id': 1}))
+        assert response.content == b'secret'
+
+    def test_sync_views_stay_sync(self):
+        @admin_required
+        def view(request):
+            return HttpResponse('ok')
+
+        assert not iscoroutinefunction(view)
+
+
+class TestAsyncHttpClient:
+
+    def _mock_client(self, handler):
+        return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+    def test_one_pooled_client_per_loop(self):
+        async def clients():
+            first = async_http.get_async_client()
+            second = async_http.get_async_client()
+            await async_http.aclose_clients()
+            return first, second
+
+        first, second = asyncio.run(clients())
+        assert first is second
+
+    def _recording_client(self, built):
+        def build():
+            client = self._mock_client(lambda request: httpx.Response(200, json={}))
+            built.append(client)
+            return client
+        return build
+
+    def test_temporary_loop_closes_its_client(self):
+        # async_to_sync under WSGI: a fresh loop per request, nothing to pool with
+        built = []
+
+        async def fetch():
+            await async_http.aget('https://cloud.test/api/x/')
+            return asyncio.get_running_loop() in async_http._clients
+
+        with patch.object(async_http, '_build_client', self._recording_client(built)):
+            assert async_to_sync(fetch)() is False
+        assert len(built) == 1 and built[0].is_closed
+
+    def test_asgi_loop_reuses_pooled_client(self):
+        built = []
+
+        async def fetch():
+            async_http.mark_persistent_loop()
+            await async_http.aget('https://cloud.test/api/x/')
+            await async_http.aget('https://cloud.test/api/y/')
+            await async_http.aclose_clients()
+
+        with patch.object(async_http, '_build_client', self._recording_client(built)):
+            asyncio.run(fetch())
+        assert len(built) == 1
+
+    def test_asgi_application_handles_lifespan(self):
+        sent = []
+        messages = iter([{'type': 'lifespan.startup'}, {'type': 'lifespan.shutdown'}])
+
+        async def receive():
+            return next(messages)
+
+        async def send(message):
+            sent.append(message['type'])
+
+        async def app(scope, receive, send):
+            raise AssertionError('lifespan must not reach Django')
+
+        asyncio.run(async_http.asgi_application(app)({'type': 'lifespan'}, receive, send))
+        assert sent == ['lifespan.startup.complete', 'lifespan.shutdown.complete']
+
+    def test_aget_json(self):
+        def handler(request):
+            return httpx.Response(200, json={'results': [1, 2]})
+
+        async def fetch():
+            return await async_http.aget_json('https://cloud.test/api/x/')
+
+        with patch.object(async_http, '_build_client', lambda: self._mock_client(handler)):
+            assert asyncio.run(fetch()) == (200, {'results': [1, 2]})
+
+    def test_aget_json_unreachable(self):
+        def handler(request):
+            raise httpx.ConnectError('down', request=request)
+
+        async def fetch():
+            return await async_http.aget_json('https://cloud.test/api/x/')
+
+        with patch.object(async_http, '_build_client', lambda: self._mock_client(handler)):
+            assert asyncio.run(fetch()) == (None, None)
+
+
+@pytest.mark.django_db
+class TestAsgiHandler:
+
+    def test_middleware_chain_runs_under_asgi(self, settings):
+        settings.MIDDLEWARE = [
+            'apps.core.middleware.server_timing.ServerTimingMiddleware',
+        ] + settings.MIDDLEWARE
+        response = async_to_sync(AsyncClient().get)('/htmx/health/')
+
+        # Session, language and auth layers ran; JWTMiddleware sent us to login
+        assert response.status_code == 302
+        assert '/login/' in response.url
+        assert 'Server-Timing' in response
@@ -0,0 +1,221 @@
+"""
+Tests for the custom cache backends.
+
+TwoTierCache instances are built over a LocMemCache 'shared' alias; two
+instances over the same alias stand in for two web processes.
+PostgresCache runs against a hub_cache table created in the test
+transaction (the suite runs with --nomigrations).
+"""
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.cache_backends import PostgresCache, TwoTierCache
+from apps.core.cache_backends.postgres import create_cache_table
+
+
+@pytest.fixture
+def shared(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'shared': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'two-tier-tests',
+        },
+    }
+    l2 = caches['shared']
+    l2.clear()
+    yield l2
+    l2.clear()
+
+
+def _two_tier(**options):
+    options = {'L2': 'shared', 'L1_PREFIXES': ['config_', 'mp:'], **options}
+    return TwoTierCache('', {'TIMEOUT': 300, 'OPTIONS': options})
+
+
+class TestReads:
+
+    def test_l1_hit_skips_l2(self, shared):
+        cache = _two_tier()
+        cache.set('config_hub', {'name': 'Hub'})
+
+        with patch.object(shared, 'get_many', wraps=shared.get_many) as get_many:
+            assert cache.get('config_hub') == {'name': 'Hub'}
+        get_many.assert_not_called()
+        assert cache.stats()['l1_hits'] == 1
+
+    def test_loads_from_l2_into_l1(self, shared):
+        _two_tier().set('config_hub', 'v1')
+        other = _two_tier()
+
+        assert other.get('config_hub') == 'v1'
+        assert other.get('config_hub') == 'v1'
+        stats = other.stats()
+        assert stats['l2_hits'] == 1
+        assert stats['l1_hits'] == 1
+
+    def test_revalidation_keeps_unchanged_entry(self, shared):
+        cache = _two_tier(L1_REVALIDATE=0)
+        cache.set('config_hub', 'v1')
+
+        assert cache.get('config_hub') == 'v1'
+        assert cache.stats()['l1_revalidated'] == 1
+
+    def test_write_elsewhere_invalidates_l1(self, shared):
+        first, second = _two_tier(L1_REVALIDATE=0), _two_tier(L1_REVALIDATE=0)
+        first.set('config_hub', 'v1')
+        assert second.get('config_hub') == 'v1'
+
+        first.set('config_hub', 'v2')
+        assert second.get('config_hub') == 'v2'
+        assert second.stats()['l1_stale'] == 1
+
+    def test_delete_elsewhere_invalidates_l1(self, shared):
+        first, second = _two_tier(L1_REVALIDATE=0), _two_tier(L1_REVALIDATE=0)
+        first.set('config_hub', 'v1')
+        assert second.get('config_hub') == 'v1'
+
+        first.delete('config_hub')
+        assert second.get('config_hub') is None
+
+    def test_get_many_is_one_l2_call(self, shared):
+        _two_tier().set_many({'mp:a': 1, 'mp:b': 2, 'rl:pin:1': 3})
+        cache = _two_tier()
+
+        with patch.object(shared, 'get_many', wraps=shared.get_many) as get_many:
+            values = cache.get_many(['mp:a', 'mp:b', 'rl:pin:1', 'mp:missing'])
+        assert values == {'mp:a': 1, 'mp:b': 2, 'rl:pin:1': 3}
+        assert get_many.call_count == 1
+        assert cache.stats()['misses'] == 1
+
+
+class TestL2OnlyKeys:
+
+    def test_keys_outside_prefixes_never_use_l1(self, shared):
+        cache = _two_tier()
+        cache.set('rl:pin:1', 1)
+
+        assert shared.get('rl:pin:1') == 1
+        assert cache.stats()['l1_size'] == 0
+
+    def test_incr_uses_l2_counter(self, shared):
+        first, second = _two_tier(), _two_tier()
+        first.set('rl:pin:1', 1)
+
+        assert second.incr('rl:pin:1') == 2
+        assert first.get('rl:pin:1') == 2
+
+
+class TestL1Bound:
+
+    def test_lru_evicts_oldest(self, shared):
+        cache = _two_tier(L1_MAX_ENTRIES=2)
+        cache.set('mp:a', 1)
+        cache.set('mp:b', 2)
+        cache.get('mp:a')
+        cache.set('mp:c', 3)
+
+        stats = cache.stats()
+        assert stats['l1_size'] == 2
+        assert stats['l1_evictions'] == 1
+        # Evicted from L1 only; still served from L2
+        assert cache.get('mp:b') == 2
+        assert cache.stats()['l2_hits'] == 1
+
+    def test_expired_entry_is_a_miss(self, shared):
+        cache = _two_tier()
+        cache.set('mp:a', 1, timeout=0)
+        assert cache.get('mp:a') is None
+
+
+@pytest.fixture
+def pg_cache(db):
+    create_cache_table(connection)
+    return PostgresCache('hub_cache', {'TIMEOUT': 300})
+
+
+class TestPostgresCache:
+
+    def test_set_get_roundtrip(self, pg_cache):
+        pg_cache.set('config_hub', {'name': 'Hub'})
+        pg_cache.set('flag', True)
+        pg_cache.set('count', 3)
+
+        assert pg_cache.get('config_hub') == {'name': 'Hub'}
+        assert pg_cache.get('flag') is True
+        assert pg_cache.get('count') == 3
+        assert pg_cache.get('missing', 'default') == 'default'
+
+    def test_batched_operations_are_single_statements(self, pg_cache):
+        with CaptureQueriesContext(connection) as queries:
+            pg_cache.set_many({'a': 1, 'b': [2], 'c': 'three'})
+            values = pg_cache.get_many(['a', 'b', 'c', 'missing'])
+            pg_cache.delete_many(['a', 'b'])
+
+        assert values == {'a': 1, 'b': [2], 'c': 'three'}
+        assert len(queries) == 3
+        assert pg_cache.get_many(['a', 'b', 'c']) == {'c': 'three'}
+
+    def test_set_overwrites(self, pg_cache):
+        pg_cache.set('key', 'old')
+        pg_cache.set('key', 'new')
+        assert pg_cache.get('key') == 'new'
+
+    def test_add_only_when_absent(self, pg_cache):
+        assert pg_cache.add('key', 1)
+        assert not pg_cache.add('key', 2)
+        assert pg_cache.get('key') == 1
+
+    def test_add_replaces_expired_entry(self, pg_cache):
+        pg_cache.set('key', 'old')
+        pg_cache._execute("UPDATE {table} SET expires = now() - interval '1 second'")
+        assert pg_cache.add('key', 'new')
+        assert pg_cache.get('key') == 'new'
+
+    def test_incr_is_atomic_sql(self, pg_cache):
+        pg_cache.set('rl:pin:1', 1)
+        with CaptureQueriesContext(connection) as queries:
+            assert pg_cache.incr('rl:pin:1') == 2
+        assert len(queries) == 1
+        assert pg_cache.decr('rl:pin:1', 2) == 0
+
+    def test_incr_missing_raises(self, pg_cache):
+        with pytest.raises(ValueError):
+            pg_cache.incr('missing')
+
+    def test_incr_non_counter_value(self, pg_cache):
+        pg_cache.set('ratio', 1.5)
+        assert pg_cache.incr('ratio') == 2.5
+
+    def test_expired_entries_are_invisible_and_cleaned_up(self, pg_cache):
+        pg_cache.set('old', 1)
+        pg_cache.set('forever', 2, timeout=None)
+        pg_cache._execute(
+            "UPDATE {table} SET expires = now() - interval '1 second' WHERE expires IS NOT NULL",
+        )
+
+        assert pg_cache.get('old') is None
+        assert not pg_cache.has_key('old')
+        assert pg_cache.delete_expired() == 1
+        assert pg_cache.get('forever') == 2
+
+    def test_non_positive_timeout_deletes(self, pg_cache):
+        pg_cache.set('key', 1)
+        pg_cache.set('key', 2, timeout=0)
+        assert pg_cache.get('key') is None
+
+    def test_touch_and_delete(self, pg_cache):
+        pg_cache.set('key', 1)
+        assert pg_cache.touch('key', timeout=None)
+        assert pg_cache.delete('key')
+        assert not pg_cache.delete('key')
+        assert not pg_cache.touch('key')
+
+    def test_table_is_unlogged(self, pg_cache):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT relpersistence FROM pg_class WHERE relname = 'hub_cache'")
+            assert cursor.fetchone() == ('u',)
@@ -0,0 +1,251 @@
+"""
+Tests for the shared Cloud HTTP client: circuit breaker, per-endpoint
+timeouts and metrics (apps/core/services/cloud_http.py).
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import requests
+import responses
+
+from apps.core.services import async_http, cloud_http
+from apps.core.services.cloud_http import CircuitBreaker, CircuitOpenError
+from apps.core.services.connectivity import ConnectivityChecker
+
+CLOUD = 'https://cloud.test'
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def breaker_settings(settings):
+    settings.CLOUD_HTTP_BREAKER_THRESHOLD = 3
+    settings.CLOUD_HTTP_BREAKER_RESET = 30
+
+
+def _fail(n, url=f'{CLOUD}/api/x/'):
+    for _ in range(n):
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cloud_http.get(url)
+
+
+class TestCircuitBreaker:
+
+    def test_opens_after_consecutive_failures(self):
+        breaker = CircuitBreaker(failure_threshold=3, reset_timeout=30, clock=FakeClock())
+        breaker.record_failure()
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == 'closed'
+
+        breaker.record_failure()
+        assert breaker.state == 'open'
+        assert breaker.allow_request() is False
+
+    def test_half_open_allows_one_probe(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+
+        clock.now += 30
+        assert breaker.state == 'half_open'
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker.record_success()
+        assert breaker.state == 'closed'
+        assert breaker.allow_request() is True
+
+    def test_failed_probe_reopens(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30, clock=clock)
+        breaker.record_failure()
+        clock.now += 30
+        assert breaker.allow_request() is True
+
+        breaker.record_failure()
+        assert breaker.state == 'open'
+        clock.now += 29
+        assert breaker.allow_request() is False
+
+
+class TestRequest:
+
+    @responses.activate
+    def test_fails_fast_while_open(self, breaker_settings):
+        responses.add(responses.GET, f'{CLOUD}/api/x/', body=requests.exceptions.ConnectionError('down'))
+
+        _fail(3)
+        calls = len(responses.calls)
+
+        with pytest.raises(CircuitOpenError):
+            cloud_http.get(f'{CLOUD}/api/other/')
+        # No network call made, other hosts unaffected
+        assert len(responses.calls) == calls
+        assert cloud_http.get_breaker('https://other.test/').state == 'closed'
+
+        stats = cloud_http.metrics.snapshot()['cloud.test/api/other/']
+        assert stats['rejected'] == 1
+
+    @responses.activate
+    def test_gateway_errors_count_as_failures(self, breaker_settings):
+        responses.add(responses.POST, f'{CLOUD}/api/x/', status=503)
+        for _ in range(3):
+            assert cloud_http.post(f'{CLOUD}/api/x/', json={}).status_code == 503
+        assert cloud_http.get_breaker(CLOUD).state == 'open'
+
+    @responses.activate
+    def test_client_errors_do_not_open(self, breaker_settings):
+        responses.add(responses.GET, f'{CLOUD}/api/x/', status=404)
+        for _ in range(5):
+            cloud_http.get(f'{CLOUD}/api/x/')
+        assert cloud_http.get_breaker(CLOUD).state == 'closed'
+
+    @responses.activate
+    def test_probe_bypasses_open_breaker(self, breaker_settings):
+        responses.add(responses.GET, f'{CLOUD}/api/x/', body=requests.exceptions.ConnectionError('down'))
+        responses.add(responses.GET, f'{CLOUD}/health/', status=200)
+        _fail(3)
+
+        assert cloud_http.get(f'{CLOUD}/health/', probe=True).status_code == 200
+        assert cloud_http.get_breaker(CLOUD).state == 'closed'
+
+    @responses.activate
+    def test_unrelated_error_releases_probe(self, breaker_settings, settings):
+        settings.CLOUD_HTTP_BREAKER_RESET = 0  # half-open as soon as it opens
+        responses.add(responses.GET, f'{CLOUD}/api/x/', body=requests.exceptions.ConnectionError('down'))
+        _fail(3)
+
+        responses.replace(responses.GET, f'{CLOUD}/api/x/', body=requests.exceptions.TooManyRedirects('loop'))
+        with pytest.raises(requests.exceptions.TooManyRedirects):
+            cloud_http.get(f'{CLOUD}/api/x/')
+
+        # The next call is still allowed to probe, and closes the breaker
+        responses.replace(responses.GET, f'{CLOUD}/api/x/', status=200)
+        assert cloud_http.get(f'{CLOUD}/api/x/').status_code == 200
+        assert cloud_http.get_breaker(CLOUD).state == 'closed'
+
+    @responses.activate
+    def test_session_keeps_no_cookies(self):
+        responses.add(responses.GET, f'{CLOUD}/api/x/', headers={'Set-Cookie': 'sessionid=hub-a; Path=/'})
+        cloud_http.get(f'{CLOUD}/api/x/')
+        cloud_http.get(f'{CLOUD}/api/x/', cookies={'sessionid': 'hub-b'})
+
+        assert 'Cookie' not in responses.calls[0].request.headers
+        assert responses.calls[1].request.headers['Cookie'] == 'sessionid=hub-b'
+        assert len(cloud_http.get_session().cookies) == 0
+
+    def test_shared_session(self):
+        assert cloud_http.get_session() is cloud_http.get_session()
+
+
+class TestTimeouts:
+
+    def test_endpoint_table(self, settings):
+        settings.CLOUD_HTTP_CONNECT_TIMEOUT = 3
+        assert cloud_http.get_timeout(f'{CLOUD}/health/') == (3, 5)
+        assert cloud_http.get_timeout(f'{CLOUD}/api/marketplace/modules/') == (3, 15)
+        assert cloud_http.get_timeout(f'{CLOUD}/api/unknown/') == (3, cloud_http.DEFAULT_TIMEOUT)
+
+    def test_caller_and_settings_override(self, settings):
+        settings.CLOUD_HTTP_CONNECT_TIMEOUT = 3
+        settings.CLOUD_HTTP_TIMEOUTS = {'/api/marketplace/solutions/': 40}
+        assert cloud_http.get_timeout(f'{CLOUD}/api/marketplace/solutions/a/') == (3, 40)
+        assert cloud_http.get_timeout(f'{CLOUD}/api/x/', timeout=2) == (2, 2)
+        assert cloud_http.get_timeout(f'{CLOUD}/api/x/', timeout=(1, 60)) == (1, 60)
+
+
+class TestMetrics:
+
+    def test_endpoint_name_collapses_ids(self):
+        name = cloud_http.endpoint_name(
+            f'{CLOUD}/api/hubs/me/commands/5f0c6a1e-0b8e-4a7d-9a44-1d7e2f3b4c5d/ack/?x=1'
+        )
+        assert name == 'cloud.test/api/hubs/me/commands/{id}/ack/'
+        assert cloud_http.endpoint_name(f'{CLOUD}/api/invoices/42/') == 'cloud.test/api/invoices/{id}/'
+
+    @responses.activate
+    def test_records_status_and_errors(self):
+        responses.add(responses.GET, f'{CLOUD}/api/x/', status=200)
+        responses.add(responses.GET, f'{CLOUD}/api/y/', body=requests.exceptions.ConnectTimeout())
+        cloud_http.get(f'{CLOUD}/api/x/')
+        with pytest.raises(requests.exceptions.ConnectTimeout):
+            cloud_http.get(f'{CLOUD}/api/y/')
+
+        snapshot = cloud_http.metrics.snapshot()
+        assert snapshot['cloud.test/api/x/']['statuses'] == {200: 1}
+        assert snapshot['cloud.test/api/y/']['errors'] == 1
+        assert snapshot['cloud.test/api/y/']['statuses'] == {'ConnectTimeout': 1}
+
+
+class TestConnectivityFeedsBreaker:
+
+    @responses.activate
+    def test_failed_checks_open_breaker(self, breaker_settings):
+        responses.add(responses.GET, f'{CLOUD}/health/', status=503)
+        checker = ConnectivityChecker(cloud_url=CLOUD)
+        for _ in range(3):
+            assert checker._check_connectivity() is False
+        assert cloud_http.get_breaker(CLOUD).state == 'open'
+
+        responses.replace(responses.GET, f'{CLOUD}/health/', status=200)
+        assert checker._check_connectivity() is True
+        assert cloud_http.get_breaker(CLOUD).state == 'closed'
+
+
+class TestAsyncClient:
+
+    def test_aget_fails_fast_while_open(self, breaker_settings):
+        requests_seen = []
+
+        def handler(request):
+            requests_seen.append(request)
+            raise httpx.ConnectError('down', request=request)
+
+        async def fetch():
+            results = [await async_http.aget_json(f'{CLOUD}/api/x/') for _ in range(5)]
+            await async_http.aclose_clients()
+            return results
+
+        client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))  # noqa: E731
+        with patch.object(async_http, '_build_client', client):
+            assert asyncio.run(fetch()) == [(None, None)] * 5
+
+        assert len(requests_seen) == 3
+        assert cloud_http.get_breaker(CLOUD).state == 'open'
+
+    def test_aget_releases_probe_on_unexpected_error(self, breaker_settings, settings):
+        settings.CLOUD_HTTP_BREAKER_RESET = 0
+        breaker = cloud_http.get_breaker(CLOUD)
+        for _ in range(3):
+            breaker.record_failure()
+        outcomes = iter([RuntimeError('bug'), httpx.Response(200, json={})])
+
+        def handler(request):
+            outcome = next(outcomes)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+
+        async def fetch():
+            with pytest.raises(RuntimeError):
+                await async_http.aget(f'{CLOUD}/api/x/')
+            response = await async_http.aget(f'{CLOUD}/api/x/')
+            await async_http.aclose_clients()
+            return response.status_code
+
+        client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))  # noqa: E731
+        with patch.object(async_http, '_build_client', client):
+            assert asyncio.run(fetch()) == 200
+        assert breaker.state == 'closed'
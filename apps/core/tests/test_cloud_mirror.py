@@ -0,0 +1,203 @@
+"""
+Tests for the local mirror of Cloud reference data (apps/core/services/cloud_mirror.py).
+"""
+import asyncio
+from unittest.mock import patch
+
+import httpx
+import pytest
+import requests
+import responses
+from django.core.cache import cache
+
+from apps.core.services import async_http, cloud_mirror
+from apps.core.services.blueprint_service import BlueprintService
+
+CLOUD = 'https://cloud.test'
+TYPES = f'{CLOUD}/api/blueprints/types/'
+
+
+@pytest.fixture
+def stale(settings):
+    """Every stored copy needs revalidation."""
+    settings.CLOUD_MIRROR_MAX_AGE = 0
+
+
+class TestFetch:
+
+    @responses.activate
+    def test_fresh_copy_served_without_request(self):
+        responses.add(responses.GET, TYPES, json=[{'code': 'bar'}], headers={'ETag': '"v1"'})
+
+        assert cloud_mirror.fetch(TYPES, params={'language': 'es'}) == [{'code': 'bar'}]
+        assert cloud_mirror.fetch(TYPES, params={'language': 'es'}) == [{'code': 'bar'}]
+        assert len(responses.calls) == 1
+
+    @responses.activate
+    def test_revalidates_with_validators(self, stale):
+        responses.add(responses.GET, TYPES, json=[{'code': 'bar'}],
+                      headers={'ETag': '"v1"', 'Last-Modified': 'Sat, 17 Oct 2026 10:00:00 GMT'})
+        cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, status=304)
+        assert cloud_mirror.fetch(TYPES) == [{'code': 'bar'}]
+
+        request = responses.calls[1].request
+        assert request.headers['If-None-Match'] == '"v1"'
+        assert request.headers['If-Modified-Since'] == 'Sat, 17 Oct 2026 10:00:00 GMT'
+
+    @responses.activate
+    def test_changed_payload_replaces_copy(self, stale):
+        responses.add(responses.GET, TYPES, json=[{'code': 'bar'}], headers={'ETag': '"v1"'})
+        cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, json=[{'code': 'cafe'}], headers={'ETag': '"v2"'})
+        assert cloud_mirror.fetch(TYPES) == [{'code': 'cafe'}]
+
+        entry, _ = cloud_mirror.load(cloud_mirror.mirror_key(TYPES))
+        assert entry['etag'] == '"v2"'
+
+    @responses.activate
+    def test_copies_keyed_by_query(self):
+        for language in ('es', 'en'):
+            responses.add(responses.GET, TYPES, json=[language],
+                          match=[responses.matchers.query_param_matcher({'language': language})])
+
+        assert cloud_mirror.fetch(TYPES, params={'language': 'es'}) == ['es']
+        assert cloud_mirror.fetch(TYPES, params={'language': 'en'}) == ['en']
+        assert cloud_mirror.mirror_key(TYPES, {'b': 1, 'a': 2}) == f'{TYPES}?a=2&b=1'
+
+    @responses.activate
+    def test_stale_copy_served_when_offline(self, stale):
+        responses.add(responses.GET, TYPES, json=[{'code': 'bar'}])
+        cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, body=requests.exceptions.ConnectionError('offline'))
+        assert cloud_mirror.fetch(TYPES) == [{'code': 'bar'}]
+
+        responses.replace(responses.GET, TYPES, status=500)
+        assert cloud_mirror.fetch(TYPES) == [{'code': 'bar'}]
+
+    @responses.activate
+    def test_raises_without_copy(self):
+        responses.add(responses.GET, TYPES, body=requests.exceptions.ConnectionError('offline'))
+        with pytest.raises(requests.exceptions.ConnectionError):
+            cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, status=500)
+        with pytest.raises(requests.exceptions.HTTPError):
+            cloud_mirror.fetch(TYPES)
+
+    @responses.activate
+    def test_gone_resource_is_dropped(self, stale):
+        url = f'{TYPES}bar/'
+        responses.add(responses.GET, url, json={'code': 'bar'})
+        cloud_mirror.fetch(url)
+
+        responses.replace(responses.GET, url, status=404)
+        with pytest.raises(requests.exceptions.HTTPError):
+            cloud_mirror.fetch(url)
+        assert cloud_mirror.load(cloud_mirror.mirror_key(url)) == (None, None)
+
+    @responses.activate
+    def test_auth_failure_drops_copy(self, stale):
+        responses.add(responses.GET, TYPES, json=[{'code': 'bar'}])
+        cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, status=401)
+        with pytest.raises(requests.exceptions.HTTPError):
+            cloud_mirror.fetch(TYPES)
+        assert cloud_mirror.load(cloud_mirror.mirror_key(TYPES)) == (None, None)
+
+    @responses.activate
+    def test_invalid_json(self, stale):
+        responses.add(responses.GET, TYPES, body='<html>maintenance</html>')
+        with pytest.raises(requests.exceptions.RequestException):
+            cloud_mirror.fetch(TYPES)
+
+        responses.replace(responses.GET, TYPES, json=[{'code': 'bar'}])
+        cloud_mirror.fetch(TYPES)
+        responses.replace(responses.GET, TYPES, body='<html>maintenance</html>')
+        assert cloud_mirror.fetch(TYPES) == [{'code': 'bar'}]
+
+
+class TestAsyncFetch:
+
+    def _run(self, handler, *calls):
+        async def fetch():
+            results = []
+            for url in calls:
+                try:
+                    results.append(await cloud_mirror.afetch(url))
+                except httpx.HTTPError as e:
+                    results.append(type(e))
+            await async_http.aclose_clients()
+            return results
+
+        client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler))  # noqa: E731
+        with patch.object(async_http, '_build_client', client):
+            return asyncio.run(fetch())
+
+    def test_conditional_and_offline(self, stale):
+        seen = []
+
+        def handler(request):
+            seen.append(request.headers.get('If-None-Match'))
+            if len(seen) == 1:
+                return httpx.Response(200, json=['bar'], headers={'ETag': '"v1"'})
+            if len(seen) == 2:
+                return httpx.Response(304)
+            raise httpx.ConnectError('offline', request=request)
+
+        assert self._run(handler, TYPES, TYPES, TYPES) == [['bar'], ['bar'], ['bar']]
+        assert seen == [None, '"v1"', '"v1"']
+
+    def test_error_without_copy(self):
+        results = self._run(lambda request: httpx.Response(503), TYPES)
+        assert results == [httpx.HTTPStatusError]
+
+    def test_invalid_json_is_an_http_error(self):
+        results = self._run(lambda request: httpx.Response(200, text='<html>'), TYPES)
+        assert results == [httpx.DecodingError]
+
+
+class TestBlueprintService:
+
+    @responses.activate
+    def test_wizard_data_survives_outage(self, stale, settings):
+        settings.CLOUD_API_URL = CLOUD
+        url = f'{CLOUD}/api/blueprints/sectors/'
+        responses.add(responses.GET, url, json=[{'code': 'retail'}])
+        cache.delete('bp:sectors:es')
+        assert BlueprintService.get_sectors(language='es') == [{'code': 'retail'}]
+
+        # Cloud down and the 5-minute cache expired: the mirror still answers
+        cache.delete('bp:sectors:es')
+        responses.replace(responses.GET, url, body=requests.exceptions.ConnectionError('offline'))
+        assert BlueprintService.get_sectors(language='es') == [{'code': 'retail'}]
+        cache.delete('bp:sectors:es')
+
+
+@pytest.mark.django_db
+class TestMarketplaceModules:
+
+    @responses.activate
+    def test_per_hub_catalog_is_not_mirrored(self, settings):
+        from apps.configuration.models import HubConfig
+        from apps.marketplace.views import _CK_MODULES_LIST, _fetch_all_modules
+
+        settings.CLOUD_API_URL = CLOUD
+        config = HubConfig.get_solo()
+        config.hub_jwt = 'hub-token'
+        config.save()
+        url = f'{CLOUD}/api/marketplace/modules/'
+        responses.add(responses.GET, url, json=[{'slug': 'pos', 'can_install': False}])
+        cache.delete(_CK_MODULES_LIST)
+        _fetch_all_modules()
+
+        # Purchased a moment ago: bulk_install drops the cache and must see it
+        responses.replace(responses.GET, url, json=[{'slug': 'pos', 'can_install': True}])
+        cache.delete(_CK_MODULES_LIST)
+        assert _fetch_all_modules() == ([{'slug': 'pos', 'can_install': True}], None)
+        assert cloud_mirror.load(cloud_mirror.mirror_key(url)) == (None, None)
+        cache.delete(_CK_MODULES_LIST)
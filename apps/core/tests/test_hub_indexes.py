@@ -0,0 +1,112 @@
+"""
+Tests for the standard HubBaseModel partial indexes and index_report.
+"""
+from io import StringIO
+
+import pytest
+from django.core.management import call_command
+from django.db import connection, models
+from django.db.migrations.state import ModelState
+from django.test.utils import isolate_apps
+
+from apps.accounts.models import LocalUser, Permission, Role, TrustedDevice
+from apps.core.models import HubBaseModel, hub_indexes
+from apps.core.models.indexes import LIVE
+from apps.sync.models import SyncQueue
+
+
+def _partial(model):
+    return {tuple(index.fields): index for index in model._meta.indexes if index.condition == LIVE}
+
+
+class TestHubIndexes:
+
+    def test_standard_indexes_are_added(self):
+        indexes = _partial(LocalUser)
+        assert ('hub_id', 'created_at') in indexes
+        assert ('hub_id', 'updated_at') in indexes
+
+    def test_ordering_index(self):
+        assert ('hub_id', 'name') in _partial(LocalUser)
+        assert ('hub_id', 'module_id', 'codename') in _partial(Permission)
+        assert ('hub_id', '-last_used') in _partial(TrustedDevice)
+
+    def test_ordering_on_created_at_is_not_duplicated(self):
+        fields = [tuple(index.fields) for index in SyncQueue._meta.indexes]
+        assert fields.count(('hub_id', 'created_at')) == 1
+
+    def test_names_fit_and_are_stable(self):
+        for model in (LocalUser, Permission, TrustedDevice, SyncQueue):
+            for index in hub_indexes(model):
+                assert len(index.name) <= 30
+                assert index.name.endswith('_live')
+        assert [i.name for i in hub_indexes(LocalUser)] == [i.name for i in hub_indexes(LocalUser)]
+
+    def test_declared_indexes_are_kept(self):
+        names = {index.name for index in TrustedDevice._meta.indexes}
+        assert 'idx_trusted_device_hub_user' in names
+
+    @isolate_apps('apps.core')
+    def test_opt_out(self):
+        class Ticket(HubBaseModel):
+            auto_hub_indexes = False
+            number = models.IntegerField()
+
+            class Meta:
+                app_label = 'core'
+                ordering = ['number']
+
+        assert Ticket._meta.indexes == []
+
+    @isolate_apps('apps.core')
+    def test_model_without_meta_indexes_gets_them_in_migrations(self):
+        class Ticket(HubBaseModel):
+            number = models.IntegerField()
+
+            class Meta:
+                app_label = 'core'
+                ordering = ['number']
+
+        state = ModelState.from_model(Ticket)
+        assert {tuple(index.fields) for index in state.options['indexes']} == {
+            ('hub_id', 'created_at'), ('hub_id', 'updated_at'), ('hub_id', 'number'),
+        }
+
+    def test_is_deleted_keeps_its_index(self):
+        # Module models without migrations of their own rely on it
+        assert Role._meta.get_field('is_deleted').db_index
+
+    @pytest.mark.django_db
+    def test_migrations_are_up_to_date(self):
+        call_command('makemigrations', '--check', '--dry-run', stdout=StringIO())
+
+    @isolate_apps('apps.core')
+    def test_ordering_through_relations_is_skipped(self):
+        class Ticket(HubBaseModel):
+            user = models.ForeignKey(LocalUser, on_delete=models.CASCADE)
+
+            class Meta:
+                app_label = 'core'
+                ordering = ['user__name']
+
+        assert set(_partial(Ticket)) == {('hub_id', 'created_at'), ('hub_id', 'updated_at')}
+
+
+@pytest.mark.django_db
+class TestIndexReport:
+
+    def test_reports_sections(self):
+        out = StringIO()
+        call_command('index_report', '--min-rows', '0', stdout=out)
+        output = out.getvalue()
+        assert 'Declared but missing from the database (run migrate): none' in output
+        assert 'Never used (idx_scan = 0)' in output
+        assert 'Mostly sequential scans' in output
+
+    def test_missing_index_is_reported(self):
+        name = hub_indexes(LocalUser)[0].name
+        with connection.cursor() as cursor:
+            cursor.execute(f'DROP INDEX {connection.ops.quote_name(name)}')
+        out = StringIO()
+        call_command('index_report', stdout=out)
+        assert f'accounts_local_users.{name}' in out.getvalue()
@@ -24,7 +24,7 @@ pytestmark = pytest.mark.unit
 class TestPublicKeyFetcher:
     """Test public key fetching from Cloud."""
 
-    @patch('apps.core.services.public_key_fetcher.requests.get')
+    @patch('apps.core.services.public_key_fetcher.cloud_http.get')
     def test_fetches_public_key_from_cloud(self, mock_get):
         """
         GIVEN: Cloud API available
@@ -52,7 +52,7 @@ class TestPublicKeyFetcher:
         assert "BEGIN PUBLIC KEY" in public_key
         mock_get.assert_called_once()
 
-    @patch('requests.get')
+    @patch('apps.core.services.cloud_http.get')
     def test_uses_cached_key_when_available(self, mock_get):
         """
         GIVEN: Public key cached recently
@@ -72,7 +72,7 @@ class TestPublicKeyFetcher:
         assert public_key == cached_key
         mock_get.assert_not_called()  # Should not call Cloud
 
-    @patch('requests.get')
+    @patch('apps.core.services.cloud_http.get')
     def test_refreshes_key_when_cache_expired(self, mock_get):
         """
         GIVEN: Public key cache expired (> 24 hours)
@@ -98,7 +98,7 @@ class TestPublicKeyFetcher:
         assert "NEW_KEY" in public_key
         mock_get.assert_called_once()
 
-    @patch('requests.get')
+    @patch('apps.core.services.cloud_http.get')
     def test_handles_network_error_gracefully(self, mock_get):
         """
         GIVEN: Cloud not available (network error)
@@ -260,7 +260,7 @@ class TestOfflineMode:
         # Clear cache to ensure fresh check
         cache.clear()
 
-        with patch('apps.core.services.connectivity.requests.get') as mock_get:
+        with patch('apps.core.services.connectivity.cloud_http.get') as mock_get:
             mock_get.side_effect = Exception("Connection refused")
 
             checker = ConnectivityChecker(cloud_url='http://localhost:8000')
@@ -0,0 +1,183 @@
+"""
+Tests for advisory-lock leader election (apps/core/services/leader_election.py).
+
+Electors are driven with step() instead of their threads; each holds its
+own database session, like electors in different worker processes.
+"""
+import time
+import uuid
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.db import connection
+
+from apps.core.services import leader_election
+from apps.core.services.leader_election import LeaderElector, lock_key, run_as_leader
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def hub_id():
+    return str(uuid.uuid4())
+
+
+@pytest.fixture
+def make_elector(hub_id):
+    electors = []
+
+    def make(name='cloud_sync', **kwargs):
+        kwargs.setdefault('hub_id', hub_id)
+        elector = LeaderElector(name, start=MagicMock(), stop=MagicMock(), interval=1, **kwargs)
+        electors.append(elector)
+        return elector
+
+    yield make
+    for elector in electors:
+        elector._demote('test teardown')
+        elector._close()
+
+
+def _backend_pid(elector):
+    with elector._conn.cursor() as cursor:
+        cursor.execute('SELECT pg_backend_pid()')
+        return cursor.fetchone()[0]
+
+
+class TestLockKey:
+
+    def test_stable_signed_and_distinct(self, hub_id):
+        key = lock_key(hub_id, 'scheduler')
+        assert key == lock_key(hub_id, 'scheduler')
+        assert -2 ** 63 <= key < 2 ** 63
+        assert key != lock_key(hub_id, 'cloud_sync')
+        assert key != lock_key(str(uuid.uuid4()), 'scheduler')
+
+
+class TestElection:
+
+    def test_one_leader_per_service(self, make_elector):
+        first, second = make_elector(), make_elector()
+        first.step()
+        second.step()
+
+        assert (first.is_leader, second.is_leader) == (True, False)
+        first._start.assert_called_once()
+        second._start.assert_not_called()
+
+        # Renewal keeps leadership
+        first.step()
+        second.step()
+        assert (first.is_leader, second.is_leader) == (True, False)
+        first._start.assert_called_once()
+
+    def test_services_and_hubs_are_independent(self, make_elector):
+        electors = [make_elector('cloud_sync'), make_elector('scheduler'),
+                    make_elector('cloud_sync', hub_id=str(uuid.uuid4()))]
+        for elector in electors:
+            elector.step()
+        assert all(elector.is_leader for elector in electors)
+
+    def test_stepping_down_hands_over(self, make_elector):
+        first, second = make_elector(), make_elector()
+        first.step()
+
+        first._demote('shutdown')
+        first._stop.assert_called_once()
+
+        second.step()
+        assert second.is_leader
+        second._start.assert_called_once()
+
+    def test_failover_when_leader_session_dies(self, make_elector):
+        first, second = make_elector(), make_elector()
+        first.step()
+        second.step()
+
+        # The leader's process (and so its session) goes away
+        with connection.cursor() as cursor:
+            cursor.execute('SELECT pg_terminate_backend(%s)', [_backend_pid(first)])
+
+        second.step()
+        assert second.is_leader
+
+        # The old leader notices on its next renewal and stops its service
+        first.step()
+        assert not first.is_leader
+        first._stop.assert_called_once()
+
+    def test_lease_expires_for_silent_leader(self, make_elector):
+        first, second = make_elector(lease=1), make_elector(lease=1)
+        first.step()
+
+        time.sleep(1.5)  # leader hangs past its lease
+
+        second.step()
+        assert second.is_leader
+
+    def test_start_failure_steps_down(self, make_elector):
+        first, second = make_elector(), make_elector()
+        first._start.side_effect = RuntimeError('boom')
+        first.step()
+        assert not first.is_leader
+
+        second.step()
+        assert second.is_leader
+
+    def test_service_not_started_releases_leadership(self, make_elector):
+        first, second = make_elector(), make_elector()
+        first._start.return_value = False  # e.g. Cloud not configured yet
+        first.step()
+        assert not first.is_leader
+        first._stop.assert_not_called()
+
+        second.step()
+        assert second.is_leader
+
+        # Tried again on a later round
+        second._demote('shutdown')
+        first._start.return_value = None
+        first.step()
+        assert first.is_leader
+
+    def test_lock_key_follows_hub_id(self, make_elector, hub_id):
+        configured = str(uuid.uuid4())
+        with patch.object(leader_election, '_current_hub_id', return_value='unconfigured'):
+            elector = make_elector(hub_id=None)
+            elector.step()
+            assert elector._key == lock_key('unconfigured', 'cloud_sync')
+
+        # Hub configured after startup: step down, then lead under the new id
+        with patch.object(leader_election, '_current_hub_id', return_value=configured):
+            elector.step()
+            assert not elector.is_leader
+            elector._stop.assert_called_once()
+            elector.step()
+            assert elector.is_leader
+            assert elector._key == lock_key(configured, 'cloud_sync')
+
+    def test_thread_elects_and_stops(self, make_elector):
+        elector = make_elector()
+        elector.start()
+        deadline = time.monotonic() + 5
+        while not elector.is_leader and time.monotonic() < deadline:
+            time.sleep(0.05)
+        assert elector.is_leader
+
+        elector.stop()
+        assert not elector.is_leader
+        elector._stop.assert_called_once()
+        assert elector._conn is None
+
+
+class TestRegistry:
+
+    def test_run_as_leader_is_idempotent(self):
+        with patch.object(LeaderElector, 'start') as start, \
+                patch.dict(leader_election._electors, clear=True):
+            first = run_as_leader('scheduler', start=MagicMock())
+            second = run_as_leader('scheduler', start=MagicMock())
+
+            assert first is second
+            assert start.call_count == 2  # start() itself is a no-op while running
+            assert leader_election.get_leadership_status() == {'scheduler': False}
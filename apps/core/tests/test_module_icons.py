@@ -0,0 +1,143 @@
+"""
+Tests for module icon template tags.
+
+Covers icon discovery, memoized SVG rendering, PNG static URLs and the
+module icon view.
+"""
+import os
+import pytest
+
+from apps.core.templatetags import module_icons
+from apps.core.templatetags.module_icons import (
+    clear_icon_cache,
+    find_module_icon,
+    module_icon,
+    module_icon_component,
+    render_svg_icon,
+)
+
+
+SVG = '<svg viewBox="0 0 24 24" width="10" height="10"><path d="M0 0"/></svg>'
+
+
+@pytest.fixture
+def modules_dir(tmp_path, settings):
+    settings.MODULES_DIR = tmp_path
+    settings.DEBUG = True
+    clear_icon_cache()
+    yield tmp_path
+    clear_icon_cache()
+
+
+def _write_icon(modules_dir, module_id, name, content, subdir=None):
+    icons_dir = modules_dir / module_id / 'static' / (subdir or f'{module_id}/icons')
+    icons_dir.mkdir(parents=True, exist_ok=True)
+    path = icons_dir / name
+    if isinstance(content, bytes):
+        path.write_bytes(content)
+    else:
+        path.write_text(content)
+    return path
+
+
+class TestFindModuleIcon:
+
+    def test_no_icon(self, modules_dir):
+        assert find_module_icon('sales') is None
+
+    def test_namespaced_svg(self, modules_dir):
+        path = _write_icon(modules_dir, 'sales', 'icon.svg', SVG)
+        info = find_module_icon('sales')
+        assert info['type'] == 'svg'
+        assert info['path'] == path
+
+    def test_legacy_svg_layout(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.svg', SVG, subdir='icons')
+        assert find_module_icon('sales')['type'] == 'svg'
+
+    def test_invalid_svg_falls_through_to_png(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.svg', 'not an svg')
+        _write_icon(modules_dir, 'sales', 'icon.png', b'\x89PNG')
+        info = find_module_icon('sales')
+        assert info['type'] == 'png'
+        assert info['static_name'] == 'sales/icons/icon.png'
+
+    def test_inactive_module_png_has_no_static_name(self, modules_dir):
+        _write_icon(modules_dir, '_sales', 'icon.png', b'\x89PNG', subdir='sales/icons')
+        info = find_module_icon('sales')
+        assert info['static_name'] is None
+
+
+class TestModuleIconRendering:
+
+    def test_svg_render_is_memoized(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.svg', SVG)
+        module_icon(module_id='sales', size='text-xl')
+        module_icon(module_id='sales', size='text-xl')
+        info = render_svg_icon.cache_info()
+        assert info.hits >= 1
+        assert info.currsize == 1
+
+    def test_svg_mtime_change_invalidates(self, modules_dir):
+        path = _write_icon(modules_dir, 'sales', 'icon.svg', SVG)
+        first = module_icon(module_id='sales')
+        path.write_text(SVG.replace('M0 0', 'M1 1'))
+        stat = path.stat()
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+        second = module_icon(module_id='sales')
+        assert 'M0 0' in first
+        assert 'M1 1' in second
+
+    def test_svg_classes_and_size(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.svg', SVG)
+        html = module_icon(module_id='sales', css_class='text-primary', size='text-3xl')
+        assert 'width="30"' in html
+        assert 'class="text-primary text-3xl"' in html
+
+    def test_png_uses_fingerprinted_static_url(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.png', b'\x89PNG')
+        html = module_icon(module_id='sales')
+        assert 'data:image/png' not in html
+        assert 'sales/icons/icon.png?v=' in html
+
+    @pytest.mark.parametrize('module_dir, subdir', [('sales', 'icons'), ('_sales', 'sales/icons')])
+    def test_unservable_png_uses_icon_view(self, modules_dir, module_dir, subdir):
+        _write_icon(modules_dir, module_dir, 'icon.png', b'\x89PNG', subdir=subdir)
+        html = module_icon(module_id='sales')
+        assert 'data:image/png' not in html
+        assert '/htmx/module-icon/sales.png?v=' in html
+
+    def test_component_png_url(self, modules_dir):
+        _write_icon(modules_dir, 'sales', 'icon.png', b'\x89PNG')
+        context = module_icon_component(module_id='sales')
+        assert context['has_png']
+        assert 'sales/icons/icon.png?v=' in context['png_url']
+        # Raw base64 only for inlined icons, never a URL
+        assert context['png_data'] is None
+
+    def test_missing_icon_falls_back_to_djicons(self, modules_dir, monkeypatch):
+        import djicons
+        monkeypatch.setattr(djicons, 'get', lambda name, css_class='': f'<i>{name}</i>')
+        assert module_icon(module_id='sales', icon='cart-outline') == '<i>cart-outline</i>'
+        assert module_icons.find_module_icon('sales') is None
+
+
+class TestModuleIconView:
+
+    def test_serves_png(self, modules_dir, rf):
+        from apps.core.views import module_icon as module_icon_view
+
+        _write_icon(modules_dir, 'sales', 'icon.png', b'\x89PNG', subdir='icons')
+        response = module_icon_view(rf.get('/htmx/module-icon/sales.png?v=abc'), 'sales')
+        assert response['Content-Type'] == 'image/png'
+        assert 'immutable' in response['Cache-Control']
+        assert b''.join(response.streaming_content) == b'\x89PNG'
+
+    def test_missing_icon(self, modules_dir, rf):
+        from django.http import Http404
+
+        from apps.core.views import module_icon as module_icon_view
+
+        _write_icon(modules_dir, 'sales', 'icon.svg', SVG)
+        with pytest.raises(Http404):
+            module_icon_view(rf.get('/htmx/module-icon/sales.png'), 'sales')
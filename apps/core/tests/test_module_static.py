@@ -0,0 +1,187 @@
+"""
+Tests for the per-module static asset pipeline.
+
+Runs ModuleStaticService against a temporary MODULES_DIR/STATIC_ROOT with
+a manifest storage, checking hashing, manifest merging and compression.
+"""
+import json
+import os
+from unittest.mock import patch
+
+import pytest
+
+from apps.core.services.module_static_service import ModuleStaticService
+
+
+MANIFEST_STORAGE = {
+    'staticfiles': {
+        'BACKEND': 'django.contrib.staticfiles.storage.ManifestStaticFilesStorage',
+    },
+    'default': {
+        'BACKEND': 'django.core.files.storage.FileSystemStorage',
+    },
+}
+
+
+@pytest.fixture
+def static_env(tmp_path, settings):
+    modules_dir = tmp_path / 'modules'
+    static_root = tmp_path / 'staticfiles'
+    modules_dir.mkdir()
+    static_root.mkdir()
+
+    settings.MODULES_DIR = modules_dir
+    settings.STATIC_ROOT = static_root
+    settings.STORAGES = MANIFEST_STORAGE
+
+    # Existing manifest from the image-build collectstatic
+    (static_root / 'css').mkdir()
+    (static_root / 'css' / 'core.css').write_text('body{}')
+    (static_root / 'staticfiles.json').write_text(json.dumps({
+        'paths': {'css/core.css': 'css/core.abc123def456.css'},
+        'version': '1.1',
+    }))
+    return modules_dir, static_root
+
+
+def _write_module_static(modules_dir, module_id, rel, content):
+    path = modules_dir / module_id / 'static' / rel
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(content)
+    return path
+
+
+def _manifest(static_root):
+    return json.loads((static_root / 'staticfiles.json').read_text())['paths']
+
+
+class TestModuleStaticService:
+
+    def test_disabled_without_manifest_storage(self, tmp_path, settings):
+        settings.MODULES_DIR = tmp_path
+        settings.STORAGES = {
+            'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+            'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        }
+        _write_module_static(tmp_path, 'sales', 'sales/js/app.js', 'x')
+        result = ModuleStaticService.collect_module('sales')
+        assert result.skipped
+
+    def test_module_without_static_dir_is_skipped(self, static_env):
+        modules_dir, _ = static_env
+        (modules_dir / 'sales').mkdir()
+        assert ModuleStaticService.collect_module('sales').skipped
+
+    def test_files_are_hashed_and_merged_into_manifest(self, static_env):
+        modules_dir, static_root = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/js/app.js', 'console.log(1)')
+
+        result = ModuleStaticService.collect_module('sales', refresh=False)
+
+        assert result.collected == 1
+        assert result.errors == []
+        paths = _manifest(static_root)
+        # Core entries survive the merge
+        assert paths['css/core.css'] == 'css/core.abc123def456.css'
+        hashed = paths['sales/js/app.js']
+        assert hashed != 'sales/js/app.js'
+        assert (static_root / hashed).exists()
+
+    def test_css_references_are_rewritten(self, static_env):
+        modules_dir, static_root = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/img/logo.png', 'png')
+        _write_module_static(
+            modules_dir, 'sales', 'sales/css/app.css',
+            '.logo{background:url("../img/logo.png")}',
+        )
+
+        ModuleStaticService.collect_module('sales', refresh=False)
+
+        paths = _manifest(static_root)
+        css = (static_root / paths['sales/css/app.css']).read_text()
+        assert paths['sales/img/logo.png'].split('/')[-1] in css
+
+    def test_hidden_files_are_ignored(self, static_env):
+        modules_dir, static_root = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/.DS_Store', 'x')
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'x')
+
+        result = ModuleStaticService.collect_module('sales', refresh=False)
+
+        assert result.collected == 1
+        assert 'sales/.DS_Store' not in _manifest(static_root)
+
+    def test_collect_all_skips_inactive_modules(self, static_env):
+        modules_dir, static_root = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'a')
+        _write_module_static(modules_dir, '_inventory', 'inventory/app.js', 'b')
+
+        results = ModuleStaticService.collect_all()
+
+        assert [r.module_id for r in results] == ['sales']
+        paths = _manifest(static_root)
+        assert 'sales/app.js' in paths
+        assert 'inventory/app.js' not in paths
+
+    def test_refresh_updates_live_manifest(self, static_env):
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        modules_dir, _ = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'a')
+
+        ModuleStaticService.collect_module('sales')
+
+        assert 'sales/app.js' in staticfiles_storage.hashed_files
+
+    def test_whitenoise_compression(self, static_env, settings):
+        modules_dir, static_root = static_env
+        settings.STORAGES = {
+            **MANIFEST_STORAGE,
+            'staticfiles': {
+                'BACKEND': 'whitenoise.storage.CompressedManifestStaticFilesStorage',
+            },
+        }
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'console.log(1);' * 200)
+
+        ModuleStaticService.collect_module('sales', refresh=False)
+
+        hashed = _manifest(static_root)['sales/app.js']
+        assert (static_root / f'{hashed}.gz').exists()
+
+    def test_manifest_is_never_truncated_during_post_process(self, static_env):
+        from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+
+        modules_dir, static_root = static_env
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'a')
+        seen = []
+        original = ManifestStaticFilesStorage.post_process
+
+        def post_process(storage, *args, **kwargs):
+            yield from original(storage, *args, **kwargs)
+            seen.append(_manifest(static_root))
+
+        with patch.object(ManifestStaticFilesStorage, 'post_process', post_process):
+            ModuleStaticService.collect_module('sales', refresh=False)
+
+        assert 'css/core.css' in seen[0]
+        assert 'css/core.css' in _manifest(static_root)
+        assert [p.name for p in static_root.iterdir() if p.name.startswith('.staticfiles-')] == []
+
+    def test_other_process_manifest_is_reloaded(self, static_env, monkeypatch):
+        from django.contrib.staticfiles.storage import staticfiles_storage
+
+        from apps.core.services import module_static_service
+
+        modules_dir, static_root = static_env
+        monkeypatch.setattr(module_static_service, 'MANIFEST_CHECK_INTERVAL', 0)
+        monkeypatch.setitem(module_static_service._manifest_state, 'mtime', None)
+        assert ModuleStaticService.reload_if_changed() is False  # records the mtime
+
+        # Another worker collects a module
+        _write_module_static(modules_dir, 'sales', 'sales/app.js', 'a')
+        ModuleStaticService.collect_module('sales', refresh=False)
+        os.utime(static_root / 'staticfiles.json', ns=(1, 1))
+
+        assert ModuleStaticService.reload_if_changed() is True
+        assert 'sales/app.js' in staticfiles_storage.hashed_files
+        assert ModuleStaticService.reload_if_changed() is False
@@ -0,0 +1,193 @@
+"""
+Tests for non-blocking module subscription checks.
+
+Cloud calls are patched; the tests check that requests are served from
+cache/DB, that refreshes are batched and persisted, and the grace policy.
+"""
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+from django.core.cache import cache
+from django.utils import timezone
+
+from apps.core.middleware import module_subscription as ms
+from apps.core.models import ModuleSubscriptionState
+
+HUB = 'hub-1'
+TOKEN = 'token'
+CLOUD_GET = 'apps.core.services.cloud_http.get'
+
+
+def _clear_status_cache():
+    cache.delete_many([
+        f'{prefix}{HUB}:{m}'
+        for prefix in (ms._CK_SUB_STATUS, ms._CK_SUB_CONFIRM) for m in ('tobacco', 'assistant')
+    ])
+
+
+@pytest.fixture(autouse=True)
+def clean_cache():
+    _clear_status_cache()
+    ms._refresh_failed_at = 0.0
+    yield
+    _clear_status_cache()
+
+
+def _response(payload, status_code=200):
+    response = MagicMock(status_code=status_code)
+    response.json.return_value = payload
+    return response
+
+
+@pytest.mark.django_db
+class TestRefresh:
+
+    def test_batched_call_persists_statuses(self):
+        payload = {'subscriptions': {
+            'tobacco': {'status': 'active'},
+            'assistant': {'status': 'expired'},
+        }}
+        with patch(CLOUD_GET, return_value=_response(payload)) as get:
+            stored = ms.refresh_subscription_statuses(['tobacco', 'assistant'], HUB, TOKEN)
+
+        assert stored == 2
+        assert get.call_count == 1
+        assert get.call_args.kwargs['params'] == {'modules': 'tobacco,assistant'}
+        states = dict(ModuleSubscriptionState.objects.values_list('module_id', 'status'))
+        assert states == {'tobacco': 'active', 'assistant': 'expired'}
+
+    def test_falls_back_to_per_module_calls(self):
+        responses = [_response({}), _response({'status': 'trialing'})]
+        with patch(CLOUD_GET, side_effect=responses) as get:
+            ms.refresh_subscription_statuses(['tobacco'], HUB, TOKEN)
+
+        assert get.call_count == 2
+        assert ModuleSubscriptionState.objects.get(module_id='tobacco').status == 'trialing'
+
+    def test_network_error_keeps_last_known_status(self):
+        ModuleSubscriptionState.objects.create(
+            hub_id=HUB, module_id='tobacco', status='active', checked_at=timezone.now(),
+        )
+        with patch(CLOUD_GET, side_effect=ConnectionError('down')):
+            assert ms.refresh_subscription_statuses(['tobacco'], HUB, TOKEN) == 0
+
+        assert ModuleSubscriptionState.objects.get(module_id='tobacco').status == 'active'
+
+
+@pytest.mark.django_db
+class TestGetSubscriptionStatus:
+
+    def test_fresh_status_does_not_refresh(self):
+        ModuleSubscriptionState.objects.create(
+            hub_id=HUB, module_id='tobacco', status='active', checked_at=timezone.now(),
+        )
+        with patch.object(ms, '_schedule_refresh') as schedule, patch(CLOUD_GET) as get:
+            assert ms.get_subscription_status('tobacco', HUB, TOKEN) == 'active'
+
+        schedule.assert_not_called()
+        get.assert_not_called()
+
+    def test_stale_status_is_served_while_refreshing(self):
+        ModuleSubscriptionState.objects.create(
+            hub_id=HUB, module_id='tobacco', status='expired',
+            checked_at=timezone.now() - timedelta(hours=1),
+        )
+        with patch.object(ms, '_schedule_refresh') as schedule:
+            assert ms.get_subscription_status('tobacco', HUB, TOKEN) == 'expired'
+
+        schedule.assert_called_once_with(HUB, TOKEN)
+
+    def test_never_confirmed_is_unconfirmed(self):
+        with patch.object(ms, '_schedule_refresh') as schedule:
+            assert ms.get_subscription_status('tobacco', HUB, TOKEN) == 'unconfirmed'
+        schedule.assert_called_once()
+
+    def test_status_older_than_grace_is_unknown(self, settings):
+        settings.MODULE_SUBSCRIPTION_GRACE_HOURS = 1
+        ModuleSubscriptionState.objects.create(
+            hub_id=HUB, module_id='tobacco', status='active',
+            checked_at=timezone.now() - timedelta(hours=2),
+        )
+        with patch.object(ms, '_schedule_refresh'):
+            assert ms.get_subscription_status('tobacco', HUB, TOKEN) == 'unknown'
+
+    def test_invalidate_marks_stale(self):
+        ModuleSubscriptionState.objects.create(
+            hub_id=HUB, module_id='tobacco', status='none', checked_at=timezone.now(),
+        )
+        with patch.object(ms, '_schedule_refresh') as schedule, \
+                patch.object(ms, '_get_hub_credentials', return_value=(HUB, TOKEN)):
+            ms.get_subscription_status('tobacco', HUB, TOKEN)
+            schedule.assert_not_called()
+
+            ms.invalidate_subscription_cache('tobacco')
+            assert ms.get_subscription_status('tobacco', HUB, TOKEN) == 'none'
+            schedule.assert_called_once()
+
+
+class TestGracePolicy:
+
+    def test_paid_statuses_are_allowed(self):
+        assert ms.is_status_allowed('active')
+        assert ms.is_status_allowed('trialing')
+        assert not ms.is_status_allowed('expired')
+        assert not ms.is_status_allowed('none')
+
+    def test_unknown_follows_policy(self, settings):
+        settings.MODULE_SUBSCRIPTION_UNKNOWN_POLICY = 'allow'
+        assert ms.is_status_allowed('unknown')
+        settings.MODULE_SUBSCRIPTION_UNKNOWN_POLICY = 'deny'
+        assert not ms.is_status_allowed('unknown')
+
+    def test_unconfirmed_is_always_denied(self, settings):
+        settings.MODULE_SUBSCRIPTION_UNKNOWN_POLICY = 'allow'
+        assert not ms.is_status_allowed('unconfirmed')
+
+    def test_is_module_paid_follows_policy(self, settings):
+        settings.MODULE_SUBSCRIPTION_UNKNOWN_POLICY = 'allow'
+        with patch.object(ms, '_is_premium_module', return_value=True), \
+                patch.object(ms, 'get_subscription_status', return_value='unknown'):
+            assert ms.is_module_paid('tobacco')
+        with patch.object(ms, '_is_premium_module', return_value=True), \
+                patch.object(ms, 'get_subscription_status', return_value='unconfirmed'):
+            assert not ms.is_module_paid('tobacco')
+
+
+@pytest.mark.django_db
+class TestMiddleware:
+
+    def _process(self, schedule=None):
+        from django.test import RequestFactory
+
+        request = RequestFactory().get('/m/tobacco/')
+        request.session = {'local_user_id': 'user-1'}
+        request.resolver_match = MagicMock(namespace='tobacco')
+        with patch.object(ms, '_is_premium_module', return_value=True), \
+                patch.object(ms, '_get_hub_credentials', return_value=(HUB, TOKEN)), \
+                patch.object(ms, 'classify_request', return_value=MagicMock(module_id='tobacco')), \
+                patch.object(ms, '_schedule_refresh', schedule or MagicMock()):
+            return ms.ModuleSubscriptionMiddleware(lambda r: None).process_view(request, None, (), {})
+
+    def test_first_access_confirms_with_cloud(self):
+        payload = {'subscriptions': {'tobacco': {'status': 'active'}}}
+        with patch(CLOUD_GET, return_value=_response(payload)) as get:
+            assert self._process() is None
+        get.assert_called_once()
+
+    def test_first_access_denied_when_cloud_cannot_confirm(self):
+        with patch(CLOUD_GET, side_effect=ConnectionError('down')):
+            response = self._process()
+        assert response.status_code == 302
+        assert '/pricing/' in response.url
+
+    def test_failed_confirmation_is_not_repeated(self):
+        schedule = MagicMock()
+        with patch(CLOUD_GET, side_effect=ConnectionError('down')) as get:
+            assert self._process(schedule).status_code == 302
+            assert self._process(schedule).status_code == 302
+        # One Cloud call for both requests; the first does not also start a
+        # background refresh, and later ones back off after the failure
+        get.assert_called_once()
+        assert schedule.call_count == 1
+        assert ms._refresh_failed_at > 0
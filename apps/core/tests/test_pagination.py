@@ -0,0 +1,191 @@
+"""
+Tests for keyset (cursor) pagination: apps/core/pagination.py and
+InfiniteScrollPaginator(mode='cursor').
+"""
+import uuid
+from datetime import timedelta
+
+import pytest
+from django.test import RequestFactory
+from django.http import HttpResponse
+from django.utils import timezone
+from unittest.mock import patch
+
+from apps.accounts.models import LocalUser, Role
+from apps.core.htmx import InfiniteScrollPaginator, infinite_scroll_view
+from apps.core.pagination import decode_cursor, estimate_count, keyset_page
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture
+def users():
+    """25 users in one hub; names repeat and half have no last_login."""
+    hub_id = uuid.uuid4()
+    now = timezone.now()
+    LocalUser.objects.bulk_create([
+        LocalUser(
+            hub_id=hub_id,
+            name=f'User {i // 3:02d}',
+            email=f'user{i}@example.com',
+            pin_hash='',
+            last_login=now - timedelta(hours=i) if i % 2 else None,
+        )
+        for i in range(25)
+    ])
+    return LocalUser.objects.filter(hub_id=hub_id)
+
+
+def _walk(queryset, per_page, **kwargs):
+    """Every page of queryset, following next_cursor."""
+    pages, cursor = [], None
+    while True:
+        page = keyset_page(queryset, per_page, cursor=cursor, **kwargs)
+        pages.append(page)
+        cursor = page['next_cursor']
+        if cursor is None:
+            return pages
+
+
+class TestKeysetPage:
+
+    @pytest.mark.parametrize('ordering', [
+        ('name',),
+        ('-name',),
+        ('last_login',),
+        ('-last_login',),
+        ('-last_login', 'name'),
+    ])
+    def test_pages_match_offset_pagination(self, users, ordering):
+        queryset = users.order_by(*ordering)
+        expected = list(queryset.order_by(*ordering, 'pk').values_list('pk', flat=True))
+
+        pages = _walk(queryset, per_page=7)
+
+        assert [obj.pk for page in pages for obj in page['items']] == expected
+        assert [len(page['items']) for page in pages] == [7, 7, 7, 4]
+        assert [page['page_number'] for page in pages] == [1, 2, 3, 4]
+        assert [page['offset'] for page in pages] == [0, 7, 14, 21]
+
+    def test_foreign_key_orders_by_its_column(self, users):
+        hub_id = users.first().hub_id
+        # Role names sort opposite to their ids
+        roles = sorted(
+            (Role.objects.create(hub_id=hub_id, name=f'role-{i}') for i in range(3)),
+            key=lambda role: role.pk, reverse=True,
+        )
+        for i, user in enumerate(users):
+            user.role_obj = roles[i % 3] if i % 4 else None
+            user.save(update_fields=['role_obj'])
+        queryset = users.order_by('role_obj')
+
+        pages = _walk(queryset, per_page=4)
+
+        expected = list(users.order_by('role_obj_id', 'pk').values_list('pk', flat=True))
+        assert [obj.pk for page in pages for obj in page['items']] == expected
+
+    def test_reverse_relation_ordering_is_rejected(self, users):
+        with pytest.raises(ValueError):
+            keyset_page(users.order_by('trusted_devices'), 10)
+
+    def test_model_ordering_is_default(self, users):
+        pages = _walk(users.order_by(), per_page=10)
+        names = [obj.name for page in pages for obj in page['items']]
+        assert names == sorted(names)
+        assert len(names) == 25
+
+    def test_exact_count_runs_once(self, users, django_assert_num_queries):
+        first = keyset_page(users.order_by('name'), 10)
+        assert first['total_count'] == 25
+
+        # Later pages: the page query only, total carried in the cursor
+        with django_assert_num_queries(1):
+            second = keyset_page(users.order_by('name'), 10, cursor=first['next_cursor'])
+        assert second['total_count'] == 25
+
+    def test_last_page_fetches_one_extra_row(self, users):
+        page = keyset_page(users.order_by('name'), 25, count=None)
+        assert len(page['items']) == 25
+        assert page['next_cursor'] is None
+        assert page['total_count'] is None
+
+    def test_capped_count(self, users):
+        page = keyset_page(users.order_by('name'), 10, count='capped', count_cap=20)
+        assert page['total_count'] == 20
+        assert page['total_count_capped'] is True
+
+        page = keyset_page(users.order_by('name'), 10, count='capped', count_cap=50)
+        assert page['total_count'] == 25
+        assert page['total_count_capped'] is False
+
+    def test_estimated_count(self, users):
+        estimate = estimate_count(users)
+        assert isinstance(estimate, int)
+        assert estimate >= 0
+
+    @pytest.mark.parametrize('cursor', ['garbage', 'a:b:c', ''])
+    def test_invalid_cursor_starts_over(self, users, cursor):
+        page = keyset_page(users.order_by('name'), 10, cursor=cursor)
+        assert page['page_number'] == 1
+        assert page['offset'] == 0
+
+    def test_cursor_for_other_ordering_is_rejected(self, users):
+        cursor = keyset_page(users.order_by('name'), 10)['next_cursor']
+        assert decode_cursor(users.order_by('name'), cursor) is not None
+        assert decode_cursor(users.order_by('-last_login', 'name'), cursor) is None
+
+    def test_random_ordering_is_rejected(self, users):
+        with pytest.raises(ValueError):
+            keyset_page(users.order_by('?'), 10)
+
+
+class TestCursorPaginator:
+
+    def test_get_page(self, users):
+        paginator = InfiniteScrollPaginator(users.order_by('name'), per_page=10, mode='cursor')
+
+        first = paginator.get_page(1)
+        assert first['is_first_page'] is True
+        assert first['has_next'] is True
+        assert first['total_count'] == 25
+        assert first['total_pages'] == 3
+        assert (first['start_index'], first['end_index']) == (1, 10)
+
+        second = paginator.get_page(first['next_page'])
+        assert second['is_first_page'] is False
+        assert second['page_number'] == 2
+        assert (second['start_index'], second['end_index']) == (11, 20)
+
+        third = paginator.get_page(second['next_page'])
+        assert third['has_next'] is False
+        assert third['next_page'] is None
+        assert (third['start_index'], third['end_index']) == (21, 25)
+
+        seen = {obj.pk for page in (first, second, third) for obj in page['items']}
+        assert len(seen) == 25
+
+    def test_without_count(self, users):
+        paginator = InfiniteScrollPaginator(users, per_page=10, mode='cursor', count=None)
+        page = paginator.get_page(None)
+        assert page['total_count'] is None
+        assert page['total_pages'] is None
+        assert page['has_next'] is True
+
+    def test_invalid_options(self, users):
+        with pytest.raises(ValueError):
+            InfiniteScrollPaginator(users, mode='seek')
+        with pytest.raises(ValueError):
+            InfiniteScrollPaginator(users, mode='cursor', count='approximate')
+
+    def test_view_renders_items_template_for_cursor(self, users):
+        cursor = InfiniteScrollPaginator(users, per_page=10, mode='cursor').get_page(1)['next_page']
+
+        @infinite_scroll_view('full.html', 'partial.html', 'items.html')
+        def my_view(request):
+            return {}
+
+        request = RequestFactory().get('/test/', {'page': cursor}, HTTP_HX_REQUEST='true')
+        with patch('apps.core.htmx.render') as mock_render:
+            mock_render.return_value = HttpResponse('items')
+            my_view(request)
+        assert mock_render.call_args[0][1] == 'items.html'
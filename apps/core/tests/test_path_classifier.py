@@ -0,0 +1,84 @@
+"""
+Tests for the shared path classifier used by the auth/SSO/setup middlewares.
+"""
+import pytest
+from django.test import RequestFactory
+
+from apps.core.path_classifier import (
+    SCOPE_AUTH,
+    SCOPE_SETUP,
+    SCOPE_SSO,
+    PathClassifier,
+    classify_request,
+    path_classifier,
+)
+
+
+@pytest.fixture
+def classifier():
+    c = PathClassifier(cache_size=16)
+    c.register(SCOPE_AUTH, prefixes=['/static/', '/api/'], exact=['/login/'])
+    c.register(SCOPE_SSO, prefixes=['/static/', '/login/', '/htmx/'])
+    return c
+
+
+class TestPathClassifier:
+
+    def test_prefix_matches_collect_all_scopes(self, classifier):
+        info = classifier.classify('/static/css/app.css')
+        assert info.is_exempt(SCOPE_AUTH)
+        assert info.is_exempt(SCOPE_SSO)
+
+    def test_exact_match_is_not_a_prefix(self, classifier):
+        assert classifier.classify('/login/').is_exempt(SCOPE_AUTH)
+        assert not classifier.classify('/login/extra/').is_exempt(SCOPE_AUTH)
+        # ...while another scope registered it as a prefix
+        assert classifier.classify('/login/extra/').is_exempt(SCOPE_SSO)
+
+    def test_unmatched_path(self, classifier):
+        info = classifier.classify('/settings/')
+        assert info.exempt == frozenset()
+        assert info.module_id == ''
+
+    def test_module_id(self, classifier):
+        assert classifier.classify('/m/sales/orders/1/').module_id == 'sales'
+        assert classifier.classify('/m/sales').module_id == 'sales'
+        assert classifier.classify('/m/').module_id == ''
+
+    def test_results_are_cached_per_path(self, classifier):
+        assert classifier.classify('/settings/') is classifier.classify('/settings/')
+
+    def test_register_rebuilds_and_clears_cache(self, classifier):
+        before = classifier.classify('/files/')
+        classifier.register(SCOPE_SETUP, prefixes=['/files/'])
+        after = classifier.classify('/files/')
+        assert after is not before
+        assert after.is_exempt(SCOPE_SETUP)
+
+    def test_unknown_path_is_not_public(self, classifier):
+        info = classifier.classify('/definitely-not-a-route/')
+        assert info.resolver_match is None
+        assert not info.is_public
+
+
+class TestClassifyRequest:
+
+    def test_request_is_tagged_once(self):
+        request = RequestFactory().get('/m/inventory/')
+        info = classify_request(request)
+        assert request.path_class is info
+        assert classify_request(request) is info
+        assert info.module_id == 'inventory'
+
+    def test_middlewares_share_the_classifier(self):
+        from apps.accounts.middleware import JWTMiddleware
+        from apps.core.middleware import CloudSSOMiddleware
+
+        JWTMiddleware(lambda r: None)
+        CloudSSOMiddleware(lambda r: None)
+
+        info = path_classifier.classify('/verify-pin/')
+        assert info.is_exempt(SCOPE_AUTH)
+        assert info.is_exempt(SCOPE_SSO)
+        assert not path_classifier.classify('/htmx/sidebar/').is_exempt(SCOPE_AUTH)
+        assert path_classifier.classify('/htmx/sidebar/').is_exempt(SCOPE_SSO)
@@ -0,0 +1,244 @@
+"""
+Tests for the sliding-window rate limiter.
+
+Limiters run on a LocMemCache alias with time.time patched, so windows
+and lockouts can be stepped through without sleeping.
+"""
+import json
+import threading
+from unittest.mock import patch
+
+import pytest
+import responses
+from django.core.cache import caches
+from django.test import RequestFactory
+
+from apps.auth.login.views import cloud_login
+from apps.core.services.rate_limiter import CLOUD_LOGIN, RateLimit, RateLimiter, client_ip, login_identity
+
+NOW = 960_000.0  # start of a 60 s bucket
+
+
+@pytest.fixture
+def limiter_cache(settings):
+    settings.CACHES = {
+        **settings.CACHES,
+        'ratelimit': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'rate-limiter-tests',
+        },
+    }
+    cache = caches['ratelimit']
+    cache.clear()
+    yield cache
+    cache.clear()
+
+
+@pytest.fixture
+def clock():
+    with patch('apps.core.services.rate_limiter.time.time') as now:
+        now.return_value = NOW
+        yield now
+
+
+def _limiter(**policy):
+    policy = {'name': 'test', 'limit': 3, 'window': 60, **policy}
+    return RateLimiter(RateLimit(**policy), cache_alias='ratelimit')
+
+
+class TestSlidingWindow:
+
+    def test_denies_after_limit(self, limiter_cache, clock):
+        limiter = _limiter()
+        for _ in range(3):
+            decision = limiter.check('user-1')
+            assert decision.allowed
+            limiter.hit('user-1', decision)
+
+        decision = limiter.check('user-1')
+        assert not decision.allowed
+        assert not decision.locked
+        # The 3 attempts must decay to 2 in the next bucket: 60 s + 20 s
+        assert decision.retry_after == 80
+        # Other identities are unaffected
+        assert limiter.check('user-2').allowed
+
+    def test_check_is_one_round_trip(self, limiter_cache, clock):
+        limiter = _limiter()
+        with patch.object(limiter_cache, 'get_many', wraps=limiter_cache.get_many) as get_many:
+            limiter.check('user-1')
+        assert get_many.call_count == 1
+
+    def test_previous_bucket_decays(self, limiter_cache, clock):
+        limiter = _limiter()
+        for _ in range(3):
+            limiter.hit('user-1')
+
+        # Half-way through the next bucket: 3 * 0.5 = 1.5, rounded up to 2
+        clock.return_value = NOW + 90
+        decision = limiter.check('user-1')
+        assert decision.allowed
+        assert decision.count == 2
+        assert decision.remaining == 1
+
+    def test_no_extra_attempt_after_bucket_boundary(self, limiter_cache, clock):
+        limiter = _limiter()
+        clock.return_value = NOW + 59
+        for _ in range(3):
+            limiter.hit('user-1')
+
+        # 2.95 weighted attempts would let a 4th one in two seconds later
+        clock.return_value = NOW + 61
+        decision = limiter.check('user-1')
+        assert not decision.allowed
+        clock.return_value = NOW + 61 + decision.retry_after
+        assert limiter.check('user-1').allowed
+
+    def test_reset_clears_attempts(self, limiter_cache, clock):
+        limiter = _limiter()
+        for _ in range(3):
+            limiter.hit('user-1')
+        limiter.reset('user-1')
+        assert limiter.check('user-1').allowed
+
+    def test_consume_counts_allowed_requests(self, limiter_cache, clock):
+        limiter = _limiter()
+        assert all(limiter.consume('ip').allowed for _ in range(3))
+        assert not limiter.consume('ip').allowed
+
+
+class TestLockout:
+
+    def test_lockout_with_backoff(self, limiter_cache, clock):
+        limiter = _limiter(lockout=100, backoff=2)
+        for _ in range(3):
+            decision = limiter.hit('user-1')
+        assert decision.locked
+        assert decision.retry_after == 100
+
+        # Lock and window both expired: the next lockout lasts twice as long
+        clock.return_value = NOW + 300
+        assert limiter.check('user-1').allowed
+        for _ in range(3):
+            decision = limiter.hit('user-1')
+        assert decision.locked
+        assert decision.retry_after == 200
+
+        clock.return_value = NOW + 350
+        decision = limiter.check('user-1')
+        assert decision.locked
+        assert decision.retry_after == 150
+
+    def test_lockout_is_capped(self, limiter_cache, clock):
+        limiter = _limiter(limit=1, lockout=100, backoff=10, max_lockout=500)
+        limiter.hit('user-1')
+        clock.return_value = NOW + 200
+        assert limiter.hit('user-1').retry_after == 500
+
+
+class TestConcurrency:
+
+    def test_concurrent_hits_are_not_lost(self, limiter_cache, clock):
+        limiter = _limiter(limit=1000)
+        barrier = threading.Barrier(8)
+
+        def attempt():
+            barrier.wait()
+            for _ in range(25):
+                limiter.hit('user-1')
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert limiter.check('user-1').count == 200
+
+
+@pytest.mark.django_db(transaction=True)
+class TestConfiguredBackend:
+    """The limiters' own cache alias, as configured for the deployment."""
+
+    def test_concurrent_hits_are_not_lost(self, clock):
+        from django.db import connections
+
+        limiter = RateLimiter(RateLimit('test-configured', limit=1000, window=60))
+        limiter.reset('user-1')
+        barrier = threading.Barrier(8)
+
+        def attempt():
+            barrier.wait()
+            try:
+                for _ in range(25):
+                    limiter.hit('user-1')
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=attempt) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        try:
+            assert limiter.check('user-1').count == 200
+        finally:
+            limiter.reset('user-1')
+
+
+class TestClientIp:
+
+    def _request(self, forwarded=None):
+        headers = {'HTTP_X_FORWARDED_FOR': forwarded} if forwarded else {}
+        return RequestFactory().get('/', REMOTE_ADDR='10.0.0.1', **headers)
+
+    def test_without_proxy_uses_remote_addr(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 0
+        assert client_ip(self._request('6.6.6.6')) == '10.0.0.1'
+
+    def test_spoofed_entries_are_ignored(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 1
+        assert client_ip(self._request('6.6.6.6, 203.0.113.7')) == '203.0.113.7'
+        settings.TRUSTED_PROXY_COUNT = 2
+        assert client_ip(self._request('6.6.6.6, 203.0.113.7, 10.0.0.9')) == '203.0.113.7'
+
+    def test_missing_hops_fall_back_to_remote_addr(self, settings):
+        settings.TRUSTED_PROXY_COUNT = 2
+        assert client_ip(self._request('203.0.113.7')) == '10.0.0.1'
+        assert client_ip(self._request()) == '10.0.0.1'
+
+
+@pytest.mark.django_db
+class TestCloudLogin:
+
+    EMAIL = ' Owner@Example.com '
+
+    @pytest.fixture(autouse=True)
+    def reset(self, settings):
+        settings.CLOUD_API_URL = 'https://cloud.test'
+        CLOUD_LOGIN.reset(login_identity(self.EMAIL))
+        yield
+        CLOUD_LOGIN.reset(login_identity(self.EMAIL))
+
+    def _login(self, ip):
+        request = RequestFactory().post(
+            '/cloud-login/', json.dumps({'email': self.EMAIL, 'password': 'x'}),
+            content_type='application/json', REMOTE_ADDR=ip,
+        )
+        return json.loads(cloud_login(request).content)
+
+    @responses.activate
+    def test_failures_are_counted_per_email(self):
+        responses.add(responses.POST, 'https://cloud.test/api/auth/login/', status=401)
+        for i in range(5):
+            assert self._login(f'10.0.0.{i}')['error'] == 'Invalid credentials'
+        assert self._login('10.0.0.99').get('locked')
+        assert login_identity(self.EMAIL) == 'owner@example.com'
+
+    @responses.activate
+    def test_cloud_errors_are_not_failed_attempts(self):
+        responses.add(responses.POST, 'https://cloud.test/api/auth/login/', status=503)
+        for _ in range(6):
+            assert not self._login('10.0.0.1').get('locked')
+        assert CLOUD_LOGIN.check(login_identity(self.EMAIL)).count == 0
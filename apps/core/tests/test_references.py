@@ -177,3 +177,89 @@ class TestClearCache:
 
         # Cleanup
         _relationship_cache.clear()
+
+
+@pytest.mark.django_db
+class TestGetReferenceCounts:
+    """Tests for the batch API (one grouped query per relation)."""
+
+    @pytest.fixture
+    def roles(self):
+        import uuid
+        from apps.accounts.models import LocalUser, Role
+
+        clear_cache()
+        hub_id = uuid.uuid4()
+        roles = Role.objects.bulk_create([
+            Role(hub_id=hub_id, name=f'role{i}', display_name=f'Role {i}') for i in range(3)
+        ])
+        LocalUser.objects.bulk_create([
+            LocalUser(hub_id=hub_id, name=f'User {i}', email=f'u{i}@example.com',
+                      pin_hash='', role_obj=roles[i % 2], is_deleted=(i == 4))
+            for i in range(5)
+        ])
+        return roles
+
+    def _group(self, refs, model_name):
+        return next(g for g in refs['groups'] if g['model_name'] == model_name)
+
+    def test_counts_for_many_objects(self, roles):
+        from apps.core.references import get_reference_counts
+
+        refs = get_reference_counts(roles)
+
+        assert set(refs) == {role.pk for role in roles}
+        users = self._group(refs[roles[0].pk], 'LocalUser')
+        assert users['count'] == 2  # the soft-deleted user is excluded
+        assert users['on_delete'] == 'SET_NULL'
+        assert users['items'] == []
+        assert refs[roles[0].pk]['set_null_count'] == 2
+        assert self._group(refs[roles[1].pk], 'LocalUser')['count'] == 2
+        assert refs[roles[2].pk]['total_count'] == 0
+
+    def test_include_deleted(self, roles):
+        from apps.core.references import get_reference_counts
+
+        refs = get_reference_counts(roles, include_deleted=True)
+        assert self._group(refs[roles[0].pk], 'LocalUser')['count'] == 3
+
+    def test_item_samples(self, roles):
+        from apps.core.references import get_reference_counts
+
+        refs = get_reference_counts(roles, max_items=1)
+        users = self._group(refs[roles[0].pk], 'LocalUser')
+        assert [u.name for u in users['items']] == ['User 0']
+        assert users['has_more'] is True
+
+    def test_query_count_does_not_grow_with_objects(self, roles, django_assert_max_num_queries):
+        from apps.core.references import _build_relationship_map, get_reference_counts
+
+        relations = len(_build_relationship_map(type(roles[0])))
+        with django_assert_max_num_queries(relations * 2):
+            get_reference_counts(roles, max_items=5)
+
+    def test_matches_get_references(self, roles):
+        from apps.core.references import get_reference_counts
+
+        single = get_references(roles[1])
+        batch = get_reference_counts(roles, max_items=5)[roles[1].pk]
+        assert single['total_count'] == batch['total_count']
+        assert [(g['model_name'], g['count']) for g in single['groups']] == \
+            [(g['model_name'], g['count']) for g in batch['groups']]
+
+    def test_protected_only(self, roles):
+        from apps.accounts.models import LocalUser
+        from apps.core.references import can_delete_many, get_reference_counts
+
+        assert get_reference_counts(roles, protected_only=True)[roles[0].pk]['groups'] == []
+        assert all(can_delete_many(roles).values())
+
+        remote_field = LocalUser._meta.get_field('role_obj').remote_field
+        with patch.object(remote_field, 'on_delete', models.PROTECT):
+            deletable = can_delete_many(roles)
+        assert deletable == {roles[0].pk: False, roles[1].pk: False, roles[2].pk: True}
+
+    def test_empty(self):
+        from apps.core.references import get_reference_counts
+
+        assert get_reference_counts([]) == {}
@@ -0,0 +1,143 @@
+"""
+Tests for the chooser search backends (apps/core/search.py).
+"""
+import time
+import uuid
+
+import pytest
+from django.db import connection
+
+from apps.accounts.models import LocalUser
+from apps.core import search as search_module
+from apps.core.chooser import ChooserConfig
+from apps.core.pagination import keyset_page
+from apps.core.search import (
+    RANK, TRIGRAM_CHECK_INTERVAL, create_search_indexes, get_search_backend, is_text_field, normalize,
+    search, trigram_available,
+)
+
+pytestmark = pytest.mark.django_db
+
+NAMES = ['Ana Núñez', 'Nuñez Pérez', 'Ananías Gómez', 'Mariana Ruiz', 'Pedro Sánchez']
+
+
+@pytest.fixture
+def users():
+    hub_id = uuid.uuid4()
+    LocalUser.objects.bulk_create([
+        LocalUser(hub_id=hub_id, name=name, email=f'{i:04d}@example.com', pin_hash='')
+        for i, name in enumerate(NAMES)
+    ])
+    return LocalUser.objects.filter(hub_id=hub_id).order_by('name')
+
+
+@pytest.fixture
+def trigram(db):
+    """pg_trgm, hub_unaccent() and indexes inside the test transaction."""
+    search_module._trigram_ready.clear()
+    create_search_indexes(connection, LocalUser._meta.db_table, ['name', 'email'])
+    yield
+    search_module._trigram_ready.clear()
+
+
+def _names(queryset):
+    return [user.name for user in queryset]
+
+
+def test_normalize():
+    assert normalize('Núñez-Çelik') == 'NUNEZ-CELIK'
+
+
+def test_is_text_field():
+    assert is_text_field(LocalUser, 'name')
+    assert is_text_field(LocalUser, 'email')
+    assert not is_text_field(LocalUser, 'hub_id')
+    assert not is_text_field(LocalUser, 'missing')
+
+
+def test_auto_falls_back_to_basic_without_extensions():
+    search_module._trigram_ready.clear()
+    try:
+        assert get_search_backend('auto', 'default').name == 'basic'
+        with pytest.raises(ValueError):
+            get_search_backend('elastic', 'default')
+    finally:
+        search_module._trigram_ready.clear()
+
+
+class TestBasicBackend:
+
+    def test_filters_and_ranks(self, users):
+        results = search(users, 'ana', ['name'], backend='basic', rank=True)
+        # Prefix matches first, then the rest by name
+        assert _names(results) == ['Ana Núñez', 'Ananías Gómez', 'Mariana Ruiz']
+        assert [getattr(u, RANK) for u in results] == [1.0, 1.0, 0.0]
+
+    def test_prefix_fields(self, users):
+        results = search(users, '000', [], prefix_fields=['email'], backend='basic')
+        assert len(results) == 5
+        assert not search(users, '00@', [], prefix_fields=['email'], backend='basic').exists()
+
+    def test_empty_query(self, users):
+        assert search(users, '', ['name']) is users
+
+
+@pytest.mark.skipif(connection.vendor != 'postgresql', reason='pg_trgm is PostgreSQL only')
+class TestTrigramBackend:
+
+    def test_auto_uses_trigram(self, trigram):
+        assert get_search_backend('auto', 'default').name == 'trigram'
+
+    def test_accent_insensitive(self, trigram, users):
+        assert _names(search(users, 'nunez', ['name'])) == ['Ana Núñez', 'Nuñez Pérez']
+
+    def test_tolerates_typos(self, trigram, users):
+        assert 'Pedro Sánchez' in _names(search(users, 'sanches', ['name']))
+
+    def test_ranked_best_first(self, trigram, users):
+        results = search(users, 'nunez', ['name'], rank=True)
+        # Both match the word fully; the prefix match wins
+        assert _names(results)[0] == 'Nuñez Pérez'
+
+    def test_prefix_fields_rank_first(self, trigram, users):
+        results = search(users, '0004', ['name'], prefix_fields=['email'], rank=True)
+        assert _names(results)[0] == 'Pedro Sánchez'
+
+    def test_setup_is_checked_again(self, trigram):
+        search_module._trigram_ready['default'] = (False, time.monotonic())
+        assert not trigram_available('default')
+
+        # Extensions created since the last check are picked up
+        search_module._trigram_ready['default'] = (False, time.monotonic() - TRIGRAM_CHECK_INTERVAL)
+        assert trigram_available('default')
+
+    def test_non_text_fields_use_icontains(self, trigram, users):
+        user = users.first()
+        results = search(users, str(user.hub_id)[:8], ['name', 'hub_id'], prefix_fields=['id'], rank=True)
+        assert len(results) == len(NAMES)
+        sql = str(results.query)
+        assert 'hub_unaccent("accounts_local_users"."name")' in sql
+        assert 'hub_unaccent("accounts_local_users"."hub_id")' not in sql
+        assert 'hub_unaccent("accounts_local_users"."id")' not in sql
+
+    def test_uses_trigram_index(self, trigram, users):
+        with connection.cursor() as cursor:
+            # Tiny table: make the planner show which index it can use
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute('SET LOCAL enable_indexscan = off')
+        plan = search(LocalUser.all_objects.all(), 'nunez', ['name']).order_by().explain()
+        assert '_trgm' in plan
+
+    def test_keyset_pages_over_rank(self, trigram, users):
+        results = search(users, 'a', ['name'], prefix_fields=['email'], rank=True)
+        first = keyset_page(results, 2)
+        rest = keyset_page(results, 10, cursor=first['next_cursor'])
+        paged = [u.pk for u in first['items'] + rest['items']]
+        assert paged == [u.pk for u in results.order_by(f'-{RANK}', 'name', 'pk')]
+
+
+def test_chooser_config_search(users):
+    config = ChooserConfig(model=LocalUser, search_fields=['name'], search_backend='basic')
+    assert _names(config.search(users, 'ruiz')) == ['Mariana Ruiz']
+    with pytest.raises(ValueError):
+        ChooserConfig(model=LocalUser, search_fields=['name'], search_backend='solr')
@@ -0,0 +1,170 @@
+"""
+Tests for the opt-in request timing instrumentation.
+
+Covers the per-request recorder (self time, I/O attribution, header),
+percentile aggregation, ServerTimingMiddleware and the timed handler
+that wraps each middleware layer.
+"""
+import time
+
+import pytest
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+
+from apps.core.middleware.server_timing import (
+    RequestTimings,
+    ServerTimingMiddleware,
+    TimedHandlerMixin,
+    TimingStats,
+    _current,
+    stage,
+    timed,
+    timing_stats,
+)
+
+
+class TestRequestTimings:
+
+    def test_self_time_excludes_nested_stages(self):
+        timings = RequestTimings()
+        token = _current.set(timings)
+        try:
+            with stage('outer'):
+                time.sleep(0.01)
+                with stage('inner'):
+                    time.sleep(0.02)
+        finally:
+            _current.reset(token)
+
+        assert timings.stages['inner']['time'] >= 0.02
+        assert timings.stages['outer']['time'] < timings.stages['inner']['time']
+
+    def test_io_is_attributed_to_innermost_stage(self):
+        timings = RequestTimings()
+        timings.enter('mw.Outer')
+        timings.enter('view')
+        timings.record('db', 0.005)
+        timings.exit()
+        timings.record('cache', 0.001)
+        timings.exit()
+
+        assert timings.stages['view']['db'] == 1
+        assert timings.stages['mw.Outer']['cache'] == 1
+        assert timings.counters['db'][0] == 1
+
+    def test_header_format(self):
+        timings = RequestTimings()
+        timings.enter('cp.module_menu_items')
+        timings.record('db', 0.002)
+        timings.exit()
+        timings.finish()
+
+        header = timings.server_timing_header()
+
+        assert header.startswith('total;dur=')
+        assert 'db;dur=2.0;desc="1 calls"' in header
+        assert 'cp.module_menu_items;dur=' in header
+        assert '(1 queries)' in header
+
+    def test_stage_is_noop_without_recorder(self):
+        with stage('anything'):
+            pass
+        assert timed(lambda: 42, 'x')() == 42
+
+
+class TestTimingStats:
+
+    def _timings(self, total_ms):
+        timings = RequestTimings()
+        timings.total = total_ms / 1000
+        return timings
+
+    def test_percentiles_per_url_name(self):
+        stats = TimingStats(max_samples=500)
+        for ms in range(1, 101):
+            stats.add('sales:index', self._timings(ms))
+        stats.add('htmx:sidebar', self._timings(5))
+
+        rows = {r['url_name']: r for r in stats.snapshot()}
+
+        row = rows['sales:index']
+        assert row['count'] == 100
+        assert row['p50'] == pytest.approx(50)
+        assert row['p95'] == pytest.approx(95)
+        assert row['p99'] == pytest.approx(99)
+        # Slowest p95 first
+        assert stats.snapshot()[0]['url_name'] == 'sales:index'
+
+    def test_window_is_bounded(self):
+        stats = TimingStats(max_samples=3)
+        for ms in (100, 1, 1, 1):
+            stats.add('x', self._timings(ms))
+        assert stats.snapshot()[0]['count'] == 3
+        assert stats.snapshot()[0]['p99'] == pytest.approx(1)
+
+
+@pytest.mark.django_db
+class TestServerTimingMiddleware:
+
+    def test_header_counts_queries(self):
+        def view(request):
+            with connection.cursor() as cursor:
+                cursor.execute('SELECT 1')
+                cursor.execute('SELECT 1')
+            return HttpResponse('ok')
+
+        middleware = ServerTimingMiddleware(view)
+        response = middleware(RequestFactory().get('/'))
+
+        assert 'db;dur=' in response['Server-Timing']
+        assert 'desc="2 calls"' in response['Server-Timing']
+
+    def test_async_counts_queries_in_worker_threads(self):
+        from asgiref.sync import async_to_sync, sync_to_async
+        from django.db import connections
+
+        def query():
+            # A pool thread: its own connection, opened after the middleware
+            try:
+                with connections['default'].cursor() as cursor:
+                    cursor.execute('SELECT 1')
+            finally:
+                connections.close_all()
+
+        async def view(request):
+            await sync_to_async(query, thread_sensitive=False)()
+            return HttpResponse('ok')
+
+        middleware = ServerTimingMiddleware(view)
+        response = async_to_sync(middleware)(RequestFactory().get('/'))
+
+        assert 'desc="1 calls"' in response['Server-Timing'].split('db;')[1]
+
+    def test_samples_are_recorded(self):
+        timing_stats.reset()
+        middleware = ServerTimingMiddleware(lambda request: HttpResponse('ok'))
+        middleware(RequestFactory().get('/'))
+        assert timing_stats.snapshot()[0]['url_name'] == 'unresolved'
+
+
+@pytest.mark.django_db
+class TestTimedHandler:
+
+    def test_each_middleware_is_a_stage(self, client, settings):
+        from django.test.client import ClientHandler
+
+        class TimedClientHandler(TimedHandlerMixin, ClientHandler):
+            pass
+
+        settings.MIDDLEWARE = [
+            'apps.core.middleware.server_timing.ServerTimingMiddleware',
+            'django.middleware.common.CommonMiddleware',
+        ]
+        client.handler = TimedClientHandler()
+
+        response = client.get('/htmx/health/')
+
+        header = response['Server-Timing']
+        assert 'mw.CommonMiddleware;dur=' in header
+        assert 'view;dur=' in header
@@ -0,0 +1,181 @@
+"""
+Tests for the coalesced session engine (SESSION_MODE=coalesced).
+
+Requests go through CoalescingSessionMiddleware around a small view
+function; queries against django_session are counted with
+CaptureQueriesContext.
+"""
+from unittest.mock import patch
+
+import pytest
+from django.conf import settings
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext
+
+from apps.core.middleware.session import CoalescingSessionMiddleware, flags_cookie_name
+from apps.core.session_backends.coalesced import SessionStore
+
+pytestmark = pytest.mark.django_db
+
+
+@pytest.fixture(autouse=True)
+def coalesced_engine(settings):
+    settings.SESSION_ENGINE = 'apps.core.session_backends.coalesced'
+
+
+@pytest.fixture
+def session_key():
+    store = SessionStore()
+    store['local_user_id'] = 'user-1'
+    store['hub_id'] = 'hub-1'
+    store['user_language'] = 'es'
+    store['jwt_token'] = 'secret'
+    store.create()
+    yield store.session_key
+    store.delete()
+
+
+def _request(session_key, flags=None):
+    request = RequestFactory().get('/pos/')
+    request.COOKIES[settings.SESSION_COOKIE_NAME] = session_key
+    if flags:
+        request.COOKIES[flags_cookie_name()] = flags
+    return request
+
+
+def _run(request, view):
+    middleware = CoalescingSessionMiddleware(view)
+    with CaptureQueriesContext(connection) as queries:
+        response = middleware(request)
+    session_queries = [q['sql'] for q in queries if 'django_session' in q['sql']]
+    return response, session_queries
+
+
+def _reads_flags(request):
+    assert request.session.get('local_user_id') == 'user-1'
+    assert request.session['hub_id'] == 'hub-1'
+    assert 'store_config_checked' not in request.session
+    return HttpResponse('ok')
+
+
+def _flags_for(session_key):
+    response, _ = _run(_request(session_key), _reads_flags)
+    return response.cookies[flags_cookie_name()].value
+
+
+class TestFlagsCookie:
+
+    def test_first_request_issues_flags(self, session_key):
+        flags = _flags_for(session_key)
+        payload = SessionStore.load_flags(flags, session_key)
+        assert payload == {'local_user_id': 'user-1', 'hub_id': 'hub-1', 'user_language': 'es'}
+
+    def test_flag_reads_skip_the_session_store(self, session_key):
+        request = _request(session_key, _flags_for(session_key))
+        with patch.object(SessionStore, 'load') as load:
+            response, session_queries = _run(request, _reads_flags)
+
+        load.assert_not_called()
+        assert session_queries == []
+        assert flags_cookie_name() not in response.cookies
+
+    def test_other_keys_load_the_session(self, session_key):
+        def view(request):
+            assert request.session.get('jwt_token') == 'secret'
+            return HttpResponse('ok')
+
+        request = _request(session_key, _flags_for(session_key))
+        _run(request, view)
+        assert request.session.is_loaded
+
+    def test_flags_are_bound_to_the_session_key(self, session_key):
+        flags = _flags_for(session_key)
+        assert SessionStore.load_flags(flags, 'another-session-key') is None
+
+    def test_expired_flags_are_ignored(self, session_key, settings):
+        flags = _flags_for(session_key)
+        settings.SESSION_FLAGS_MAX_AGE = -1
+        assert SessionStore.load_flags(flags, session_key) is None
+
+    def test_flush_deletes_flags_cookie(self, session_key):
+        def view(request):
+            request.session.flush()
+            return HttpResponse('ok')
+
+        response, _ = _run(_request(session_key, _flags_for(session_key)), view)
+        assert response.cookies[flags_cookie_name()].value == ''
+
+    def test_replayed_flags_after_logout_are_rejected(self, session_key):
+        flags = _flags_for(session_key)
+
+        def logout(request):
+            # apps.auth.login.views.logout: drop the PIN keys, keep the session
+            for key in ('local_user_id', 'hub_id', 'user_language'):
+                request.session.pop(key, None)
+            return HttpResponse('ok')
+
+        _run(_request(session_key, flags), logout)
+
+        assert SessionStore.load_flags(flags, session_key) is None
+
+        def view(request):
+            assert request.session.get('local_user_id') is None
+            return HttpResponse('ok')
+
+        request = _request(session_key, flags)
+        _run(request, view)
+        assert request.session.is_loaded
+
+    def test_replayed_flags_after_flush_are_rejected(self, session_key):
+        flags = _flags_for(session_key)
+
+        def view(request):
+            request.session.flush()
+            return HttpResponse('ok')
+
+        _run(_request(session_key, flags), view)
+        assert SessionStore.load_flags(flags, session_key) is None
+
+    def test_role_change_invalidates_flags(self, session_key):
+        flags = _flags_for(session_key)
+
+        def view(request):
+            request.session['user_role'] = 'admin'
+            return HttpResponse('ok')
+
+        response, _ = _run(_request(session_key, flags), view)
+        assert SessionStore.load_flags(flags, session_key) is None
+        reissued = response.cookies[flags_cookie_name()].value
+        assert SessionStore.load_flags(reissued, session_key)['user_role'] == 'admin'
+
+
+class TestWriteCoalescing:
+
+    def test_forced_saves_write_once(self, session_key):
+        def view(request):
+            request.session['pending_user_id'] = 'user-2'
+            request.session.save()
+            request.session['store_config_checked'] = True
+            request.session.save()
+            return HttpResponse('ok')
+
+        _, session_queries = _run(_request(session_key), view)
+        writes = [sql for sql in session_queries if sql.startswith(('UPDATE', 'INSERT'))]
+        assert len(writes) == 1
+
+        stored = SessionStore(session_key).load()
+        assert stored['pending_user_id'] == 'user-2'
+        assert stored['store_config_checked'] is True
+
+    def test_unchanged_values_are_not_written(self, session_key):
+        def view(request):
+            request.session['hub_id'] = 'hub-1'
+            request.session.save()
+            return HttpResponse('ok')
+
+        request = _request(session_key, _flags_for(session_key))
+        _, session_queries = _run(request, view)
+        assert session_queries == []
+        assert not request.session.modified
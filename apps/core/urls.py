@@ -28,6 +28,12 @@ urlpatterns = [
     # Health check (for internal use and Docker healthcheck)
     path('health/', views.health_check, name='health_check'),
 
+    # Request timing diagnostics (REQUEST_TIMING=true)
+    path('diagnostics/timing/', views.request_timing, name='request_timing'),
+
+    # Module PNG icons staticfiles can't serve (templatetags/module_icons.py)
+    path('module-icon/<slug:module_id>.png', views.module_icon, name='module_icon'),
+
     # Generic Chooser (model selection modals)
     path('chooser/<str:model_key>/search/', chooser_views.chooser_search, name='chooser_search'),
     path('chooser/<str:model_key>/filters/', chooser_views.chooser_filters, name='chooser_filters'),
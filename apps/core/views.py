@@ -21,8 +21,11 @@ from django.http import JsonResponse, HttpResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 from django.conf import settings as django_settings
+from django.core.cache import cache
 
+from apps.accounts.decorators import admin_required
 from apps.accounts.models import LocalUser
+from apps.core.htmx import htmx_view
 
 
 # =============================================================================
@@ -162,6 +165,33 @@ def update_notification_dismiss(request):
     return render(request, 'ui/update_notification_empty.html')
 
 
+# =============================================================================
+# Module Icons
+# =============================================================================
+
+@require_http_methods(["GET", "HEAD"])
+def module_icon(request, module_id):
+    """
+    Serve a module's PNG icon that staticfiles can't (inactive modules,
+    legacy flat static/icons/ layout). URLs built by the module_icon tag
+    carry ?v=<content hash> and are cached as immutable.
+    """
+    from django.http import FileResponse, Http404
+
+    from apps.core.templatetags.module_icons import find_module_icon
+
+    icon_info = find_module_icon(module_id)
+    if not icon_info or icon_info['type'] != 'png':
+        raise Http404('Module icon not found')
+
+    response = FileResponse(open(icon_info['path'], 'rb'), content_type='image/png')
+    if request.GET.get('v'):
+        response['Cache-Control'] = 'public, max-age=31536000, immutable'
+    else:
+        response['Cache-Control'] = 'no-cache'
+    return response
+
+
 # =============================================================================
 # Sidebar (HTMX partial)
 # =============================================================================
@@ -204,3 +234,40 @@ def csp_report(request):
     except (json.JSONDecodeError, ValueError):
         pass
     return HttpResponse(status=204)
+
+
+# =============================================================================
+# Request Timing Diagnostics (REQUEST_TIMING=true)
+# =============================================================================
+
+
+@admin_required
+@htmx_view('core/diagnostics/timing_page.html', 'core/diagnostics/partials/timing_content.html')
+def request_timing(request):
+    """
+    Per-URL-name p50/p95/p99 and per-stage breakdown collected by
+    ServerTimingMiddleware. ?format=json returns the raw snapshot;
+    POST with action=reset clears the sample window.
+    """
+    from apps.core.middleware.server_timing import timing_stats
+
+    if request.method == 'POST' and request.POST.get('action') == 'reset':
+        timing_stats.reset()
+
+    rows = timing_stats.snapshot()
+    # Two-tier cache (web deployments) exposes L1/L2 hit counters
+    cache_stats = cache.stats() if hasattr(cache, 'stats') else None
+    if request.GET.get('format') == 'json':
+        return JsonResponse({
+            'enabled': django_settings.REQUEST_TIMING_ENABLED,
+            'routes': rows,
+            'cache': cache_stats,
+        })
+
+    return {
+        'current_section': 'settings',
+        'page_title': 'Request timing',
+        'timing_enabled': django_settings.REQUEST_TIMING_ENABLED,
+        'rows': rows,
+        'cache_stats': cache_stats,
+    }
@@ -35,7 +35,7 @@ def get_role_options(hub_id):
 
 def _build_list_context(hub_id, per_page=10):
     """Build context dict for the employees list (used after mutations)."""
-    local_users = LocalUser.objects.filter(hub_id=hub_id).order_by('name')
+    local_users = LocalUser.objects.filter(hub_id=hub_id).select_related('role_obj').order_by('name')
     active_count = local_users.filter(is_active=True).count()
     paginator = Paginator(local_users, per_page if per_page > 0 else max(local_users.count(), 1))
     page_obj = paginator.get_page(1)
@@ -89,7 +89,7 @@ def index(request):
         per_page = 12
 
     # Base queryset — show all employees (active + inactive) unless filtered
-    local_users = LocalUser.objects.filter(hub_id=hub_id)
+    local_users = LocalUser.objects.filter(hub_id=hub_id).select_related('role_obj')
 
     # Status filter
     if status_filter == 'active':
@@ -324,7 +324,8 @@ def bulk_toggle(request):
         messages.success(request, _('%(count)d employees deactivated') % {'count': count})
     elif action == 'delete':
         # Soft-delete: deactivate and mark as deleted
-        employees.update(is_active=False, is_deleted=True)
+        employees.update(is_active=False)
+        employees.soft_delete(by=request.session.get('local_user_id'))
         messages.success(request, _('%(count)d employees deleted') % {'count': count})
 
     return _render_list(request, hub_id)
@@ -392,7 +393,14 @@ def import_employees(request):
         messages.warning(request, _('The file is empty'))
         return _render_list(request, hub_id)
 
+    # Existing emails and roles are loaded once; new users are inserted in
+    # one bulk_create instead of create() + save() per row.
+    existing_emails = set(LocalUser.objects.filter(hub_id=hub_id).values_list('email', flat=True))
+    roles = list(Role.objects.filter(hub_id=hub_id, is_active=True, is_deleted=False))
+    default_role = next((role for role in roles if role.name == 'employee'), None)
+
     result = ImportResult()
+    new_users = []
     for row_num, row in enumerate(rows, start=2):
         name = (row.get('Name') or row.get('name') or '').strip()
         email = (row.get('Email') or row.get('email') or '').strip()
@@ -404,38 +412,40 @@ def import_employees(request):
             result.errors.append((row_num, _('Missing name or email')))
             continue
 
-        # Skip duplicates
-        if LocalUser.objects.filter(hub_id=hub_id, email=email).exists():
+        # Skip duplicates (already stored, or earlier in the file)
+        if email in existing_emails:
             result.skipped += 1
             continue
+        existing_emails.add(email)
 
         # Resolve role by name or display_name
         role_obj = None
         if role_name:
-            role_obj = Role.objects.filter(
-                hub_id=hub_id, is_active=True, is_deleted=False
-            ).filter(
-                Q(name__iexact=role_name) | Q(display_name__iexact=role_name)
-            ).first()
+            role_obj = next(
+                (role for role in roles
+                 if role.name.lower() == role_name.lower()
+                 or role.display_name.lower() == role_name.lower()),
+                None,
+            )
         if not role_obj:
-            role_obj = Role.objects.filter(
-                hub_id=hub_id, name='employee', is_active=True, is_deleted=False
-            ).first()
+            role_obj = default_role
 
         # Default PIN if not valid
         if not pin or len(pin) != 4 or not pin.isdigit():
             pin = '0000'
 
-        user = LocalUser.objects.create(
+        user = LocalUser(
             hub_id=hub_id,
             email=email,
             name=name,
             role_obj=role_obj,
             role=role_obj.name if role_obj else 'employee',
         )
-        user.set_pin(pin)
-        user.save(update_fields=['pin_hash'])
-        result.created += 1
+        user.set_pin(pin, save=False)
+        new_users.append(user)
+
+    LocalUser.objects.bulk_create(new_users, by=request.session.get('local_user_id'))
+    result.created = len(new_users)
 
     # Build result message
     parts = []
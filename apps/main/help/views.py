@@ -6,6 +6,7 @@ import logging
 import requests
 from apps.accounts.decorators import login_required
 from apps.core.htmx import htmx_view
+from apps.core.services import cloud_http
 from django.conf import settings
 
 logger = logging.getLogger(__name__)
@@ -15,7 +16,7 @@ def _load_help_sections():
     """Fetch help sections from Cloud Blueprint API (S3-backed, cached)."""
     base = getattr(settings, 'CLOUD_API_URL', 'https://erplora.com')
     try:
-        resp = requests.get(f'{base}/api/blueprints/docs/', timeout=10)
+        resp = cloud_http.get(f'{base}/api/blueprints/docs/', timeout=10)
         resp.raise_for_status()
         return resp.json()
     except requests.RequestException:
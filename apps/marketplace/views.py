@@ -6,13 +6,14 @@ Tabs:
 - Business Types: Browse by business type (from blueprints)
 - Compliance: Country-specific required modules
 """
+import asyncio
 import json
 import logging
+import httpx
 import requests
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 from pathlib import Path
 
+from asgiref.sync import sync_to_async
 from django.core.cache import cache
 from django.http import HttpResponse
 from django.template.loader import render_to_string
@@ -21,25 +22,13 @@ from django.urls import reverse
 from django.utils.translation import gettext_lazy as _
 
 from apps.core.htmx import htmx_view
+from apps.core.services import cloud_http, cloud_mirror
+from apps.core.services.async_http import aget, aget_json
 from apps.accounts.decorators import login_required
 
 logger = logging.getLogger(__name__)
 
 
-def _get_session():
-    """Get a requests session with automatic retry on connection errors.
-
-    Retries on connection resets/timeouts (common after long idle periods
-    when the underlying TCP connection goes stale in the pool).
-    """
-    session = requests.Session()
-    retry = Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
-    adapter = HTTPAdapter(max_retries=retry)
-    session.mount('https://', adapter)
-    session.mount('http://', adapter)
-    return session
-
-
 # Cache TTL (seconds)
 _CACHE_TTL = getattr(django_settings, 'MARKETPLACE_CACHE_TTL', 300)
 
@@ -47,6 +36,7 @@ _CACHE_TTL = getattr(django_settings, 'MARKETPLACE_CACHE_TTL', 300)
 _CK_MODULES_LIST = 'mp:modules_list'
 _CK_SECTORS_LIST = 'mp:sectors_list'
 _CK_TYPES_LIST = 'mp:types_list'
+_CK_FU_LIST = 'mp:functional_units_list'
 _CK_FU_DETAIL = 'mp:fu:'                  # + slug (functional unit)
 _CK_TYPE_DETAIL = 'mp:type:'              # + slug (business type)
 _CK_MODULE_DETAIL = 'mp:module:'           # + slug
@@ -161,7 +151,7 @@ def get_store_config(store_type):
 
 @login_required
 @htmx_view('marketplace/pages/marketplace.html', 'marketplace/partials/marketplace_content.html')
-def store_index(request, store_type='modules'):
+async def store_index(request, store_type='modules'):
     """
     Main marketplace view with sidebar filters.
     """
@@ -175,15 +165,24 @@ def store_index(request, store_type='modules'):
     # Get language for localized names
     language = getattr(request, 'LANGUAGE_CODE', 'en')[:2]
 
+    # Sectors, business types and functional units from Cloud, in parallel
+    blueprints = None
+    if store_type == 'modules':
+        blueprints = await asyncio.gather(
+            _afetch_sectors_for_filters(),
+            _afetch_business_types_for_filters(),
+            _afetch_functional_units(),
+        )
+
     # Get filters based on store type
-    filters_data = _get_filters_for_store(store_type, language, request)
+    filters_data = _get_filters_for_store(store_type, language, request, blueprints)
 
     # Default business type filter from HubConfig
-    hub_config = HubConfig.get_config()
+    hub_config = await sync_to_async(HubConfig.get_config)()
     selected_types = hub_config.selected_business_types or []
     default_business_types = []
     if selected_types and store_type == 'modules':
-        all_types = _fetch_business_types_for_filters()
+        all_types = blueprints[1]
         types_by_code = {t.get('code', ''): t for t in all_types}
         for code in selected_types:
             t = types_by_code.get(code)
@@ -206,7 +205,7 @@ def store_index(request, store_type='modules'):
 
 
 def _fetch_sectors_for_filters():
-    """Fetch sectors from Cloud blueprints API for the marketplace filter (cached)."""
+    """Fetch sectors from Cloud blueprints API for the marketplace filter (cached, mirrored)."""
     cached = cache.get(_CK_SECTORS_LIST)
     if cached is not None:
         return cached
@@ -214,25 +213,20 @@ def _fetch_sectors_for_filters():
     cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
 
     try:
-        response = _get_session().get(
+        data = cloud_mirror.fetch(
             f"{cloud_api_url}/api/blueprints/sectors/",
             headers={'Accept': 'application/json'},
             timeout=10,
         )
-        if response.status_code == 200:
-            data = response.json()
-            sectors = data.get('results', data) if isinstance(data, dict) else data
-            if not isinstance(sectors, list):
-                sectors = []
-            cache.set(_CK_SECTORS_LIST, sectors, _CACHE_TTL)
-            return sectors
     except requests.exceptions.RequestException:
-        pass
-    return []
+        return []
+    sectors = _results_list(data)
+    cache.set(_CK_SECTORS_LIST, sectors, _CACHE_TTL)
+    return sectors
 
 
 def _fetch_business_types_for_filters():
-    """Fetch business types from Cloud blueprints API for the marketplace filter (cached)."""
+    """Fetch business types from Cloud blueprints API for the marketplace filter (cached, mirrored)."""
     cached = cache.get(_CK_TYPES_LIST)
     if cached is not None:
         return cached
@@ -240,61 +234,95 @@ def _fetch_business_types_for_filters():
     cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
 
     try:
-        response = _get_session().get(
+        data = cloud_mirror.fetch(
             f"{cloud_api_url}/api/blueprints/types/",
             headers={'Accept': 'application/json'},
             timeout=10,
         )
-        if response.status_code == 200:
-            data = response.json()
-            types = data.get('results', data) if isinstance(data, dict) else data
-            if not isinstance(types, list):
-                types = []
-            # Filter out types without a code (required for URL generation)
-            types = [t for t in types if t.get('code')]
-            cache.set(_CK_TYPES_LIST, types, _CACHE_TTL)
-            return types
     except requests.exceptions.RequestException:
-        pass
-    return []
+        return []
+    # Filter out types without a code (required for URL generation)
+    types = [t for t in _results_list(data) if t.get('code')]
+    cache.set(_CK_TYPES_LIST, types, _CACHE_TTL)
+    return types
 
 
 def _fetch_functional_units():
-    """Fetch functional units from Cloud blueprints API (cached, replaces solutions)."""
-    cache_key = 'mp:functional_units_list'
-    cached = cache.get(cache_key)
+    """Fetch functional units from Cloud blueprints API (cached, mirrored, replaces solutions)."""
+    cached = cache.get(_CK_FU_LIST)
     if cached is not None:
         return cached
 
     cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
 
     try:
-        response = _get_session().get(
+        data = cloud_mirror.fetch(
             f"{cloud_api_url}/api/blueprints/functional-units/",
             headers={'Accept': 'application/json'},
             timeout=15,
         )
-        if response.status_code == 200:
-            data = response.json()
-            units = data.get('results', data) if isinstance(data, dict) else data
-            if not isinstance(units, list):
-                units = []
-            cache.set(cache_key, units, _CACHE_TTL)
-            return units
     except requests.exceptions.RequestException:
-        pass
-    return []
+        return []
+    units = _results_list(data)
+    cache.set(_CK_FU_LIST, units, _CACHE_TTL)
+    return units
+
+
+# --- Async Cloud fetchers (async views; same cache keys as the sync ones) ---
+
+def _results_list(data):
+    """Unwrap a Cloud list payload ({'results': [...]} or [...])."""
+    items = data.get('results', data) if isinstance(data, dict) else data
+    return items if isinstance(items, list) else []
+
+
+async def _afetch_blueprint_list(cache_key, path, timeout=10, require_code=False):
+    """Fetch a public blueprints list from Cloud (cached, mirrored). [] on failure."""
+    cached = await cache.aget(cache_key)
+    if cached is not None:
+        return cached
+
+    try:
+        data = await cloud_mirror.afetch(f"{_get_cloud_api_url()}{path}", timeout=timeout)
+    except (httpx.HTTPError, ValueError) as e:
+        logger.warning(f"[MARKETPLACE] Could not fetch {path}: {e}")
+        return []
+    items = _results_list(data)
+    if require_code:
+        # Filter out types without a code (required for URL generation)
+        items = [item for item in items if item.get('code')]
+    await cache.aset(cache_key, items, _CACHE_TTL)
+    return items
+
+
+async def _afetch_sectors_for_filters():
+    return await _afetch_blueprint_list(_CK_SECTORS_LIST, '/api/blueprints/sectors/')
+
 
+async def _afetch_business_types_for_filters():
+    return await _afetch_blueprint_list(_CK_TYPES_LIST, '/api/blueprints/types/', require_code=True)
 
-def _get_filters_for_store(store_type, language, request):
-    """Get filter options based on store type"""
+
+async def _afetch_functional_units():
+    return await _afetch_blueprint_list(_CK_FU_LIST, '/api/blueprints/functional-units/', timeout=15)
+
+def _get_filters_for_store(store_type, language, request, blueprints=None):
+    """Get filter options based on store type
+
+    blueprints: (sectors, business_types, functional_units) already fetched
+    by the caller; fetched here (sync) when None.
+    """
     filters = {}
 
     if store_type == 'modules':
         # Fetch sectors and business types from blueprints API
-        sectors = _fetch_sectors_for_filters()
-        business_types = _fetch_business_types_for_filters()
-        functional_units = _fetch_functional_units()
+        if blueprints is None:
+            blueprints = (
+                _fetch_sectors_for_filters(),
+                _fetch_business_types_for_filters(),
+                _fetch_functional_units(),
+            )
+        sectors, business_types, functional_units = blueprints
 
         filters['sectors'] = sectors
         filters['business_types'] = business_types
@@ -379,7 +407,7 @@ def cancel_subscription(request):
     cloud_api_url = _get_cloud_api_url()
 
     try:
-        response = _get_session().post(
+        response = cloud_http.post(
             f"{cloud_api_url}/api/marketplace/modules/{module_id}/cancel-subscription/",
             json={},
             headers={
@@ -429,7 +457,7 @@ def my_purchases(request):
     cloud_api_url = _get_cloud_api_url()
 
     try:
-        response = _get_session().get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/marketplace/modules/my_purchases/",
             headers={
                 'X-Hub-Token': auth_token,
@@ -542,7 +570,7 @@ def _create_roles_for_installed_modules(module_slugs):
         cloud_api_url = _get_cloud_api_url()
         for type_code in selected_types:
             try:
-                resp = _get_session().get(
+                resp = cloud_http.get(
                     f"{cloud_api_url}/api/blueprints/types/{type_code}/",
                     headers={'Accept': 'application/json'},
                     timeout=15,
@@ -560,7 +588,7 @@ def _create_roles_for_installed_modules(module_slugs):
 # Products list with DataTable pagination
 
 @login_required
-def products_list(request, store_type):
+async def products_list(request, store_type):
     """
     HTMX endpoint: Fetch and render products with DataTable pagination.
     Returns HTML partial with product cards or table rows.
@@ -589,12 +617,14 @@ def products_list(request, store_type):
     config = get_store_config(store_type)
 
     if store_type == 'modules':
-        return _fetch_modules_list(request, search_query, sector_filter, type_filter, sort_field, sort_dir, current_view, per_page, page_number, industry_filter, solution_filter, status_filter)
+        # Cloud list fetched on the event loop; filtering/rendering in a thread
+        modules_result = await _afetch_all_modules()
+        return await sync_to_async(_fetch_modules_list)(request, search_query, sector_filter, type_filter, sort_field, sort_dir, current_view, per_page, page_number, industry_filter, solution_filter, status_filter, modules_result=modules_result)
     elif store_type == 'hubs':
-        return _fetch_hubs_list(request, search_query, '', 12)
+        return await sync_to_async(_fetch_hubs_list)(request, search_query, '', 12)
     else:
         # Coming soon stores
-        html = render_to_string('marketplace/partials/coming_soon.html', {
+        html = await sync_to_async(render_to_string)('marketplace/partials/coming_soon.html', {
             'store_type': store_type,
             'store_config': config,
         }, request=request)
@@ -604,6 +634,9 @@ def products_list(request, store_type):
 def _fetch_all_modules():
     """Fetch all modules from Cloud API (cached).
 
+    Not mirrored on disk (cloud_mirror): can_install and purchase state are
+    per hub and must be current.
+
     Returns:
         tuple: (modules_list or None, error_message or None)
     """
@@ -622,7 +655,7 @@ def _fetch_all_modules():
     headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
 
     try:
-        response = _get_session().get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/marketplace/modules/",
             headers=headers,
             timeout=30,
@@ -648,13 +681,62 @@ def _fetch_all_modules():
         return None, str(_('Could not connect to Cloud. Please try again.'))
 
 
-def _fetch_modules_list(request, search_query, sector_filter, type_filter, sort_field, sort_dir, current_view, per_page, page_number, industry_filter='', solution_filter='', status_filter=''):
-    """Fetch modules from Cloud API with DataTable pagination"""
+async def _afetch_all_modules():
+    """Async variant of _fetch_all_modules() (same cache and messages)."""
+    cached = await cache.aget(_CK_MODULES_LIST)
+    if cached is not None:
+        return cached, None
+
+    from apps.configuration.models import HubConfig
+    hub_config = await sync_to_async(HubConfig.get_solo)()
+    auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
+
+    if not auth_token:
+        return None, str(_('Hub not connected to Cloud. Please connect in Settings.'))
+
+    try:
+        response = await aget(
+            f"{_get_cloud_api_url()}/api/marketplace/modules/",
+            headers={'X-Hub-Token': auth_token},
+            timeout=30,
+        )
+    except httpx.ConnectError as e:
+        logger.error(f"[MARKETPLACE] Connection error fetching modules: {e}")
+        return None, str(_('Connection error. Please check your internet connection and try again.'))
+    except httpx.TimeoutException as e:
+        logger.error(f"[MARKETPLACE] Timeout fetching modules: {e}")
+        return None, str(_('Cloud is taking too long to respond. Please try again.'))
+    except httpx.HTTPError as e:
+        logger.error(f"[MARKETPLACE] Error fetching modules: {e}")
+        return None, str(_('Could not connect to Cloud. Please try again.'))
+
+    if response.status_code != 200:
+        logger.warning(f"[MARKETPLACE] Cloud API returned {response.status_code}")
+        return None, str(_('Could not load modules from Cloud (error %(code)s). Please try again.') % {'code': response.status_code})
+
+    try:
+        data = response.json()
+    except ValueError as e:
+        # 200 with a non-JSON body (proxy or captive portal page)
+        logger.error(f"[MARKETPLACE] Invalid response fetching modules: {e}")
+        return None, str(_('Could not load modules from Cloud (invalid response). Please try again.'))
+
+    modules = _results_list(data)
+    await cache.aset(_CK_MODULES_LIST, modules, _CACHE_TTL)
+    return modules, None
+
+
+def _fetch_modules_list(request, search_query, sector_filter, type_filter, sort_field, sort_dir, current_view, per_page, page_number, industry_filter='', solution_filter='', status_filter='', modules_result=None):
+    """Fetch modules from Cloud API with DataTable pagination
+
+    modules_result: (modules, error) from _afetch_all_modules() when the
+    caller already fetched the list.
+    """
     from django.core.paginator import Paginator
 
     installed_module_ids = _get_installed_module_ids()
 
-    modules, error = _fetch_all_modules()
+    modules, error = modules_result if modules_result is not None else _fetch_all_modules()
     if modules is None:
         html = render_to_string('marketplace/partials/error.html', {
             'error': error or 'Unknown error'
@@ -794,16 +876,41 @@ def _fetch_hubs_list(request, search_query, cursor, page_size):
 
 # Module Detail View
 
+async def _afetch_module_detail(slug, headers):
+    """Module detail from Cloud (cached). Returns (module, error_message)."""
+    cache_key = f"{_CK_MODULE_DETAIL}{slug}"
+    module = await cache.aget(cache_key)
+    if module is not None:
+        return module, None
+
+    response = await aget(
+        f"{_get_cloud_api_url()}/api/marketplace/modules/{slug}/",
+        headers=headers,
+        timeout=30,
+    )
+    if response.status_code == 404:
+        return None, f'Module "{slug}" not found.'
+    if response.status_code != 200:
+        return None, f'Cloud API returned {response.status_code}'
+
+    try:
+        module = response.json()
+    except ValueError:
+        return None, 'Cloud API returned an invalid response'
+    await cache.aset(cache_key, module, _CACHE_TTL)
+    return module, None
+
+
 @login_required
 @htmx_view('marketplace/pages/marketplace.html', 'marketplace/partials/module_detail_content.html')
-def module_detail(request, slug):
+async def module_detail(request, slug):
     """
     Module detail page view.
     Fetches module details from Cloud API.
     """
     from apps.configuration.models import HubConfig
 
-    hub_config = HubConfig.get_solo()
+    hub_config = await sync_to_async(HubConfig.get_solo)()
     auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
 
     if not auth_token:
@@ -812,98 +919,79 @@ def module_detail(request, slug):
             'error': 'Hub not connected to Cloud. Please connect in Settings.',
         }
 
-    installed_module_ids = _get_installed_module_ids()
+    installed_module_ids = await sync_to_async(_get_installed_module_ids)()
 
     cloud_api_url = _get_cloud_api_url()
     headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
 
     try:
-        # Fetch module details from Cloud API (cached)
-        cache_key = f"{_CK_MODULE_DETAIL}{slug}"
-        module = cache.get(cache_key)
-        if module is None:
-            response = _get_session().get(
-                f"{cloud_api_url}/api/marketplace/modules/{slug}/",
-                headers=headers,
-                timeout=30
-            )
-
-            if response.status_code == 404:
-                return {
-                    'current_section': 'marketplace',
-                    'error': f'Module "{slug}" not found.',
-                }
-
-            if response.status_code != 200:
-                return {
-                    'current_section': 'marketplace',
-                    'error': f'Cloud API returned {response.status_code}',
-                }
-
-            module = response.json()
-            cache.set(cache_key, module, _CACHE_TTL)
-
-        # Check if installed (compare both slug and module_id)
-        is_installed = slug in installed_module_ids or module.get('module_id', '') in installed_module_ids
-
-        # Check if update available (compare local version vs Cloud version)
-        has_update = False
-        installed_version = None
-        cloud_version = module.get('version', '')
-        if is_installed:
-            mod_id = module.get('module_id', '') or slug
-            installed_version = _get_installed_module_version(mod_id)
-            if installed_version and cloud_version and installed_version != cloud_version:
-                has_update = True
-
-        # Check ownership (from API response or via check_ownership endpoint)
-        is_owned = module.get('is_owned', False)
-        if not is_owned:
-            try:
-                ownership_response = _get_session().get(
-                    f"{cloud_api_url}/api/marketplace/modules/{module.get('id', '')}/check_ownership/",
-                    headers=headers,
-                    timeout=10
-                )
-                if ownership_response.status_code == 200:
-                    ownership_data = ownership_response.json()
-                    is_owned = ownership_data.get('is_owned', False)
-            except Exception:
-                pass
-
-        # Determine if free
-        is_free = module.get('module_type') == 'free' or module.get('price', 0) == 0
-
-        # Related modules (same category) — use cached modules list
-        related_modules = []
-        all_modules, _ = _fetch_all_modules()
-        if all_modules:
-            category = module.get('category', '')
-            related_modules = [
-                m for m in all_modules
-                if m.get('category') == category and m.get('slug') != slug
-            ][:3]
-
+        # Module details and the modules list (for related modules) in parallel
+        (module, error), (all_modules, _error) = await asyncio.gather(
+            _afetch_module_detail(slug, headers),
+            _afetch_all_modules(),
+        )
+    except httpx.HTTPError as e:
         return {
             'current_section': 'marketplace',
-            'page_title': module.get('name', 'Module Details'),
-            'module': module,
-            'is_installed': is_installed,
-            'has_update': has_update,
-            'installed_version': installed_version,
-            'is_owned': is_owned,
-            'is_free': is_free,
-            'related_modules': related_modules,
-            'back_url': reverse('marketplace:index'),
-            'navigation': _marketplace_navigation('modules'),
+            'error': f'Failed to connect to Cloud: {str(e)}',
         }
 
-    except requests.exceptions.RequestException as e:
+    if module is None:
         return {
             'current_section': 'marketplace',
-            'error': f'Failed to connect to Cloud: {str(e)}',
+            'error': error,
         }
 
+    # Check if installed (compare both slug and module_id)
+    is_installed = slug in installed_module_ids or module.get('module_id', '') in installed_module_ids
+
+    # Check if update available (compare local version vs Cloud version)
+    has_update = False
+    installed_version = None
+    cloud_version = module.get('version', '')
+    if is_installed:
+        mod_id = module.get('module_id', '') or slug
+        installed_version = await sync_to_async(_get_installed_module_version)(mod_id)
+        if installed_version and cloud_version and installed_version != cloud_version:
+            has_update = True
+
+    # Check ownership (from API response or via check_ownership endpoint)
+    is_owned = module.get('is_owned', False)
+    if not is_owned:
+        _status, ownership_data = await aget_json(
+            f"{cloud_api_url}/api/marketplace/modules/{module.get('id', '')}/check_ownership/",
+            headers=headers,
+            timeout=10,
+        )
+        if isinstance(ownership_data, dict):
+            is_owned = ownership_data.get('is_owned', False)
+
+    # Determine if free
+    is_free = module.get('module_type') == 'free' or module.get('price', 0) == 0
+
+    # Related modules (same category) — use cached modules list
+    related_modules = []
+    if all_modules:
+        category = module.get('category', '')
+        related_modules = [
+            m for m in all_modules
+            if m.get('category') == category and m.get('slug') != slug
+        ][:3]
+
+    return {
+        'current_section': 'marketplace',
+        'page_title': module.get('name', 'Module Details'),
+        'module': module,
+        'is_installed': is_installed,
+        'has_update': has_update,
+        'installed_version': installed_version,
+        'is_owned': is_owned,
+        'is_free': is_free,
+        'related_modules': related_modules,
+        'back_url': reverse('marketplace:index'),
+        'navigation': _marketplace_navigation('modules'),
+    }
+
 
 # --- Functional Units views (replaces Solutions) ---
 
@@ -916,14 +1004,13 @@ def _fetch_functional_unit_modules(slug, cloud_api_url):
         return slug, cached
 
     try:
-        r = _get_session().get(
+        data = cloud_mirror.fetch(
             f"{cloud_api_url}/api/blueprints/functional-units/{slug}/",
             headers={'Accept': 'application/json'}, timeout=15,
         )
-        if r.status_code == 200:
-            modules = r.json().get('modules', [])
-            cache.set(cache_key, modules, _CACHE_TTL)
-            return slug, modules
+        modules = data.get('modules', [])
+        cache.set(cache_key, modules, _CACHE_TTL)
+        return slug, modules
     except Exception:
         pass
     return slug, []
@@ -985,7 +1072,7 @@ def solutions_bulk_install(request):
         cloud_api_url = _get_cloud_api_url()
         for type_code in all_types:
             try:
-                resp = _get_session().get(
+                resp = cloud_http.get(
                     f"{cloud_api_url}/api/blueprints/types/{type_code}/",
                     headers={'Accept': 'application/json'}, timeout=15,
                 )
@@ -1123,7 +1210,7 @@ def solution_detail(request, slug):
         fu_cache_key = f"{_CK_FU_DETAIL}{slug}:full"
         solution = cache.get(fu_cache_key)
         if solution is None:
-            response = _get_session().get(
+            response = cloud_http.get(
                 f"{cloud_api_url}/api/blueprints/functional-units/{slug}/",
                 headers={'Accept': 'application/json'},
                 timeout=15,
@@ -1193,7 +1280,7 @@ def solution_install(request, slug):
 
     try:
         # Fetch functional unit detail to get modules
-        response = _get_session().get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/blueprints/functional-units/{slug}/",
             headers={'Accept': 'application/json'},
             timeout=15,
@@ -1325,7 +1412,7 @@ def block_toggle(request, slug):
         if hub_config.hub_id:
             cloud_api_url = _get_cloud_api_url()
             try:
-                response = _get_session().get(
+                response = cloud_http.get(
                     f"{cloud_api_url}/api/blueprints/types/{slug}/",
                     headers={'Accept': 'application/json'},
                     timeout=15,
@@ -1382,7 +1469,7 @@ def business_type_detail(request, slug):
         type_cache_key = f"{_CK_TYPE_DETAIL}{slug}:full"
         industry = cache.get(type_cache_key)
         if industry is None:
-            response = _get_session().get(
+            response = cloud_http.get(
                 f"{cloud_api_url}/api/blueprints/types/{slug}/",
                 headers={'Accept': 'application/json'},
                 timeout=15,
@@ -1823,7 +1910,7 @@ def module_pricing(request, module_id):
             hub_config = HubConfig.get_solo()
             auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
             if auth_token:
-                resp = _get_session().get(
+                resp = cloud_http.get(
                     f'{cloud_api_url}/api/marketplace/modules/{module_id}/',
                     headers={'X-Hub-Token': auth_token, 'Accept': 'application/json'},
                     timeout=10,
@@ -1923,7 +2010,7 @@ def module_subscribe(request):
         if tier_slug:
             purchase_payload['tier_slug'] = tier_slug
 
-        response = _get_session().post(
+        response = cloud_http.post(
             f'{cloud_api_url}/api/marketplace/modules/{module_id}/purchase/',
             json=purchase_payload,
             headers={
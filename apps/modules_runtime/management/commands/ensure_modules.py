@@ -16,10 +16,11 @@ Runs automatically at container startup, before gunicorn.
 import logging
 from pathlib import Path
 
-import requests as http_requests
 from django.conf import settings
 from django.core.management.base import BaseCommand
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -241,7 +242,7 @@ class Command(BaseCommand):
         }
 
         try:
-            resp = http_requests.get(url, headers=headers, timeout=15)
+            resp = cloud_http.get(url, headers=headers, timeout=15)
             if resp.status_code != 200:
                 logger.warning(
                     '[ensure_modules] Cloud hub-modules returned %d', resp.status_code
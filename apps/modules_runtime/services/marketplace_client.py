@@ -9,6 +9,7 @@ from typing import Optional
 from django.conf import settings
 
 from apps.configuration.models import HubConfig
+from apps.core.services import cloud_http
 
 logger = logging.getLogger(__name__)
 
@@ -100,7 +101,7 @@ class MarketplaceClient:
         url = f"{self.base_url}/api/marketplace/{endpoint}"
 
         try:
-            response = requests.request(
+            response = cloud_http.request(
                 method=method,
                 url=url,
                 headers=self._get_headers(),
@@ -11,6 +11,8 @@ from datetime import datetime, timedelta
 from django.conf import settings
 from django.core.cache import cache
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -65,7 +67,7 @@ class SubscriptionChecker:
         headers = {'X-Hub-Token': auth_token}
 
         try:
-            response = requests.get(api_url, headers=headers, timeout=10)
+            response = cloud_http.get(api_url, headers=headers, timeout=10)
             response.raise_for_status()
             result = response.json()
 
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import TokenCache, SyncQueue
+from .models import TokenCache, SyncQueue, CloudCommand
 
 
 @admin.register(TokenCache)
@@ -39,3 +39,24 @@ class SyncQueueAdmin(admin.ModelAdmin):
             'fields': ('created_at', 'updated_at', 'completed_at', 'next_retry_at')
         }),
     )
+
+
+@admin.register(CloudCommand)
+class CloudCommandAdmin(admin.ModelAdmin):
+    list_display = ('command_type', 'command_id', 'source', 'status', 'attempts', 'created_at', 'acked_at')
+    list_filter = ('command_type', 'source', 'status')
+    search_fields = ('command_id', 'error')
+    ordering = ('-created_at',)
+    readonly_fields = ('created_at', 'updated_at', 'started_at', 'completed_at', 'acked_at')
+
+    fieldsets = (
+        ('Command', {
+            'fields': ('command_id', 'source', 'command_type', 'payload')
+        }),
+        ('Execution', {
+            'fields': ('status', 'attempts', 'result', 'error', 'ack_required')
+        }),
+        ('Timestamps', {
+            'fields': ('created_at', 'updated_at', 'started_at', 'completed_at', 'acked_at')
+        }),
+    )
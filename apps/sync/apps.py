@@ -14,14 +14,15 @@ class SyncConfig(AppConfig):
         Initialize sync app.
 
         - Initialize HubConfig from environment variables (HUB_JWT, etc.)
-        - Start heartbeat service in web deployment mode
+        - Start heartbeat service in web deployment mode (in the leader
+          process only, see apps.core.services.leader_election)
         """
         # Skip during migrations or management commands
         if 'migrate' in sys.argv or 'makemigrations' in sys.argv:
             return
 
-        # Skip if running tests
-        if 'test' in sys.argv:
+        # Skip if running tests (manage.py test or pytest)
+        if 'test' in sys.argv or 'pytest' in sys.modules:
             return
 
         # Initialize HubConfig from env vars
@@ -134,17 +135,9 @@ class SyncConfig(AppConfig):
         except Exception:
             return
 
-        # Choose sync method: WebSocket (preferred) or HTTP polling (fallback)
-        use_websocket = getattr(settings, 'CLOUD_SYNC_WEBSOCKET', True)
-
         try:
-            if use_websocket:
-                from .services.websocket_client import start_websocket_client
-                start_websocket_client()
-                print("[SYNC] WebSocket client started")
-            else:
-                from .services.heartbeat import start_heartbeat_service
-                start_heartbeat_service()
-                print("[SYNC] HTTP polling started")
+            from .services import start_cloud_sync
+            start_cloud_sync()
+            print("[SYNC] Cloud sync leader election started")
         except Exception as e:
             print(f"[SYNC] Error starting sync service: {e}")
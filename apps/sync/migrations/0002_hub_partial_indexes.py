@@ -0,0 +1,21 @@
+# Generated by Django 6.1.2 on 2026-10-18 22:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='syncqueue',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='sync_syncqu_create_a0d8a8_live'),
+        ),
+        migrations.AddIndex(
+            model_name='syncqueue',
+            index=models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='sync_syncqu_update_491d3b_live'),
+        ),
+    ]
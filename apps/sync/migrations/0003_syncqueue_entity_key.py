@@ -0,0 +1,23 @@
+# Generated by Django 6.1.2 on 2026-10-18 23:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0002_hub_partial_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='syncqueue',
+            name='entity_key',
+            field=models.CharField(blank=True, default='', help_text='Remote entity the operation touches (enables compaction)', max_length=255),
+        ),
+        migrations.AlterField(
+            model_name='syncqueue',
+            name='status',
+            field=models.CharField(choices=[('pending', 'Pending'), ('processing', 'Processing'), ('completed', 'Completed'), ('failed', 'Failed'), ('compacted', 'Compacted')], default='pending', max_length=20),
+        ),
+    ]
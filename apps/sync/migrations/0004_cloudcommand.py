@@ -0,0 +1,48 @@
+# Generated by Django 6.1.2 on 2026-10-18 23:52
+
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('sync', '0003_syncqueue_entity_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CloudCommand',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, editable=False, primary_key=True, serialize=False)),
+                ('hub_id', models.UUIDField(blank=True, db_index=True, editable=False, help_text='Hub this record belongs to (for multi-tenancy)', null=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('created_by', models.UUIDField(blank=True, help_text='UUID of the user who created this record', null=True)),
+                ('updated_by', models.UUIDField(blank=True, help_text='UUID of the user who last updated this record', null=True)),
+                ('is_deleted', models.BooleanField(db_index=True, default=False, help_text='Soft delete flag - record is hidden but not removed')),
+                ('deleted_at', models.DateTimeField(blank=True, help_text='Timestamp when record was soft deleted', null=True)),
+                ('command_id', models.CharField(help_text='Idempotency key (Cloud command id)', max_length=255)),
+                ('source', models.CharField(choices=[('poll', 'HTTP polling'), ('websocket', 'WebSocket')], default='poll', max_length=20)),
+                ('command_type', models.CharField(max_length=50)),
+                ('payload', models.JSONField(default=dict)),
+                ('command_jwt', models.TextField(blank=True)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('running', 'Running'), ('completed', 'Completed'), ('failed', 'Failed')], default='pending', max_length=20)),
+                ('attempts', models.IntegerField(default=0)),
+                ('result', models.JSONField(blank=True, default=dict)),
+                ('error', models.TextField(blank=True)),
+                ('ack_required', models.BooleanField(default=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('acked_at', models.DateTimeField(blank=True, null=True)),
+            ],
+            options={
+                'verbose_name': 'Cloud Command',
+                'verbose_name_plural': 'Cloud Commands',
+                'db_table': 'sync_cloudcommand',
+                'ordering': ['created_at'],
+                'indexes': [models.Index(fields=['hub_id', 'source', 'status'], name='sync_cloudc_hub_id_af88c5_idx'), models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'created_at'], name='sync_cloudc_create_b3ec92_live'), models.Index(condition=models.Q(('is_deleted', False)), fields=['hub_id', 'updated_at'], name='sync_cloudc_update_72fa38_live')],
+                'constraints': [models.UniqueConstraint(fields=('hub_id', 'command_id'), name='sync_cloudcommand_unique_id')],
+            },
+        ),
+    ]
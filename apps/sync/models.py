@@ -2,9 +2,10 @@
 Synchronization models for Hub-Cloud communication.
 """
 
+import random
 from datetime import timedelta
 
-from django.db import models
+from django.db import models, transaction
 from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
@@ -109,6 +110,7 @@ class SyncQueue(HubBaseModel):
         ('processing', 'Processing'),
         ('completed', 'Completed'),
         ('failed', 'Failed'),
+        ('compacted', 'Compacted'),  # superseded before upload, see services/compaction.py
     ]
 
     # Operation details
@@ -117,6 +119,10 @@ class SyncQueue(HubBaseModel):
     method = models.CharField(max_length=10, default='POST', help_text='HTTP method')
     payload = models.JSONField(default=dict, help_text='Request body')
     headers = models.JSONField(default=dict, help_text='Additional headers')
+    entity_key = models.CharField(
+        max_length=255, blank=True, default='',
+        help_text='Remote entity the operation touches (enables compaction)',
+    )
 
     # Sync status
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
@@ -146,7 +152,8 @@ class SyncQueue(HubBaseModel):
         return f"{self.operation_type} - {self.status} ({self.created_at})"
 
     @classmethod
-    def add_operation(cls, operation_type, endpoint, method='POST', payload=None, headers=None):
+    def add_operation(cls, operation_type, endpoint, method='POST', payload=None, headers=None,
+                      entity_key=None):
         """
         Add operation to the sync queue.
 
@@ -156,18 +163,41 @@ class SyncQueue(HubBaseModel):
             method: HTTP method (POST, DELETE, PUT, PATCH)
             payload: Data to send in request body
             headers: Additional headers (X-Hub-Token added automatically)
+            entity_key: Remote entity the operation touches (defaults to
+                payload['id']); operations on the same entity are compacted
+                before upload
 
         Returns:
             SyncQueue: Created queue item
         """
+        payload = payload or {}
+        if entity_key is None:
+            entity_key = payload.get('id')
         return cls.objects.create(
             operation_type=operation_type,
             endpoint=endpoint,
             method=method.upper(),
-            payload=payload or {},
+            payload=payload,
             headers=headers or {},
+            # No id (None, '') means no key: never group unrelated operations
+            entity_key=str(entity_key) if entity_key else '',
         )
 
+    # Backoff after the n-th failure: 2^n minutes, capped, with +-10% jitter so
+    # a queue that failed together (offline period) does not retry together
+    MAX_BACKOFF_MINUTES = 60
+
+    # A 'processing' claim older than this is considered abandoned (worker died)
+    CLAIM_LEASE = timedelta(minutes=5)
+
+    @classmethod
+    def _ready(cls, now):
+        """Pending operations whose retry time has come."""
+        return models.Q(
+            status='pending',
+            retry_count__lt=models.F('max_retries'),
+        ) & (models.Q(next_retry_at__isnull=True) | models.Q(next_retry_at__lte=now))
+
     @classmethod
     def get_pending_operations(cls, limit=10):
         """
@@ -178,12 +208,91 @@ class SyncQueue(HubBaseModel):
         """
         now = timezone.now()
 
-        return cls.objects.filter(
-            status='pending',
+        return cls.objects.filter(cls._ready(now)).order_by('created_at')[:limit]
+
+    @classmethod
+    def claim_batch(cls, limit=100):
+        """
+        Claim up to `limit` ready operations for this worker.
+
+        Rows are locked with SELECT ... FOR UPDATE SKIP LOCKED, so concurrent
+        workers claim disjoint batches without waiting on each other, and
+        marked 'processing' before the lock is released; the HTTP calls
+        happen outside the transaction.
+
+        Operations are claimed in queue order, and only the oldest waiting
+        operation of an entity (entity_key) is claimed: while an earlier one
+        waits for its retry time, is claimed by another worker or sits in
+        this batch, the later ones stay queued, so Cloud receives an
+        entity's changes in the order they were made.
+
+        Claims older than CLAIM_LEASE are taken over (the worker that made
+        them died); the lost attempt counts as a retry.
+
+        Returns:
+            list[SyncQueue]: Claimed operations, status 'processing'
+        """
+        now = timezone.now()
+        abandoned = models.Q(status='processing', updated_at__lt=now - cls.CLAIM_LEASE)
+        # A waiting operation queued before this one on the same entity.
+        # Filtered in SQL, before the LIMIT: a blocked entity's later
+        # operations must not fill the batch and starve other entities.
+        earlier_waiting = cls.objects.filter(
+            models.Q(created_at__lt=models.OuterRef('created_at'))
+            | models.Q(created_at=models.OuterRef('created_at'), id__lt=models.OuterRef('id')),
+            entity_key=models.OuterRef('entity_key'),
+            status__in=('pending', 'processing'),
             retry_count__lt=models.F('max_retries'),
-        ).filter(
-            models.Q(next_retry_at__isnull=True) | models.Q(next_retry_at__lte=now)
-        ).order_by('created_at')[:limit]
+        ).exclude(entity_key='')
+
+        with transaction.atomic():
+            candidates = list(
+                cls.objects.filter(cls._ready(now) | abandoned)
+                .exclude(models.Exists(earlier_waiting))
+                .order_by('created_at', 'id')
+                .select_for_update(skip_locked=True)
+                .values_list('id', 'status', 'retry_count', 'max_retries')[:limit]
+            )
+            if not candidates:
+                return []
+
+            ids, taken_over, exhausted = [], [], []
+            for pk, status, retry_count, max_retries in candidates:
+                if status == 'processing':
+                    if retry_count + 1 >= max_retries:
+                        exhausted.append(pk)
+                        continue
+                    taken_over.append(pk)
+                ids.append(pk)
+
+            lost = {'retry_count': models.F('retry_count') + 1, 'last_error': 'Claim abandoned'}
+            if exhausted:
+                cls.objects.filter(id__in=exhausted).update(status='failed', updated_at=now, **lost)
+            if taken_over:
+                cls.objects.filter(id__in=taken_over).update(**lost)
+            if not ids:
+                return []
+            cls.objects.filter(id__in=ids).update(status='processing', updated_at=now)
+
+        operations = {op.id: op for op in cls.objects.filter(id__in=ids)}
+        return [operations[pk] for pk in ids if pk in operations]
+
+    @classmethod
+    def backoff_delay(cls, retry_count):
+        """Delay before retry number `retry_count`: 2, 4, 8, 16... minutes."""
+        minutes = min(2 ** retry_count, cls.MAX_BACKOFF_MINUTES)
+        return timedelta(minutes=minutes * random.uniform(0.9, 1.1))
+
+    def record_failure(self, error_message, now=None):
+        """Count a failed attempt and schedule the retry, without saving."""
+        self.retry_count += 1
+        self.last_error = error_message
+
+        if self.retry_count >= self.max_retries:
+            self.status = 'failed'
+        else:
+            self.status = 'pending'
+            self.next_retry_at = (now or timezone.now()) + self.backoff_delay(self.retry_count)
 
     def mark_completed(self):
         """Mark operation as completed."""
@@ -198,15 +307,81 @@ class SyncQueue(HubBaseModel):
         Args:
             error_message: Error message to store
         """
-        self.retry_count += 1
-        self.last_error = error_message
+        self.record_failure(error_message)
+        self.save(update_fields=['status', 'retry_count', 'last_error', 'next_retry_at', 'updated_at'])
 
-        if self.retry_count >= self.max_retries:
-            self.status = 'failed'
-        else:
-            self.status = 'pending'
-            # Exponential backoff: 1min, 2min, 4min, 8min, 16min
-            delay_minutes = 2 ** self.retry_count
-            self.next_retry_at = timezone.now() + timedelta(minutes=delay_minutes)
 
-        self.save(update_fields=['status', 'retry_count', 'last_error', 'next_retry_at', 'updated_at'])
+class CloudCommand(HubBaseModel):
+    """
+    Command received from Cloud (HTTP polling or WebSocket).
+
+    Commands are stored before they run and executed by
+    services/command_queue.py, so a restart does not lose them and a
+    command delivered twice (by either channel) runs once. Lifecycle:
+
+        pending -> running -> completed | failed -> acked (acked_at set)
+
+    Inherits from HubBaseModel (UUID pk, hub_id, timestamps, soft delete).
+    """
+
+    SOURCE_CHOICES = [
+        ('poll', 'HTTP polling'),
+        ('websocket', 'WebSocket'),
+    ]
+
+    STATUS_CHOICES = [
+        ('pending', 'Pending'),
+        ('running', 'Running'),
+        ('completed', 'Completed'),
+        ('failed', 'Failed'),
+    ]
+
+    FINISHED = ('completed', 'failed')
+
+    command_id = models.CharField(max_length=255, help_text='Idempotency key (Cloud command id)')
+    source = models.CharField(max_length=20, choices=SOURCE_CHOICES, default='poll')
+    command_type = models.CharField(max_length=50)
+    payload = models.JSONField(default=dict)
+    command_jwt = models.TextField(blank=True)
+
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
+    attempts = models.IntegerField(default=0)
+    result = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    # Cloud expects an ack (commands without a Cloud id are not acked)
+    ack_required = models.BooleanField(default=True)
+
+    started_at = models.DateTimeField(null=True, blank=True)
+    completed_at = models.DateTimeField(null=True, blank=True)
+    acked_at = models.DateTimeField(null=True, blank=True)
+
+    objects = HubManager()
+    all_objects = HubManagerWithDeleted()
+
+    class Meta:
+        verbose_name = _('Cloud Command')
+        verbose_name_plural = _('Cloud Commands')
+        ordering = ['created_at']
+        db_table = 'sync_cloudcommand'
+        constraints = [
+            # Whatever the channel: a command delivered by both runs once
+            models.UniqueConstraint(
+                fields=['hub_id', 'command_id'], name='sync_cloudcommand_unique_id',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['hub_id', 'source', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.command_type} ({self.command_id}) - {self.status}"
+
+    def as_command(self):
+        """The command as received: {'id', 'type', 'payload', 'command_jwt'}."""
+        return {
+            'id': self.command_id,
+            'type': self.command_type,
+            'payload': self.payload,
+            'command_jwt': self.command_jwt,
+        }
@@ -1,7 +1,25 @@
 """
 Sync services for Hub-to-Cloud communication.
 """
+from django.conf import settings
+
 from .cloud_api import CloudAPIService
 from .heartbeat import HeartbeatService
 
-__all__ = ['CloudAPIService', 'HeartbeatService']
+__all__ = ['CloudAPIService', 'HeartbeatService', 'start_cloud_sync']
+
+CLOUD_SYNC_LEADER = 'cloud_sync'
+
+
+def start_cloud_sync():
+    """
+    Start Cloud sync (WebSocket, or HTTP polling as fallback) in the one
+    process elected for it. Safe to call from every worker, repeatedly.
+    """
+    from apps.core.services.leader_election import run_as_leader
+
+    if getattr(settings, 'CLOUD_SYNC_WEBSOCKET', True):
+        from .websocket_client import start_websocket_client as start, stop_websocket_client as stop
+    else:
+        from .heartbeat import start_heartbeat_service as start, stop_heartbeat_service as stop
+    return run_as_leader(CLOUD_SYNC_LEADER, start=start, stop=stop)
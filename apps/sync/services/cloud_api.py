@@ -14,6 +14,11 @@ from django.conf import settings
 from django.utils import timezone
 
 from apps.configuration.models import HubConfig
+from apps.core.services import cloud_http
+
+from .compression import (
+    ACCEPT_ENCODING, UNSUPPORTED_MEDIA_TYPE, encode_json, received_bytes, wire_stats,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -37,6 +42,8 @@ class CloudAPIService:
     - Module marketplace access
     - Configuration sync
     - Automatic token refresh on 401
+    - Compressed request bodies and byte accounting (see compression.py)
+    - Shared pooled client and circuit breaker (apps.core.services.cloud_http)
 
     All requests use JWT authentication.
     """
@@ -45,6 +52,8 @@ class CloudAPIService:
 
     def __init__(self):
         self._reload_config()
+        # Cleared when Cloud rejects a compressed body (415)
+        self.compression_supported = True
 
     def _reload_config(self):
         """Reload configuration from database."""
@@ -71,7 +80,7 @@ class CloudAPIService:
             return False
 
         try:
-            response = requests.post(
+            response = cloud_http.post(
                 f"{self.base_url}/api/hubs/token/refresh/",
                 json={'refresh_token': self.hub_refresh_token},
                 timeout=10
@@ -116,6 +125,7 @@ class CloudAPIService:
         headers = {
             'Content-Type': 'application/json',
             'Accept': 'application/json',
+            'Accept-Encoding': ACCEPT_ENCODING,
         }
 
         if self.hub_jwt:
@@ -130,12 +140,15 @@ class CloudAPIService:
         data: Dict = None,
         params: Dict = None,
         timeout: int = None,
+        headers: Dict = None,
+        channel: str = 'cloud_api',
         _retry_on_401: bool = True
     ) -> Dict[str, Any]:
         """
         Make authenticated request to Cloud API.
 
-        Automatically refreshes token on 401 and retries once.
+        Automatically refreshes token on 401 and retries once. Large bodies
+        are compressed; a 415 is retried once uncompressed.
 
         Args:
             method: HTTP method (GET, POST, PUT, DELETE)
@@ -143,6 +156,8 @@ class CloudAPIService:
             data: Request body (for POST/PUT)
             params: Query parameters
             timeout: Request timeout in seconds
+            headers: Extra request headers
+            channel: Name the bytes on the wire are recorded under
             _retry_on_401: Internal flag to prevent infinite retry loops
 
         Returns:
@@ -157,21 +172,37 @@ class CloudAPIService:
         url = f"{self.base_url}{endpoint}"
         timeout = timeout or self.DEFAULT_TIMEOUT
 
+        request_headers = {**self._get_headers(), **(headers or {})}
+        body, raw_size = None, 0
+        if data is not None:
+            body, body_headers, raw_size = encode_json(data, compressed=self.compression_supported)
+            request_headers.update(body_headers)
+
         try:
-            response = requests.request(
-                method=method.upper(),
-                url=url,
-                headers=self._get_headers(),
-                json=data,
+            response = cloud_http.request(
+                method.upper(),
+                url,
+                headers=request_headers,
+                data=body,
                 params=params,
                 timeout=timeout
             )
+            wire_stats.record(channel, raw_size, len(body or b''), received_bytes(response))
 
             # Log request
             logger.debug(
                 f"[CLOUD API] {method.upper()} {endpoint} -> {response.status_code}"
             )
 
+            # Cloud without request decompression - send uncompressed from now on
+            if response.status_code == UNSUPPORTED_MEDIA_TYPE and 'Content-Encoding' in request_headers:
+                logger.info("[CLOUD API] Compressed body rejected, disabling compression")
+                self.compression_supported = False
+                return self._request(
+                    method, endpoint, data, params, timeout,
+                    headers=headers, channel=channel, _retry_on_401=_retry_on_401
+                )
+
             # Handle 401 - try to refresh token and retry
             if response.status_code == 401 and _retry_on_401:
                 logger.warning("[CLOUD API] Unauthorized - attempting token refresh")
@@ -179,6 +210,7 @@ class CloudAPIService:
                     # Retry the request with new token
                     return self._request(
                         method, endpoint, data, params, timeout,
+                        headers=headers, channel=channel,
                         _retry_on_401=False  # Don't retry again
                     )
                 else:
@@ -225,23 +257,31 @@ class CloudAPIService:
     # Hub Info & Heartbeat
     # =========================================================================
 
-    def send_heartbeat(self, metadata: Dict = None) -> Dict[str, Any]:
+    def send_heartbeat(self, metadata: Dict = None, delta: bool = False) -> Dict[str, Any]:
         """
         Send heartbeat to Cloud.
 
         Args:
             metadata: Optional metadata (version, modules, status)
+            delta: metadata is a JSON merge patch (RFC 7396) against the
+                last heartbeat Cloud acknowledged, not the full metadata
 
         Returns:
             Response from Cloud
         """
         data = metadata or {}
 
+        if delta:
+            return self._request(
+                'POST', '/api/hubs/me/heartbeat/', data=data,
+                headers={'X-Heartbeat-Delta': '1'}, channel='heartbeat'
+            )
+
         # Add default metadata
         if 'version' not in data:
             data['version'] = getattr(settings, 'HUB_VERSION', '1.0.0')
 
-        return self._request('POST', '/api/hubs/me/heartbeat/', data=data)
+        return self._request('POST', '/api/hubs/me/heartbeat/', data=data, channel='heartbeat')
 
     def get_hub_info(self) -> Dict[str, Any]:
         """Get Hub information from Cloud."""
@@ -291,7 +331,29 @@ class CloudAPIService:
         return self._request(
             'POST',
             f'/api/hubs/me/commands/{command_id}/ack/',
-            data=data
+            data=data,
+            channel='command_ack'
+        )
+
+    def acknowledge_commands(self, acks: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Acknowledge several executed commands in one request.
+
+        Args:
+            acks: [{'command_id', 'status', 'result', 'error'}] as in
+                acknowledge_command()
+
+        Returns:
+            Response from Cloud
+
+        Raises:
+            CloudAPIError: status_code 404/405/501 if Cloud has no batch endpoint
+        """
+        return self._request(
+            'POST',
+            '/api/hubs/me/commands/ack/',
+            data={'acks': acks},
+            channel='command_ack'
         )
 
     # =========================================================================
@@ -354,7 +416,7 @@ class CloudAPIService:
 
         # Fetch from Cloud
         try:
-            response = requests.get(
+            response = cloud_http.get(
                 f"{self.base_url}/api/auth/public-key/",
                 timeout=5
             )
@@ -0,0 +1,411 @@
+"""
+Durable execution of Cloud commands.
+
+Commands received by HeartbeatService (polling) or WebSocketClient are not
+run on the receiving thread, where a slow install_module would block
+polling and socket handling and a crash would lose the command. They go
+through a CommandQueue:
+
+    queue = CommandQueue('poll', execute=run_command, cloud_api=cloud_api)
+    queue.start()
+    queue.enqueue({'id': '...', 'type': 'install_module', 'payload': {...}})
+
+- enqueue() stores the command (CloudCommand) before anything runs. The
+  Cloud command id is the idempotency key, whatever the channel: a command
+  delivered again (poll overlap, WebSocket redelivery, or by both polling
+  and the WebSocket) does not run twice; if it already finished, its ack
+  is sent again.
+- A bounded thread pool (COMMAND_WORKERS) runs pending commands in arrival
+  order, at most `concurrency[type]` of a type at a time in the whole
+  process (both queues): module installs, updates and removals one at a
+  time, config syncs in parallel.
+- Results are acknowledged by an ack thread in batches (one request to the
+  batch ack endpoint, or one per command if Cloud has none). Acks that
+  fail stay pending and are retried every ACK_RETRY_INTERVAL seconds.
+- start() resumes after a restart: commands left 'running' by a dead
+  process go back to 'pending' (up to MAX_ATTEMPTS runs) and unsent acks
+  are sent.
+
+A queue only picks up commands of its own source, so each command runs
+with the handlers of the channel that delivered it. A command still
+pending when the other channel delivers it again is taken over by that
+channel (its queue may be stopped, e.g. the WebSocket disconnected).
+"""
+import logging
+import threading
+import time
+import uuid
+import weakref
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.db import connections, models
+from django.utils import timezone
+
+from apps.sync.models import CloudCommand
+
+from .cloud_api import CloudAPIError
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WORKERS = 4
+
+# Max commands of a type running at once (other types: up to the pool size)
+DEFAULT_CONCURRENCY = {
+    'install_module': 1,
+    'update_module': 1,
+    'remove_module': 1,
+}
+
+MAX_ATTEMPTS = 3  # runs of a command interrupted by restarts before giving up
+ACK_BATCH_SIZE = 50
+ACK_DELAY = 0.5  # seconds the ack thread waits to gather results into one request
+ACK_RETRY_INTERVAL = 60  # seconds between retries of failed acks
+DISPATCH_SCAN = 100  # pending commands considered per dispatch
+
+# Responses meaning Cloud has no batch ack endpoint
+BATCH_ACK_UNSUPPORTED = (404, 405, 501)
+
+# Commands executing in this process (not resumable)
+_inflight = set()
+_inflight_lock = threading.Lock()
+
+# Serializes dispatch across queues, so per-type limits hold process-wide
+_dispatch_lock = threading.Lock()
+
+# Started queues, woken when a slot frees up in any of them
+_queues = weakref.WeakSet()
+
+
+class CommandQueue:
+    """
+    Persistent queue of Cloud commands with a bounded worker pool.
+
+    Args:
+        source: Channel delivering the commands ('poll' or 'websocket')
+        execute: Callable taking the command dict ({'id', 'type', 'payload',
+            'command_jwt'}) and returning (success, result, error)
+        cloud_api: CloudAPIService for acks (default: get_cloud_api())
+        max_workers: Pool size (default: COMMAND_WORKERS)
+        concurrency: {command_type: max running}, over DEFAULT_CONCURRENCY
+            and COMMAND_CONCURRENCY
+        executor: concurrent.futures executor (default: own thread pool)
+        ack_delay: Seconds to gather results before acking; None disables
+            the ack thread (acks only sent by flush_acks())
+    """
+
+    def __init__(self, source, execute, cloud_api=None, max_workers=None, concurrency=None,
+                 executor=None, ack_delay=ACK_DELAY):
+        self.source = source
+        self._execute = execute
+        self._cloud_api = cloud_api
+        self.max_workers = max_workers or getattr(settings, 'COMMAND_WORKERS', DEFAULT_WORKERS)
+        self.concurrency = {
+            **DEFAULT_CONCURRENCY,
+            **getattr(settings, 'COMMAND_CONCURRENCY', {}),
+            **(concurrency or {}),
+        }
+        self.ack_delay = ack_delay
+        self.batch_ack_supported = True
+
+        self._executor = executor
+        self._owns_executor = executor is None
+        self._lock = threading.Lock()
+        self._active = Counter()
+        self._running = False
+        self._ack_wakeup = threading.Event()
+        self._ack_thread = None
+
+    @property
+    def cloud_api(self):
+        if self._cloud_api is None:
+            from .cloud_api import get_cloud_api
+            self._cloud_api = get_cloud_api()
+        return self._cloud_api
+
+    def limit(self, command_type):
+        """Max commands of command_type running at once."""
+        return self.concurrency.get(command_type, self.max_workers)
+
+    def _commands(self):
+        return CloudCommand.objects.filter(source=self.source)
+
+    # -------------------------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------------------------
+
+    def start(self):
+        """Resume interrupted commands, then run pending ones as they arrive."""
+        if self._running:
+            return
+        self._running = True
+        if self._owns_executor:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers, thread_name_prefix=f'Command-{self.source}'
+            )
+        self.resume()
+        with _inflight_lock:
+            _queues.add(self)
+        if self.ack_delay is not None:
+            self._ack_wakeup.set()  # unsent acks from before the restart
+            self._ack_thread = threading.Thread(
+                target=self._ack_loop, daemon=True, name=f'CommandAck-{self.source}'
+            )
+            self._ack_thread.start()
+        self.dispatch()
+
+    def stop(self):
+        """Stop taking commands; running ones finish and record their result."""
+        with self._lock:
+            if not self._running:
+                return
+            self._running = False
+            executor, self._executor = self._executor, (None if self._owns_executor else self._executor)
+        with _inflight_lock:
+            _queues.discard(self)
+        self._ack_wakeup.set()
+        if self._owns_executor and executor:
+            executor.shutdown(wait=False)
+
+    def resume(self):
+        """
+        Requeue commands a dead process left 'running'.
+
+        Returns:
+            int: Commands requeued
+        """
+        with _inflight_lock:
+            inflight = set(_inflight)
+        interrupted = self._commands().filter(status='running').exclude(pk__in=inflight)
+        now = timezone.now()
+        given_up = interrupted.filter(attempts__gte=MAX_ATTEMPTS).update(
+            status='failed', error=f'Interrupted {MAX_ATTEMPTS} times', completed_at=now, updated_at=now,
+        )
+        requeued = interrupted.filter(attempts__lt=MAX_ATTEMPTS).update(status='pending', updated_at=now)
+        if requeued or given_up:
+            logger.info(f"[COMMANDS] Resumed {requeued} interrupted commands ({given_up} given up)")
+        return requeued
+
+    # -------------------------------------------------------------------------
+    # Execution
+    # -------------------------------------------------------------------------
+
+    def enqueue(self, command, ack=True):
+        """
+        Store a received command and schedule it.
+
+        Args:
+            command: {'id', 'type', 'payload', 'command_jwt'} as received; a
+                command without id gets one and is not acknowledged
+            ack: Acknowledge the result to Cloud
+
+        Returns:
+            (CloudCommand, created): created is False for a repeated delivery
+        """
+        command_id = command.get('id')
+        cmd, created = CloudCommand.objects.get_or_create(
+            command_id=str(command_id or uuid.uuid4()),
+            defaults={
+                'source': self.source,
+                'command_type': command.get('type') or '',
+                'payload': command.get('payload') or {},
+                'command_jwt': command.get('command_jwt') or '',
+                'ack_required': ack and bool(command_id),
+            },
+        )
+
+        if not created:
+            logger.info(f"[COMMANDS] Duplicate delivery of {cmd.command_id} ({cmd.status}, {cmd.source})")
+            if cmd.status in CloudCommand.FINISHED and cmd.ack_required and cmd.acked_at:
+                # Cloud redelivers a finished command: our ack was lost (the
+                # queue of the channel that ran it sends it again)
+                CloudCommand.objects.filter(pk=cmd.pk).update(acked_at=None)
+                self._ack_wakeup.set()
+            elif cmd.status == 'pending' and cmd.source != self.source:
+                # Not started by the other channel yet: run it here
+                if CloudCommand.objects.filter(pk=cmd.pk, status='pending').update(source=self.source):
+                    cmd.source = self.source
+                    self.dispatch()
+            return cmd, False
+
+        self.dispatch()
+        return cmd, True
+
+    def dispatch(self):
+        """
+        Start pending commands while workers and per-type slots are free.
+
+        Returns:
+            int: Commands started
+        """
+        with self._lock:
+            if not self._running:
+                return 0
+            free = self.max_workers - sum(self._active.values())
+            if free <= 0:
+                return 0
+
+            claimed = []
+            with _dispatch_lock:
+                # Running in this process, whichever queue started them
+                with _inflight_lock:
+                    inflight = set(_inflight)
+                running = Counter(
+                    CloudCommand.objects.filter(pk__in=inflight, status='running')
+                    .values_list('command_type', flat=True)
+                )
+                saturated = [t for t, n in running.items() if n >= self.limit(t)]
+                pending = (
+                    self._commands().filter(status='pending')
+                    .exclude(command_type__in=saturated)
+                    .order_by('created_at')[:DISPATCH_SCAN]
+                )
+                for cmd in pending:
+                    if len(claimed) >= free:
+                        break
+                    if running[cmd.command_type] >= self.limit(cmd.command_type):
+                        continue
+                    now = timezone.now()
+                    started = self._commands().filter(pk=cmd.pk, status='pending').update(
+                        status='running', attempts=models.F('attempts') + 1, started_at=now, updated_at=now,
+                    )
+                    if not started:
+                        continue
+                    running[cmd.command_type] += 1
+                    self._active[cmd.command_type] += 1
+                    with _inflight_lock:
+                        _inflight.add(cmd.pk)
+                    claimed.append(cmd)
+
+            submitted = 0
+            for cmd in claimed:
+                try:
+                    self._executor.submit(self._run, cmd)
+                    submitted += 1
+                except RuntimeError as e:
+                    # Executor shut down by its owner: put the command back
+                    logger.warning(f"[COMMANDS] Could not start {cmd.command_id}: {e}")
+                    self._requeue(cmd)
+            return submitted
+
+    def _requeue(self, cmd):
+        """Undo a claim whose command never started (caller holds self._lock)."""
+        self._active[cmd.command_type] -= 1
+        with _inflight_lock:
+            _inflight.discard(cmd.pk)
+        self._commands().filter(pk=cmd.pk, status='running').update(
+            status='pending', attempts=models.F('attempts') - 1, started_at=None, updated_at=timezone.now(),
+        )
+
+    def _run(self, cmd):
+        logger.info(f"[COMMANDS] Executing {cmd.command_type} ({cmd.command_id})")
+        try:
+            try:
+                success, result, error = self._execute(cmd.as_command())
+            except Exception as e:
+                success, result, error = False, None, str(e)
+
+            now = timezone.now()
+            self._commands().filter(pk=cmd.pk).update(
+                status='completed' if success else 'failed',
+                result=result or {},
+                error=error or '',
+                completed_at=now,
+                updated_at=now,
+            )
+            if success:
+                logger.info(f"[COMMANDS] Command completed: {cmd.command_id}")
+            else:
+                logger.warning(f"[COMMANDS] Command failed: {cmd.command_id} - {error}")
+        except Exception as e:
+            logger.error(f"[COMMANDS] Could not record result of {cmd.command_id}: {e}")
+        finally:
+            with self._lock:
+                self._active[cmd.command_type] -= 1
+            with _inflight_lock:
+                _inflight.discard(cmd.pk)
+                queues = list(_queues)
+            self._ack_wakeup.set()
+            try:
+                # The freed type slot may be waited on by the other channel
+                for queue in queues:
+                    queue.dispatch()
+            finally:
+                if self._owns_executor:
+                    connections.close_all()
+
+    # -------------------------------------------------------------------------
+    # Acknowledgement
+    # -------------------------------------------------------------------------
+
+    def _ack_loop(self):
+        while self._running:
+            woken = self._ack_wakeup.wait(ACK_RETRY_INTERVAL)
+            self._ack_wakeup.clear()
+            if not self._running:
+                break
+            if woken:
+                time.sleep(self.ack_delay)
+            try:
+                while self.flush_acks() == ACK_BATCH_SIZE:
+                    pass
+            except Exception as e:
+                logger.error(f"[COMMANDS] Error sending acks: {e}")
+            finally:
+                connections.close_all()
+
+    def flush_acks(self):
+        """
+        Acknowledge finished commands to Cloud (one batch).
+
+        Returns:
+            int: Commands acknowledged
+        """
+        commands = list(
+            self._commands()
+            .filter(ack_required=True, acked_at__isnull=True, status__in=CloudCommand.FINISHED)
+            .order_by('completed_at')[:ACK_BATCH_SIZE]
+        )
+        if not commands:
+            return 0
+        acked = self._send_acks(commands)
+        if acked:
+            self._commands().filter(pk__in=acked).update(acked_at=timezone.now())
+        return len(acked)
+
+    def _send_acks(self, commands):
+        """Send acks; returns the pks Cloud accepted."""
+        if self.batch_ack_supported:
+            acks = []
+            for cmd in commands:
+                ack = {'command_id': cmd.command_id, 'status': cmd.status, 'result': cmd.result or {}}
+                if cmd.error:
+                    ack['error'] = cmd.error
+                acks.append(ack)
+            try:
+                self.cloud_api.acknowledge_commands(acks)
+                return [cmd.pk for cmd in commands]
+            except CloudAPIError as e:
+                if e.status_code not in BATCH_ACK_UNSUPPORTED:
+                    logger.warning(f"[COMMANDS] Failed to ack {len(acks)} commands: {e.message}")
+                    return []
+                logger.info("[COMMANDS] Cloud has no batch ack endpoint, acking one by one")
+                self.batch_ack_supported = False
+
+        acked = []
+        for cmd in commands:
+            try:
+                self.cloud_api.acknowledge_command(
+                    command_id=cmd.command_id,
+                    status=cmd.status,
+                    result=cmd.result or None,
+                    error=cmd.error or None,
+                )
+            except CloudAPIError as e:
+                logger.warning(f"[COMMANDS] Failed to ack command {cmd.command_id}: {e.message}")
+                if e.status_code is None:
+                    break  # Cloud unreachable: retry later
+                continue
+            acked.append(cmd.pk)
+        return acked
@@ -0,0 +1,196 @@
+"""
+Compaction of queued sync operations.
+
+After a long offline period SyncQueue holds many operations on the same
+remote entity. Before upload, the pending operations of every entity
+(operation family + SyncQueue.entity_key) are reduced to the ones that
+change the final state on Cloud:
+
+    update, update, update        -> one update carrying the merged payload
+    create, update, ..., delete   -> nothing (Cloud never saw the entity)
+    update, ..., delete           -> delete
+    delete, create                -> both (re-created)
+
+A merged update takes the queue position of the last operation it
+replaces, so operations queued in between (on other entities) are never
+sent before an entity state they may depend on. A create/delete pair is
+kept when an operation queued in between references the entity (its key
+appears in that operation's payload). A create that was already
+attempted (retry_count > 0, e.g. a timeout) may have reached Cloud, so
+create/delete pairs are only dropped for creates never sent. Entities with
+an operation being uploaded ('processing') are left alone.
+
+Superseded operations get status 'compacted'; their count is the number
+of Cloud requests avoided (SyncService.get_queue_status()).
+
+Operations without entity_key, or with an operation_type not in
+OPERATION_KINDS, are never compacted.
+"""
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+from django.db import transaction
+from django.utils import timezone
+
+from apps.sync.models import SyncQueue
+
+logger = logging.getLogger(__name__)
+
+CREATE, UPDATE, DELETE = 'create', 'update', 'delete'
+
+# operation_type -> (entity family, kind). Upserts (sale_sync) are updates.
+# Mirrors SyncQueue.OPERATION_TYPES. Nothing in the Hub core queues these
+# through SyncQueue.add_operation() yet: this is the extension point, and an
+# operation type is only compacted once it is listed here.
+OPERATION_KINDS = {
+    'user_register': ('user', CREATE),
+    'user_update': ('user', UPDATE),
+    'user_remove': ('user', DELETE),
+    'module_install': ('module', CREATE),
+    'module_uninstall': ('module', DELETE),
+    'sale_sync': ('sale', UPDATE),
+}
+
+MERGED_FIELDS = ['payload', 'headers']
+
+
+def _kind(operation):
+    return OPERATION_KINDS[operation.operation_type][1]
+
+
+@dataclass
+class Compaction:
+    survivors: list = field(default_factory=list)  # operations to send
+    changed: list = field(default_factory=list)    # survivors given a merged payload
+    merged: list = field(default_factory=list)     # updates folded into a survivor
+    dropped: list = field(default_factory=list)    # operations cancelled by a delete
+
+
+def _references(value, key):
+    """True if key appears as a value anywhere in a payload."""
+    if isinstance(value, dict):
+        return any(_references(v, key) for v in value.values())
+    if isinstance(value, list):
+        return any(_references(v, key) for v in value)
+    return isinstance(value, (str, int)) and not isinstance(value, bool) and str(value) == key
+
+
+def compact_operations(operations, referenced=None):
+    """
+    Compact the operations of one entity (oldest first).
+
+    Args:
+        operations: SyncQueue rows of one entity, in queue order
+        referenced: Optional callable(first, last) telling whether an
+            operation queued between first and last (on another entity)
+            references this entity; such create/delete pairs are kept
+    """
+    result = Compaction()
+    survivors = result.survivors
+    for operation in operations:
+        kind = _kind(operation)
+        last = survivors[-1] if survivors else None
+
+        if kind == UPDATE and last is not None and _kind(last) == UPDATE:
+            # Last state wins, in the last operation's queue position
+            operation.payload = {**last.payload, **operation.payload}
+            operation.headers = {**last.headers, **operation.headers}
+            survivors[-1] = operation
+            result.changed.append(operation)
+            result.merged.append(last)
+
+        elif kind == DELETE:
+            while survivors and _kind(survivors[-1]) == UPDATE:
+                result.dropped.append(survivors.pop())
+            create = survivors[-1] if survivors and _kind(survivors[-1]) == CREATE else None
+            if (create is not None and create.retry_count == 0
+                    and not (referenced and referenced(create, operation))):
+                result.dropped.append(survivors.pop())
+                result.dropped.append(operation)
+            else:
+                survivors.append(operation)
+
+        else:
+            survivors.append(operation)
+
+    result.changed = [op for op in result.changed if op in survivors]
+    return result
+
+
+def compact_queue(limit=5000):
+    """
+    Compact pending operations in the queue.
+
+    Runs in one transaction; rows locked by a worker claiming a batch are
+    skipped (SKIP LOCKED).
+
+    Args:
+        limit: Maximum pending operations examined per run
+
+    Returns:
+        dict: {'examined', 'entities', 'merged', 'dropped', 'requests_avoided'}
+    """
+    stats = {'examined': 0, 'entities': 0, 'merged': 0, 'dropped': 0, 'requests_avoided': 0}
+    types = list(OPERATION_KINDS)
+
+    with transaction.atomic():
+        # Every pending operation, so references from other types are seen
+        pending = list(
+            SyncQueue.objects.filter(status='pending')
+            .order_by('created_at', 'id')
+            .select_for_update(skip_locked=True)[:limit]
+        )
+        stats['examined'] = len(pending)
+        if not pending:
+            return stats
+        position = {op.id: i for i, op in enumerate(pending)}
+
+        def referenced(first, last):
+            between = pending[position[first.id] + 1:position[last.id]]
+            return any(
+                op.entity_key != first.entity_key and _references(op.payload, first.entity_key)
+                for op in between
+            )
+
+        entities = defaultdict(list)
+        for operation in pending:
+            if operation.operation_type in OPERATION_KINDS and operation.entity_key:
+                entity = (OPERATION_KINDS[operation.operation_type][0], operation.entity_key)
+                entities[entity].append(operation)
+        entities = {entity: ops for entity, ops in entities.items() if len(ops) > 1}
+        if not entities:
+            return stats
+
+        busy = {
+            (OPERATION_KINDS[op_type][0], key)
+            for op_type, key in SyncQueue.objects.filter(
+                status='processing', operation_type__in=types,
+            ).exclude(entity_key='').values_list('operation_type', 'entity_key')
+        }
+
+        changed, superseded = [], []
+        for entity, operations in entities.items():
+            if entity in busy:
+                continue
+            result = compact_operations(operations, referenced)
+            if not (result.merged or result.dropped):
+                continue
+            stats['entities'] += 1
+            stats['merged'] += len(result.merged)
+            stats['dropped'] += len(result.dropped)
+            changed.extend(result.changed)
+            superseded.extend(result.merged + result.dropped)
+
+        if changed:
+            SyncQueue.objects.bulk_update(changed, MERGED_FIELDS)
+        if superseded:
+            now = timezone.now()
+            SyncQueue.objects.filter(id__in=[op.id for op in superseded]).update(
+                status='compacted', completed_at=now, updated_at=now,
+            )
+
+    stats['requests_avoided'] = len(superseded)
+    if superseded:
+        logger.info(f"[SYNC] Compacted queue: {stats}")
+    return stats
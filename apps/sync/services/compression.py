@@ -0,0 +1,142 @@
+"""
+Request compression and wire accounting for Hub-to-Cloud calls.
+
+Request bodies larger than CLOUD_COMPRESSION_MIN_BYTES are sent with
+Content-Encoding: zstd (when the optional `zstandard` package is installed)
+or gzip. Small bodies (acks, short heartbeats) go uncompressed: the codec
+header would cost more than it saves.
+
+    CLOUD_COMPRESSION = 'auto'   zstd if available, else gzip
+                        'zstd'   zstd (gzip if zstandard is missing)
+                        'gzip'
+                        'none'
+
+Responses are decompressed by urllib3, which handles every encoding listed
+in ACCEPT_ENCODING. A Cloud that rejects compressed bodies (415) gets the
+same request again uncompressed; callers then stop compressing.
+
+Every call records raw and on-the-wire byte counts in `wire_stats`, keyed by
+channel (cloud_api, heartbeat, command_ack, sync).
+"""
+import gzip
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from urllib3.util.request import make_headers
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+logger = logging.getLogger(__name__)
+
+COMPRESSION_MODES = ('auto', 'zstd', 'gzip', 'none')
+
+# Encodings urllib3 can decode here (zstd/br only with their packages)
+ACCEPT_ENCODING = make_headers(accept_encoding=True)['accept-encoding']
+
+# Cloud does not accept the request encoding
+UNSUPPORTED_MEDIA_TYPE = 415
+
+GZIP_LEVEL = 6
+ZSTD_LEVEL = 3
+
+
+def get_encoding(mode=None):
+    """Content-Encoding to use for a CLOUD_COMPRESSION mode, or None."""
+    mode = mode or getattr(settings, 'CLOUD_COMPRESSION', 'auto')
+    if mode not in COMPRESSION_MODES:
+        raise ValueError(f"Unknown CLOUD_COMPRESSION '{mode}' (choose from {', '.join(COMPRESSION_MODES)})")
+    if mode == 'none':
+        return None
+    if mode in ('auto', 'zstd') and zstandard is not None:
+        return 'zstd'
+    return 'gzip'
+
+
+def compress(raw, encoding):
+    if encoding == 'zstd':
+        return zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    if encoding == 'gzip':
+        # mtime=0: same body, same bytes
+        return gzip.compress(raw, compresslevel=GZIP_LEVEL, mtime=0)
+    raise ValueError(f"Unsupported encoding '{encoding}'")
+
+
+def decompress(body, encoding):
+    """Reverse compress(); body unchanged when encoding is empty."""
+    if not encoding:
+        return body
+    if encoding == 'zstd':
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    if encoding == 'gzip':
+        return gzip.decompress(body)
+    raise ValueError(f"Unsupported encoding '{encoding}'")
+
+
+def encode_json(data, compressed=True, min_bytes=None):
+    """
+    Serialize data for a request body.
+
+    Returns:
+        (body, headers, raw_size): body bytes, Content-Type/Content-Encoding
+        headers and the size of the uncompressed JSON
+    """
+    raw = json.dumps(data, separators=(',', ':'), default=str).encode()
+    headers = {'Content-Type': 'application/json'}
+    if min_bytes is None:
+        min_bytes = getattr(settings, 'CLOUD_COMPRESSION_MIN_BYTES', 1024)
+    encoding = get_encoding() if compressed else None
+    if encoding and len(raw) >= min_bytes:
+        body = compress(raw, encoding)
+        if len(body) < len(raw):
+            headers['Content-Encoding'] = encoding
+            return body, headers, len(raw)
+    return raw, headers, len(raw)
+
+
+def received_bytes(response):
+    """Response body size as received (before decompression)."""
+    raw = getattr(response, 'raw', None)
+    try:
+        size = raw.tell()
+        if isinstance(size, int) and size:
+            return size
+    except (AttributeError, OSError, ValueError):
+        pass
+    return len(response.content or b'')
+
+
+class WireStats:
+    """Thread-safe byte counters per channel."""
+
+    FIELDS = ('requests', 'raw_bytes', 'sent_bytes', 'received_bytes')
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._channels = defaultdict(lambda: dict.fromkeys(self.FIELDS, 0))
+
+    def record(self, channel, raw, sent, received):
+        with self._lock:
+            counters = self._channels[channel]
+            counters['requests'] += 1
+            counters['raw_bytes'] += raw
+            counters['sent_bytes'] += sent
+            counters['received_bytes'] += received
+        logger.debug(f"[WIRE] {channel}: sent {sent}/{raw} bytes, received {received} bytes")
+
+    def snapshot(self):
+        """{channel: counters} copy."""
+        with self._lock:
+            return {channel: dict(counters) for channel, counters in self._channels.items()}
+
+    def reset(self):
+        with self._lock:
+            self._channels.clear()
+
+
+wire_stats = WireStats()
@@ -2,7 +2,14 @@
 Heartbeat Service for Hub-to-Cloud communication.
 
 Sends periodic heartbeats to Cloud to indicate Hub is online.
-Also polls for pending commands and executes them.
+Also polls for pending commands and hands them to a CommandQueue, which
+stores them and executes them in a worker pool (see command_queue.py).
+
+With HEARTBEAT_DELTA enabled, a heartbeat only carries what changed since
+the last heartbeat Cloud acknowledged, as a JSON merge patch (RFC 7396).
+Patches are computed against the acknowledged metadata, so re-sending after
+a failed heartbeat is safe. Every HEARTBEAT_FULL_EVERY heartbeats, or when
+Cloud answers {'full_heartbeat_required': true}, the full metadata is sent.
 """
 import logging
 import threading
@@ -12,10 +19,28 @@ from typing import Optional, Callable, Dict, Any
 from django.conf import settings
 
 from .cloud_api import CloudAPIService, CloudAPIError, get_cloud_api
+from .command_queue import CommandQueue
 
 logger = logging.getLogger(__name__)
 
 
+def merge_patch(old: Dict[str, Any], new: Dict[str, Any]) -> Dict[str, Any]:
+    """JSON merge patch (RFC 7396) turning old into new; {} if unchanged."""
+    patch = {}
+    for key, value in new.items():
+        if key not in old:
+            patch[key] = value
+        elif isinstance(value, dict) and isinstance(old[key], dict):
+            nested = merge_patch(old[key], value)
+            if nested:
+                patch[key] = nested
+        elif value != old[key]:
+            patch[key] = value
+    for key in old.keys() - new.keys():
+        patch[key] = None
+    return patch
+
+
 class HeartbeatService:
     """
     Background service for heartbeat and command polling.
@@ -23,7 +48,7 @@ class HeartbeatService:
     Features:
     - Periodic heartbeat every 60 seconds (configurable)
     - Command polling every 5 minutes (configurable)
-    - Automatic command execution
+    - Durable command execution in a worker pool, acks batched
     - Graceful shutdown
 
     Usage:
@@ -38,6 +63,7 @@ class HeartbeatService:
     DEFAULT_HEARTBEAT_INTERVAL = 120  # seconds (outside business hours)
     BUSINESS_HOURS_HEARTBEAT_INTERVAL = 30  # seconds (during business hours — keeps App Runner warm)
     DEFAULT_COMMAND_POLL_INTERVAL = 300  # 5 minutes
+    DEFAULT_FULL_HEARTBEAT_EVERY = 20  # delta heartbeats between full ones
 
     def __init__(
         self,
@@ -67,12 +93,19 @@ class HeartbeatService:
         self._heartbeat_thread: Optional[threading.Thread] = None
         self._command_thread: Optional[threading.Thread] = None
 
+        # Delta heartbeat state: last metadata Cloud acknowledged
+        self._acked_metadata: Optional[Dict[str, Any]] = None
+        self._deltas_since_full = 0
+
         # Command handlers registry
         self._command_handlers: Dict[str, Callable] = {}
 
         # Register default handlers
         self._register_default_handlers()
 
+        # Polled commands are stored and run off the polling thread
+        self.command_queue = CommandQueue('poll', execute=self._run_command, cloud_api=self.cloud_api)
+
     def _register_default_handlers(self):
         """Register default command handlers."""
         self.register_handler('install_module', self._handle_install_module)
@@ -92,14 +125,19 @@ class HeartbeatService:
         logger.debug(f"[HEARTBEAT] Registered handler for {command_type}")
 
     def start(self):
-        """Start heartbeat and command polling threads."""
+        """
+        Start heartbeat and command polling threads.
+
+        Returns:
+            bool: True if the service is running
+        """
         if self._running:
             logger.warning("[HEARTBEAT] Service already running")
-            return
+            return True
 
         if not self.cloud_api.is_configured:
             logger.warning("[HEARTBEAT] Hub not configured, service not started")
-            return
+            return False
 
         self._running = True
 
@@ -124,6 +162,7 @@ class HeartbeatService:
             f"(heartbeat={self.heartbeat_interval}s, "
             f"commands={self.command_poll_interval}s)"
         )
+        return True
 
     def stop(self):
         """Stop heartbeat service."""
@@ -132,6 +171,7 @@ class HeartbeatService:
 
         self._running = False
         logger.info("[HEARTBEAT] Service stopping...")
+        self.command_queue.stop()
 
         # Wait for threads to finish
         if self._heartbeat_thread and self._heartbeat_thread.is_alive():
@@ -176,6 +216,13 @@ class HeartbeatService:
         # Initial delay before first poll
         time.sleep(10)
 
+        if self._running:
+            try:
+                # Resume commands interrupted by a restart
+                self.command_queue.start()
+            except Exception as e:
+                logger.error(f"[HEARTBEAT] Error starting command queue: {str(e)}")
+
         while self._running:
             try:
                 self._poll_commands()
@@ -189,12 +236,29 @@ class HeartbeatService:
                 time.sleep(1)
 
     def _send_heartbeat(self):
-        """Send heartbeat to Cloud."""
+        """Send heartbeat to Cloud (a delta when enabled, see module docstring)."""
         try:
             metadata = self._get_heartbeat_metadata()
-            response = self.cloud_api.send_heartbeat(metadata)
+            full_every = getattr(settings, 'HEARTBEAT_FULL_EVERY', self.DEFAULT_FULL_HEARTBEAT_EVERY)
+            if (
+                getattr(settings, 'HEARTBEAT_DELTA', False)
+                and self._acked_metadata is not None
+                and self._deltas_since_full < full_every
+            ):
+                response = self.cloud_api.send_heartbeat(
+                    merge_patch(self._acked_metadata, metadata), delta=True
+                )
+                self._deltas_since_full += 1
+            else:
+                response = self.cloud_api.send_heartbeat(metadata)
+                self._deltas_since_full = 0
             logger.debug(f"[HEARTBEAT] Sent successfully: {response}")
 
+            if isinstance(response, dict) and response.get('full_heartbeat_required'):
+                self._acked_metadata = None
+            else:
+                self._acked_metadata = metadata
+
         except CloudAPIError as e:
             logger.warning(f"[HEARTBEAT] Failed to send: {e.message}")
 
@@ -275,7 +339,7 @@ class HeartbeatService:
             return []
 
     def _poll_commands(self):
-        """Poll and execute pending commands."""
+        """Poll pending commands and queue them for execution."""
         try:
             commands = self.cloud_api.get_pending_commands()
 
@@ -286,17 +350,20 @@ class HeartbeatService:
             logger.info(f"[HEARTBEAT] Received {len(commands)} pending commands")
 
             for cmd in commands:
-                self._execute_command(cmd)
+                self.command_queue.enqueue(cmd)
 
         except CloudAPIError as e:
             logger.warning(f"[HEARTBEAT] Failed to poll commands: {e.message}")
 
-    def _execute_command(self, command: Dict[str, Any]):
+    def _run_command(self, command: Dict[str, Any]) -> tuple:
         """
-        Execute a single command.
+        Verify and run a command (CommandQueue worker).
 
         Args:
             command: Command data from Cloud
+
+        Returns:
+            (success, result, error)
         """
         command_id = command.get('id')
         command_type = command.get('type')
@@ -312,53 +379,21 @@ class HeartbeatService:
                 logger.warning(
                     f"[HEARTBEAT] Command JWT verification failed: {command_id}"
                 )
-                self._ack_command(command_id, 'failed', error='JWT verification failed')
-                return
+                return False, None, 'JWT verification failed'
 
         # Get handler
         handler = self._command_handlers.get(command_type)
 
         if not handler:
             logger.warning(f"[HEARTBEAT] No handler for command type: {command_type}")
-            self._ack_command(
-                command_id,
-                'failed',
-                error=f'Unknown command type: {command_type}'
-            )
-            return
+            return False, None, f'Unknown command type: {command_type}'
 
         # Execute handler
         try:
-            success, result, error = handler(payload)
-
-            if success:
-                self._ack_command(command_id, 'completed', result=result)
-                logger.info(f"[HEARTBEAT] Command completed: {command_id}")
-            else:
-                self._ack_command(command_id, 'failed', error=error)
-                logger.warning(f"[HEARTBEAT] Command failed: {command_id} - {error}")
-
+            return handler(payload)
         except Exception as e:
             logger.error(f"[HEARTBEAT] Command execution error: {str(e)}")
-            self._ack_command(command_id, 'failed', error=str(e))
-
-    def _ack_command(
-        self,
-        command_id: str,
-        status: str,
-        result: Dict = None,
-        error: str = None
-    ):
-        """Acknowledge command execution to Cloud."""
-        try:
-            self.cloud_api.acknowledge_command(
-                command_id=command_id,
-                status=status,
-                result=result,
-                error=error
-            )
-        except CloudAPIError as e:
-            logger.error(f"[HEARTBEAT] Failed to ack command {command_id}: {e.message}")
+            return False, None, str(e)
 
     # =========================================================================
     # Default Command Handlers
@@ -424,9 +459,9 @@ def get_heartbeat_service() -> HeartbeatService:
 
 
 def start_heartbeat_service():
-    """Start the heartbeat service (call from AppConfig.ready())."""
+    """Start the heartbeat service (call from AppConfig.ready()); False if not started."""
     service = get_heartbeat_service()
-    service.start()
+    return service.start()
 
 
 def stop_heartbeat_service():
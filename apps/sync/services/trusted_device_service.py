@@ -7,6 +7,8 @@ import logging
 import requests
 from django.conf import settings
 
+from apps.core.services import cloud_http
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,7 +29,7 @@ class TrustedDeviceService:
             dict with 'valid': False if invalid
         """
         try:
-            response = requests.post(
+            response = cloud_http.post(
                 f"{self.base_url}/api/auth/trusted-devices/verify/",
                 json={'device_token': device_token},
                 timeout=self.DEFAULT_TIMEOUT,
@@ -59,7 +61,7 @@ class TrustedDeviceService:
             if ip_address:
                 data['ip_address'] = ip_address
 
-            response = requests.post(
+            response = cloud_http.post(
                 f"{self.base_url}/api/auth/trusted-devices/create/",
                 json=data,
                 headers={'Authorization': f'Bearer {access_token}'},
@@ -87,7 +89,7 @@ class TrustedDeviceService:
             list of device dicts, or empty list on failure
         """
         try:
-            response = requests.get(
+            response = cloud_http.get(
                 f"{self.base_url}/api/auth/trusted-devices/",
                 headers={'Authorization': f'Bearer {access_token}'},
                 timeout=self.DEFAULT_TIMEOUT,
@@ -114,7 +116,7 @@ class TrustedDeviceService:
             True if revoked, False on failure
         """
         try:
-            response = requests.post(
+            response = cloud_http.post(
                 f"{self.base_url}/api/auth/trusted-devices/{device_id}/revoke/",
                 headers={'Authorization': f'Bearer {access_token}'},
                 timeout=self.DEFAULT_TIMEOUT,
@@ -5,6 +5,10 @@ Maintains persistent WebSocket connection to Cloud for:
 - Receiving commands from Cloud (install module, sync config)
 - Sending events to Cloud (module installed, user sync)
 
+Commands are not handled on the socket thread: they are stored and run by
+a CommandQueue (see command_queue.py), so a slow install does not stall
+the connection and a restart does not lose a command.
+
 Note: Online/offline status is determined on-demand via HTTP ping from Cloud.
 The WebSocket library's built-in ping/pong (ping_interval=60) keeps the connection alive.
 """
@@ -16,6 +20,8 @@ from typing import Optional, Callable, Dict, Any
 
 from django.conf import settings
 
+from .command_queue import CommandQueue
+
 logger = logging.getLogger(__name__)
 
 
@@ -25,7 +31,7 @@ class WebSocketClient:
 
     Features:
     - Auto-reconnect on disconnect
-    - Command handlers registry
+    - Command handlers registry (run by a CommandQueue worker pool)
     - Thread-safe message sending
     - Connection keepalive via WebSocket ping/pong (60s)
 
@@ -47,6 +53,7 @@ class WebSocketClient:
         # Command handlers
         self._handlers: Dict[str, Callable] = {}
         self._register_default_handlers()
+        self.command_queue = CommandQueue('websocket', execute=self._run_command)
 
         # Get config
         self._hub_id = None
@@ -91,18 +98,24 @@ class WebSocketClient:
         logger.debug(f"[WS] Registered handler for {message_type}")
 
     def start(self):
-        """Start WebSocket client in background thread."""
+        """
+        Start WebSocket client in background thread.
+
+        Returns:
+            bool: True if the client is running
+        """
         if self._running:
             logger.warning("[WS] Client already running")
-            return
+            return True
 
         self._load_config()
 
         if not self.is_configured:
             logger.warning("[WS] Hub not configured, client not started")
-            return
+            return False
 
         self._running = True
+        self.command_queue.start()
 
         # Start connection thread
         self._thread = threading.Thread(
@@ -113,6 +126,7 @@ class WebSocketClient:
         self._thread.start()
 
         logger.info("[WS] Client started")
+        return True
 
     def stop(self):
         """Stop WebSocket client."""
@@ -120,6 +134,7 @@ class WebSocketClient:
             return
 
         self._running = False
+        self.command_queue.stop()
 
         if self.ws:
             try:
@@ -199,13 +214,13 @@ class WebSocketClient:
 
             logger.debug(f"[WS] Received: {message_type}")
 
-            # Find and call handler
-            handler = self._handlers.get(message_type)
-            if handler:
-                try:
-                    handler(data)
-                except Exception as e:
-                    logger.error(f"[WS] Handler error for {message_type}: {e}")
+            # Queue for a worker; the Cloud command id makes redelivery safe
+            if message_type in self._handlers:
+                self.command_queue.enqueue({
+                    'id': data.get('command_id') or data.get('id'),
+                    'type': message_type,
+                    'payload': data,
+                })
             else:
                 logger.debug(f"[WS] No handler for: {message_type}")
 
@@ -214,6 +229,19 @@ class WebSocketClient:
         except Exception as e:
             logger.error(f"[WS] Error processing message: {e}")
 
+    def _run_command(self, command: Dict[str, Any]) -> tuple:
+        """Run a queued message with its handler (CommandQueue worker)."""
+        message_type = command.get('type')
+        handler = self._handlers.get(message_type)
+        if not handler:
+            return False, None, f'Unknown command type: {message_type}'
+        try:
+            handler(command.get('payload') or {})
+        except Exception as e:
+            logger.error(f"[WS] Handler error for {message_type}: {e}")
+            return False, None, str(e)
+        return True, None, None
+
     def _on_error(self, ws, error):
         """Handle WebSocket error."""
         logger.error(f"[WS] Error: {error}")
@@ -280,9 +308,9 @@ def get_websocket_client() -> WebSocketClient:
 
 
 def start_websocket_client():
-    """Start the WebSocket client (call from AppConfig.ready())."""
+    """Start the WebSocket client (call from AppConfig.ready()); False if not started."""
     client = get_websocket_client()
-    client.start()
+    return client.start()
 
 
 def stop_websocket_client():
@@ -10,6 +10,7 @@ from django.views.decorators.http import require_POST
 
 from apps.accounts.decorators import login_required
 from apps.configuration.models import HubConfig
+from apps.core.services import cloud_http
 
 logger = logging.getLogger(__name__)
 
@@ -37,7 +38,7 @@ def submit_bug_report(request):
     endpoint = f"{cloud_url}/api/hubs/me/bug-report/"
 
     try:
-        response = http_requests.post(
+        response = cloud_http.post(
             endpoint,
             files={'screenshot': ('screenshot.png', screenshot.read(), 'image/png')},
             data={
@@ -15,6 +15,7 @@ from rest_framework.response import Response
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from apps.configuration.models import HubConfig
+from apps.core.services import cloud_http
 from apps.core.api_base import IsAuthenticated, IsAdmin, SuccessResponseSerializer, ErrorResponseSerializer
 
 
@@ -363,7 +364,7 @@ class MarketplaceView(APIView):
 
             headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
 
-            response = requests.get(
+            response = cloud_http.get(
                 f"{cloud_api_url}/api/marketplace/modules/",
                 headers=headers,
                 timeout=30
@@ -375,7 +376,7 @@ class MarketplaceView(APIView):
 
                 categories = []
                 try:
-                    cat_response = requests.get(
+                    cat_response = cloud_http.get(
                         f"{cloud_api_url}/api/marketplace/categories/",
                         headers=headers,
                         timeout=10
@@ -437,7 +438,7 @@ class ModulePurchaseView(APIView):
             cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
             headers = {'Content-Type': 'application/json', 'X-Hub-Token': auth_token}
 
-            response = requests.post(
+            response = cloud_http.post(
                 f"{cloud_api_url}/api/marketplace/modules/{module_id}/purchase/",
                 json={
                     'success_url': f"{cloud_api_url}/dashboard/modules/marketplace/payment-success/?module_id={module_id}&source=hub",
@@ -504,7 +505,7 @@ class ModuleOwnershipView(APIView):
             cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
             headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
 
-            response = requests.get(
+            response = cloud_http.get(
                 f"{cloud_api_url}/api/marketplace/modules/{module_id}/check_ownership/",
                 headers=headers,
                 timeout=10
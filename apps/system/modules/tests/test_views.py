@@ -29,7 +29,7 @@ class MarketplaceViewsTest(TestCase):
         request.session = self.session
         return request
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_marketplace_modules_list_success(self, mock_hub_config, mock_requests_get):
         """Test marketplace modules list returns modules from Cloud API."""
@@ -66,7 +66,7 @@ class MarketplaceViewsTest(TestCase):
         assert response.status_code == 200
         assert b'Test Module' in response.content
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_marketplace_modules_list_with_type_filter(self, mock_hub_config, mock_requests_get):
         """Test marketplace filters by module type."""
@@ -94,7 +94,7 @@ class MarketplaceViewsTest(TestCase):
         assert b'Free Module' in response.content
         assert b'Paid Module' not in response.content
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_marketplace_modules_list_no_auth_token(self, mock_hub_config, mock_requests_get):
         """Test marketplace returns error when no auth token."""
@@ -111,7 +111,7 @@ class MarketplaceViewsTest(TestCase):
         assert response.status_code == 200  # Returns HTML error, not HTTP error
         assert b'not connected to Cloud' in response.content
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_marketplace_modules_list_pagination(self, mock_hub_config, mock_requests_get):
         """Test marketplace pagination works correctly."""
@@ -163,7 +163,7 @@ class ModuleDetailViewTest(TestCase):
         request.session = self.session
         return request
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_module_detail_success(self, mock_hub_config, mock_requests_get):
         """Test module detail returns module info in rendered HTML."""
@@ -204,7 +204,7 @@ class ModuleDetailViewTest(TestCase):
         assert response.status_code == 200
         assert b'Test Module' in response.content
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_module_detail_not_found(self, mock_hub_config, mock_requests_get):
         """Test module detail returns error for non-existent module."""
@@ -243,7 +243,7 @@ class MarketplaceAPITest(TestCase):
         request.session = self.session
         return request
 
-    @patch('apps.system.modules.views.requests.post')
+    @patch('apps.system.modules.views.cloud_http.post')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_purchase_module_free(self, mock_hub_config, mock_requests_post):
         """Test acquiring a free module."""
@@ -269,7 +269,7 @@ class MarketplaceAPITest(TestCase):
 
         assert response.status_code == 200
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     @patch('apps.configuration.models.HubConfig.get_solo')
     def test_check_ownership_owned(self, mock_hub_config, mock_requests_get):
         """Test checking ownership of an owned module."""
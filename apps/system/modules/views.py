@@ -4,12 +4,16 @@ System Modules Views
 Module management and marketplace - similar to WordPress modules page.
 All views support SPA navigation via HTMX.
 """
+import asyncio
 import json
 import re
 import shutil
+import httpx
 import requests
 from pathlib import Path
 
+from asgiref.sync import sync_to_async
+
 from django.http import JsonResponse
 from django.utils.html import escape as html_escape
 from django.utils.translation import gettext as _
@@ -17,6 +21,8 @@ from django.views.decorators.http import require_http_methods
 from django.conf import settings as django_settings
 
 from apps.core.htmx import htmx_view
+from apps.core.services import cloud_http
+from apps.core.services.async_http import aget, aget_json
 from apps.accounts.decorators import login_required, admin_required
 
 
@@ -173,13 +179,8 @@ def modules_index(request):
     return context
 
 
-@login_required
-@htmx_view('system/modules/pages/marketplace.html', 'system/modules/partials/marketplace_content.html')
-def marketplace(request):
-    """Marketplace view - shows modules from ERPlora Cloud"""
-    from apps.configuration.models import HubConfig
-    from config.module_categories import get_all_categories, get_all_industries
-
+def _installed_module_ids():
+    """Module ids present in MODULES_DIR (active or disabled)."""
     modules_dir = Path(django_settings.MODULES_DIR)
     installed_module_ids = []
 
@@ -188,6 +189,17 @@ def marketplace(request):
             if module_dir.is_dir() and not module_dir.name.startswith('.'):
                 module_id = module_dir.name.lstrip('_')
                 installed_module_ids.append(module_id)
+    return installed_module_ids
+
+
+@login_required
+@htmx_view('system/modules/pages/marketplace.html', 'system/modules/partials/marketplace_content.html')
+async def marketplace(request):
+    """Marketplace view - shows modules from ERPlora Cloud"""
+    from apps.configuration.models import HubConfig
+    from config.module_categories import get_all_categories, get_all_industries
+
+    installed_module_ids = await sync_to_async(_installed_module_ids)()
 
     # Get language for localized names
     language = getattr(request, 'LANGUAGE_CODE', 'en')[:2]
@@ -197,35 +209,24 @@ def marketplace(request):
     industries = get_all_industries(language)
 
     # Fetch from Cloud API (source of truth for multi-language support)
-    hub_config = HubConfig.get_solo()
+    hub_config = await sync_to_async(HubConfig.get_solo)()
     auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
 
     if auth_token:
         cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
         headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
-        try:
-            # Fetch categories from Cloud
-            cat_response = requests.get(
-                f"{cloud_api_url}/api/marketplace/categories/",
-                headers=headers, params={'language': language}, timeout=10
-            )
-            if cat_response.status_code == 200:
-                cloud_categories = cat_response.json()
-                if cloud_categories:
-                    categories = cloud_categories
-
-            # Fetch industries from Cloud
-            ind_response = requests.get(
-                f"{cloud_api_url}/api/marketplace/industries/",
-                headers=headers, params={'language': language}, timeout=10
-            )
-            if ind_response.status_code == 200:
-                cloud_industries = ind_response.json()
-                if cloud_industries:
-                    industries = cloud_industries
-        except Exception:
-            # Fallback to local config if Cloud is unreachable
-            pass
+        params = {'language': language}
+
+        # Categories and industries in parallel; local config stays as the
+        # fallback if Cloud is unreachable
+        (_cat_status, cloud_categories), (_ind_status, cloud_industries) = await asyncio.gather(
+            aget_json(f"{cloud_api_url}/api/marketplace/categories/", headers=headers, params=params),
+            aget_json(f"{cloud_api_url}/api/marketplace/industries/", headers=headers, params=params),
+        )
+        if cloud_categories:
+            categories = cloud_categories
+        if cloud_industries:
+            industries = cloud_industries
 
     return {
         'current_section': 'marketplace',
@@ -281,7 +282,7 @@ def marketplace_modules_list(request):
     }
 
     try:
-        response = requests.get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/marketplace/modules/",
             headers=headers,
             timeout=30
@@ -419,7 +420,7 @@ def module_detail(request, slug):
     }
 
     try:
-        response = requests.get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/marketplace/modules/{slug}/",
             headers=headers,
             timeout=30
@@ -441,7 +442,7 @@ def module_detail(request, slug):
         # Fetch related modules (same category)
         related_modules = []
         try:
-            all_response = requests.get(
+            all_response = cloud_http.get(
                 f"{cloud_api_url}/api/marketplace/modules/",
                 headers=headers,
                 timeout=10
@@ -912,12 +913,12 @@ def module_restart_server(request):
 
 @require_http_methods(["GET"])
 @login_required
-def fetch_marketplace(request):
+async def fetch_marketplace(request):
     """Proxy to fetch modules from Cloud API"""
 
     try:
         from apps.configuration.models import HubConfig
-        hub_config = HubConfig.get_solo()
+        hub_config = await sync_to_async(HubConfig.get_solo)()
 
         cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
         headers = {'Accept': 'application/json'}
@@ -932,36 +933,22 @@ def fetch_marketplace(request):
         headers['X-Hub-Token'] = auth_token
         api_url = f"{cloud_api_url}/api/marketplace/modules/"
 
-        response = requests.get(api_url, headers=headers, timeout=30)
+        # Modules, categories and industries in parallel
+        response, (_cat_status, categories), (_ind_status, industries) = await asyncio.gather(
+            aget(api_url, headers=headers, timeout=30),
+            aget_json(f"{cloud_api_url}/api/marketplace/categories/", headers=headers),
+            aget_json(f"{cloud_api_url}/api/marketplace/industries/", headers=headers),
+        )
 
         if response.status_code == 200:
             data = response.json()
             modules = data.get('results', data) if isinstance(data, dict) else data
 
-            categories = []
-            industries = []
-            try:
-                cat_response = requests.get(
-                    f"{cloud_api_url}/api/marketplace/categories/",
-                    headers=headers, timeout=10
-                )
-                if cat_response.status_code == 200:
-                    categories = cat_response.json()
-
-                ind_response = requests.get(
-                    f"{cloud_api_url}/api/marketplace/industries/",
-                    headers=headers, timeout=10
-                )
-                if ind_response.status_code == 200:
-                    industries = ind_response.json()
-            except Exception:
-                pass
-
             return JsonResponse({
                 'success': True,
                 'modules': modules if isinstance(modules, list) else [],
-                'categories': categories,
-                'industries': industries
+                'categories': categories or [],
+                'industries': industries or []
             })
         else:
             return JsonResponse({
@@ -969,7 +956,7 @@ def fetch_marketplace(request):
                 'error': f'Cloud API returned {response.status_code}'
             }, status=response.status_code)
 
-    except requests.exceptions.RequestException as e:
+    except httpx.HTTPError as e:
         return JsonResponse({
             'success': False,
             'error': f'Failed to connect to Cloud: {str(e)}'
@@ -1008,7 +995,7 @@ def purchase_module(request):
             'X-Hub-Token': auth_token,
         }
 
-        response = requests.post(
+        response = cloud_http.post(
             f"{cloud_api_url}/api/marketplace/modules/{module_id}/purchase/",
             json={'success_url': success_url, 'cancel_url': cancel_url},
             headers=headers, timeout=30
@@ -1071,7 +1058,7 @@ def rate_module(request):
             return JsonResponse({'success': False, 'error': 'Hub not connected to Cloud'}, status=401)
 
         cloud_api_url = getattr(django_settings, 'CLOUD_API_URL', 'https://erplora.com')
-        response = requests.post(
+        response = cloud_http.post(
             f"{cloud_api_url}/api/marketplace/modules/{module_id}/review/",
             json={'rating': rating, 'comment': comment},
             headers={'X-Hub-Token': auth_token, 'Content-Type': 'application/json'},
@@ -1115,7 +1102,7 @@ def check_ownership(request, module_id):
         auth_token = hub_config.hub_jwt or hub_config.cloud_api_token
         headers = {'Accept': 'application/json', 'X-Hub-Token': auth_token}
 
-        response = requests.get(
+        response = cloud_http.get(
             f"{cloud_api_url}/api/marketplace/modules/{module_id}/check_ownership/",
             headers=headers, timeout=10
         )
@@ -3,14 +3,33 @@ ASGI config for config project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
 
+Used by the ASGI server mode (HUB_SERVER=asgi): uvicorn workers under
+gunicorn, so Cloud-bound views (marketplace, module store) wait on Cloud
+without holding a worker. See the Dockerfile / docker-compose.yml.
+
 For more information on this file, see
 https://docs.djangoproject.com/en/6.0/howto/deployment/asgi/
 """
 
 import os
 
-from django.core.asgi import get_asgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_asgi_application()
+django.setup(set_prefix=False)
+
+# Opt-in per-middleware timing (REQUEST_TIMING=true), as in config/wsgi.py.
+from django.conf import settings  # noqa: E402
+
+if settings.REQUEST_TIMING_ENABLED:
+    from apps.core.middleware.server_timing import TimedASGIHandler
+    application = TimedASGIHandler()
+else:
+    from django.core.handlers.asgi import ASGIHandler
+    application = ASGIHandler()
+
+# Pooled Cloud client on the worker's event loop (apps.core.services.async_http)
+from apps.core.services.async_http import asgi_application  # noqa: E402
+
+application = asgi_application(application)
@@ -0,0 +1,80 @@
+"""
+Database connection settings shared by the settings modules.
+
+database_from_url() parses a DATABASE_URL and applies the connection
+policy from the environment:
+
+    DB_POOL=true             psycopg 3 connection pool (Django's OPTIONS['pool']);
+                             refuses to start when psycopg 3 is not installed
+                             (the image ships psycopg2)
+    DB_POOL_MIN_SIZE=1       pool bounds and how long to wait for a free
+    DB_POOL_MAX_SIZE=10      connection (seconds)
+    DB_POOL_TIMEOUT=10
+    DB_CONN_MAX_AGE=60       persistent connections: seconds to keep a
+                             connection open between requests (0 = close
+                             after each request). Always 0 under
+                             HUB_SERVER=asgi: queries run in sync_to_async
+                             threads that outlive the request, so persistent
+                             connections would pile up (use DB_POOL instead)
+    DB_CONN_HEALTH_CHECKS=true
+                             check a persistent connection before reusing it,
+                             so a connection dropped by Aurora scaling or a
+                             failover is replaced instead of failing a request
+
+replica_databases() adds a 'replica' alias when DATABASE_REPLICA_URL is
+set; reads are sent there only inside using_replica() (see
+apps/core/db_router.py).
+"""
+
+from decouple import config
+from django.core.exceptions import ImproperlyConfigured
+
+REPLICA = 'replica'
+
+
+def _psycopg3_available():
+    try:
+        import psycopg  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def apply_connection_policy(database):
+    """Set pooling / persistent connection options on one DATABASES entry."""
+    if config('DB_POOL', default=False, cast=bool):
+        if not _psycopg3_available():
+            raise ImproperlyConfigured(
+                "DB_POOL=true needs psycopg 3 (pip install 'psycopg[binary]'); "
+                "only psycopg2 is installed. Unset DB_POOL to use persistent connections."
+            )
+        database.setdefault('OPTIONS', {})['pool'] = {
+            'min_size': config('DB_POOL_MIN_SIZE', default=1, cast=int),
+            'max_size': config('DB_POOL_MAX_SIZE', default=10, cast=int),
+            'timeout': config('DB_POOL_TIMEOUT', default=10, cast=int),
+        }
+        # The pool owns connection reuse; Django must not keep them itself
+        database['CONN_MAX_AGE'] = 0
+    elif config('HUB_SERVER', default='wsgi').lower() == 'asgi':
+        database['CONN_MAX_AGE'] = 0
+    else:
+        database['CONN_MAX_AGE'] = config('DB_CONN_MAX_AGE', default=60, cast=int)
+    database['CONN_HEALTH_CHECKS'] = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+    return database
+
+
+def database_from_url(url):
+    """DATABASES entry for a postgres:// URL with the connection policy applied."""
+    import dj_database_url
+    return apply_connection_policy(dj_database_url.parse(url))
+
+
+def replica_databases():
+    """{'replica': {...}} when DATABASE_REPLICA_URL is set, else {}."""
+    url = config('DATABASE_REPLICA_URL', default='')
+    if not url:
+        return {}
+    replica = database_from_url(url)
+    # Tests run against the primary only
+    replica['TEST'] = {'MIRROR': 'default'}
+    return {REPLICA: replica}
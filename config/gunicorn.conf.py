@@ -0,0 +1,26 @@
+"""
+Gunicorn configuration (Docker image and docker-compose).
+
+HUB_SERVER selects the server mode:
+
+- wsgi (default): config.wsgi:application with sync workers
+  (GUNICORN_WORKER_CLASS / GUNICORN_THREADS, e.g. gthread + 4 threads).
+- asgi: config.asgi:application with uvicorn workers. Cloud-bound views
+  (marketplace, module store) are async, so a slow Cloud keeps a request
+  waiting on the event loop instead of holding a worker the POS needs.
+
+Bind address, worker count, timeout and pid file are passed on the
+command line.
+"""
+
+import os
+
+HUB_SERVER = os.environ.get('HUB_SERVER', 'wsgi').lower()
+
+if HUB_SERVER == 'asgi':
+    wsgi_app = 'config.asgi:application'
+    worker_class = 'uvicorn_worker.UvicornWorker'
+else:
+    wsgi_app = 'config.wsgi:application'
+    worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'sync')
+    threads = int(os.environ.get('GUNICORN_THREADS', '1'))
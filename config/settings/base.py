@@ -225,22 +225,29 @@ WSGI_APPLICATION = 'config.wsgi.application'
 # =============================================================================
 # Supports DATABASE_URL env var (used by App Runner / Aurora Serverless v2)
 # Falls back to individual settings for local development
+# Connection pooling / persistent connections: DB_POOL, DB_CONN_MAX_AGE, ...
+# Read replica: DATABASE_REPLICA_URL (see config/database.py)
+
+from config.database import apply_connection_policy, database_from_url, replica_databases
 
 _database_url = config('DATABASE_URL', default='')
 if _database_url:
-    import dj_database_url
-    DATABASES = {'default': dj_database_url.parse(_database_url)}
+    DATABASES = {'default': database_from_url(_database_url)}
 else:
     DATABASES = {
-        'default': {
+        'default': apply_connection_policy({
             'ENGINE': 'django.db.backends.postgresql',
             'NAME': config('DB_NAME', default='erplora_hub'),
             'USER': config('DB_USER', default='erplora'),
             'PASSWORD': config('DB_PASSWORD', default='erplora'),
             'HOST': config('DB_HOST', default='localhost'),
             'PORT': config('DB_PORT', default='5432'),
-        }
+        })
     }
+DATABASES.update(replica_databases())
+
+# Reads go to the replica only inside using_replica(); no-op without one
+DATABASE_ROUTERS = ['apps.core.db_router.ReplicaRouter']
 
 # =============================================================================
 # PASSWORD VALIDATION
@@ -333,17 +340,68 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # CACHE
 # =============================================================================
 
+# Rate limiter counters (apps.core.services.rate_limiter) need an atomic
+# incr on every deployment: FileBasedCache.incr is a get + set that loses
+# concurrent PIN attempts. PostgresCache increments in SQL.
+RATE_LIMIT_CACHE = {
+    'BACKEND': 'apps.core.cache_backends.PostgresCache',
+    'LOCATION': 'hub_cache',
+    'TIMEOUT': 300,
+}
+
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
         'LOCATION': Path('/app/data/cache') if Path('/app/data').exists() else BASE_DIR / '.cache',
         'TIMEOUT': 300,  # 5 minutes default
-    }
+    },
+    'ratelimit': RATE_LIMIT_CACHE,
 }
 
 # Marketplace cache TTL (seconds)
 MARKETPLACE_CACHE_TTL = 300  # 5 minutes
 
+# Premium module subscription checks (ModuleSubscriptionMiddleware)
+# Last-known status is served from cache/DB; after FRESH_TTL seconds one
+# batched background call refreshes all premium modules. A status not
+# confirmed within GRACE_HOURS counts as 'unknown', which UNKNOWN_POLICY
+# resolves: 'allow' (fail-open) or 'deny' (redirect to pricing). A status
+# never confirmed at all is always denied.
+MODULE_SUBSCRIPTION_FRESH_TTL = 300
+MODULE_SUBSCRIPTION_GRACE_HOURS = config('MODULE_SUBSCRIPTION_GRACE_HOURS', default=72, cast=int)
+MODULE_SUBSCRIPTION_UNKNOWN_POLICY = config('MODULE_SUBSCRIPTION_UNKNOWN_POLICY', default='allow')
+
+# =============================================================================
+# REQUEST TIMING (opt-in diagnostics)
+# =============================================================================
+# REQUEST_TIMING=true adds ServerTimingMiddleware (outermost) and switches
+# config/wsgi.py to a handler that times each middleware layer. Emits a
+# Server-Timing header and aggregates per URL name for /htmx/diagnostics/timing/.
+# The middleware is inserted by each environment file after its own
+# MIDDLEWARE index-based inserts.
+
+REQUEST_TIMING_ENABLED = config('REQUEST_TIMING', default=False, cast=bool)
+REQUEST_TIMING_SAMPLES = config('REQUEST_TIMING_SAMPLES', default=500, cast=int)
+REQUEST_TIMING_MIDDLEWARE = 'apps.core.middleware.server_timing.ServerTimingMiddleware'
+
+# =============================================================================
+# SESSIONS
+# =============================================================================
+# SESSION_MODE=coalesced switches to a cached_db session store with a signed
+# flags cookie and write coalescing (apps/core/session_backends/coalesced.py):
+# requests that only read the per-request keys (local_user_id, hub_id,
+# language, ...) do no session query, and forced saves are written once at
+# the end of the request, only when something changed.
+
+SESSION_MODE = config('SESSION_MODE', default='db')
+SESSION_FLAGS_MAX_AGE = config('SESSION_FLAGS_MAX_AGE', default=300, cast=int)  # seconds
+
+if SESSION_MODE == 'coalesced':
+    SESSION_ENGINE = 'apps.core.session_backends.coalesced'
+    MIDDLEWARE[MIDDLEWARE.index('django.contrib.sessions.middleware.SessionMiddleware')] = (
+        'apps.core.middleware.session.CoalescingSessionMiddleware'
+    )
+
 # =============================================================================
 # CLOUD API
 # =============================================================================
@@ -352,6 +410,47 @@ MARKETPLACE_CACHE_TTL = 300  # 5 minutes
 # Priority: CLOUD_URL > CLOUD_BASE_URL > CLOUD_API_URL (legacy)
 CLOUD_API_URL = config('CLOUD_URL', default=config('CLOUD_BASE_URL', default=config('CLOUD_API_URL', default='https://erplora.com')))
 
+# Pooled Cloud clients: apps.core.services.cloud_http (blocking calls) and
+# async_http (async views under ASGI, HUB_SERVER=asgi)
+CLOUD_HTTP_MAX_CONNECTIONS = config('CLOUD_HTTP_MAX_CONNECTIONS', default=20, cast=int)
+CLOUD_HTTP_MAX_KEEPALIVE = config('CLOUD_HTTP_MAX_KEEPALIVE', default=10, cast=int)
+
+# Cloud calls fail fast for CLOUD_HTTP_BREAKER_RESET seconds after
+# CLOUD_HTTP_BREAKER_THRESHOLD consecutive failures (circuit breaker).
+# Read timeouts per path prefix: cloud_http.ENDPOINT_TIMEOUTS, overridable
+# with a CLOUD_HTTP_TIMEOUTS dict in a settings module.
+CLOUD_HTTP_CONNECT_TIMEOUT = config('CLOUD_HTTP_CONNECT_TIMEOUT', default=3.05, cast=float)
+CLOUD_HTTP_BREAKER_THRESHOLD = config('CLOUD_HTTP_BREAKER_THRESHOLD', default=5, cast=int)
+CLOUD_HTTP_BREAKER_RESET = config('CLOUD_HTTP_BREAKER_RESET', default=30, cast=int)
+
+# Leader election for singleton background services (Cloud sync, scheduler):
+# lock attempts/renewals every INTERVAL seconds; a leader silent for LEASE
+# seconds is dropped and another process takes over
+LEADER_ELECTION_INTERVAL = config('LEADER_ELECTION_INTERVAL', default=5, cast=int)
+LEADER_ELECTION_LEASE = config('LEADER_ELECTION_LEASE', default=15, cast=int)
+
+# Cloud commands: worker threads running queued commands (module installs
+# run one at a time regardless; see apps/sync/services/command_queue.py)
+COMMAND_WORKERS = config('COMMAND_WORKERS', default=4, cast=int)
+
+# Offline sync queue: operations claimed and sent to Cloud per batch
+SYNC_BATCH_SIZE = config('SYNC_BATCH_SIZE', default=100, cast=int)
+
+# Request body compression for Cloud calls: auto (zstd if installed, else
+# gzip), zstd, gzip or none. Smaller bodies are sent as-is.
+CLOUD_COMPRESSION = config('CLOUD_COMPRESSION', default='auto')
+CLOUD_COMPRESSION_MIN_BYTES = config('CLOUD_COMPRESSION_MIN_BYTES', default=1024, cast=int)
+
+# Delta heartbeats: send only fields changed since the last acknowledged
+# heartbeat (Cloud must accept X-Heartbeat-Delta), full every N heartbeats
+HEARTBEAT_DELTA = config('HEARTBEAT_DELTA', default=False, cast=bool)
+HEARTBEAT_FULL_EVERY = config('HEARTBEAT_FULL_EVERY', default=20, cast=int)
+
+# Local mirror of Cloud blueprint/catalog data (DATA_DIR/cloud_mirror):
+# copies younger than MAX_AGE seconds are served as-is, older ones are
+# revalidated with conditional GETs, any copy is served when offline
+CLOUD_MIRROR_MAX_AGE = config('CLOUD_MIRROR_MAX_AGE', default=300, cast=int)
+
 # =============================================================================
 # DEPLOYMENT MODE (overridden per environment)
 # =============================================================================
@@ -361,6 +460,10 @@ OFFLINE_ENABLED = True
 CLOUD_SYNC_REQUIRED = False
 DEMO_MODE = config('DEMO_MODE', default=False, cast=bool)
 
+# Reverse proxies that append to X-Forwarded-For (client_ip() for rate limits).
+# 0 = no proxy, the client is REMOTE_ADDR
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=0, cast=int)
+
 # =============================================================================
 # HUB CONFIGURATION
 # =============================================================================
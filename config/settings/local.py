@@ -34,8 +34,7 @@ DATA_DIR = _paths.base_dir
 # Database — PostgreSQL (defaults from base.py, overridable via DATABASE_URL)
 _database_url = config('DATABASE_URL', default='')
 if _database_url:
-    import dj_database_url
-    DATABASES = {'default': dj_database_url.parse(_database_url)}
+    DATABASES = {'default': database_from_url(_database_url), **replica_databases()}
 
 # Modules (hub/modules/ for local, /app/modules/ for Docker)
 MODULES_DIR = _paths.modules_dir
@@ -147,3 +146,11 @@ if DEBUG_TOOLBAR_ENABLED:
 INSTALLED_APPS += ['django_browser_reload']
 
 MIDDLEWARE += ['django_browser_reload.middleware.BrowserReloadMiddleware']
+
+# =============================================================================
+# REQUEST TIMING (opt-in) — outermost middleware
+# =============================================================================
+
+if REQUEST_TIMING_ENABLED:
+    MIDDLEWARE.insert(0, REQUEST_TIMING_MIDDLEWARE)
+    print("[LOCAL] Request timing: ENABLED")
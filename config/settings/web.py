@@ -53,8 +53,7 @@ DATA_DIR.mkdir(parents=True, exist_ok=True)
 # =============================================================================
 
 DATABASE_URL = config('DATABASE_URL')
-import dj_database_url
-DATABASES = {'default': dj_database_url.parse(DATABASE_URL)}
+DATABASES = {'default': database_from_url(DATABASE_URL), **replica_databases()}
 
 # Modules - uses base.py config (MODULES_DIR from DataPaths or env var)
 # In Docker: /app/modules/ by default, can be overridden via MODULES_DIR env var
@@ -165,6 +164,7 @@ SECURE_HSTS_INCLUDE_SUBDOMAINS = True
 SECURE_HSTS_PRELOAD = True
 SECURE_SSL_REDIRECT = False  # App Runner handles TLS termination
 SECURE_PROXY_SSL_HEADER = ('HTTP_X_FORWARDED_PROTO', 'https')
+TRUSTED_PROXY_COUNT = config('TRUSTED_PROXY_COUNT', default=1, cast=int)  # App Runner
 X_FRAME_OPTIONS = 'DENY'
 
 # CSRF cookies also scoped to this subdomain
@@ -218,8 +218,10 @@ INSTALLED_APPS += ['corsheaders']
 
 # CORS middleware must be before CommonMiddleware
 MIDDLEWARE.insert(0, 'corsheaders.middleware.CorsMiddleware')
-# WhiteNoise right after SecurityMiddleware for static files
-MIDDLEWARE.insert(2, 'whitenoise.middleware.WhiteNoiseMiddleware')
+# WhiteNoise right after SecurityMiddleware for static files.
+# Subclass rescans STATIC_ROOT after runtime module installs (see
+# apps.core.services.module_static_service).
+MIDDLEWARE.insert(2, 'apps.core.middleware.static_files.ModuleStaticFilesMiddleware')
 
 # Enable CSRF protection in production (disabled in base.py for desktop mode)
 # Insert CsrfViewMiddleware after CommonMiddleware
@@ -234,6 +236,10 @@ if _s3_endpoint:
     # So we insert at 5 to place CloudSSO right after Session
     MIDDLEWARE.insert(5, 'apps.core.middleware.CloudSSOMiddleware')
 
+# Seconds a successful Cloud session + hub access verification is reused
+# (signed cache entry keyed by an HMAC of the Cloud sessionid). 0 disables.
+SSO_VERIFY_CACHE_TTL = config('SSO_VERIFY_CACHE_TTL', default=60, cast=int)
+
 # =============================================================================
 # STATIC & MEDIA STORAGE BACKENDS
 # =============================================================================
@@ -247,6 +253,11 @@ STORAGES = {
     },
 }
 
+# Hashed files (core at build time, modules at install time) are served with
+# "Cache-Control: max-age=315360000, public, immutable"; everything else gets
+# a short max-age so unhashed URLs pick up module updates.
+WHITENOISE_MAX_AGE = 300
+
 # =============================================================================
 # MODULE SECURITY - Strict for web
 # =============================================================================
@@ -269,16 +280,46 @@ CLOUD_PUBLIC_URL = CLOUD_API_URL
 # =============================================================================
 # Override FileBasedCache from base.py — DB cache works across instances
 # and ensures rate limiting (PIN attempts) is consistent.
-# Requires: python manage.py createcachetable (run once during deploy)
+# 'shared' is an UNLOGGED Postgres table (created by the core migrations);
+# expired rows are removed every CACHE_CLEANUP_INTERVAL seconds by the
+# scheduler instead of being culled during writes.
+#
+# 'default' keeps hot read-mostly keys in a per-process LRU (L1) and only
+# revalidates them against the shared DB cache every CACHE_L1_REVALIDATE
+# seconds. Keys outside CACHE_L1_PREFIXES (PIN attempts, lockouts, rate
+# limits) always go straight to the DB cache.
+
+CACHE_L1_PREFIXES = [
+    'config_',                      # singleton configs (get_solo)
+    'mp:',                          # marketplace lists/details
+    'bp:',                          # blueprint catalog
+    'mod_pricing:',
+    'mod_sub:',
+    'cloud_connectivity_status',
+    'hub.sessions.flags_version:',  # coalesced sessions: flags cookie version
+]
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
-        'LOCATION': 'django_cache',
+        'BACKEND': 'apps.core.cache_backends.TwoTierCache',
         'TIMEOUT': 300,
-    }
+        'OPTIONS': {
+            'L2': 'shared',
+            'L1_PREFIXES': CACHE_L1_PREFIXES,
+            'L1_MAX_ENTRIES': config('CACHE_L1_MAX_ENTRIES', default=1000, cast=int),
+            'L1_REVALIDATE': config('CACHE_L1_REVALIDATE', default=2, cast=float),
+        },
+    },
+    'shared': {
+        'BACKEND': 'apps.core.cache_backends.PostgresCache',
+        'LOCATION': 'hub_cache',
+        'TIMEOUT': 300,
+    },
+    'ratelimit': RATE_LIMIT_CACHE,
 }
 
+CACHE_CLEANUP_INTERVAL = config('CACHE_CLEANUP_INTERVAL', default=300, cast=int)  # seconds
+
 # Hub JWT token (generated by Cloud during deployment)
 # This is a long-lived token (1 year) for Hub authentication
 HUB_JWT = config('HUB_JWT', default='')
@@ -314,12 +355,20 @@ if MODULES_DIR.exists() and str(MODULES_DIR) not in sys.path:
 load_modules(MODULES_DIR)
 load_module_templates(MODULES_DIR)
 
+# =============================================================================
+# REQUEST TIMING (opt-in) — outermost, after all index-based inserts above
+# =============================================================================
+
+if REQUEST_TIMING_ENABLED:
+    MIDDLEWARE.insert(0, REQUEST_TIMING_MIDDLEWARE)
+
 # =============================================================================
 # STARTUP INFO
 # =============================================================================
 
 _db_name = DATABASES['default'].get('NAME', DATABASE_URL.split('/')[-1] if '/' in DATABASE_URL else 'unknown')
 print(f"[HUB] {HUB_NAME} ({HUB_ID}) [AWS]")
-print(f"[HUB] Database: PostgreSQL - {_db_name}")
+print(f"[HUB] Database: PostgreSQL - {_db_name}"
+      + (' (+ replica)' if 'replica' in DATABASES else ''))
 print(f"[HUB] Data: {DATA_DIR}")
 print(f"[HUB] S3: {AWS_STORAGE_BUCKET_NAME}/{AWS_LOCATION}/")
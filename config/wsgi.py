@@ -9,8 +9,20 @@ https://docs.djangoproject.com/en/6.0/howto/deployment/wsgi/
 
 import os
 
-from django.core.wsgi import get_wsgi_application
+import django
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
 
-application = get_wsgi_application()
+django.setup(set_prefix=False)
+
+# Opt-in per-middleware timing (REQUEST_TIMING=true): use a handler that
+# times every middleware layer. See apps.core.middleware.server_timing.
+# Only one handler is built (building one loads the whole middleware chain).
+from django.conf import settings  # noqa: E402
+
+if settings.REQUEST_TIMING_ENABLED:
+    from apps.core.middleware.server_timing import TimedWSGIHandler
+    application = TimedWSGIHandler()
+else:
+    from django.core.handlers.wsgi import WSGIHandler
+    application = WSGIHandler()
@@ -105,6 +105,17 @@ if hasattr(settings, 'MIDDLEWARE'):
 User = get_user_model()
 
 
+@pytest.fixture(scope='session')
+def django_db_setup(django_db_setup, django_db_blocker):
+    """--nomigrations skips RunPython: create the hub_cache table (rate limiter cache)."""
+    from django.db import connection
+
+    from apps.core.cache_backends.postgres import create_cache_table
+
+    with django_db_blocker.unblock():
+        create_cache_table(connection)
+
+
 @pytest.fixture(autouse=True)
 def cleanup_test_artifacts():
     """
@@ -130,6 +141,24 @@ def cleanup_test_artifacts():
                 pass  # Ignore errors during cleanup
 
 
+@pytest.fixture(autouse=True)
+def reset_cloud_http():
+    """Cloud circuit breakers are per process: don't let one test's outage open them for the next."""
+    from apps.core.services import cloud_http
+
+    cloud_http.reset_breakers()
+    yield
+    cloud_http.reset_breakers()
+    cloud_http.metrics.reset()
+
+
+@pytest.fixture(autouse=True)
+def cloud_mirror_dir(settings, tmp_path):
+    """Each test gets an empty Cloud mirror (no stored copies from other tests or the dev data dir)."""
+    settings.CLOUD_MIRROR_DIR = tmp_path / 'cloud_mirror'
+    return settings.CLOUD_MIRROR_DIR
+
+
 @pytest.fixture
 def user(db):
     """
@@ -18,6 +18,11 @@ def pytest_configure(config):
     """
     os.environ['DJANGO_ALLOW_ASYNC_UNSAFE'] = 'true'
 
+    # query_budget marker/fixture (N+1 regression guard)
+    from tests import query_budget
+    if not config.pluginmanager.is_registered(query_budget):
+        config.pluginmanager.register(query_budget, 'query_budget')
+
 
 import pytest
 from decimal import Decimal
@@ -410,6 +410,7 @@ class TestJWTRefreshFlow:
 class TestConfigSyncFlow:
     """E2E tests for configuration synchronization."""
 
+    @pytest.mark.django_db
     @responses.activate
     def test_config_sync_command_flow(self, hub_config, mock_settings):
         """Test configuration sync command execution."""
@@ -436,29 +437,47 @@ class TestConfigSyncFlow:
 
         responses.add(
             responses.POST,
-            'https://cloud.erplora.com/api/hubs/me/commands/sync-config-1/ack/',
+            'https://cloud.erplora.com/api/hubs/me/commands/ack/',
             json={'success': True},
             status=200
         )
 
         from apps.sync.services.cloud_api import CloudAPIService
+        from apps.sync.services.command_queue import CommandQueue
         from apps.sync.services.heartbeat import HeartbeatService
 
         cloud_api = CloudAPIService()
 
+        class ManualExecutor:
+            def __init__(self):
+                self.submitted = []
+
+            def submit(self, fn, *args):
+                self.submitted.append((fn, args))
+
         # Mock JWT verification to pass
         with patch.object(cloud_api, 'verify_command_jwt', return_value={'type': 'hub_command', 'hub_id': 'e2e-test-hub-id'}):
             heartbeat = HeartbeatService(cloud_api=cloud_api)
-
-            # Poll and execute commands
-            commands = cloud_api.get_pending_commands()
-            assert len(commands) == 1
-
-            for cmd in commands:
-                heartbeat._execute_command(cmd)
+            executor = ManualExecutor()
+            heartbeat.command_queue = CommandQueue(
+                'poll', execute=heartbeat._run_command, cloud_api=cloud_api,
+                executor=executor, ack_delay=None,
+            )
+            heartbeat.command_queue.start()
+
+            try:
+                # Poll, run the queued command and send its ack
+                heartbeat._poll_commands()
+                assert len(executor.submitted) == 1
+                for fn, args in executor.submitted:
+                    fn(*args)
+                assert heartbeat.command_queue.flush_acks() == 1
+            finally:
+                heartbeat.command_queue.stop()
 
             # Verify ack was sent
             assert len(responses.calls) == 2
             ack_request = responses.calls[1].request
             body = json.loads(ack_request.body)
-            assert body['status'] == 'completed'
+            assert body['acks'][0]['command_id'] == 'sync-config-1'
+            assert body['acks'][0]['status'] == 'completed'
@@ -0,0 +1,166 @@
+"""
+Query budgets for the core views.
+
+Each view is rendered for an admin against a seeded hub (hundreds of
+employees, a few dozen roles, a couple of hundred permissions) and must stay
+within its declared number of SQL queries. Budgets are per request and do
+not depend on the amount of data: a view that queries once per row (N+1)
+blows its budget and the failure report shows the repeated query and the
+code that issued it. See tests/query_budget.py.
+"""
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.test import Client
+
+from apps.accounts.models import LocalUser, Permission, Role, RolePermission
+
+pytestmark = [pytest.mark.integration, pytest.mark.django_db]
+
+EMPLOYEES = 300
+ROLES = 30
+MODULES = 20
+PERMISSIONS_PER_MODULE = 10
+
+
+@pytest.fixture
+def seeded_hub(db):
+    """A hub with realistic amounts of employees, roles and permissions."""
+    hub_id = uuid.uuid4()
+
+    permissions = Permission.objects.bulk_create([
+        Permission(
+            hub_id=hub_id,
+            codename=f'module{m}.action_{p}',
+            name=f'Action {p} of module {m}',
+            module_id=f'module{m}',
+        )
+        for m in range(MODULES) for p in range(PERMISSIONS_PER_MODULE)
+    ])
+
+    roles = Role.objects.bulk_create(
+        [Role(hub_id=hub_id, name='admin', display_name='Admin', is_system=True)]
+        + [Role(hub_id=hub_id, name=f'role{r}', display_name=f'Role {r}') for r in range(ROLES - 1)]
+    )
+    RolePermission.objects.bulk_create(
+        [RolePermission(hub_id=hub_id, role=roles[0], wildcard='*')]
+        + [
+            RolePermission(hub_id=hub_id, role=role, permission=permission)
+            for i, role in enumerate(roles[1:])
+            for permission in permissions[i * 5:i * 5 + 15]
+        ]
+    )
+
+    users = LocalUser.objects.bulk_create([
+        LocalUser(
+            hub_id=hub_id,
+            name=f'Employee {i:03d}',
+            email=f'employee{i}@example.com',
+            role_obj=roles[i % ROLES],
+            role=roles[i % ROLES].name,
+            pin_hash='',
+        )
+        for i in range(EMPLOYEES)
+    ])
+    return {'hub_id': hub_id, 'admin': users[0], 'roles': roles, 'users': users}
+
+
+@pytest.fixture
+def admin_client(seeded_hub, store_config):
+    client = Client()
+    session = client.session
+    session['local_user_id'] = str(seeded_hub['admin'].id)
+    session['hub_id'] = str(seeded_hub['hub_id'])
+    session['user_role'] = 'admin'
+    session['store_config_checked'] = True
+    session.save()
+    # Warm-up: per-process caches (config singletons, menus, ...) are not
+    # what the budgets are about
+    client.get('/')
+    return client
+
+
+def _get(client, url, **headers):
+    response = client.get(url, **headers)
+    assert response.status_code == 200, response.status_code
+    return response
+
+
+class TestCoreViewBudgets:
+
+    @pytest.mark.query_budget(8, label='main.index')
+    def test_home(self, admin_client):
+        _get(admin_client, '/')
+
+    def test_employees_index(self, admin_client, query_budget):
+        with query_budget(10, label='employees.index'):
+            _get(admin_client, '/employees/?per_page=96')
+
+    def test_employees_export(self, admin_client, query_budget):
+        with query_budget(6, label='employees.index export'):
+            _get(admin_client, '/employees/?export=csv')
+
+    def test_role_list(self, admin_client, query_budget):
+        with query_budget(10, label='roles.role_list'):
+            _get(admin_client, '/roles/')
+
+    def test_role_detail(self, admin_client, seeded_hub, query_budget):
+        role = seeded_hub['roles'][3]
+        with query_budget(14, label='roles.role_detail'):
+            _get(admin_client, f'/roles/{role.id}/')
+
+    def test_settings(self, admin_client, query_budget):
+        with query_budget(12, label='settings.index'):
+            _get(admin_client, '/settings/')
+
+    def test_chooser_search(self, admin_client, query_budget):
+        with query_budget(6, label='chooser_search'):
+            _get(admin_client, '/htmx/chooser/accounts.localuser/search/?q=Employee',
+                 HTTP_HX_REQUEST='true')
+
+    def test_chooser_search_next_page(self, admin_client, query_budget):
+        url = '/htmx/chooser/accounts.localuser/search/?q=Employee'
+        first = _get(admin_client, url, HTTP_HX_REQUEST='true')
+        cursor = first.context['next_cursor']
+        # Keyset page: no count and no OFFSET
+        with query_budget(5, label='chooser_search next page'):
+            second = _get(admin_client, f'{url}&cursor={cursor}', HTTP_HX_REQUEST='true')
+        assert second.context['page'] == 2
+        assert second.context['total'] == first.context['total']
+
+    def test_marketplace_products(self, admin_client, query_budget):
+        modules = [
+            {'slug': f'module{i}', 'name': f'Module {i}', 'module_type': 'free', 'price': 0}
+            for i in range(60)
+        ]
+
+        async def fetch_all():
+            return modules, None
+
+        with patch('apps.marketplace.views._afetch_all_modules', fetch_all):
+            with query_budget(5, label='marketplace.products_list'):
+                _get(admin_client, '/marketplace/products/?per_page=48', HTTP_HX_REQUEST='true')
+
+
+class TestQueryBudgetPlugin:
+
+    def test_report_shows_repeated_queries(self, seeded_hub):
+        from tests.query_budget import record_queries
+
+        with record_queries() as recorder:
+            for user in LocalUser.objects.filter(hub_id=seeded_hub['hub_id'])[:5]:
+                user.role_obj.name  # one query per row
+
+        duplicates = recorder.duplicates()
+        assert duplicates[0][0] == 5
+        report = recorder.report('n_plus_one', budget=2)
+        assert '6 queries (budget 2)' in report
+        assert '5x SELECT' in report
+        assert 'tests/integration/test_query_budgets.py' in report
+
+    def test_budget_failure(self, seeded_hub, query_budget):
+        with pytest.raises(pytest.fail.Exception, match='budget 1'):
+            with query_budget(1, label='plugin self-test (expected overrun)'):
+                list(Role.objects.all())
+                list(Permission.objects.all())
@@ -0,0 +1,108 @@
+"""
+Rate limiter benchmark — concurrent failed-PIN attempts against one user.
+
+Compares the old get + set counter with RateLimiter.hit (atomic incr) on
+the configured cache, and reports throughput and lost increments.
+
+Usage:
+    # Default cache of the current settings (FileBasedCache locally)
+    cd hub && python tests/load/bench_rate_limiter.py
+
+    # Web settings (TwoTierCache over the UNLOGGED Postgres cache)
+    cd hub && DJANGO_SETTINGS_MODULE=config.settings.web \\
+        python tests/load/bench_rate_limiter.py --threads 16 --attempts 200
+
+    # Another cache alias
+    cd hub && python tests/load/bench_rate_limiter.py --alias shared
+
+Every thread records --attempts failures for the same identity, so the
+expected final count is threads * attempts. The naive counter loses
+updates whenever two threads read the same value before writing.
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+import uuid
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.core.cache import caches  # noqa: E402
+from django.db import connections  # noqa: E402
+
+from apps.core.services.rate_limiter import RateLimit, RateLimiter  # noqa: E402
+
+
+def run_threads(threads, attempts, fn):
+    """Run fn() attempts times in each of threads threads; return seconds."""
+    barrier = threading.Barrier(threads + 1)
+
+    def worker():
+        barrier.wait()
+        try:
+            for _ in range(attempts):
+                fn()
+        finally:
+            connections.close_all()
+
+    pool = [threading.Thread(target=worker) for _ in range(threads)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def bench_naive(alias, threads, attempts):
+    key = f'bench_pin_attempts_{uuid.uuid4().hex}'
+
+    def attempt():
+        cache = caches[alias]
+        cache.set(key, cache.get(key, 0) + 1, timeout=300)
+
+    elapsed = run_threads(threads, attempts, attempt)
+    count = caches[alias].get(key, 0)
+    caches[alias].delete(key)
+    return elapsed, count
+
+
+def bench_limiter(alias, threads, attempts):
+    limiter = RateLimiter(
+        RateLimit('bench', limit=threads * attempts + 1, window=3600), cache_alias=alias,
+    )
+    identity = uuid.uuid4().hex
+
+    elapsed = run_threads(threads, attempts, lambda: limiter.hit(identity))
+    count = limiter.check(identity).count
+    limiter.reset(identity)
+    return elapsed, count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--alias', default='default', help='cache alias (default: default)')
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument('--attempts', type=int, default=100, help='attempts per thread')
+    args = parser.parse_args()
+
+    expected = args.threads * args.attempts
+    backend = type(caches[args.alias]).__name__
+    print(f"Cache '{args.alias}' ({backend}): {args.threads} threads x {args.attempts} attempts")
+    print(f"{'':<12}{'ops/s':>10}{'counted':>10}{'lost':>8}")
+
+    for label, bench in (('get + set', bench_naive), ('limiter', bench_limiter)):
+        elapsed, count = bench(args.alias, args.threads, args.attempts)
+        lost = expected - count
+        print(f"{label:<12}{expected / elapsed:>10.0f}{count:>10.0f}{lost:>8.0f}")
+
+
+if __name__ == '__main__':
+    main()
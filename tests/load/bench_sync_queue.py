@@ -0,0 +1,159 @@
+"""
+Sync queue benchmark — drain a backlog of queued operations after an offline period.
+
+Seeds --ops pending SyncQueue operations, starts a local fake Cloud (batch
+endpoint, optional --latency per request) and drains the queue with
+--workers concurrent SyncService workers. Reports throughput, HTTP
+requests made and operations sent more than once (must be 0: workers claim
+disjoint batches with SELECT ... FOR UPDATE SKIP LOCKED).
+
+Usage:
+    # PostgreSQL (SKIP LOCKED); the seeded operations are deleted afterwards
+    cd hub && DATABASE_URL=postgres://... python tests/load/bench_sync_queue.py
+
+    cd hub && python tests/load/bench_sync_queue.py --ops 10000 --workers 4 --batch 200
+
+    # Compare with the old one-request-per-operation path
+    cd hub && python tests/load/bench_sync_queue.py --no-batch-endpoint
+"""
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import MagicMock, patch
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'config.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.db import connections  # noqa: E402
+
+from apps.core.services.sync_service import BATCH_ENDPOINT, SyncService  # noqa: E402
+from apps.sync.models import SyncQueue  # noqa: E402
+from apps.sync.services.compression import decompress  # noqa: E402
+
+OPERATION_TYPE = 'sale_sync'
+BENCH_MARKER = 'bench_sync_queue'
+
+
+class FakeCloud(BaseHTTPRequestHandler):
+    """Accepts batch and single operations; counts what it receives."""
+
+    batch_endpoint = True
+    latency = 0.0
+    received = Counter()
+    requests = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        body = json.loads(decompress(body, self.headers.get('Content-Encoding')) or b'{}')
+        time.sleep(self.latency)
+        with self.lock:
+            type(self).requests += 1
+
+        if self.path == BATCH_ENDPOINT:
+            if not self.batch_endpoint:
+                return self._reply(404, {})
+            ids = [op['id'] for op in body['operations']]
+            with self.lock:
+                self.received.update(ids)
+            return self._reply(200, {'results': [{'id': pk, 'status': 201} for pk in ids]})
+
+        with self.lock:
+            self.received.update([body['op']])
+        return self._reply(201, {})
+
+    def _reply(self, status, data):
+        payload = json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+def seed(ops):
+    created = SyncQueue.objects.bulk_create([
+        SyncQueue(operation_type=OPERATION_TYPE, endpoint='/api/bench/', payload={}, headers={})
+        for _ in range(ops)
+    ])
+    # Single-request fallback: the fake Cloud identifies operations by payload
+    for op in created:
+        op.payload = {'op': str(op.id), 'marker': BENCH_MARKER}
+    SyncQueue.objects.bulk_update(created, ['payload'])
+    return {str(op.id) for op in created}
+
+
+def drain(workers, batch):
+    barrier = threading.Barrier(workers + 1)
+
+    def worker():
+        barrier.wait()
+        try:
+            with patch('apps.core.services.sync_service.HubConfig') as hub_config:
+                hub_config.get_config.return_value = MagicMock(is_configured=True, cloud_api_token='x')
+                service = SyncService()
+            while service.process_queue(batch)['processed']:
+                pass
+        finally:
+            connections.close_all()
+
+    pool = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    parser.add_argument('--ops', type=int, default=5000, help='queued operations')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--batch', type=int, default=100, help='operations per claim')
+    parser.add_argument('--latency', type=float, default=0.005, help='fake Cloud latency (s)')
+    parser.add_argument('--no-batch-endpoint', action='store_true',
+                        help='fake Cloud without the batch endpoint (one request per operation)')
+    args = parser.parse_args()
+
+    FakeCloud.batch_endpoint = not args.no_batch_endpoint
+    FakeCloud.latency = args.latency
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakeCloud)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    from django.conf import settings
+    settings.CLOUD_API_URL = f'http://127.0.0.1:{server.server_port}'
+
+    ids = seed(args.ops)
+    try:
+        elapsed = drain(args.workers, args.batch)
+    finally:
+        SyncQueue.all_objects.filter(id__in=ids).delete()
+        server.shutdown()
+
+    sent = sum(FakeCloud.received[pk] for pk in ids)
+    duplicates = sum(1 for pk in ids if FakeCloud.received[pk] > 1)
+    missing = sum(1 for pk in ids if not FakeCloud.received[pk])
+    vendor = connections['default'].vendor
+    print(f"{args.ops} operations, {args.workers} workers, batch {args.batch}, {vendor}, "
+          f"{'batch endpoint' if FakeCloud.batch_endpoint else 'single requests'}")
+    print(f"{'ops/s':>10}{'seconds':>10}{'requests':>10}{'sent':>8}{'dup':>6}{'missing':>8}")
+    print(f"{args.ops / elapsed:>10.0f}{elapsed:>10.2f}{FakeCloud.requests:>10}"
+          f"{sent:>8}{duplicates:>6}{missing:>8}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,175 @@
+"""
+Query budget plugin: fail a test when code runs more SQL than declared.
+
+Registered from tests/conftest.py. Two ways to declare a budget:
+
+    @pytest.mark.query_budget(30)
+    def test_employees(admin_client):
+        admin_client.get('/employees/')          # whole test call
+
+    def test_roles(admin_client, query_budget):
+        role = ...
+        with query_budget(20, label='roles.detail'):
+            admin_client.get(f'/roles/{role.id}/')
+
+Every query on every database alias is recorded with its duration and the
+project stack frames that issued it. When a budget is exceeded the test
+fails with a report of the query count, total DB time and the repeated
+query patterns (the usual N+1 signature) with the code that ran them.
+The terminal summary lists every budget checked during the run.
+"""
+
+import re
+import time
+import traceback
+from collections import Counter
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pytest
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+_THIS_FILE = str(Path(__file__).resolve())
+
+# Placeholders lists of any length are the same query pattern
+_IN_LIST = re.compile(r'IN \((?:%s, )*%s\)')
+
+
+@dataclass
+class Query:
+    sql: str
+    duration: float
+    stack: list = field(default_factory=list)
+
+    @property
+    def pattern(self):
+        return _IN_LIST.sub('IN (...)', self.sql)
+
+
+def _project_stack(limit=4):
+    """Innermost project frames (no site-packages, no this plugin)."""
+    frames = []
+    for frame in traceback.extract_stack()[:-2]:
+        filename = frame.filename
+        if filename == _THIS_FILE or 'site-packages' in filename:
+            continue
+        if not filename.startswith(str(PROJECT_ROOT)):
+            continue
+        frames.append(frame)
+    return [
+        f'{Path(f.filename).relative_to(PROJECT_ROOT)}:{f.lineno} in {f.name}'
+        for f in frames[-limit:]
+    ]
+
+
+class QueryRecorder:
+    """connection.execute_wrapper() that records every query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries.append(Query(sql, time.perf_counter() - start, _project_stack()))
+
+    @property
+    def count(self):
+        return len(self.queries)
+
+    @property
+    def total_time(self):
+        return sum(q.duration for q in self.queries)
+
+    def duplicates(self):
+        """[(count, first Query)] for patterns run more than once, most first."""
+        counts = Counter(q.pattern for q in self.queries)
+        first = {}
+        for q in self.queries:
+            first.setdefault(q.pattern, q)
+        return [(n, first[p]) for p, n in counts.most_common() if n > 1]
+
+    def report(self, label, budget, max_patterns=5):
+        lines = [
+            f'{label}: {self.count} queries (budget {budget}), '
+            f'{self.total_time * 1000:.1f} ms in the database',
+        ]
+        duplicates = self.duplicates()
+        if duplicates:
+            lines.append('Repeated queries:')
+            for n, query in duplicates[:max_patterns]:
+                lines.append(f'  {n}x {query.pattern[:200]}')
+                lines.extend(f'      {frame}' for frame in query.stack)
+        else:
+            lines.append('No repeated queries; slowest:')
+            for query in sorted(self.queries, key=lambda q: -q.duration)[:max_patterns]:
+                lines.append(f'  {query.duration * 1000:.1f} ms {query.pattern[:200]}')
+                lines.extend(f'      {frame}' for frame in query.stack)
+        return '\n'.join(lines)
+
+
+@contextmanager
+def record_queries():
+    """Record the queries run in the block on every database alias."""
+    from django.db import connections
+
+    recorder = QueryRecorder()
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(recorder))
+        yield recorder
+
+
+_results = []
+
+
+@contextmanager
+def check_budget(budget, label):
+    """Fail the test if the block runs more than `budget` queries."""
+    with record_queries() as recorder:
+        yield recorder
+    _results.append((label, recorder.count, budget, recorder.total_time))
+    if recorder.count > budget:
+        pytest.fail(recorder.report(label, budget), pytrace=False)
+
+
+# -----------------------------------------------------------------------------
+# pytest hooks and fixtures
+# -----------------------------------------------------------------------------
+
+def pytest_configure(config):
+    config.addinivalue_line(
+        'markers', 'query_budget(n): fail if the test call runs more than n SQL queries',
+    )
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    marker = item.get_closest_marker('query_budget')
+    if marker is None:
+        return (yield)
+    budget = marker.args[0] if marker.args else marker.kwargs['budget']
+    with check_budget(budget, marker.kwargs.get('label', item.name)):
+        return (yield)
+
+
+@pytest.fixture
+def query_budget():
+    """query_budget(n, label=...) context manager; see module docstring."""
+    def factory(budget, label='block'):
+        return check_budget(budget, label)
+    return factory
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not _results:
+        return
+    terminalreporter.section('query budgets')
+    for label, count, budget, total in _results:
+        status = 'OVER' if count > budget else 'ok'
+        terminalreporter.write_line(
+            f'{status:>4}  {count:>4}/{budget:<4} {total * 1000:8.1f} ms  {label}'
+        )
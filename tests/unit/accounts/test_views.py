@@ -132,6 +132,22 @@ class TestVerifyPinView(TestCase):
         assert response.status_code == 200
         assert self.client.session.get('local_user_id') == str(self.user.id)
 
+    def test_verify_locks_after_three_failures(self):
+        """Three wrong PINs lock the user out, even with the right PIN."""
+        def post(pin):
+            return self.client.post(
+                self.url,
+                data=json.dumps({'user_id': str(self.user.id), 'pin': pin}),
+                content_type='application/json'
+            ).json()
+
+        for _ in range(3):
+            assert post('9999')['success'] is False
+
+        data = post('1234')
+        assert data['success'] is False
+        assert data['locked'] is True
+
 
 class TestSetupPinView(TestCase):
     """Test PIN setup for new users."""
@@ -319,6 +335,64 @@ class TestEmployeeAPIViews(TestCase):
         employee.refresh_from_db()
         assert employee.is_active is False
 
+    def _enter_hub(self):
+        import uuid
+        hub_id = uuid.uuid4()
+        LocalUser.objects.filter(pk=self.admin.pk).update(hub_id=hub_id)
+        session = self.client.session
+        session['hub_id'] = str(hub_id)
+        session['store_config_checked'] = True
+        session.save()
+
+    def test_import_employees_bulk(self):
+        """CSV import inserts new employees in one batch and skips duplicates."""
+        from django.core.files.uploadedfile import SimpleUploadedFile
+        from django.test.utils import CaptureQueriesContext
+        from django.db import connection
+
+        self._enter_hub()
+        csv = (
+            'Name,Email,Role,PIN\n'
+            'Ana,ana@example.com,employee,1111\n'
+            'Admin Again,admin@example.com,,\n'
+            'Ana Twice,ana@example.com,,\n'
+            'Bob,bob@example.com,,12\n'
+        ).encode()
+        upload = SimpleUploadedFile('staff.csv', csv, content_type='text/csv')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(
+                reverse('main:employees_import'), {'file': upload}, HTTP_HX_REQUEST='true'
+            )
+
+        assert response.status_code == 200
+        inserts = [q for q in queries if q['sql'].startswith('INSERT INTO "accounts_local_users"')]
+        assert len(inserts) == 1
+        bob = LocalUser.objects.get(email='bob@example.com')
+        assert bob.check_pin('0000')
+        assert str(bob.created_by) == str(self.admin.id)
+        assert LocalUser.objects.filter(email='ana@example.com').count() == 1
+
+    def test_bulk_delete_employees_is_soft(self):
+        """Bulk delete marks employees deleted with deleted_at set."""
+        self._enter_hub()
+        employee = LocalUser.objects.create(
+            hub_id=self.client.session['hub_id'],
+            email='bulk@example.com', name='Bulk', role='employee', pin_hash='', is_active=True
+        )
+
+        response = self.client.post(
+            reverse('main:employees_bulk_toggle'),
+            {'ids': str(employee.id), 'action': 'delete'},
+            HTTP_HX_REQUEST='true',
+        )
+
+        assert response.status_code == 200
+        employee = LocalUser.all_objects.get(pk=employee.pk)
+        assert employee.is_deleted is True
+        assert employee.is_active is False
+        assert employee.deleted_at is not None
+
     def test_create_employee_duplicate_email(self):
         """Creating employee with existing email should fail."""
         response = self.client.post(
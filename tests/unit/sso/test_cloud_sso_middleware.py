@@ -437,3 +437,110 @@ class TestCloudSSOMiddlewareLocalUserCreation(TestCase):
         # Should redirect to setup-pin since PIN was reset
         assert result.status_code == 302
         assert '/setup-pin/' in result.url
+
+
+@override_settings(CLOUD_API_URL='https://int.erplora.com')
+class TestCloudSSOMiddlewareVerificationCache(TestCase):
+    """Test pooled, cached and single-flighted Cloud verification."""
+
+    def setUp(self):
+        from django.core.cache import cache
+        from django.utils.crypto import salted_hmac
+        from apps.core.middleware import cloud_sso_middleware as sso
+
+        self.middleware = CloudSSOMiddleware(Mock(return_value=HttpResponse()))
+        self.middleware.hub_id = 'test-hub-id'
+        self.middleware.demo_mode = False
+        self.session_id = 'cache-test-session'
+        self.cache_key = salted_hmac(sso._VERIFY_SALT, self.session_id, algorithm='sha256').hexdigest()
+        cache_entry = f'{sso._CK_VERIFY}{self.cache_key}'
+        cache.delete(cache_entry)
+        self.addCleanup(cache.delete, cache_entry)
+
+    def _add_cloud_responses(self, has_access=True):
+        responses.add(
+            responses.GET,
+            'https://int.erplora.com/api/auth/verify-session/',
+            json={'authenticated': True, 'email': 'user@example.com', 'user_id': 1, 'name': 'U'},
+            status=200,
+        )
+        responses.add(
+            responses.GET,
+            'https://int.erplora.com/api/hubs/test-hub-id/check-access/',
+            json={'has_access': has_access},
+            status=200,
+        )
+
+    @responses.activate
+    def test_success_is_cached(self):
+        self._add_cloud_responses()
+
+        first = self.middleware._verify_cloud_session(self.session_id)
+        second = self.middleware._verify_cloud_session(self.session_id)
+
+        assert first == second == (True, first[1], True)
+        assert len(responses.calls) == 2  # session + access, once
+
+    @responses.activate
+    def test_denied_access_is_not_cached(self):
+        self._add_cloud_responses(has_access=False)
+
+        assert self.middleware._verify_cloud_session(self.session_id)[2] is False
+        self.middleware._verify_cloud_session(self.session_id)
+
+        assert len(responses.calls) == 4
+
+    def test_tampered_cache_entry_is_ignored(self):
+        from django.core.cache import cache
+        from apps.core.middleware import cloud_sso_middleware as sso
+
+        cache.set(f'{sso._CK_VERIFY}{self.cache_key}', 'not-a-signed-value', 60)
+
+        assert self.middleware._get_cached_verification(self.cache_key) is None
+
+    def test_concurrent_verifications_are_single_flighted(self):
+        import threading
+        import time
+
+        calls = []
+
+        def slow_check(session_id):
+            calls.append(session_id)
+            time.sleep(0.2)
+            return False, None, True
+
+        with patch.object(self.middleware, '_check_session', side_effect=slow_check), \
+                patch.object(self.middleware, '_check_hub_access', return_value=(True, True)):
+            threads = [
+                threading.Thread(target=self.middleware._verify_cloud_session, args=(self.session_id,))
+                for _ in range(5)
+            ]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+
+        assert len(calls) == 1
+
+    def test_http_session_is_reused(self):
+        assert self.middleware._get_http_session() is self.middleware._get_http_session()
+
+    @responses.activate
+    def test_cloud_cookies_are_not_shared_between_users(self):
+        from django.core.cache import cache
+
+        self.middleware.demo_mode = True
+        responses.add(
+            responses.GET,
+            'https://int.erplora.com/api/auth/verify-session/',
+            json={'authenticated': True, 'email': 'user@example.com', 'user_id': 1, 'name': 'U'},
+            headers={'Set-Cookie': 'sessionid=refreshed; Domain=int.erplora.com; Path=/'},
+        )
+
+        self.middleware._verify_cloud_session('first-user')
+        self.middleware._verify_cloud_session(self.session_id)
+        cache.clear()
+
+        cookies = [call.request.headers['Cookie'] for call in responses.calls]
+        assert cookies == ['sessionid=first-user', f'sessionid={self.session_id}']
+        assert len(self.middleware._get_http_session().cookies) == 0
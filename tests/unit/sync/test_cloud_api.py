@@ -353,6 +353,25 @@ class TestCommandMethods:
         assert request_body['status'] == 'failed'
         assert request_body['error'] == 'Module not found'
 
+    @responses.activate
+    def test_acknowledge_commands_batch(self, cloud_api):
+        """Test acknowledging several commands in one request."""
+        responses.add(
+            responses.POST,
+            'https://api.test.com/api/hubs/me/commands/ack/',
+            json={'success': True},
+            status=200
+        )
+
+        cloud_api.acknowledge_commands([
+            {'command_id': 'cmd-1', 'status': 'completed', 'result': {}},
+            {'command_id': 'cmd-2', 'status': 'failed', 'result': {}, 'error': 'boom'},
+        ])
+
+        import json
+        request_body = json.loads(responses.calls[0].request.body)
+        assert [ack['command_id'] for ack in request_body['acks']] == ['cmd-1', 'cmd-2']
+
 
 class TestJWTVerification:
     """Tests for command JWT verification."""
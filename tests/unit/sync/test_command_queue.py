@@ -0,0 +1,311 @@
+"""
+Unit tests for the durable Cloud command queue.
+"""
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from apps.sync.models import CloudCommand
+from apps.sync.services.cloud_api import CloudAPIError
+from apps.sync.services.command_queue import MAX_ATTEMPTS, CommandQueue
+
+pytestmark = [pytest.mark.unit, pytest.mark.django_db]
+
+
+class ManualExecutor:
+    """Executor running submitted work only when the test says so."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+    def running(self):
+        return [args[0].command_type for _, args in self.submitted]
+
+    def run_next(self):
+        fn, args = self.submitted.pop(0)
+        fn(*args)
+
+    def run_all(self):
+        while self.submitted:
+            self.run_next()
+
+
+@pytest.fixture
+def cloud_api():
+    return MagicMock()
+
+
+@pytest.fixture
+def executor():
+    return ManualExecutor()
+
+
+@pytest.fixture
+def make_queue(cloud_api, executor):
+    queues = []
+
+    def make(execute=None, source='poll', **kwargs):
+        kwargs.setdefault('max_workers', 4)
+        queue = CommandQueue(
+            source, execute=execute or (lambda command: (True, {'ran': command['id']}, None)),
+            cloud_api=cloud_api, executor=executor, ack_delay=None, **kwargs
+        )
+        queue.start()
+        queues.append(queue)
+        return queue
+
+    yield make
+    for queue in queues:
+        queue.stop()
+
+
+def _command(command_id, command_type='sync_config', **payload):
+    return {'id': command_id, 'type': command_type, 'payload': payload, 'command_jwt': ''}
+
+
+class TestEnqueue:
+
+    def test_stores_then_runs(self, make_queue, executor):
+        queue = make_queue()
+        cmd, created = queue.enqueue(_command('cmd-1', module_id='inventory'))
+
+        assert created
+        cmd.refresh_from_db()
+        assert (cmd.status, cmd.attempts, cmd.payload) == ('running', 1, {'module_id': 'inventory'})
+
+        executor.run_all()
+        cmd.refresh_from_db()
+        assert cmd.status == 'completed'
+        assert cmd.result == {'ran': 'cmd-1'}
+        assert cmd.completed_at is not None
+
+    def test_redelivery_runs_once(self, make_queue, executor):
+        calls = []
+        queue = make_queue(execute=lambda command: calls.append(command['id']) or (True, None, None))
+
+        queue.enqueue(_command('cmd-1'))
+        _, created = queue.enqueue(_command('cmd-1'))
+        executor.run_all()
+        queue.enqueue(_command('cmd-1'))
+        executor.run_all()
+
+        assert created is False
+        assert calls == ['cmd-1']
+        assert CloudCommand.objects.count() == 1
+
+    def test_delivery_by_both_channels_runs_once(self, make_queue, executor):
+        calls = []
+        execute = lambda command: calls.append(command['id']) or (True, None, None)  # noqa: E731
+        poll = make_queue(execute=execute)
+        websocket = make_queue(execute=execute, source='websocket')
+
+        poll.enqueue(_command('cmd-1'))
+        _, created = websocket.enqueue(_command('cmd-1'))
+        executor.run_all()
+
+        assert created is False
+        assert calls == ['cmd-1']
+        assert CloudCommand.objects.get().source == 'poll'
+
+    def test_pending_command_is_taken_over_by_other_channel(self, make_queue, executor, cloud_api):
+        stopped = CommandQueue('websocket', execute=lambda command: (True, None, None), cloud_api=cloud_api,
+                               executor=executor, ack_delay=None)
+        stopped.enqueue(_command('cmd-1'))  # received, then the socket dropped
+        poll = make_queue()
+
+        poll.enqueue(_command('cmd-1'))
+        executor.run_all()
+
+        cmd = CloudCommand.objects.get()
+        assert (cmd.source, cmd.status) == ('poll', 'completed')
+
+    def test_redelivery_of_acked_command_acks_again(self, make_queue, executor, cloud_api):
+        queue = make_queue()
+        queue.enqueue(_command('cmd-1'))
+        executor.run_all()
+        assert queue.flush_acks() == 1
+
+        queue.enqueue(_command('cmd-1'))
+        assert queue.flush_acks() == 1
+        assert cloud_api.acknowledge_commands.call_count == 2
+
+    def test_failures_are_recorded(self, make_queue, executor):
+        def execute(command):
+            if command['id'] == 'boom':
+                raise RuntimeError('handler crashed')
+            return False, None, 'Missing module_id'
+
+        queue = make_queue(execute=execute)
+        queue.enqueue(_command('bad'))
+        queue.enqueue(_command('boom'))
+        executor.run_all()
+
+        errors = dict(CloudCommand.objects.values_list('command_id', 'error'))
+        assert errors == {'bad': 'Missing module_id', 'boom': 'handler crashed'}
+        assert set(CloudCommand.objects.values_list('status', flat=True)) == {'failed'}
+
+
+class TestConcurrency:
+
+    def test_per_type_limits(self, make_queue, executor):
+        queue = make_queue()
+        queue.enqueue(_command('i1', 'install_module'))
+        queue.enqueue(_command('i2', 'install_module'))
+        queue.enqueue(_command('s1'))
+        queue.enqueue(_command('s2'))
+
+        # One install at a time, config syncs alongside
+        assert executor.running() == ['install_module', 'sync_config', 'sync_config']
+
+        executor.run_next()
+        assert executor.running() == ['sync_config', 'sync_config', 'install_module']
+        executor.run_all()
+        assert CloudCommand.objects.filter(status='completed').count() == 4
+
+    def test_pool_is_bounded(self, make_queue, executor):
+        queue = make_queue(max_workers=2)
+        for i in range(5):
+            queue.enqueue(_command(f's{i}'))
+
+        assert len(executor.submitted) == 2
+        executor.run_all()
+        assert CloudCommand.objects.filter(status='completed').count() == 5
+
+    def test_limits_are_configurable(self, make_queue, executor, settings):
+        settings.COMMAND_CONCURRENCY = {'sync_config': 1}
+        queue = make_queue(concurrency={'install_module': 2})
+        for i in range(2):
+            queue.enqueue(_command(f'i{i}', 'install_module'))
+            queue.enqueue(_command(f's{i}'))
+
+        assert sorted(executor.running()) == ['install_module', 'install_module', 'sync_config']
+
+    def test_limits_are_shared_by_both_channels(self, make_queue, executor):
+        poll = make_queue()
+        websocket = make_queue(source='websocket')
+        poll.enqueue(_command('i1', 'install_module'))
+        websocket.enqueue(_command('i2', 'install_module'))
+
+        assert executor.running() == ['install_module']
+
+        executor.run_next()
+        assert executor.running() == ['install_module']
+        executor.run_all()
+        assert CloudCommand.objects.filter(status='completed').count() == 2
+
+
+class TestStop:
+
+    def test_dispatch_after_stop_leaves_commands_pending(self, cloud_api):
+        queue = CommandQueue('poll', execute=lambda command: (True, None, None), cloud_api=cloud_api,
+                             ack_delay=None)
+        queue.start()
+        queue.stop()
+
+        assert queue.dispatch() == 0
+        queue.enqueue(_command('cmd-1'))
+        assert CloudCommand.objects.get().status == 'pending'
+
+    def test_command_rejected_by_executor_is_requeued(self, make_queue, executor):
+        queue = make_queue()
+        executor.submit = MagicMock(side_effect=RuntimeError('cannot schedule new futures after shutdown'))
+
+        queue.enqueue(_command('cmd-1'))
+
+        cmd = CloudCommand.objects.get()
+        assert (cmd.status, cmd.attempts) == ('pending', 0)
+        assert queue.dispatch() == 0
+
+
+class TestResume:
+
+    def test_interrupted_commands_rerun(self, cloud_api, executor):
+        CloudCommand.objects.create(command_id='cmd-1', command_type='sync_config', status='running', attempts=1)
+        CloudCommand.objects.create(
+            command_id='cmd-2', command_type='sync_config', status='running', attempts=MAX_ATTEMPTS
+        )
+        CloudCommand.objects.create(
+            command_id='ws-1', source='websocket', command_type='sync_config', status='running', attempts=1
+        )
+
+        queue = CommandQueue('poll', execute=lambda command: (True, None, None), cloud_api=cloud_api,
+                             executor=executor, ack_delay=None)
+        queue.start()
+        executor.run_all()
+        queue.stop()
+
+        statuses = dict(CloudCommand.objects.values_list('command_id', 'status'))
+        assert statuses == {'cmd-1': 'completed', 'cmd-2': 'failed', 'ws-1': 'running'}
+        assert CloudCommand.objects.get(command_id='cmd-1').attempts == 2
+
+
+class TestAcks:
+
+    def test_results_acked_in_one_batch(self, make_queue, executor, cloud_api):
+        queue = make_queue(execute=lambda command: (command['id'] == 'ok', {}, None if command['id'] == 'ok' else 'no'))
+        queue.enqueue(_command('ok'))
+        queue.enqueue(_command('ko'))
+        executor.run_all()
+
+        assert queue.flush_acks() == 2
+        acks = cloud_api.acknowledge_commands.call_args[0][0]
+        assert {(a['command_id'], a['status']) for a in acks} == {('ok', 'completed'), ('ko', 'failed')}
+        assert [a.get('error') for a in acks if a['command_id'] == 'ko'] == ['no']
+        assert not CloudCommand.objects.filter(acked_at__isnull=True).exists()
+
+        assert queue.flush_acks() == 0
+        cloud_api.acknowledge_command.assert_not_called()
+
+    def test_falls_back_to_single_acks(self, make_queue, executor, cloud_api):
+        cloud_api.acknowledge_commands.side_effect = CloudAPIError('API error: 404', status_code=404)
+        queue = make_queue()
+        queue.enqueue(_command('cmd-1'))
+        queue.enqueue(_command('cmd-2'))
+        executor.run_all()
+
+        assert queue.flush_acks() == 2
+        assert cloud_api.acknowledge_command.call_count == 2
+        assert queue.batch_ack_supported is False
+
+    def test_failed_acks_are_retried(self, make_queue, executor, cloud_api):
+        cloud_api.acknowledge_commands.side_effect = CloudAPIError('Connection error - Cloud not reachable')
+        queue = make_queue()
+        queue.enqueue(_command('cmd-1'))
+        executor.run_all()
+
+        assert queue.flush_acks() == 0
+        cloud_api.acknowledge_commands.side_effect = None
+        assert queue.flush_acks() == 1
+
+    def test_commands_without_id_are_not_acked(self, make_queue, executor, cloud_api):
+        queue = make_queue()
+        queue.enqueue({'type': 'user_revoked', 'payload': {'user_id': 'u1'}})
+        executor.run_all()
+
+        assert CloudCommand.objects.get().status == 'completed'
+        assert queue.flush_acks() == 0
+        cloud_api.acknowledge_commands.assert_not_called()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_worker_pool_runs_and_acks(cloud_api):
+    """End to end with the real thread pool and ack thread."""
+    queue = CommandQueue('poll', execute=lambda command: (True, None, None), cloud_api=cloud_api,
+                         max_workers=2, ack_delay=0.05)
+    queue.start()
+    try:
+        for i in range(3):
+            queue.enqueue(_command(f'cmd-{i}'))
+
+        deadline = time.monotonic() + 10
+        while time.monotonic() < deadline and CloudCommand.objects.filter(acked_at__isnull=True).exists():
+            time.sleep(0.05)
+    finally:
+        queue.stop()
+
+    assert set(CloudCommand.objects.values_list('status', flat=True)) == {'completed'}
+    assert not CloudCommand.objects.filter(acked_at__isnull=True).exists()
@@ -0,0 +1,143 @@
+"""
+Unit tests for compaction of queued sync operations.
+"""
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+
+from apps.sync.models import SyncQueue
+from apps.sync.services.compaction import compact_operations, compact_queue
+
+pytestmark = [pytest.mark.unit, pytest.mark.django_db]
+
+
+def _queue(*operations):
+    """Queue (operation_type, entity_key, payload) tuples, one second apart."""
+    start = timezone.now() - timedelta(hours=1)
+    created = []
+    for i, (operation_type, key, payload) in enumerate(operations):
+        op = SyncQueue.add_operation(operation_type, f'/api/{operation_type}/', payload=payload,
+                                     entity_key=key)
+        SyncQueue.objects.filter(pk=op.pk).update(created_at=start + timedelta(seconds=i))
+        created.append(op)
+    return created
+
+
+def _pending():
+    return list(SyncQueue.objects.filter(status='pending').order_by('created_at'))
+
+
+class TestCompactOperations:
+
+    def _ops(self, *types, retry_count=0):
+        return [
+            SyncQueue(operation_type=t, entity_key='u1', payload={'step': i}, retry_count=retry_count)
+            for i, t in enumerate(types)
+        ]
+
+    def test_updates_merge_into_last_position(self):
+        ops = self._ops('user_update', 'user_update', 'user_update')
+        ops[0].payload = {'name': 'Ana', 'email': 'a@x.com'}
+        ops[2].payload = {'name': 'Ana María'}
+
+        result = compact_operations(ops)
+
+        assert result.survivors == [ops[2]]
+        assert ops[2].payload == {'name': 'Ana María', 'email': 'a@x.com', 'step': 1}
+        assert result.merged == ops[:2]
+        assert result.changed == [ops[2]]
+
+    def test_create_then_delete_cancels_out(self):
+        ops = self._ops('user_register', 'user_update', 'user_remove')
+        result = compact_operations(ops)
+        assert result.survivors == []
+        assert len(result.dropped) == 3
+
+    def test_attempted_create_is_kept(self):
+        ops = self._ops('user_register', 'user_remove', retry_count=1)
+        result = compact_operations(ops)
+        assert result.survivors == ops
+
+    def test_updates_before_delete_are_dropped(self):
+        ops = self._ops('user_update', 'user_update', 'user_remove')
+        result = compact_operations(ops)
+        assert result.survivors == [ops[2]]
+
+    def test_referenced_create_delete_pair_is_kept(self):
+        ops = self._ops('user_register', 'user_remove')
+        result = compact_operations(ops, referenced=lambda first, last: True)
+        assert result.survivors == ops
+
+    def test_delete_then_create_kept(self):
+        ops = self._ops('module_uninstall', 'module_install')
+        assert compact_operations(ops).survivors == ops
+
+
+class TestCompactQueue:
+
+    def test_compacts_and_keeps_causal_order(self):
+        ops = _queue(
+            ('user_register', 'u1', {'name': 'Ana'}),
+            ('user_update', 'u2', {'name': 'Bea'}),
+            ('sale_sync', 's1', {'total': 10}),
+            ('user_update', 'u2', {'name': 'Beatriz'}),
+            ('sale_sync', 's1', {'total': 12}),
+            ('user_remove', 'u1', {}),
+            ('user_update', 'u3', {'name': 'Carla'}),
+        )
+
+        stats = compact_queue()
+
+        assert stats['requests_avoided'] == 4
+        assert stats == {'examined': 7, 'entities': 3, 'merged': 2, 'dropped': 2, 'requests_avoided': 4}
+        pending = _pending()
+        # Merged updates take the place of their last operation
+        assert [op.pk for op in pending] == [ops[3].pk, ops[4].pk, ops[6].pk]
+        assert pending[0].payload == {'name': 'Beatriz'}
+        assert pending[1].payload == {'total': 12}
+        assert SyncQueue.objects.filter(status='compacted').count() == 4
+
+    def test_pair_referenced_in_between_is_kept(self):
+        _queue(
+            ('user_register', 'u1', {'name': 'Ana'}),
+            ('sale_sync', 's1', {'lines': [{'seller_id': 'u1'}]}),
+            ('user_remove', 'u1', {}),
+        )
+        assert compact_queue()['requests_avoided'] == 0
+        assert len(_pending()) == 3
+
+    def test_skips_entities_being_uploaded(self):
+        ops = _queue(
+            ('user_register', 'u1', {}),
+            ('user_remove', 'u1', {}),
+        )
+        SyncQueue.objects.filter(pk=ops[0].pk).update(status='processing')
+
+        assert compact_queue()['requests_avoided'] == 0
+        assert len(_pending()) == 1
+
+    def test_operations_without_entity_are_untouched(self):
+        _queue(
+            ('user_update', '', {'name': 'A'}),
+            ('user_update', '', {'name': 'B'}),
+        )
+        assert compact_queue()['requests_avoided'] == 0
+
+    def test_entity_key_defaults_to_payload_id(self):
+        op = SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 7})
+        assert op.entity_key == '7'
+
+    def test_missing_id_means_no_entity_key(self):
+        for payload in ({'id': None}, {'id': ''}, {}):
+            assert SyncQueue.add_operation('user_update', '/api/users/', payload=payload).entity_key == ''
+
+    def test_queue_status_reports_avoided_requests(self, settings):
+        from unittest.mock import MagicMock, patch
+
+        _queue(('sale_sync', 's1', {}), ('sale_sync', 's1', {}))
+        compact_queue()
+        with patch('apps.core.services.sync_service.HubConfig') as hub_config:
+            hub_config.get_config.return_value = MagicMock(is_configured=True)
+            from apps.core.services.sync_service import SyncService
+            assert SyncService().get_queue_status()['requests_avoided'] == 1
@@ -0,0 +1,202 @@
+"""
+Unit tests for compressed Cloud requests, wire accounting and delta heartbeats.
+"""
+import gzip
+import json
+
+import pytest
+import responses
+from unittest.mock import MagicMock, patch
+
+from apps.sync.services import compression
+from apps.sync.services.compression import encode_json, get_encoding, wire_stats
+from apps.sync.services.heartbeat import HeartbeatService, merge_patch
+
+pytestmark = pytest.mark.unit
+
+BIG = {'modules': [f'module_{i}' for i in range(200)]}
+
+
+@pytest.fixture(autouse=True)
+def clean_wire_stats():
+    wire_stats.reset()
+    yield
+    wire_stats.reset()
+
+
+@pytest.fixture
+def gzip_only(settings):
+    settings.CLOUD_COMPRESSION = 'gzip'
+    settings.CLOUD_COMPRESSION_MIN_BYTES = 1024
+
+
+@pytest.fixture
+def cloud_api(gzip_only):
+    with patch('apps.sync.services.cloud_api.HubConfig') as hub_config:
+        config = MagicMock(hub_jwt='test.jwt.token', hub_id='test-hub-id', hub_refresh_token='')
+        hub_config.get_solo.return_value = config
+        from apps.sync.services.cloud_api import CloudAPIService
+        service = CloudAPIService()
+    service.base_url = 'https://api.test.com'
+    return service
+
+
+def _body(request):
+    body = request.body
+    if request.headers.get('Content-Encoding') == 'gzip':
+        body = gzip.decompress(body)
+    return json.loads(body)
+
+
+class TestEncodeJson:
+
+    def test_small_body_is_not_compressed(self, gzip_only):
+        body, headers, raw_size = encode_json({'status': 'completed'})
+        assert 'Content-Encoding' not in headers
+        assert json.loads(body) == {'status': 'completed'}
+        assert raw_size == len(body)
+
+    def test_large_body_is_compressed(self, gzip_only):
+        body, headers, raw_size = encode_json(BIG)
+        assert headers['Content-Encoding'] == 'gzip'
+        assert len(body) < raw_size
+        assert json.loads(gzip.decompress(body)) == BIG
+
+    def test_compression_disabled(self, settings):
+        settings.CLOUD_COMPRESSION = 'none'
+        _, headers, _ = encode_json(BIG)
+        assert 'Content-Encoding' not in headers
+
+    def test_uncompressed_when_not_supported(self, gzip_only):
+        _, headers, _ = encode_json(BIG, compressed=False)
+        assert 'Content-Encoding' not in headers
+
+    def test_zstd_falls_back_to_gzip(self):
+        with patch.object(compression, 'zstandard', None):
+            assert get_encoding('auto') == 'gzip'
+            assert get_encoding('zstd') == 'gzip'
+        assert get_encoding('none') is None
+
+    def test_unknown_mode(self):
+        with pytest.raises(ValueError):
+            get_encoding('brotli')
+
+
+class TestCloudAPICompression:
+
+    @responses.activate
+    def test_large_body_sent_compressed(self, cloud_api):
+        responses.add(responses.POST, 'https://api.test.com/api/hubs/me/heartbeat/', json={'success': True})
+
+        cloud_api.send_heartbeat(dict(BIG))
+
+        request = responses.calls[0].request
+        assert request.headers['Content-Encoding'] == 'gzip'
+        assert _body(request)['modules'] == BIG['modules']
+
+        stats = wire_stats.snapshot()['heartbeat']
+        assert stats['requests'] == 1
+        assert stats['sent_bytes'] == len(request.body)
+        assert stats['sent_bytes'] < stats['raw_bytes']
+        assert stats['received_bytes'] > 0
+
+    @responses.activate
+    def test_gzip_response_is_decoded(self, cloud_api):
+        payload = gzip.compress(json.dumps({'commands': [{'id': 'cmd-1'}]}).encode())
+        responses.add(
+            responses.GET, 'https://api.test.com/api/hubs/me/commands/',
+            body=payload, headers={'Content-Encoding': 'gzip'}, content_type='application/json',
+        )
+
+        assert cloud_api.get_pending_commands() == [{'id': 'cmd-1'}]
+        assert 'gzip' in responses.calls[0].request.headers['Accept-Encoding']
+        assert wire_stats.snapshot()['cloud_api']['received_bytes'] == len(payload)
+
+    @responses.activate
+    def test_unsupported_media_type_retries_uncompressed(self, cloud_api):
+        url = 'https://api.test.com/api/hubs/me/heartbeat/'
+        responses.add(responses.POST, url, status=415)
+        responses.add(responses.POST, url, json={'success': True})
+
+        assert cloud_api.send_heartbeat(dict(BIG)) == {'success': True}
+
+        assert 'Content-Encoding' not in responses.calls[1].request.headers
+        assert cloud_api.compression_supported is False
+
+    @responses.activate
+    def test_delta_heartbeat_header(self, cloud_api):
+        responses.add(responses.POST, 'https://api.test.com/api/hubs/me/heartbeat/', json={})
+
+        cloud_api.send_heartbeat({'status': 'degraded'}, delta=True)
+
+        request = responses.calls[0].request
+        assert request.headers['X-Heartbeat-Delta'] == '1'
+        assert _body(request) == {'status': 'degraded'}
+
+
+class TestMergePatch:
+
+    def test_unchanged(self):
+        assert merge_patch({'a': 1, 'm': {'x': 1}}, {'a': 1, 'm': {'x': 1}}) == {}
+
+    def test_changed_added_removed(self):
+        old = {'a': 1, 'b': 2, 'metrics': {'cpu': 1, 'mem': 10}}
+        new = {'a': 1, 'c': 3, 'metrics': {'cpu': 2, 'mem': 10}}
+        assert merge_patch(old, new) == {'b': None, 'c': 3, 'metrics': {'cpu': 2}}
+
+
+class TestDeltaHeartbeat:
+
+    @pytest.fixture
+    def service(self, settings):
+        settings.HEARTBEAT_DELTA = True
+        settings.HEARTBEAT_FULL_EVERY = 2
+        cloud_api = MagicMock(is_configured=True)
+        cloud_api.send_heartbeat.return_value = {'success': True}
+        service = HeartbeatService(cloud_api=cloud_api)
+        self.metadata = {'version': '1.0.0', 'modules': ['inventory'], 'status': 'healthy'}
+        service._get_heartbeat_metadata = lambda: dict(self.metadata)
+        return service
+
+    def _sent(self, service):
+        args, kwargs = service.cloud_api.send_heartbeat.call_args
+        return args[0], kwargs.get('delta', False)
+
+    def test_first_heartbeat_is_full_then_deltas(self, service):
+        service._send_heartbeat()
+        assert self._sent(service) == (self.metadata, False)
+
+        self.metadata['status'] = 'degraded'
+        service._send_heartbeat()
+        assert self._sent(service) == ({'status': 'degraded'}, True)
+
+        service._send_heartbeat()
+        assert self._sent(service) == ({}, True)
+
+        # HEARTBEAT_FULL_EVERY deltas, then a full heartbeat
+        service._send_heartbeat()
+        assert self._sent(service) == (self.metadata, False)
+
+    def test_failed_heartbeat_keeps_acknowledged_base(self, service):
+        from apps.sync.services.cloud_api import CloudAPIError
+
+        service._send_heartbeat()
+        self.metadata['modules'] = ['inventory', 'sales']
+        service.cloud_api.send_heartbeat.side_effect = CloudAPIError('Connection error')
+        service._send_heartbeat()
+
+        service.cloud_api.send_heartbeat.side_effect = None
+        service._send_heartbeat()
+        assert self._sent(service) == ({'modules': ['inventory', 'sales']}, True)
+
+    def test_cloud_can_require_full_heartbeat(self, service):
+        service.cloud_api.send_heartbeat.return_value = {'full_heartbeat_required': True}
+        service._send_heartbeat()
+        service._send_heartbeat()
+        assert self._sent(service) == (self.metadata, False)
+
+    def test_disabled_by_default(self, service, settings):
+        settings.HEARTBEAT_DELTA = False
+        service._send_heartbeat()
+        service._send_heartbeat()
+        assert self._sent(service) == (self.metadata, False)
@@ -184,21 +184,22 @@ class TestCommandPolling:
 
         mock_cloud_api.get_pending_commands.assert_called_once()
 
-    def test_executes_pending_commands(self, heartbeat_service, mock_cloud_api):
-        """Test that pending commands are executed."""
-        mock_cloud_api.get_pending_commands.return_value = [
-            {
-                'id': 'cmd-1',
-                'type': 'install_module',
-                'payload': {'module_id': 'test'},
-                'command_jwt': 'valid.jwt'
-            }
-        ]
+    def test_queues_pending_commands(self, heartbeat_service, mock_cloud_api):
+        """Test that pending commands are queued, not run on the polling thread."""
+        command = {
+            'id': 'cmd-1',
+            'type': 'install_module',
+            'payload': {'module_id': 'test'},
+            'command_jwt': 'valid.jwt'
+        }
+        mock_cloud_api.get_pending_commands.return_value = [command]
 
-        with patch.object(heartbeat_service, '_execute_command') as mock_exec:
+        with patch.object(heartbeat_service.command_queue, 'enqueue') as mock_enqueue, \
+                patch.object(heartbeat_service, '_run_command') as mock_run:
             heartbeat_service._poll_commands()
 
-            mock_exec.assert_called_once()
+            mock_enqueue.assert_called_once_with(command)
+            mock_run.assert_not_called()
 
     def test_polling_handles_api_error(self, heartbeat_service, mock_cloud_api):
         """Test polling continues on API error."""
@@ -210,10 +211,25 @@ class TestCommandPolling:
         heartbeat_service._poll_commands()
 
 
+class ManualExecutor:
+    """Executor running submitted work only when the test says so."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append((fn, args))
+
+    def run_all(self):
+        while self.submitted:
+            fn, args = self.submitted.pop(0)
+            fn(*args)
+
+
 class TestCommandExecution:
     """Tests for command execution."""
 
-    def test_execute_command_success(self, heartbeat_service, mock_cloud_api):
+    def test_run_command_success(self, heartbeat_service):
         """Test successful command execution."""
         command = {
             'id': 'cmd-1',
@@ -222,17 +238,13 @@ class TestCommandExecution:
             'command_jwt': 'valid.jwt'
         }
 
-        heartbeat_service._execute_command(command)
+        success, result, error = heartbeat_service._run_command(command)
 
-        # Should acknowledge completion
-        mock_cloud_api.acknowledge_command.assert_called_once_with(
-            command_id='cmd-1',
-            status='completed',
-            result={'installed': 'inventory'},
-            error=None
-        )
+        assert success is True
+        assert result == {'installed': 'inventory'}
+        assert error is None
 
-    def test_execute_command_unknown_type(self, heartbeat_service, mock_cloud_api):
+    def test_run_command_unknown_type(self, heartbeat_service):
         """Test execution of unknown command type."""
         command = {
             'id': 'cmd-1',
@@ -241,15 +253,12 @@ class TestCommandExecution:
             'command_jwt': 'valid.jwt'
         }
 
-        heartbeat_service._execute_command(command)
+        success, result, error = heartbeat_service._run_command(command)
 
-        # Should acknowledge failure
-        mock_cloud_api.acknowledge_command.assert_called_once()
-        call_args = mock_cloud_api.acknowledge_command.call_args
-        assert call_args[1]['status'] == 'failed'
-        assert 'Unknown command type' in call_args[1]['error']
+        assert success is False
+        assert 'Unknown command type' in error
 
-    def test_execute_command_jwt_verification_fails(self, heartbeat_service, mock_cloud_api):
+    def test_run_command_jwt_verification_fails(self, heartbeat_service, mock_cloud_api):
         """Test execution fails when JWT verification fails."""
         mock_cloud_api.verify_command_jwt.return_value = None
 
@@ -260,14 +269,12 @@ class TestCommandExecution:
             'command_jwt': 'invalid.jwt'
         }
 
-        heartbeat_service._execute_command(command)
+        success, result, error = heartbeat_service._run_command(command)
 
-        # Should acknowledge failure
-        call_args = mock_cloud_api.acknowledge_command.call_args
-        assert call_args[1]['status'] == 'failed'
-        assert 'JWT verification' in call_args[1]['error']
+        assert success is False
+        assert 'JWT verification' in error
 
-    def test_execute_command_handler_exception(self, heartbeat_service, mock_cloud_api):
+    def test_run_command_handler_exception(self, heartbeat_service):
         """Test execution handles handler exceptions."""
         # Register a failing handler
         def failing_handler(payload):
@@ -283,11 +290,37 @@ class TestCommandExecution:
         }
 
         # Should not raise
-        heartbeat_service._execute_command(command)
+        success, result, error = heartbeat_service._run_command(command)
+
+        assert success is False
+        assert error == 'Handler crashed'
+
+    @pytest.mark.django_db
+    def test_queued_command_is_run_and_acknowledged(self, heartbeat_service, mock_cloud_api):
+        """Test a polled command goes through the CommandQueue to an ack."""
+        from apps.sync.services.command_queue import CommandQueue
+
+        executor = ManualExecutor()
+        queue = CommandQueue(
+            'poll', execute=heartbeat_service._run_command, cloud_api=mock_cloud_api,
+            executor=executor, ack_delay=None,
+        )
+        queue.start()
+        try:
+            queue.enqueue({
+                'id': 'cmd-1',
+                'type': 'install_module',
+                'payload': {'module_id': 'inventory'},
+                'command_jwt': 'valid.jwt'
+            })
+            executor.run_all()
+            assert queue.flush_acks() == 1
+        finally:
+            queue.stop()
 
-        # Should acknowledge failure
-        call_args = mock_cloud_api.acknowledge_command.call_args
-        assert call_args[1]['status'] == 'failed'
+        mock_cloud_api.acknowledge_commands.assert_called_once_with([
+            {'command_id': 'cmd-1', 'status': 'completed', 'result': {'installed': 'inventory'}},
+        ])
 
 
 class TestCommandHandlers:
@@ -362,7 +395,7 @@ class TestRegisterHandler:
             'command_jwt': 'valid.jwt'
         }
 
-        heartbeat_service._execute_command(command)
+        heartbeat_service._run_command(command)
 
         assert len(handler_called) == 1
         assert handler_called[0] == {'data': 'test'}
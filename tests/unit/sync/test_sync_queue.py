@@ -0,0 +1,250 @@
+"""
+Unit tests for SyncQueue claiming and batched SyncService processing.
+"""
+import threading
+from datetime import timedelta
+from unittest.mock import MagicMock, patch
+
+import pytest
+import responses
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.sync.models import SyncQueue
+from apps.sync.services.compression import decompress
+
+pytestmark = [pytest.mark.unit, pytest.mark.django_db]
+
+CLOUD = 'https://api.test.com'
+BATCH_URL = f'{CLOUD}/api/hubs/me/sync/batch/'
+
+
+def _operations(request):
+    """Operations of a batch request, as the Cloud decodes them."""
+    import json
+    body = decompress(request.body, request.headers.get('Content-Encoding'))
+    return json.loads(body)['operations']
+
+
+def _add(n, **fields):
+    return SyncQueue.objects.bulk_create([
+        SyncQueue(operation_type='sale_sync', endpoint=f'/api/sales/{i}/', payload={'n': i}, **fields)
+        for i in range(n)
+    ])
+
+
+@pytest.fixture
+def service(settings):
+    settings.CLOUD_API_URL = CLOUD
+    settings.SYNC_BATCH_SIZE = 50
+    with patch('apps.core.services.sync_service.HubConfig') as hub_config:
+        hub_config.get_config.return_value = MagicMock(is_configured=True, cloud_api_token='token')
+        from apps.core.services.sync_service import SyncService
+        yield SyncService()
+
+
+class TestClaimBatch:
+
+    def test_claims_in_queue_order(self):
+        now = timezone.now()
+        first, second = _add(2, next_retry_at=now - timedelta(minutes=1))
+        SyncQueue.objects.filter(pk=second.pk).update(next_retry_at=now - timedelta(minutes=5))
+        fresh = _add(1)[0]
+        _add(1, next_retry_at=now + timedelta(minutes=5))  # not due yet
+
+        claimed = SyncQueue.claim_batch(limit=10)
+
+        assert [op.pk for op in claimed] == [first.pk, second.pk, fresh.pk]
+        assert {op.status for op in claimed} == {'processing'}
+
+    def test_entity_waits_for_its_earlier_operations(self):
+        now = timezone.now()
+        backing_off = SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 1})
+        SyncQueue.objects.filter(pk=backing_off.pk).update(
+            retry_count=1, next_retry_at=now + timedelta(minutes=2),
+        )
+        later = SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 1})
+        a1, a2 = (SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 2})
+                  for _ in range(2))
+        other = SyncQueue.add_operation('user_update', '/api/users/', payload={})
+
+        # User 1 waits for its retry; user 2 sends one operation at a time
+        assert [op.pk for op in SyncQueue.claim_batch()] == [a1.pk, other.pk]
+        assert SyncQueue.claim_batch() == []
+
+        SyncQueue.objects.filter(pk=a1.pk).update(status='completed')
+        assert [op.pk for op in SyncQueue.claim_batch()] == [a2.pk]
+
+        SyncQueue.objects.filter(pk=backing_off.pk).update(next_retry_at=now - timedelta(seconds=1))
+        assert [op.pk for op in SyncQueue.claim_batch()] == [backing_off.pk]
+        assert later.pk not in [op.pk for op in SyncQueue.claim_batch()]
+
+    def test_blocked_entity_does_not_starve_others(self):
+        blocked = SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 1})
+        SyncQueue.objects.filter(pk=blocked.pk).update(
+            retry_count=1, next_retry_at=timezone.now() + timedelta(minutes=2),
+        )
+        for _ in range(5):
+            SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 1})
+        other = SyncQueue.add_operation('user_update', '/api/users/', payload={'id': 2})
+
+        assert [op.pk for op in SyncQueue.claim_batch(limit=5)] == [other.pk]
+
+    def test_claims_are_disjoint(self):
+        _add(5)
+        first = SyncQueue.claim_batch(limit=3)
+        second = SyncQueue.claim_batch(limit=3)
+        assert len(first) == 3 and len(second) == 2
+        assert not {op.pk for op in first} & {op.pk for op in second}
+        assert SyncQueue.claim_batch(limit=3) == []
+
+    def test_takes_over_abandoned_claims(self):
+        op = _add(1)[0]
+        SyncQueue.claim_batch()
+        assert SyncQueue.claim_batch() == []
+
+        SyncQueue.objects.filter(pk=op.pk).update(
+            updated_at=timezone.now() - SyncQueue.CLAIM_LEASE - timedelta(seconds=1),
+        )
+        assert [o.pk for o in SyncQueue.claim_batch()] == [op.pk]
+        # The attempt lost with the dead worker counts
+        assert SyncQueue.objects.get(pk=op.pk).retry_count == 1
+
+    def test_abandoned_claim_on_last_attempt_fails(self):
+        op = _add(1, max_retries=1)[0]
+        SyncQueue.objects.filter(pk=op.pk).update(
+            status='processing',
+            updated_at=timezone.now() - SyncQueue.CLAIM_LEASE - timedelta(seconds=1),
+        )
+        assert SyncQueue.claim_batch() == []
+        op.refresh_from_db()
+        assert (op.status, op.retry_count) == ('failed', 1)
+
+    @pytest.mark.django_db(transaction=True)
+    @pytest.mark.skipif(connection.vendor != 'postgresql', reason='SKIP LOCKED needs PostgreSQL')
+    def test_skips_rows_locked_by_another_worker(self):
+        ops = _add(4)
+        locked = {op.pk for op in ops[:2]}
+        claimed = []
+
+        with transaction.atomic():
+            # Another worker holds these rows
+            list(SyncQueue.objects.filter(pk__in=locked).select_for_update())
+
+            def worker():
+                try:
+                    claimed.extend(op.pk for op in SyncQueue.claim_batch(limit=10))
+                finally:
+                    connection.close()
+
+            thread = threading.Thread(target=worker)
+            thread.start()
+            thread.join(timeout=10)
+            assert not thread.is_alive(), 'claim_batch blocked on locked rows'
+
+        assert set(claimed) == {op.pk for op in ops[2:]}
+
+
+class TestBackoff:
+
+    def test_exponential_with_cap(self):
+        with patch('apps.sync.models.random.uniform', return_value=1.0):
+            delays = [SyncQueue.backoff_delay(n) for n in (1, 2, 3, 10)]
+        assert delays == [timedelta(minutes=m) for m in (2, 4, 8, 60)]
+
+    def test_failure_schedules_retry_then_gives_up(self):
+        op = SyncQueue(max_retries=2, retry_count=0)
+        op.record_failure('boom')
+        assert op.status == 'pending'
+        assert op.next_retry_at > timezone.now()
+        op.record_failure('boom')
+        assert op.status == 'failed'
+
+
+class TestProcessQueue:
+
+    @responses.activate
+    def test_one_request_and_bulk_updates_per_batch(self, service, django_assert_max_num_queries):
+        ops = _add(30)
+
+        def reply(request):
+            import json
+            assert request.headers['X-Hub-Token'] == 'token'
+            results = [{'id': op['id'], 'status': 201} for op in _operations(request)]
+            results[0]['status'] = 500
+            results[0]['error'] = 'boom'
+            return 207, {}, json.dumps({'results': results})
+
+        responses.add_callback(responses.POST, BATCH_URL, callback=reply)
+
+        # compaction scan + claim (lock + mark) + fetch + one UPDATE for
+        # completed and one bulk_update for failed operations, whatever the
+        # batch size
+        with django_assert_max_num_queries(10):
+            stats = service.process_queue()
+
+        assert stats == {'processed': 30, 'completed': 29, 'failed': 1}
+        assert len(responses.calls) == 1
+        failed = SyncQueue.objects.get(pk=ops[0].pk)
+        assert (failed.status, failed.retry_count, failed.last_error) == ('pending', 1, 'boom')
+        assert SyncQueue.objects.filter(status='completed').count() == 29
+
+    @responses.activate
+    def test_falls_back_to_single_requests(self, service):
+        _add(3)
+        responses.add(responses.POST, BATCH_URL, status=404)
+        for i in range(3):
+            responses.add(responses.POST, f'{CLOUD}/api/sales/{i}/', status=201)
+
+        stats = service.process_queue()
+
+        assert stats['completed'] == 3
+        assert service.batch_supported is False
+
+    @responses.activate
+    def test_offline_backs_off_whole_batch(self, service):
+        from requests.exceptions import ConnectionError
+        _add(3)
+        responses.add(responses.POST, BATCH_URL, body=ConnectionError())
+
+        assert service.drain_queue() == {'processed': 3, 'completed': 0, 'failed': 3}
+        assert not SyncQueue.objects.filter(next_retry_at__isnull=True).exists()
+        assert SyncQueue.claim_batch() == []
+
+    @responses.activate
+    def test_drain_after_offline_period(self, service):
+        import json
+        _add(120)
+        responses.add_callback(
+            responses.POST, BATCH_URL,
+            callback=lambda r: (200, {}, json.dumps({'results': [
+                {'id': op['id'], 'status': 200} for op in _operations(r)
+            ]})),
+        )
+
+        totals = service.drain_queue()
+
+        assert totals == {'processed': 120, 'completed': 120, 'failed': 0}
+        assert len(responses.calls) == 3  # batches of SYNC_BATCH_SIZE
+
+    @responses.activate
+    def test_batch_body_is_compressed(self, service, settings):
+        from apps.sync.services.compression import wire_stats
+        settings.CLOUD_COMPRESSION = 'gzip'
+        wire_stats.reset()
+        _add(50)
+        responses.add(responses.POST, BATCH_URL, status=404)
+        for i in range(50):
+            responses.add(responses.POST, f'{CLOUD}/api/sales/{i}/', status=201)
+        service.batch_supported = True
+
+        service.process_queue()
+
+        batch = responses.calls[0].request
+        assert batch.headers['Content-Encoding'] == 'gzip'
+        assert len(_operations(batch)) == 50
+        # Single operations are below CLOUD_COMPRESSION_MIN_BYTES
+        assert 'Content-Encoding' not in responses.calls[1].request.headers
+        stats = wire_stats.snapshot()['sync']
+        assert stats['requests'] == 51
+        assert stats['sent_bytes'] < stats['raw_bytes']
@@ -104,3 +104,92 @@ class TestHubBaseModel:
         for field in HubBaseModel._meta.get_fields():
             if field.name == 'is_deleted':
                 assert field.default is False
+
+
+@pytest.mark.django_db
+class TestHubQuerySet:
+    """Tests for the set-based helpers on HubQuerySet."""
+
+    @pytest.fixture
+    def hub_id(self, db):
+        import uuid
+        from unittest.mock import patch
+        hub_id = uuid.uuid4()
+        with patch('apps.core.models.managers.current_hub_id', return_value=hub_id):
+            yield hub_id
+
+    def _users(self, count):
+        from apps.accounts.models import LocalUser
+        return [
+            LocalUser(name=f'User {i}', email=f'user{i}@example.com', pin_hash='')
+            for i in range(count)
+        ]
+
+    def test_bulk_create_stamps_hub_and_creator(self, hub_id, django_assert_num_queries):
+        """bulk_create fills hub_id and created_by/updated_by in one INSERT."""
+        import uuid
+        from apps.accounts.models import LocalUser
+
+        actor = uuid.uuid4()
+        users = self._users(3)
+        with django_assert_num_queries(1):
+            LocalUser.objects.bulk_create(users, by=actor)
+
+        stored = LocalUser.objects.all()
+        assert stored.count() == 3
+        assert {u.hub_id for u in stored} == {hub_id}
+        assert {(u.created_by, u.updated_by) for u in stored} == {(actor, actor)}
+
+    def test_bulk_create_keeps_explicit_hub_id(self, hub_id):
+        """An explicit hub_id is not overwritten."""
+        import uuid
+        from apps.accounts.models import LocalUser
+
+        other = uuid.uuid4()
+        user = self._users(1)[0]
+        user.hub_id = other
+        LocalUser.objects.bulk_create([user])
+
+        assert LocalUser.objects.all_hubs().get(pk=user.pk).hub_id == other
+
+    def test_bulk_update_stamps_updated_fields(self, hub_id):
+        """bulk_update writes updated_at and updated_by along with the fields."""
+        import uuid
+        from apps.accounts.models import LocalUser
+
+        users = LocalUser.objects.bulk_create(self._users(2))
+        before = LocalUser.objects.get(pk=users[0].pk).updated_at
+        actor = uuid.uuid4()
+        for user in users:
+            user.name = user.name.upper()
+        LocalUser.objects.bulk_update(users, ['name'], by=actor)
+
+        stored = LocalUser.objects.get(pk=users[0].pk)
+        assert stored.name == 'USER 0'
+        assert stored.updated_by == actor
+        assert stored.updated_at > before
+
+    def test_soft_delete_and_restore(self, hub_id, django_assert_num_queries):
+        """soft_delete()/restore() are a single UPDATE each."""
+        import uuid
+        from apps.accounts.models import LocalUser
+
+        users = LocalUser.objects.bulk_create(self._users(3))
+        ids = [u.pk for u in users[:2]]
+        actor = uuid.uuid4()
+
+        qs = LocalUser.objects.filter(pk__in=ids)
+        with django_assert_num_queries(1):
+            assert qs.soft_delete(by=actor) == 2
+
+        assert LocalUser.objects.count() == 1
+        deleted = LocalUser.all_objects.get(pk=ids[0])
+        assert deleted.is_deleted and deleted.deleted_at is not None
+        assert deleted.updated_by == actor
+
+        # Already deleted rows are not touched again
+        assert LocalUser.all_objects.filter(pk__in=ids).soft_delete() == 0
+
+        assert LocalUser.objects.with_deleted().filter(pk__in=ids).restore() == 2
+        assert LocalUser.objects.count() == 3
+        assert LocalUser.objects.get(pk=ids[0]).deleted_at is None
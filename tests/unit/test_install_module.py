@@ -71,7 +71,7 @@ class TestInstallFromMarketplace:
     """Tests for the install_from_marketplace API endpoint."""
 
     @patch('apps.modules_runtime.loader.module_loader')
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     def test_install_from_marketplace(self, mock_get, mock_loader, authenticated_client, hub_config, tmp_path):
         """Install from marketplace should download, extract, and register module."""
         hub_config.hub_jwt = 'test.jwt.token'
@@ -97,7 +97,7 @@ class TestInstallFromMarketplace:
         assert data['success'] is True
 
     @patch('apps.modules_runtime.loader.module_loader')
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     def test_http_to_https_normalization(self, mock_get, mock_loader, authenticated_client, hub_config, tmp_path):
         """Download URLs should be normalized from http:// to https://."""
         hub_config.hub_jwt = 'test.jwt.token'
@@ -123,7 +123,7 @@ class TestInstallFromMarketplace:
         actual_url = mock_get.call_args[0][0]
         assert actual_url.startswith('https://')
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     def test_install_fails_gracefully_on_cloud_error(self, mock_get, authenticated_client, hub_config, tmp_path):
         """Install should fail gracefully when Cloud returns an error."""
         hub_config.hub_jwt = 'test.jwt.token'
@@ -207,7 +207,7 @@ class TestModuleActivateDeactivate:
 class TestFetchMarketplace:
     """Tests for the fetch_marketplace API endpoint."""
 
-    @patch('apps.system.modules.views.requests.get')
+    @patch('apps.system.modules.views.cloud_http.get')
     def test_fetch_marketplace_with_mock_response(self, mock_get, authenticated_client, hub_config):
         """Fetch marketplace should proxy Cloud API and return modules."""
         hub_config.hub_jwt = 'test.jwt.token'
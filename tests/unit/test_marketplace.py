@@ -132,6 +132,34 @@ class TestMarketplaceIndex:
         assert '<!DOCTYPE' not in content
 
 
+class TestAsyncStoreIndex:
+    """The async store index fetches its Cloud blueprints concurrently."""
+
+    def test_blueprints_are_fetched_concurrently(self, authenticated_client, hub_config):
+        import asyncio
+        from apps.marketplace import views
+
+        hub_config.is_configured = True
+        hub_config.save()
+
+        running = {'now': 0, 'max': 0}
+
+        async def fetch():
+            running['now'] += 1
+            running['max'] = max(running['max'], running['now'])
+            await asyncio.sleep(0.01)
+            running['now'] -= 1
+            return []
+
+        with patch.object(views, '_afetch_sectors_for_filters', fetch), \
+                patch.object(views, '_afetch_business_types_for_filters', fetch), \
+                patch.object(views, '_afetch_functional_units', fetch):
+            response = authenticated_client.get(reverse('marketplace:index'), HTTP_HX_REQUEST='true')
+
+        assert response.status_code == 200
+        assert running['max'] == 3
+
+
 class TestModuleDetail:
     """Tests for the module detail page."""
 
@@ -171,6 +199,26 @@ class TestProductsList:
 
         assert response.status_code == 200
 
+    def test_non_json_cloud_response_is_an_error_message(self, hub_config):
+        """A 200 HTML page (proxy, captive portal) is an error message, not a 500."""
+        from unittest.mock import AsyncMock
+
+        from asgiref.sync import async_to_sync
+        from django.core.cache import cache
+
+        from apps.marketplace import views
+
+        hub_config.hub_jwt = 'test.jwt.token'
+        hub_config.save()
+        cache.delete(views._CK_MODULES_LIST)
+        html_page = MagicMock(status_code=200, json=MagicMock(side_effect=ValueError('Expecting value')))
+
+        with patch.object(views, 'aget', AsyncMock(return_value=html_page)):
+            modules, error = async_to_sync(views._afetch_all_modules)()
+
+        assert modules is None
+        assert 'invalid response' in error
+
 
 class TestMarketplaceAuth:
     """Tests for marketplace authentication requirements."""